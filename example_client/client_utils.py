@@ -14,32 +14,155 @@
 # limitations under the License.
 #
 
+import csv
+import json
+import math
 import numpy as np
 
+
+class LatencyHistogram:
+    """Fixed memory, mergeable latency histogram with log-linear buckets.
+
+    Values are recorded in milliseconds and stored with microsecond resolution. Every power of two
+    range is split into 2^(precision_bits - 1) linear sub-buckets, which bounds the relative error
+    of any reported percentile to 2^-(precision_bits - 1). Values above highest_ms are counted in
+    the last bucket. Histograms with the same configuration merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, highest_ms=3600 * 1000, precision_bits=7):
+        self.highest_ms = highest_ms
+        self.precision_bits = precision_bits
+        self._sub_bucket_count = 1 << precision_bits
+        self._half_count = self._sub_bucket_count >> 1
+        self._highest_us = int(highest_ms * 1000)
+        self.counts = np.zeros(self._index(self._highest_us) + 1, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+        self.sum_of_squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value_us):
+        if value_us < self._sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.precision_bits
+        return shift * self._half_count + (value_us >> shift)
+
+    def _bucket_range_us(self, index):
+        if index < self._sub_bucket_count:
+            return index, index
+        shift = index // self._half_count - 1
+        mantissa = index - shift * self._half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ms):
+        value_us = min(max(int(value_ms * 1000), 0), self._highest_us)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.sum_of_squares += value_ms * value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other):
+        if self.highest_ms != other.highest_ms or self.precision_bits != other.precision_bits:
+            raise ValueError("Cannot merge histograms with different configuration")
+        self.counts += other.counts
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_of_squares += other.sum_of_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def average(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def variance(self):
+        if not self.count:
+            return 0.0
+        return max(self.sum_of_squares / self.count - self.average() ** 2, 0.0)
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def percentile(self, percentile):
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        lower, upper = self._bucket_range_us(index)
+        return min(max((lower + upper) / 2000, self.min), self.max)
+
+    def buckets(self):
+        for index in np.flatnonzero(self.counts):
+            lower, upper = self._bucket_range_us(int(index))
+            yield lower / 1000, upper / 1000, int(self.counts[index])
+
+    def to_dict(self, percentiles=(50, 90, 99, 99.9)):
+        return {
+            "highest_ms": self.highest_ms,
+            "precision_bits": self.precision_bits,
+            "count": self.count,
+            "sum": self.sum,
+            "sum_of_squares": self.sum_of_squares,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "average": self.average(),
+            "std": self.std(),
+            "percentiles": {str(p): self.percentile(p) for p in percentiles},
+            "buckets": [[lower, upper, count] for lower, upper, count in self.buckets()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["highest_ms"], data["precision_bits"])
+        for lower, _, count in data["buckets"]:
+            histogram.counts[histogram._index(int(round(lower * 1000)))] += count
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.sum_of_squares = data["sum_of_squares"]
+        if histogram.count:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["lower_ms", "upper_ms", "count", "cumulative_percent"])
+            cumulative = 0
+            for lower, upper, count in self.buckets():
+                cumulative += count
+                writer.writerow([lower, upper, count, 100 * cumulative / self.count])
+
+
 def print_statistics(processing_times, batch_size):
+    if not isinstance(processing_times, LatencyHistogram):
+        histogram = LatencyHistogram()
+        for duration in processing_times:
+            histogram.record(duration)
+        processing_times = histogram
+
+    def speed(time):
+        return round(1000 * batch_size / time, 2) if time > 0 else math.inf
+
+    average = processing_times.average()
+    median = processing_times.percentile(50)
     print('\nprocessing time for all iterations')
-    print('average time: {:.2f} ms; average speed: {:.2f} fps'
-          .format(round(np.average(processing_times), 2),
-                  round(1000 * batch_size / np.average(processing_times), 2)))
-
-    print('median time: {:.2f} ms; median speed: {:.2f} fps'
-          .format(round(np.median(processing_times), 2),
-                 round(1000 * batch_size / np.median(processing_times), 2)))
-
-    print('max time: {:.2f} ms; min speed: {:.2f} fps'.format(round(np.max(processing_times), 2),round(1000 * batch_size / np.max(processing_times), 2)))
-
-    print('min time: {:.2f} ms; max speed: {:.2f} fps'.format(round(np.min(processing_times), 2),
-                                                          round(1000 * batch_size / np.min(processing_times), 2)))
-
-    print('time percentile 90: {:.2f} ms; speed percentile 90: {:.2f} fps'.format(
-    round(np.percentile(processing_times, 90), 2),
-    round(1000 * batch_size / np.percentile(processing_times, 90), 2)
-))
-    print('time percentile 50: {:.2f} ms; speed percentile 50: {:.2f} fps'.format(
-    round(np.percentile(processing_times, 50), 2),
-    round(1000 * batch_size / np.percentile(processing_times, 50), 2)))
-    print('time standard deviation: {:.2f}'.format(round(np.std(processing_times), 2)))
-    print('time variance: {:.2f}'.format(round(np.var(processing_times), 2)))
+    print('average time: {:.2f} ms; average speed: {:.2f} fps'.format(round(average, 2), speed(average)))
+    print('median time: {:.2f} ms; median speed: {:.2f} fps'.format(round(median, 2), speed(median)))
+    print('max time: {:.2f} ms; min speed: {:.2f} fps'.format(round(processing_times.max, 2), speed(processing_times.max)))
+    print('min time: {:.2f} ms; max speed: {:.2f} fps'.format(round(processing_times.min, 2), speed(processing_times.min)))
+    for percentile in (50, 90, 99, 99.9):
+        time = processing_times.percentile(percentile)
+        print('time percentile {}: {:.2f} ms; speed percentile {}: {:.2f} fps'.format(
+            percentile, round(time, 2), percentile, speed(time)))
+    print('time standard deviation: {:.2f}'.format(round(processing_times.std(), 2)))
+    print('time variance: {:.2f}'.format(round(processing_times.variance(), 2)))
 
 def prepare_certs(server_cert=None, client_key=None, client_ca=None):
     if server_cert is not None:
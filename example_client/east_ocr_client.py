@@ -18,10 +18,8 @@ import grpc
 import cv2
 import os
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray
 import argparse
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+from ovms_client import PredictClient
 
 parser = argparse.ArgumentParser(description='Client for OCR pipeline')
 parser.add_argument('--grpc_address', required=False, default='localhost',  help='Specify url to grpc service. default:localhost')
@@ -38,24 +36,24 @@ parser.add_argument('--image_layout', required=False, default='NCHW', choices=['
 
 args = vars(parser.parse_args())
 
-def prepare_img_input_in_nchw_format(request, name, path, resize_to_shape):
+def prepare_img_input_in_nchw_format(inputs, name, path, resize_to_shape):
     img = cv2.imread(path).astype(np.float32)  # BGR color format, shape HWC
     img = cv2.resize(img, (resize_to_shape[1], resize_to_shape[0]))
     target_shape = (img.shape[0], img.shape[1])
     img = img.transpose(2,0,1).reshape(1,3,target_shape[0],target_shape[1])
-    request.inputs[name].CopyFrom(make_tensor_proto(img, shape=img.shape))
+    inputs[name] = img
 
-def prepare_img_input_in_nhwc_format(request, name, path, resize_to_shape):
+def prepare_img_input_in_nhwc_format(inputs, name, path, resize_to_shape):
     img = cv2.imread(path).astype(np.float32)  # BGR color format, shape HWC
     img = cv2.resize(img, (resize_to_shape[1], resize_to_shape[0]))
     target_shape = (img.shape[0], img.shape[1])
     img = img.reshape(1,target_shape[0],target_shape[1],3)
-    request.inputs[name].CopyFrom(make_tensor_proto(img, shape=img.shape))
+    inputs[name] = img
 
-def prepare_img_input_in_binary_format(request, name, path):
+def prepare_img_input_in_binary_format(inputs, name, path):
     with open(path, 'rb') as f:
         data = f.read()
-        request.inputs[name].CopyFrom(make_tensor_proto(data, shape=[1]))
+        inputs[name] = [data]
 
 def save_text_images_as_jpgs(output_nd, name, location):
     for i in range(output_nd.shape[0]):
@@ -89,26 +87,18 @@ def crnn_output_to_text(output_nd):
 
 
 address = "{}:{}".format(args['grpc_address'],args['grpc_port'])
-MAX_MESSAGE_LENGTH = 1024 * 1024 * 1024
-channel = grpc.insecure_channel(address,
-    options=[
-        ('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
-        ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH),
-    ])
-
-stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
-request = predict_pb2.PredictRequest()
-request.model_spec.name = args['pipeline_name']
+client = PredictClient(address, timeout=30.0)
+inputs = {}
 
 if args['image_layout'] == 'NCHW':
-    prepare_img_input_in_nchw_format(request, args['image_input_name'], args['image_input_path'], (int(args['image_height']), int(args['image_width'])))
+    prepare_img_input_in_nchw_format(inputs, args['image_input_name'], args['image_input_path'], (int(args['image_height']), int(args['image_width'])))
 elif args['image_layout'] == 'NHWC':
-    prepare_img_input_in_nhwc_format(request, args['image_input_name'], args['image_input_path'], (int(args['image_height']), int(args['image_width'])))
+    prepare_img_input_in_nhwc_format(inputs, args['image_input_name'], args['image_input_path'], (int(args['image_height']), int(args['image_width'])))
 else:
-    prepare_img_input_in_binary_format(request, args['image_input_name'], args['image_input_path'])
+    prepare_img_input_in_binary_format(inputs, args['image_input_name'], args['image_input_path'])
 
 try:
-    response = stub.Predict(request, 30.0)
+    outputs = client.predict(args['pipeline_name'], inputs)
 except grpc.RpcError as err:
     if err.code() == grpc.StatusCode.ABORTED:
         print('No text has been found in the image')
@@ -116,10 +106,8 @@ except grpc.RpcError as err:
     else:
         raise err
 
-for name in response.outputs:
+for name, output_nd in outputs.items():
     print(f"Output: name[{name}]")
-    tensor_proto = response.outputs[name]
-    output_nd = make_ndarray(tensor_proto)
     print(f"    numpy => shape[{output_nd.shape}] data[{output_nd.dtype}]")
     if name == args['text_images_output_name'] and len(args['text_images_save_path']) > 0:
         save_text_images_as_jpgs(output_nd, name, args['text_images_save_path'])
@@ -20,10 +20,10 @@ import datetime
 import grpc
 import numpy as np
 import os
-from tensorflow import make_tensor_proto, make_ndarray
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
-from client_utils import print_statistics, prepare_certs
+from ovms_tensor import make_tensor_proto, make_ndarray
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
+from client_utils import print_statistics, prepare_certs, LatencyHistogram
 
 
 def load_image(file_path):
@@ -80,7 +80,7 @@ for i in files:
 print('Start processing {} iterations with batch size {}'.format(len(files)//batch_size , batch_size))
 
 iteration = 0
-processing_times = np.zeros((0),int)
+processing_times = LatencyHistogram()
 
 
 for x in range(0, imgs.shape[0] - batch_size + 1, batch_size):
@@ -95,7 +95,7 @@ for x in range(0, imgs.shape[0] - batch_size + 1, batch_size):
     end_time = datetime.datetime.now()
 
     duration = (end_time - start_time).total_seconds() * 1000
-    processing_times = np.append(processing_times,np.array([int(duration)]))
+    processing_times.record(duration)
     output = make_ndarray(result.outputs["detection_out"])
     print("Response shape", output.shape)
     for y in range(0,img.shape[0]):  # iterate over responses from all images in the batch
@@ -17,11 +17,12 @@
 import grpc
 import numpy as np
 import classes
-from tensorflow import make_tensor_proto, make_ndarray, make_tensor_proto
+from ovms_tensor import make_tensor_proto, make_ndarray
 import datetime
 import argparse
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
+from client_utils import LatencyHistogram
 
 parser = argparse.ArgumentParser(description='Do requests to ie_serving and tf_serving using images in binary format')
 parser.add_argument('--images_list', required=False, default='input_images.txt', help='path to a file with a list of labeled images')
@@ -51,7 +52,7 @@ print('\tImages list file: {}'.format(args.get('images_list')))
 
 count = 0
 matched = 0
-processing_times = np.zeros((0),int)
+processing_times = LatencyHistogram()
 
 batch_i = 0
 image_data = []
@@ -77,7 +78,7 @@ for line in lines:
             print(Y)
         exit(1)
     duration = (end_time - start_time).total_seconds() * 1000
-    processing_times = np.append(processing_times,np.array([int(duration)]))
+    processing_times.record(duration)
     output = make_ndarray(result.outputs[args['output_name']])
     nu = np.array(output)
     # for object classification models show imagenet class
@@ -99,7 +100,7 @@ for line in lines:
     labels = []
     batch_i = 0
 
-latency = np.average(processing_times)
+latency = processing_times.average()
 accuracy = matched / count
 
 print("Overall accuracy=",accuracy*100,"%")
@@ -14,15 +14,14 @@
 # limitations under the License.
 #
 
-import grpc
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray
+from ovms_tensor import make_tensor_proto, make_ndarray
 import classes
 import datetime
 import argparse
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
-from client_utils import print_statistics, prepare_certs
+from ovms_protos import predict_pb2
+from client_utils import print_statistics, LatencyHistogram
+from ovms_client import ChannelPool
 
 
 parser = argparse.ArgumentParser(description='Sends requests via TFS gRPC API using images in numpy format. '
@@ -62,19 +61,11 @@ args = vars(parser.parse_args())
 
 address = "{}:{}".format(args['grpc_address'],args['grpc_port'])
 
-if args.get('tls'):
-    server_ca_cert, client_key, client_cert = prepare_certs(server_cert=args['server_cert'],
-                                                            client_key=args['client_key'],
-                                                            client_ca=args['client_cert'])
-    creds = grpc.ssl_channel_credentials(root_certificates=server_ca_cert,
-                                         private_key=client_key, certificate_chain=client_cert)
-    channel = grpc.secure_channel(address, creds)
-else:
-    channel = grpc.insecure_channel(address)
+channel_pool = ChannelPool(address, tls=args.get('tls'), server_cert=args['server_cert'],
+                           client_key=args['client_key'], client_cert=args['client_cert'])
+stub = channel_pool.stub()
 
-stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
-
-processing_times = np.zeros((0),int)
+processing_times = LatencyHistogram()
 
 # optional preprocessing depending on the model
 imgs = np.load(args['images_numpy_path'], mmap_mode='r', allow_pickle=False)
@@ -136,7 +127,7 @@ while iteration <= iterations:
                 print(Y)
             exit(1)
         duration = (end_time - start_time).total_seconds() * 1000
-        processing_times = np.append(processing_times,np.array([int(duration)]))
+        processing_times.record(duration)
         output = make_ndarray(result.outputs[args['output_name']])
 
         nu = np.array(output)
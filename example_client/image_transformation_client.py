@@ -14,14 +14,11 @@
 # limitations under the License.
 #
 
-import grpc
 import cv2
 import os
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray
 import argparse
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+from ovms_client import PredictClient
 parser = argparse.ArgumentParser(description='Client for image transformation node testing')
 parser.add_argument('--grpc_address', required=False, default='localhost',  help='Specify url to grpc service. default:localhost')
 parser.add_argument('--grpc_port', required=False, default=9178, help='Specify port to grpc service. default: 9178')
@@ -39,7 +36,7 @@ parser.add_argument('--output_color', required=False, default='BGR', choices=['B
 
 args = vars(parser.parse_args())
 
-def prepare_img_input(request, name, path, width, height, layout, color):
+def prepare_img_input(inputs, name, path, width, height, layout, color):
     img = cv2.imread(path).astype(np.float32)  # BGR color format, shape HWC
     img = cv2.resize(img, (width, height))
     if color == 'RGB':
@@ -53,7 +50,7 @@ def prepare_img_input(request, name, path, width, height, layout, color):
         img = img.transpose(2,0,1).reshape(1, c, h, w)
     else:
         img = img.reshape(1, img.shape[0], img.shape[1], img.shape[2])
-    request.inputs[name].CopyFrom(make_tensor_proto(img, shape=img.shape))
+    inputs[name] = img
 
 def save_img_output_as_jpg(output_nd, path, layout, color):
     img = output_nd[0]
@@ -64,19 +61,11 @@ def save_img_output_as_jpg(output_nd, path, layout, color):
     cv2.imwrite(path, img)
 
 address = "{}:{}".format(args['grpc_address'],args['grpc_port'])
-MAX_MESSAGE_LENGTH = 1024 * 1024 * 1024
-channel = grpc.insecure_channel(address,
-    options=[
-        ('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
-        ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH),
-    ])
-
-stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
-request = predict_pb2.PredictRequest()
-request.model_spec.name = args['pipeline_name']
+client = PredictClient(address, timeout=30.0)
+inputs = {}
 
 prepare_img_input(
-    request,
+    inputs,
     args['image_input_name'],
     args['input_image_path'],
     int(args['image_width']),
@@ -84,12 +73,10 @@ prepare_img_input(
     args['input_layout'],
     args['input_color'])
 
-response = stub.Predict(request, 30.0)
+outputs = client.predict(args['pipeline_name'], inputs)
 
-for name in response.outputs:
+for name, output_nd in outputs.items():
     print(f"Output: name[{name}]")
-    tensor_proto = response.outputs[name]
-    output_nd = make_ndarray(tensor_proto)
     print(f"    numpy => shape[{output_nd.shape}] data[{output_nd.dtype}]")
 
     if name == args['image_output_name']:
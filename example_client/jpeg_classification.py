@@ -17,11 +17,12 @@
 import grpc
 import numpy as np
 import classes
-from tensorflow import make_tensor_proto, make_ndarray, make_tensor_proto
+from ovms_tensor import make_tensor_proto, make_ndarray
 import datetime
 import argparse
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
+from client_utils import LatencyHistogram
 import cv2
 
 def crop_resize(img,cropx,cropy):
@@ -79,7 +80,7 @@ print('\tImages list file: {}'.format(args.get('images_list')))
 
 i = 0
 matched = 0
-processing_times = np.zeros((0),int)
+processing_times = LatencyHistogram()
 imgs = np.zeros((0,3,size, size), np.dtype('<f'))
 lbs = np.zeros((0), int)
 
@@ -101,7 +102,7 @@ for line in lines:
             print(Y)
         exit(1)
     duration = (end_time - start_time).total_seconds() * 1000
-    processing_times = np.append(processing_times,np.array([int(duration)]))
+    processing_times.record(duration)
     output = make_ndarray(result.outputs[args['output_name']])
     nu = np.array(output)
     # for object classification models show imagenet class
@@ -119,7 +120,7 @@ for line in lines:
     i += 1
     print("\t",i, classes.imagenet_classes[ma],ma, mark_message)
 
-latency = np.average(processing_times)
+latency = processing_times.average()
 accuracy = matched/i
 
 print("Overall accuracy=",accuracy*100,"%")
@@ -27,8 +27,8 @@
 
 from __future__ import print_function
 from argparse import ArgumentParser, SUPPRESS
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
 from time import time, sleep
 
 import sys
@@ -37,7 +37,7 @@ import cv2
 import grpc
 import threading
 import logging as log
-from tensorflow import make_tensor_proto, make_ndarray
+from ovms_tensor import make_tensor_proto, make_ndarray
 
 # global data (shared between threads & main)
 CLASSES = ["None", "Pedestrian", "Vehicle", "Bike", "Other"]
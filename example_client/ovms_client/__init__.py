@@ -0,0 +1,21 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from ovms_client.channel_pool import ChannelPool, DEFAULT_MAX_MESSAGE_LENGTH
+from ovms_client.predict_client import PredictClient
+from ovms_client.rest_client import RestPredictClient, RestError
+
+__all__ = ['ChannelPool', 'PredictClient', 'RestPredictClient', 'RestError', 'DEFAULT_MAX_MESSAGE_LENGTH']
@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import itertools
+import grpc
+from ovms_protos import prediction_service_pb2_grpc
+from client_utils import prepare_certs
+
+DEFAULT_MAX_MESSAGE_LENGTH = 1024 * 1024 * 1024
+DEFAULT_KEEPALIVE_TIME_MS = 30 * 1000
+DEFAULT_KEEPALIVE_TIMEOUT_MS = 10 * 1000
+
+
+class ChannelPool:
+    """Set of gRPC channels to one server, each backed by its own HTTP/2 connection.
+
+    gRPC multiplexes all calls of a channel over a single connection. Spreading calls over several
+    channels lets one client process use more server side gRPC workers. Channels and stubs are
+    created once and reused for every call.
+    """
+
+    def __init__(self, address, size=1, tls=False, server_cert=None, client_key=None, client_cert=None,
+                 max_message_length=DEFAULT_MAX_MESSAGE_LENGTH, keepalive_time_ms=DEFAULT_KEEPALIVE_TIME_MS,
+                 keepalive_timeout_ms=DEFAULT_KEEPALIVE_TIMEOUT_MS, options=None):
+        if size < 1:
+            raise ValueError("Channel pool size must be at least 1")
+        self.address = address
+        credentials = None
+        if tls:
+            server_ca_cert, client_key, client_cert = prepare_certs(server_cert=server_cert,
+                                                                    client_key=client_key,
+                                                                    client_ca=client_cert)
+            credentials = grpc.ssl_channel_credentials(root_certificates=server_ca_cert,
+                                                       private_key=client_key, certificate_chain=client_cert)
+        channel_options = [
+            ('grpc.max_send_message_length', max_message_length),
+            ('grpc.max_receive_message_length', max_message_length),
+            ('grpc.keepalive_time_ms', keepalive_time_ms),
+            ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+            ('grpc.keepalive_permit_without_calls', 1),
+            ('grpc.http2.max_pings_without_data', 0),
+            # Channels with identical arguments share subchannels, so each channel gets its own pool
+            ('grpc.use_local_subchannel_pool', 1),
+        ] + list(options or [])
+
+        self.channels = []
+        for index in range(size):
+            # Distinct argument keeps channels on separate connections on versions without local subchannel pools
+            indexed_options = channel_options + [('ovms_client.channel_index', index)]
+            if credentials is not None:
+                self.channels.append(grpc.secure_channel(address, credentials, options=indexed_options))
+            else:
+                self.channels.append(grpc.insecure_channel(address, options=indexed_options))
+        self.stubs = [prediction_service_pb2_grpc.PredictionServiceStub(channel) for channel in self.channels]
+        self._next_index = itertools.count()
+
+    def __len__(self):
+        return len(self.stubs)
+
+    def stub(self):
+        """Returns the next PredictionServiceStub in round robin order."""
+        if not self.stubs:
+            raise ValueError("Channel pool is closed")
+        return self.stubs[next(self._next_index) % len(self.stubs)]
+
+    def close(self):
+        for channel in self.channels:
+            channel.close()
+        self.channels = []
+        self.stubs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from ovms_protos import predict_pb2
+from ovms_tensor import fill_tensor_proto, make_ndarray
+from ovms_client.channel_pool import ChannelPool
+
+
+class PredictClient:
+    """Predict API over a ChannelPool taking and returning dictionaries of numpy arrays.
+
+    Inputs map tensor names to numpy arrays, or to lists of bytes for binary inputs. Outputs map
+    tensor names to numpy arrays. gRPC errors are raised as grpc.RpcError.
+    """
+
+    def __init__(self, address, pool_size=1, timeout=10.0, **channel_options):
+        self.pool = ChannelPool(address, size=pool_size, **channel_options)
+        self.timeout = timeout
+
+    @staticmethod
+    def make_request(model_name, inputs, model_version=None):
+        request = predict_pb2.PredictRequest()
+        request.model_spec.name = model_name
+        if model_version is not None:
+            request.model_spec.version.value = model_version
+        for name, data in inputs.items():
+            fill_tensor_proto(request.inputs[name], data)
+        return request
+
+    @staticmethod
+    def parse_response(response):
+        return {name: make_ndarray(tensor) for name, tensor in response.outputs.items()}
+
+    def predict(self, model_name, inputs, model_version=None, timeout=None):
+        request = self.make_request(model_name, inputs, model_version)
+        response = self.pool.stub().Predict(request, timeout or self.timeout)
+        return self.parse_response(response)
+
+    async def predict_async(self, model_name, inputs, model_version=None, timeout=None):
+        """Awaitable predict. The call runs on gRPC threads and does not block the event loop."""
+        request = self.make_request(model_name, inputs, model_version)
+        loop = asyncio.get_running_loop()
+        result = loop.create_future()
+        call = self.pool.stub().Predict.future(request, timeout or self.timeout)
+
+        def transfer(call):
+            if result.cancelled():
+                return
+            error = call.exception()
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(call.result())
+
+        call.add_done_callback(lambda call: loop.call_soon_threadsafe(transfer, call))
+        try:
+            response = await result
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        return self.parse_response(response)
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,152 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import collections
+import json
+import ssl
+from urllib.parse import urlparse
+from ovms_client.rest_json import encode_predict_request, decode_predict_response
+
+
+class RestError(Exception):
+    def __init__(self, status, message):
+        super().__init__("HTTP {}: {}".format(status, message))
+        self.status = status
+        self.message = message
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class RestPredictClient:
+    """Asyncio client for the TensorFlow Serving compatible REST predict API.
+
+    Keeps up to max_connections HTTP/1.1 keep-alive connections and reuses idle ones for new
+    requests. Requests beyond that limit wait for a free connection. Request bodies are written
+    chunk by chunk as produced by rest_json, responses are parsed into numpy arrays.
+    """
+
+    def __init__(self, url="http://localhost:8000", max_connections=8, timeout=10.0,
+                 client_cert=None, client_key=None, server_cert=None, verify_server=True):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.ssl = None
+        if parsed.scheme == "https":
+            self.ssl = ssl.create_default_context(cafile=server_cert)
+            if client_cert is not None:
+                self.ssl.load_cert_chain(client_cert, client_key)
+            if not verify_server:
+                self.ssl.check_hostname = False
+                self.ssl.verify_mode = ssl.CERT_NONE
+        self.port = parsed.port or (443 if self.ssl else 80)
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle = collections.deque()
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        return _Connection(reader, writer)
+
+    async def _send(self, connection, method, path, chunks):
+        length = sum(len(chunk) for chunk in chunks)
+        connection.writer.write("{} {} HTTP/1.1\r\nHost: {}:{}\r\nContent-Type: application/json\r\n"
+                                "Content-Length: {}\r\nConnection: keep-alive\r\n\r\n"
+                                .format(method, path, self.host, self.port, length).encode())
+        for chunk in chunks:
+            connection.writer.write(chunk)
+            await connection.writer.drain()
+        await connection.writer.drain()
+
+        head = await connection.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        version, status = lines[0].split(" ", 2)[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await connection.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await connection.reader.readuntil(b"\r\n")
+                    break
+                parts.append(await connection.reader.readexactly(size))
+                await connection.reader.readexactly(2)
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await connection.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await connection.reader.read()
+            headers["connection"] = "close"
+        reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return int(status), body, reusable
+
+    async def request(self, method, path, chunks=()):
+        """Sends a request with body made of chunks, returns (status, body)."""
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                connection = self._idle.popleft() if reused else await self._connect()
+                try:
+                    status, body, reusable = await asyncio.wait_for(
+                        self._send(connection, method, path, chunks), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as error:
+                    connection.close()
+                    # Server may have closed an idle keep-alive connection, retry on a new one
+                    if reused:
+                        continue
+                    raise error
+                except BaseException:
+                    connection.close()
+                    raise
+                if reusable:
+                    self._idle.append(connection)
+                else:
+                    connection.close()
+                return status, body
+
+    async def predict(self, model_name, inputs, model_version=None, request_format="column_name"):
+        """Runs predict with inputs, a dict of numpy arrays or lists of bytes. Returns a dict of numpy arrays."""
+        version = "" if model_version is None else "/versions/{}".format(model_version)
+        path = "/v1/models/{}{}:predict".format(model_name, version)
+        status, body = await self.request("POST", path, encode_predict_request(inputs, request_format))
+        if status != 200:
+            try:
+                message = json.loads(body).get("error", body)
+            except ValueError:
+                message = body
+            raise RestError(status, message)
+        return decode_predict_response(body)
+
+    async def close(self):
+        while self._idle:
+            self._idle.popleft().close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,241 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# TensorFlow Serving REST predict bodies built from and parsed into numpy arrays.
+# Request bodies are produced as a list of byte chunks, one per batch element, so they can be written
+# to a socket as they are. Number arrays in responses are parsed by numpy directly from the body text.
+
+import base64
+import json
+import re
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+REQUEST_FORMATS = ("row_noname", "row_name", "column_noname", "column_name")
+SIGNATURE = "serving_default"
+UNNAMED_OUTPUT = "output"
+
+_WHITESPACE = b" \t\r\n"
+_BRACKETS = b"[]"
+_FLOAT_CHARACTERS = re.compile(rb"[.eEnN]")
+_KEY = re.compile(rb'"((?:[^"\\]|\\.)*)":')
+
+
+def _is_binary(data):
+    return not isinstance(data, np.ndarray) and len(data) > 0 and isinstance(data[0], (bytes, bytearray))
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _encode_array(array):
+    """JSON text of a numeric array as a list of chunks, one per element of the first dimension."""
+    array = np.asarray(array)
+    if array.dtype == np.float16:
+        array = array.astype(np.float32)
+    if array.ndim == 0:
+        return [_dumps(array.item())]
+    if orjson is not None:
+        array = np.ascontiguousarray(array)
+        if array.ndim < 2:
+            return [orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY)]
+        rows = [orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY) for row in array]
+    else:
+        if array.ndim < 2:
+            return [json.dumps(array.tolist()).encode()]
+        rows = [json.dumps(row.tolist()).encode() for row in array]
+    return _join(rows)
+
+
+def _encode_binary(values):
+    return [_dumps([{"b64": base64.b64encode(value).decode()} for value in values])]
+
+
+def _encode_input(data):
+    return _encode_binary(data) if _is_binary(data) else _encode_array(data)
+
+
+def _encode_instance(data, index):
+    if _is_binary(data):
+        return [_dumps({"b64": base64.b64encode(data[index]).decode()})]
+    return _encode_array(np.asarray(data)[index])
+
+
+def _join(parts, separator=b","):
+    chunks = [b"["]
+    for index, part in enumerate(parts):
+        if index:
+            chunks.append(separator)
+        chunks.append(part)
+    chunks.append(b"]")
+    return chunks
+
+
+def encode_predict_request(inputs, request_format="column_name"):
+    """Returns the predict request body for inputs, a dict of numpy arrays or lists of bytes, as a list of chunks."""
+    if request_format not in REQUEST_FORMATS:
+        raise ValueError("Invalid request format: {}".format(request_format))
+    if request_format.endswith("noname") and len(inputs) != 1:
+        raise ValueError("Request format {} supports only one input".format(request_format))
+
+    chunks = [b'{"signature_name":"' + SIGNATURE.encode() + b'",']
+    if request_format == "column_name":
+        chunks.append(b'"inputs":{')
+        for index, (name, data) in enumerate(inputs.items()):
+            chunks.append((b"," if index else b"") + _dumps(name) + b":")
+            chunks.extend(_encode_input(data))
+        chunks.append(b"}")
+    elif request_format == "column_noname":
+        chunks.append(b'"inputs":')
+        chunks.extend(_encode_input(next(iter(inputs.values()))))
+    elif request_format == "row_noname":
+        chunks.append(b'"instances":')
+        chunks.extend(_encode_input(next(iter(inputs.values()))))
+    else:
+        batch_sizes = {len(data) for data in inputs.values()}
+        if len(batch_sizes) != 1:
+            raise ValueError("All inputs need the same batch size in row format")
+        chunks.append(b'"instances":[')
+        for index in range(batch_sizes.pop()):
+            chunks.append(b",{" if index else b"{")
+            for position, (name, data) in enumerate(inputs.items()):
+                chunks.append((b"," if position else b"") + _dumps(name) + b":")
+                chunks.extend(_encode_instance(data, index))
+            chunks.append(b"}")
+        chunks.append(b"]")
+    chunks.append(b"}")
+    return chunks
+
+
+def _array_end(body, start):
+    """Index after the number array starting at body[start], for a body without whitespace."""
+    ndim = len(body) - start - len(body[start:].lstrip(b"["))
+    end = body.find(b"]" * ndim, start)
+    if end < 0:
+        raise ValueError("Unterminated array in response")
+    return end + ndim, ndim
+
+
+def _parse_array(text, ndim):
+    """Parses a whitespace free, rectangular JSON number array with numpy, without Python lists."""
+    shape = []
+    for closing in range(ndim, 0, -1):
+        end = text.find(b"]" * closing)
+        shape.append(text[:end].count(b"]" * (closing - 1) + b",") + 1)
+    if text[ndim:ndim + 1] == b"]":
+        shape[-1] = 0
+        return np.zeros(shape)
+    numbers = text.translate(None, _BRACKETS)
+    dtype = np.float64 if _FLOAT_CHARACTERS.search(numbers) else np.int64
+    array = np.fromstring(numbers, dtype=dtype, sep=",")
+    if array.size != int(np.prod(shape)):
+        raise ValueError("Array in response is not rectangular")
+    return array.reshape(shape)
+
+
+def _parse_value(body, start):
+    """Returns (numpy array, end) for the array at body[start], falling back to a JSON parser for non numeric data."""
+    if body[start:start + 1] != b"[":
+        raise ValueError("Non array value in response")
+    end, ndim = _array_end(body, start)
+    text = body[start:end]
+    if b'"' in text or b"{" in text:
+        raise ValueError("Non numeric array in response")
+    return _parse_array(text, ndim), end
+
+
+def _parse_named(body, start, end):
+    """Parses {"name": [..], ...} located in body[start:end] into a dict of arrays."""
+    outputs = {}
+    position = start + 1
+    while position < end:
+        match = _KEY.match(body, position)
+        if match is None:
+            break
+        name = json.loads(b'"' + match.group(1) + b'"')
+        outputs[name], position = _parse_value(body, match.end())
+        position += 1  # separator
+    return outputs
+
+
+def _fast_parse(body):
+    body = body.translate(None, _WHITESPACE)
+    if body.startswith(b'{"outputs":'):
+        start = len(b'{"outputs":')
+        if body[start:start + 1] == b"{":
+            return _parse_named(body, start, len(body) - 1)
+        return {UNNAMED_OUTPUT: _parse_value(body, start)[0]}
+    if body.startswith(b'{"predictions":['):
+        start = len(b'{"predictions":')
+        if body[start + 1:start + 2] != b"{":
+            return {UNNAMED_OUTPUT: _parse_value(body, start)[0]}
+        rows = {}
+        position = start + 1
+        while body[position:position + 1] == b"{":
+            row_end = _find_object_end_fast(body, position)
+            for name, value in _parse_named(body, position, row_end - 1).items():
+                rows.setdefault(name, []).append(value)
+            position = row_end + 1
+        return {name: np.stack(values) for name, values in rows.items()}
+    raise ValueError("Unexpected response format")
+
+
+def _find_object_end_fast(body, start):
+    """End of a row object {"name": [numbers], ...}, skipping number arrays without scanning them."""
+    position = start + 1
+    while True:
+        match = _KEY.match(body, position)
+        if match is None:
+            raise ValueError("Unexpected row format in response")
+        position = _array_end(body, match.end())[0]
+        if body[position:position + 1] == b"}":
+            return position + 1
+        position += 1
+
+
+def _slow_parse(body):
+    result = json.loads(body)
+    if "error" in result:
+        raise ValueError("Server returned error: {}".format(result["error"]))
+    if "outputs" in result:
+        outputs = result["outputs"]
+        if isinstance(outputs, dict):
+            return {name: np.asarray(value) for name, value in outputs.items()}
+        return {UNNAMED_OUTPUT: np.asarray(outputs)}
+    if "predictions" in result:
+        predictions = result["predictions"]
+        if predictions and isinstance(predictions[0], dict):
+            return {name: np.asarray([row[name] for row in predictions]) for name in predictions[0]}
+        return {UNNAMED_OUTPUT: np.asarray(predictions)}
+    raise ValueError("Missing required response in {}".format(result))
+
+
+def decode_predict_response(body):
+    """Parses a predict response in row or column format into a dict of numpy arrays.
+
+    An unnamed output is returned under the UNNAMED_OUTPUT key. Non numeric outputs are parsed with json.
+    """
+    try:
+        return _fast_parse(body)
+    except ValueError:
+        return _slow_parse(body)
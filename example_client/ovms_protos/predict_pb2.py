@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: ovms_protos/predict.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from ovms_protos import tensor_pb2 as ovms__protos_dot_tensor__pb2
+from ovms_protos import model_pb2 as ovms__protos_dot_model__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19ovms_protos/predict.proto\x12\x12tensorflow.serving\x1a\x18ovms_protos/tensor.proto\x1a\x17ovms_protos/model.proto\"\xe2\x01\n\x0ePredictRequest\x12\x31\n\nmodel_spec\x18\x01 \x01(\x0b\x32\x1d.tensorflow.serving.ModelSpec\x12>\n\x06inputs\x18\x02 \x03(\x0b\x32..tensorflow.serving.PredictRequest.InputsEntry\x12\x15\n\routput_filter\x18\x03 \x03(\t\x1a\x46\n\x0bInputsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.tensorflow.TensorProto:\x02\x38\x01\"\xd0\x01\n\x0fPredictResponse\x12\x31\n\nmodel_spec\x18\x02 \x01(\x0b\x32\x1d.tensorflow.serving.ModelSpec\x12\x41\n\x07outputs\x18\x01 \x03(\x0b\x32\x30.tensorflow.serving.PredictResponse.OutputsEntry\x1aG\n\x0cOutputsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.tensorflow.TensorProto:\x02\x38\x01\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'ovms_protos.predict_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _PREDICTREQUEST_INPUTSENTRY._options = None
+  _PREDICTREQUEST_INPUTSENTRY._serialized_options = b'8\001'
+  _PREDICTRESPONSE_OUTPUTSENTRY._options = None
+  _PREDICTRESPONSE_OUTPUTSENTRY._serialized_options = b'8\001'
+  _PREDICTREQUEST._serialized_start=101
+  _PREDICTREQUEST._serialized_end=327
+  _PREDICTREQUEST_INPUTSENTRY._serialized_start=257
+  _PREDICTREQUEST_INPUTSENTRY._serialized_end=327
+  _PREDICTRESPONSE._serialized_start=330
+  _PREDICTRESPONSE._serialized_end=538
+  _PREDICTRESPONSE_OUTPUTSENTRY._serialized_start=467
+  _PREDICTRESPONSE_OUTPUTSENTRY._serialized_end=538
+# @@protoc_insertion_point(module_scope)
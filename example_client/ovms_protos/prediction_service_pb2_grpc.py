@@ -0,0 +1,69 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from ovms_protos import predict_pb2 as ovms__protos_dot_predict__pb2
+
+
+class PredictionServiceStub(object):
+    """Only Predict method of TensorFlow Serving PredictionService
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Predict = channel.unary_unary(
+                '/tensorflow.serving.PredictionService/Predict',
+                request_serializer=ovms__protos_dot_predict__pb2.PredictRequest.SerializeToString,
+                response_deserializer=ovms__protos_dot_predict__pb2.PredictResponse.FromString,
+                )
+
+
+class PredictionServiceServicer(object):
+    """Only Predict method of TensorFlow Serving PredictionService
+    """
+
+    def Predict(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PredictionServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=ovms__protos_dot_predict__pb2.PredictRequest.FromString,
+                    response_serializer=ovms__protos_dot_predict__pb2.PredictResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'tensorflow.serving.PredictionService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class PredictionService(object):
+    """Only Predict method of TensorFlow Serving PredictionService
+    """
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/tensorflow.serving.PredictionService/Predict',
+            ovms__protos_dot_predict__pb2.PredictRequest.SerializeToString,
+            ovms__protos_dot_predict__pb2.PredictResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
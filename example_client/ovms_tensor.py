@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Conversion between numpy arrays and TensorProto without the TensorFlow python API.
+# Numeric data is copied in one pass from the numpy buffer to tensor_content and read back with
+# np.frombuffer, which does not copy at all.
+
+import numpy as np
+from ovms_protos import tensor_pb2
+
+# https://github.com/tensorflow/tensorflow/blob/master/tensorflow/core/framework/types.proto
+DT_FLOAT = 1
+DT_DOUBLE = 2
+DT_INT32 = 3
+DT_UINT8 = 4
+DT_INT16 = 5
+DT_INT8 = 6
+DT_STRING = 7
+DT_COMPLEX64 = 8
+DT_INT64 = 9
+DT_BOOL = 10
+DT_QINT8 = 11
+DT_QUINT8 = 12
+DT_QINT32 = 13
+DT_BFLOAT16 = 14
+DT_QINT16 = 15
+DT_QUINT16 = 16
+DT_UINT16 = 17
+DT_COMPLEX128 = 18
+DT_HALF = 19
+DT_UINT32 = 22
+DT_UINT64 = 23
+
+# Little endian numpy type of the elements stored in tensor_content for each TensorProto dtype
+TENSOR_CONTENT_DTYPES = {
+    DT_FLOAT: np.dtype('<f4'),
+    DT_DOUBLE: np.dtype('<f8'),
+    DT_INT32: np.dtype('<i4'),
+    DT_UINT8: np.dtype('u1'),
+    DT_INT16: np.dtype('<i2'),
+    DT_INT8: np.dtype('i1'),
+    DT_COMPLEX64: np.dtype('<c8'),
+    DT_INT64: np.dtype('<i8'),
+    DT_BOOL: np.dtype('?'),
+    DT_QINT8: np.dtype('i1'),
+    DT_QUINT8: np.dtype('u1'),
+    DT_QINT32: np.dtype('<i4'),
+    DT_BFLOAT16: np.dtype('<u2'),
+    DT_QINT16: np.dtype('<i2'),
+    DT_QUINT16: np.dtype('<u2'),
+    DT_UINT16: np.dtype('<u2'),
+    DT_COMPLEX128: np.dtype('<c16'),
+    DT_HALF: np.dtype('<f2'),
+    DT_UINT32: np.dtype('<u4'),
+    DT_UINT64: np.dtype('<u8'),
+}
+
+NUMPY_TO_TENSOR_DTYPE = {
+    np.dtype(np.float32): DT_FLOAT,
+    np.dtype(np.float64): DT_DOUBLE,
+    np.dtype(np.int32): DT_INT32,
+    np.dtype(np.uint8): DT_UINT8,
+    np.dtype(np.int16): DT_INT16,
+    np.dtype(np.int8): DT_INT8,
+    np.dtype(np.complex64): DT_COMPLEX64,
+    np.dtype(np.int64): DT_INT64,
+    np.dtype(np.bool_): DT_BOOL,
+    np.dtype(np.uint16): DT_UINT16,
+    np.dtype(np.complex128): DT_COMPLEX128,
+    np.dtype(np.float16): DT_HALF,
+    np.dtype(np.uint32): DT_UINT32,
+    np.dtype(np.uint64): DT_UINT64,
+}
+
+# Typed repeated fields used when tensor_content is empty
+VALUE_FIELDS = {
+    DT_FLOAT: 'float_val',
+    DT_DOUBLE: 'double_val',
+    DT_INT32: 'int_val',
+    DT_UINT8: 'int_val',
+    DT_INT16: 'int_val',
+    DT_INT8: 'int_val',
+    DT_COMPLEX64: 'scomplex_val',
+    DT_INT64: 'int64_val',
+    DT_BOOL: 'bool_val',
+    DT_QINT8: 'int_val',
+    DT_QUINT8: 'int_val',
+    DT_QINT32: 'int_val',
+    DT_BFLOAT16: 'half_val',
+    DT_QINT16: 'int_val',
+    DT_QUINT16: 'int_val',
+    DT_UINT16: 'int_val',
+    DT_COMPLEX128: 'dcomplex_val',
+    DT_HALF: 'half_val',
+    DT_UINT32: 'uint32_val',
+    DT_UINT64: 'uint64_val',
+}
+
+# The model server reads these dtypes from typed fields instead of tensor_content, like the
+# sequence id (uint64_val) and sequence control input (uint32_val) of stateful models
+SERVER_VALUE_FIELD_DTYPES = {DT_HALF, DT_UINT16, DT_UINT32, DT_UINT64}
+
+
+def _is_string_data(values):
+    if isinstance(values, (bytes, str)):
+        return True
+    if isinstance(values, np.ndarray):
+        return values.dtype.kind in ('S', 'U', 'O')
+    if np.ndim(values) == 0:
+        return False
+    return len(values) > 0 and all(isinstance(value, (bytes, str)) for value in values)
+
+
+def _to_bytes(value):
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+def fill_tensor_proto(tensor, values, shape=None, dtype=None):
+    """Fills TensorProto tensor in place with values, which is a numpy array or a list of bytes for DT_STRING.
+
+    dtype is either a TensorProto DataType value or anything accepted by np.dtype.
+    """
+    tensor.Clear()
+    if _is_string_data(values):
+        flat = [values] if isinstance(values, (bytes, str)) else np.asarray(values, dtype=object).ravel()
+        tensor.dtype = DT_STRING
+        tensor.string_val.extend(_to_bytes(value) for value in flat)
+        if shape is not None:
+            dims = shape
+        elif isinstance(values, np.ndarray):
+            dims = values.shape
+        else:
+            dims = [len(flat)]
+    else:
+        if dtype is None or isinstance(dtype, int):
+            array = np.asarray(values)
+            tensor_dtype = NUMPY_TO_TENSOR_DTYPE.get(array.dtype) if dtype is None else dtype
+        else:
+            array = np.asarray(values, dtype=dtype)
+            tensor_dtype = NUMPY_TO_TENSOR_DTYPE.get(array.dtype)
+        if tensor_dtype not in TENSOR_CONTENT_DTYPES:
+            raise ValueError("Unsupported data type: {}".format(array.dtype))
+        array = np.asarray(array, dtype=TENSOR_CONTENT_DTYPES[tensor_dtype], order='C')
+        tensor.dtype = tensor_dtype
+        if tensor_dtype in SERVER_VALUE_FIELD_DTYPES:
+            field = getattr(tensor, VALUE_FIELDS[tensor_dtype])
+            if tensor_dtype == DT_HALF:
+                array = array.view(np.uint16)
+            field.extend(array.ravel().tolist())
+        else:
+            tensor.tensor_content = array.tobytes()
+        dims = array.shape if shape is None else shape
+        if shape is not None and int(np.prod(shape)) != array.size:
+            raise ValueError("Shape {} does not match {} values".format(list(shape), array.size))
+    for dim in dims:
+        tensor.tensor_shape.dim.add().size = int(dim)
+    return tensor
+
+
+def make_tensor_proto(values, shape=None, dtype=None):
+    """Creates TensorProto from numpy array or list of bytes, drop-in replacement for tensorflow.make_tensor_proto."""
+    return fill_tensor_proto(tensor_pb2.TensorProto(), values, shape, dtype)
+
+
+def make_ndarray(tensor):
+    """Creates numpy array from TensorProto, drop-in replacement for tensorflow.make_ndarray.
+
+    When the data is stored in tensor_content the returned array is a read-only view of the response buffer.
+    """
+    shape = [dim.size for dim in tensor.tensor_shape.dim]
+    if tensor.dtype == DT_STRING:
+        return np.array(list(tensor.string_val), dtype=object).reshape(shape)
+    if tensor.dtype not in TENSOR_CONTENT_DTYPES:
+        raise ValueError("Unsupported tensor data type: {}".format(tensor.dtype))
+    dtype = TENSOR_CONTENT_DTYPES[tensor.dtype]
+    if tensor.tensor_content:
+        return np.frombuffer(tensor.tensor_content, dtype=dtype).reshape(shape)
+
+    values = getattr(tensor, VALUE_FIELDS[tensor.dtype])
+    if tensor.dtype in (DT_HALF, DT_BFLOAT16):
+        array = np.fromiter(values, dtype=np.uint16, count=len(values)).view(dtype)
+    elif tensor.dtype in (DT_COMPLEX64, DT_COMPLEX128):
+        array = np.fromiter(values, dtype=dtype.type(0).real.dtype, count=len(values)).view(dtype)
+    else:
+        array = np.fromiter(values, dtype=dtype, count=len(values))
+    size = int(np.prod(shape))
+    if array.size == size:
+        return array.reshape(shape)
+    # Like TensorFlow, the last value is repeated when fewer values than elements are provided
+    result = np.empty(size, dtype=dtype)
+    result[:array.size] = array
+    result[array.size:] = array[-1] if array.size else 0
+    return result.reshape(shape)
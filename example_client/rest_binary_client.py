@@ -21,6 +21,7 @@ import json
 import classes
 import datetime
 import argparse
+from client_utils import LatencyHistogram
 
 def create_request(image_data, request_format):
     signature = "serving_default"
@@ -81,7 +82,7 @@ print('\tImages list file: {}'.format(args.get('images_list')))
 
 count = 0
 matched = 0
-processing_times = np.zeros((0), int)
+processing_times = LatencyHistogram()
 
 batch_i = 0
 image_data = []
@@ -133,7 +134,7 @@ for line in lines:
         print("Missing required response in {}".format(result_dict))
         exit(1)
     duration = (end_time - start_time).total_seconds() * 1000
-    processing_times = np.append(processing_times, np.array([int(duration)]))
+    processing_times.record(duration)
     # for object classification models show imagenet class
     print('Batch: {}; Processing time: {:.2f} ms; speed {:.2f} fps'.format(
         count // batch_size, round(duration, 2), round(1000 / duration, 2)))
@@ -159,7 +160,7 @@ for line in lines:
     labels = []
     batch_i = 0
 
-latency = np.average(processing_times)
+latency = processing_times.average()
 accuracy = matched / count
 
 print("Overall accuracy=", accuracy*100, "%")
@@ -19,30 +19,16 @@ import numpy as np
 import classes
 import datetime
 import argparse
-import json
 import requests
-from client_utils import print_statistics
+from client_utils import print_statistics, LatencyHistogram
+from ovms_client.rest_json import REQUEST_FORMATS, UNNAMED_OUTPUT, encode_predict_request, decode_predict_response
 
 
 def create_request(img, request_format):
-    signature = "serving_default"
-    if request_format == "row_name":
-        instances = []
-        for i in range(0, img.shape[0], 1):
-            instances.append({args['input_name']: img[i].tolist()})
-        data_obj = {"signature_name": signature, "instances": instances}
-    elif request_format == "row_noname":
-        data_obj = {"signature_name": signature, 'instances': img.tolist()}
-    elif request_format == "column_name":
-        data_obj = {"signature_name": signature,
-                    'inputs': {args['input_name']: img.tolist()}}
-    elif request_format == "column_noname":
-        data_obj = {"signature_name": signature, 'inputs':  img.tolist()}
-    else:
+    if request_format not in REQUEST_FORMATS:
         print("invalid request format defined")
         exit(1)
-    data_json = json.dumps(data_obj)
-    return data_json
+    return b"".join(encode_predict_request({args['input_name']: img}, request_format))
 
 
 parser = argparse.ArgumentParser(description='Sends requests via TensorFlow Serving RESTfull API using images in numpy format. '
@@ -94,7 +80,7 @@ if args.get('client_cert') is not None or args.get('client_key') is not None:
     print("Error: in order to use mTLS, you need to provide both --client_cert and --client_key. In addition, your --rest_url flag has to begin with 'https://'.")
     exit(1)
 
-processing_times = np.zeros((0), int)
+processing_times = LatencyHistogram()
 
 # optional preprocessing depending on the model
 imgs = np.load(args['images_numpy_path'], mmap_mode='r', allow_pickle=False)
@@ -151,42 +137,25 @@ while iteration <= iterations:
         result = session.post("{}:{}/v1/models/{}{}:predict".format(args['rest_url'], args['rest_port'], args['model_name'], version), data=data_json, cert=certs, verify=verify_server)
         end_time = datetime.datetime.now()
         try:
-            result_dict = json.loads(result.text)
-        except ValueError:
-            print("The server response is not json format: {}",format(result.text))
+            outputs = decode_predict_response(result.content)
+        except ValueError as error:
+            print("Invalid server response: {}".format(error))
             exit(1)
-        if "error" in result_dict:
-            print('Server returned error: {}'.format(result_dict))
-            exit(1)
-
-        if "outputs" in result_dict:  # is column format
-            keyname = "outputs"
-            if type(result_dict[keyname]) is dict:
-                if args['output_name'] not in result_dict[keyname]:
-                    print("Invalid output name", args['output_name'])
-                    print("Available outputs:")
-                    for Y in result_dict[keyname]:
-                        print(Y)
-                    exit(1)
-                output = result_dict[keyname][args['output_name']]
-            else:
-                output = result_dict[keyname]
-        elif "predictions" in result_dict:  # is row format
-            keyname = "predictions"
-            if type(result_dict[keyname][0]) is dict:  # are multiple outputs
-                output = []
-                for row in result_dict[keyname]:  # iternate over all results in the batch
-                    output.append(row[args['output_name']])
-            else:
-                output = result_dict[keyname]
+        if UNNAMED_OUTPUT in outputs and len(outputs) == 1:
+            output = outputs[UNNAMED_OUTPUT]
+        elif args['output_name'] in outputs:
+            output = outputs[args['output_name']]
         else:
-            print("Missing required response in {}".format(result_dict))
+            print("Invalid output name", args['output_name'])
+            print("Available outputs:")
+            for Y in outputs:
+                print(Y)
             exit(1)
 
         duration = (end_time - start_time).total_seconds() * 1000
-        processing_times = np.append(processing_times, np.array([int(duration)]))
+        processing_times.record(duration)
         # print(output)
-        nu = np.array(output)  # numpy array with inference results
+        nu = output  # numpy array with inference results
         print("output shape: {}".format(nu.shape))
 
         # for object classification models show imagenet class
@@ -16,21 +16,31 @@
 
 import grpc
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray, expand_dims
 import datetime
 import argparse
 import math
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
+import queue
+import sys
+sys.path.append('..')
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
 from kaldi_python_io import ArchiveReader, ArchiveWriter
 import importlib
 
 spec = importlib.util.spec_from_loader('client_utils', importlib.machinery.SourceFileLoader('client_utils', '../client_utils.py'))
 client_utils = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(client_utils)
+spec = importlib.util.spec_from_loader('ovms_tensor', importlib.machinery.SourceFileLoader('ovms_tensor', '../ovms_tensor.py'))
+ovms_tensor = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ovms_tensor)
+make_tensor_proto = ovms_tensor.make_tensor_proto
+make_ndarray = ovms_tensor.make_ndarray
 
 delimiter = ","
 
+# Bidirectional streaming method of OVMS StatefulPredictionService, it reuses TFS PredictRequest and PredictResponse messages
+PREDICT_STREAM_METHOD = '/ovms.StatefulPredictionService/PredictStream'
+
 def print_debug(msg):
     global debug_mode
     if debug_mode:
@@ -46,6 +56,28 @@ def calculate_utterance_error(referenceArray, resultArray):
     return root_mean_err
 
 
+class SequenceStream:
+    """Sends requests of a single sequence over one gRPC stream, waiting for the response to each request.
+    Opening the stream starts the sequence and closing it ends the sequence."""
+
+    def __init__(self, channel, timeout):
+        self.requests = queue.Queue()
+        predict_stream = channel.stream_stream(
+            PREDICT_STREAM_METHOD,
+            request_serializer=predict_pb2.PredictRequest.SerializeToString,
+            response_deserializer=predict_pb2.PredictResponse.FromString)
+        self.responses = predict_stream(iter(self.requests.get, None), timeout=timeout)
+
+    def predict(self, request):
+        self.requests.put(request)
+        return next(self.responses)
+
+    def close(self):
+        self.requests.put(None)
+        for _ in self.responses:
+            pass
+
+
 def parse_arguments():
     # Example commands:
     # RM_LSTM4F
@@ -122,6 +154,12 @@ def parse_arguments():
         required=False,
         default=0,
         help='Sequence ID used by every sequence provided in ARK files. Setting to 0 means sequence will obtain its ID from OVMS. Default: 0')
+    parser.add_argument(
+        '--streaming',
+        required=False,
+        default=0,
+        help='Sending requests of every sequence over a single bidirectional gRPC stream instead of separate Predict calls. '
+        'Set to 1 to enable streaming. Default: 0')
 
     print('### Starting grpc_stateful_client.py client ###')
 
@@ -245,7 +283,8 @@ def main():
             args['grpc_address'],
             args['grpc_port']))
     stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
-    processing_times = np.zeros((0), int)
+    streaming = int(args.get('streaming'))
+    processing_times = client_utils.LatencyHistogram()
     cw_l = int(args.get('cw_l'))
     cw_r = int(args.get('cw_r'))
     print('Context window left width cw_l: {}'.format(cw_l))
@@ -296,6 +335,7 @@ def main():
 
         mean_avg_rms_error_sum = 0.0
         score_index = (cw_l + cw_r) * -1
+        stream = SequenceStream(channel, 10.0 * (sequence_size + cw_l + cw_r)) if streaming else None
 
         for x in range(0, sequence_size + cw_l + cw_r):
             print_debug('\tExecution: {}\n'.format(x))
@@ -324,26 +364,40 @@ def main():
                 request.inputs[input_name].CopyFrom(
                     make_tensor_proto(tensor_data, shape=tensor_data.shape))
 
-            # Add sequence start
-            if x == 0:
-                request.inputs['sequence_control_input'].CopyFrom(
-                    make_tensor_proto([SEQUENCE_START], dtype="uint32"))
+            if streaming:
+                # Stream binds the sequence, sequence id is needed only to choose it with the first request
+                if x == 0 and sequence_id != 0:
+                    request.inputs['sequence_id'].CopyFrom(
+                        make_tensor_proto([sequence_id], dtype="uint64"))
+            else:
+                # Add sequence start
+                if x == 0:
+                    request.inputs['sequence_control_input'].CopyFrom(
+                        make_tensor_proto([SEQUENCE_START], dtype="uint32"))
 
-            # Set sequence id
-            request.inputs['sequence_id'].CopyFrom(
-                make_tensor_proto([sequence_id], dtype="uint64"))
+                # Set sequence id
+                request.inputs['sequence_id'].CopyFrom(
+                    make_tensor_proto([sequence_id], dtype="uint64"))
 
-            # Add sequence end
-            if x == sequence_size + cw_l + cw_r - 1:
-                request.inputs['sequence_control_input'].CopyFrom(
-                    make_tensor_proto([SEQUENCE_END], dtype="uint32"))
+                # Add sequence end
+                if x == sequence_size + cw_l + cw_r - 1:
+                    request.inputs['sequence_control_input'].CopyFrom(
+                        make_tensor_proto([SEQUENCE_END], dtype="uint32"))
 
             start_time = datetime.datetime.now()
             # result includes a dictionary with all model outputs
-            result = stub.Predict(request, 10.0)
+            if streaming:
+                result = stream.predict(request)
+            else:
+                result = stub.Predict(request, 10.0)
             end_time = datetime.datetime.now()
 
             if not validate_output(result, output_names):
+                if streaming:
+                    print(
+                        "ERROR: Model result validation error. Closing the stream ending the sequence and exiting.")
+                    stream.close()
+                    exit(1)
                 print(
                     "ERROR: Model result validation error. Adding end sequence inference request for the model and exiting.")
                 request.inputs['sequence_control_input'].CopyFrom(
@@ -357,8 +411,7 @@ def main():
                 get_sequence_id = False
 
             duration = (end_time - start_time).total_seconds() * 1000
-            processing_times = np.append(
-                processing_times, np.array([int(duration)]))
+            processing_times.record(duration)
 
             # Compare results after we are pass initial context window results
             if score_index >= 0:
@@ -405,6 +458,10 @@ def main():
             score_index += 1
             # END utterance loop
 
+        if streaming:
+            # Closing the stream ends the sequence
+            stream.close()
+
         if reference_scores:
             seq_avg_rms_error_sum = mean_avg_rms_error_sum / (sequence_size)
             print(
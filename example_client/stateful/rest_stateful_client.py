@@ -15,12 +15,9 @@
 #
 
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray, expand_dims
 import datetime
 import argparse
 import math
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
 from kaldi_python_io import ArchiveReader
 import json
 import requests
@@ -283,7 +280,7 @@ def main():
         print("Error: in order to use mTLS, you need to provide both --client_cert and --client_key. In addition, your --rest_url flag has to begin with 'https://'.")
         exit(1)
 
-    processing_times = np.zeros((0), int)
+    processing_times = client_utils.LatencyHistogram()
     cw_l = int(args.get('cw_l'))
     cw_r = int(args.get('cw_r'))
     print('Context window left width cw_l: {}'.format(cw_l))
@@ -401,8 +398,7 @@ def main():
                 get_sequence_id = False
 
             duration = (end_time - start_time).total_seconds() * 1000
-            processing_times = np.append(
-                processing_times, np.array([int(duration)]))
+            processing_times.record(duration)
 
             # Compare results after we are pass initial context window results
             if score_index >= 0:
@@ -22,8 +22,11 @@
 #include "tensorflow_serving/apis/prediction_service.grpc.pb.h"
 #pragma GCC diagnostic pop
 
+#include <algorithm>
+#include <chrono>
 #include <memory>
 #include <string>
+#include <thread>
 #include <utility>
 #include <vector>
 
@@ -31,7 +34,10 @@
 
 #include "binaryutils.hpp"
 #include "logging.hpp"
+#include "metrics.hpp"
 #include "opencv2/opencv.hpp"
+#include "threadpool.hpp"
+#include "timer.hpp"
 
 namespace ovms {
 
@@ -64,13 +70,6 @@ bool isPrecisionEqual(int matPrecision, InferenceEngine::Precision tensorPrecisi
     return false;
 }
 
-cv::Mat convertStringValToMat(const std::string& stringVal) {
-    std::vector<unsigned char> data(stringVal.begin(), stringVal.end());
-    cv::Mat dataMat(data, true);
-
-    return cv::imdecode(dataMat, cv::IMREAD_UNCHANGED);
-}
-
 Status convertPrecision(const cv::Mat& src, cv::Mat& dst, const InferenceEngine::Precision requestedPrecision) {
     int type = getMatTypeFromTensorPrecision(requestedPrecision);
     if (type == -1) {
@@ -81,12 +80,10 @@ Status convertPrecision(const cv::Mat& src, cv::Mat& dst, const InferenceEngine:
     return StatusCode::OK;
 }
 
-bool resizeNeeded(const cv::Mat& image, const std::shared_ptr<TensorInfo>& tensorInfo) {
+bool getTargetImageSize(const std::shared_ptr<TensorInfo>& tensorInfo, int& rows, int& cols) {
     if (tensorInfo->getLayout() != InferenceEngine::Layout::NHWC) {
         return false;
     }
-    int cols = 0;
-    int rows = 0;
     if (tensorInfo->getEffectiveShape().size() == 4) {
         cols = tensorInfo->getEffectiveShape()[2];
         rows = tensorInfo->getEffectiveShape()[1];
@@ -96,6 +93,103 @@ bool resizeNeeded(const cv::Mat& image, const std::shared_ptr<TensorInfo>& tenso
     } else {
         return false;
     }
+    return true;
+}
+
+/**
+ * @brief Reads image size and number of components from JPEG frame header without decoding the image
+ */
+bool readJpegHeader(const std::string& data, int& rows, int& cols, int& components) {
+    const auto* bytes = reinterpret_cast<const unsigned char*>(data.data());
+    const size_t size = data.size();
+    if (size < 4 || bytes[0] != 0xFF || bytes[1] != 0xD8) {
+        return false;
+    }
+    size_t pos = 2;
+    while (pos + 4 <= size) {
+        if (bytes[pos] != 0xFF) {
+            return false;
+        }
+        unsigned char marker = bytes[pos + 1];
+        if (marker == 0xFF) {
+            // fill byte
+            pos++;
+            continue;
+        }
+        pos += 2;
+        if (marker == 0x01 || (marker >= 0xD0 && marker <= 0xD7)) {
+            // markers without payload
+            continue;
+        }
+        if (marker == 0xD9 || marker == 0xDA) {
+            // end of image or start of scan before frame header
+            return false;
+        }
+        size_t length = (bytes[pos] << 8) | bytes[pos + 1];
+        if (length < 2) {
+            return false;
+        }
+        // SOF0-SOF15 except DHT, JPG and DAC
+        if (marker >= 0xC0 && marker <= 0xCF && marker != 0xC4 && marker != 0xC8 && marker != 0xCC) {
+            if (length < 8 || pos + 8 > size) {
+                return false;
+            }
+            rows = (bytes[pos + 3] << 8) | bytes[pos + 4];
+            cols = (bytes[pos + 5] << 8) | bytes[pos + 6];
+            components = bytes[pos + 7];
+            return true;
+        }
+        pos += length;
+    }
+    return false;
+}
+
+/**
+ * @brief Selects imdecode flags, JPEG images larger than the target are decoded at reduced scale
+ *
+ * JPEG decoder can scale the image by 1/2, 1/4 or 1/8 while decoding at a fraction of full decode cost.
+ * The largest factor which keeps the image at least as big as the target is used and the remaining
+ * difference is resized afterwards.
+ */
+int getDecodeFlags(const std::string& stringVal, const std::shared_ptr<TensorInfo>& tensorInfo) {
+    int targetRows = 0;
+    int targetCols = 0;
+    if (!getTargetImageSize(tensorInfo, targetRows, targetCols) || targetRows <= 0 || targetCols <= 0) {
+        return cv::IMREAD_UNCHANGED;
+    }
+    int rows = 0;
+    int cols = 0;
+    int components = 0;
+    if (!readJpegHeader(stringVal, rows, cols, components) || (components != 1 && components != 3)) {
+        return cv::IMREAD_UNCHANGED;
+    }
+    static const int colorFlags[] = {cv::IMREAD_REDUCED_COLOR_8, cv::IMREAD_REDUCED_COLOR_4, cv::IMREAD_REDUCED_COLOR_2};
+    static const int grayscaleFlags[] = {cv::IMREAD_REDUCED_GRAYSCALE_8, cv::IMREAD_REDUCED_GRAYSCALE_4, cv::IMREAD_REDUCED_GRAYSCALE_2};
+    static const int scales[] = {8, 4, 2};
+    for (size_t i = 0; i < 3; i++) {
+        int scale = scales[i];
+        // decoder rounds scaled dimensions up
+        if ((rows + scale - 1) / scale >= targetRows && (cols + scale - 1) / scale >= targetCols) {
+            // IMREAD_UNCHANGED does not apply EXIF orientation, keep it that way
+            return (components == 1 ? grayscaleFlags[i] : colorFlags[i]) | cv::IMREAD_IGNORE_ORIENTATION;
+        }
+    }
+    return cv::IMREAD_UNCHANGED;
+}
+
+cv::Mat convertStringValToMat(const std::string& stringVal, const std::shared_ptr<TensorInfo>& tensorInfo) {
+    // imdecode only reads the encoded bytes, wrap them without a copy
+    cv::Mat dataMat(1, stringVal.size(), CV_8UC1, const_cast<char*>(stringVal.data()));
+
+    return cv::imdecode(dataMat, getDecodeFlags(stringVal, tensorInfo));
+}
+
+bool resizeNeeded(const cv::Mat& image, const std::shared_ptr<TensorInfo>& tensorInfo) {
+    int cols = 0;
+    int rows = 0;
+    if (!getTargetImageSize(tensorInfo, rows, cols)) {
+        return false;
+    }
     if (cols != image.cols || rows != image.rows) {
         return true;
     }
@@ -103,18 +197,9 @@ bool resizeNeeded(const cv::Mat& image, const std::shared_ptr<TensorInfo>& tenso
 }
 
 Status resizeMat(const cv::Mat& src, cv::Mat& dst, const std::shared_ptr<TensorInfo>& tensorInfo) {
-    if (tensorInfo->getLayout() != InferenceEngine::Layout::NHWC) {
-        return StatusCode::UNSUPPORTED_LAYOUT;
-    }
     int cols = 0;
     int rows = 0;
-    if (tensorInfo->getEffectiveShape().size() == 4) {
-        cols = tensorInfo->getEffectiveShape()[2];
-        rows = tensorInfo->getEffectiveShape()[1];
-    } else if (tensorInfo->isInfluencedByDemultiplexer() && tensorInfo->getEffectiveShape().size() == 5) {
-        cols = tensorInfo->getEffectiveShape()[3];
-        rows = tensorInfo->getEffectiveShape()[2];
-    } else {
+    if (!getTargetImageSize(tensorInfo, rows, cols)) {
         return StatusCode::UNSUPPORTED_LAYOUT;
     }
     cv::resize(src, dst, cv::Size(cols, rows));
@@ -183,72 +268,78 @@ Status validateTensor(const std::shared_ptr<TensorInfo>& tensorInfo,
     return StatusCode::OK;
 }
 
-Status convertTensorToMatsMatchingTensorInfo(const tensorflow::TensorProto& src, std::vector<cv::Mat>& images, const std::shared_ptr<TensorInfo>& tensorInfo) {
-    for (int i = 0; i < src.string_val_size(); i++) {
-        cv::Mat image = convertStringValToMat(src.string_val(i));
-        if (image.data == nullptr)
-            return StatusCode::IMAGE_PARSING_FAILED;
+ThreadPool& getDecodeThreadPool() {
+    static ThreadPool pool(std::max(1u, std::thread::hardware_concurrency()));
+    return pool;
+}
 
-        auto status = validateInput(tensorInfo, image);
-        if (status != StatusCode::OK) {
-            return status;
-        }
+MetricHistogram& getDecodeDurationMetric() {
+    static MetricHistogram& metric = MetricRegistry::getInstance()
+                                         .histogram("ovms_binary_input_decode_duration_microseconds", "Duration of decoding batch of binary inputs")
+                                         .labeled();
+    return metric;
+}
 
-        if (!isPrecisionEqual(image.depth(), tensorInfo->getPrecision())) {
-            cv::Mat imageCorrectPrecision;
-            status = convertPrecision(image, imageCorrectPrecision, tensorInfo->getPrecision());
+/**
+ * @brief Decodes image and writes it with requested precision and size into preallocated slice of the blob
+ */
+Status convertStringValToSlice(const std::string& stringVal, cv::Mat& slice, const std::shared_ptr<TensorInfo>& tensorInfo) {
+    cv::Mat image = convertStringValToMat(stringVal, tensorInfo);
+    if (image.data == nullptr)
+        return StatusCode::IMAGE_PARSING_FAILED;
 
-            if (status != StatusCode::OK) {
-                return status;
-            }
-            image = std::move(imageCorrectPrecision);
-        }
+    auto status = validateInput(tensorInfo, image);
+    if (status != StatusCode::OK) {
+        return status;
+    }
 
-        if (resizeNeeded(image, tensorInfo)) {
-            cv::Mat imageResized;
-            status = resizeMat(image, imageResized, tensorInfo);
-            if (!status.ok()) {
-                return status;
-            }
-            image = std::move(imageResized);
+    // Slice already has the target size and type so OpenCV writes into it without reallocation
+    bool precisionEqual = isPrecisionEqual(image.depth(), tensorInfo->getPrecision());
+    if (!resizeNeeded(image, tensorInfo)) {
+        if (precisionEqual) {
+            image.copyTo(slice);
+            return StatusCode::OK;
         }
-        images.push_back(image);
+        return convertPrecision(image, slice, tensorInfo->getPrecision());
     }
 
-    return StatusCode::OK;
+    if (!precisionEqual) {
+        cv::Mat imageCorrectPrecision;
+        status = convertPrecision(image, imageCorrectPrecision, tensorInfo->getPrecision());
+        if (status != StatusCode::OK) {
+            return status;
+        }
+        image = std::move(imageCorrectPrecision);
+    }
+    return resizeMat(image, slice, tensorInfo);
 }
 
 template <typename T>
-InferenceEngine::Blob::Ptr createBlobFromMats(const std::vector<cv::Mat>& images, const std::shared_ptr<TensorInfo>& tensorInfo, bool isPipeline) {
+InferenceEngine::Blob::Ptr createBlob(const std::shared_ptr<TensorInfo>& tensorInfo, bool isPipeline, size_t batchSize) {
     auto dims = isPipeline ? tensorInfo->getEffectiveShape() : tensorInfo->getShape();
-    dims[0] = images.size();
+    dims[0] = batchSize;
     InferenceEngine::TensorDesc desc{tensorInfo->getPrecision(), dims, InferenceEngine::Layout::ANY};
     InferenceEngine::Blob::Ptr blob = InferenceEngine::make_shared_blob<T>(desc);
     blob->allocate();
-    char* ptr = (char*)blob->buffer();
-    for (cv::Mat image : images) {
-        memcpy(ptr, (char*)image.data, image.total() * image.elemSize());
-        ptr += (image.total() * image.elemSize());
-    }
     return blob;
 }
 
-InferenceEngine::Blob::Ptr convertMatsToBlob(std::vector<cv::Mat>& images, const std::shared_ptr<TensorInfo>& tensorInfo, bool isPipeline) {
+InferenceEngine::Blob::Ptr createBlob(const std::shared_ptr<TensorInfo>& tensorInfo, bool isPipeline, size_t batchSize) {
     switch (tensorInfo->getPrecision()) {
     case InferenceEngine::Precision::FP32:
-        return createBlobFromMats<float>(images, tensorInfo, isPipeline);
+        return createBlob<float>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::I32:
-        return createBlobFromMats<int32_t>(images, tensorInfo, isPipeline);
+        return createBlob<int32_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::I8:
-        return createBlobFromMats<int8_t>(images, tensorInfo, isPipeline);
+        return createBlob<int8_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::U8:
-        return createBlobFromMats<uint8_t>(images, tensorInfo, isPipeline);
+        return createBlob<uint8_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::FP16:
-        return createBlobFromMats<uint16_t>(images, tensorInfo, isPipeline);
+        return createBlob<uint16_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::U16:
-        return createBlobFromMats<uint16_t>(images, tensorInfo, isPipeline);
+        return createBlob<uint16_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::I16:
-        return createBlobFromMats<int16_t>(images, tensorInfo, isPipeline);
+        return createBlob<int16_t>(tensorInfo, isPipeline, batchSize);
     case InferenceEngine::Precision::I64:
     case InferenceEngine::Precision::MIXED:
     case InferenceEngine::Precision::Q78:
@@ -266,14 +357,42 @@ Status convertStringValToBlob(const tensorflow::TensorProto& src, InferenceEngin
         return status;
     }
 
-    std::vector<cv::Mat> images;
-
-    status = convertTensorToMatsMatchingTensorInfo(src, images, tensorInfo);
-    if (!status.ok()) {
-        return status;
+    Timer timer;
+    timer.start("decode");
+    const size_t batchSize = src.string_val_size();
+    InferenceEngine::Blob::Ptr decodedBlob = createBlob(tensorInfo, isPipeline, batchSize);
+    if (decodedBlob == nullptr) {
+        return StatusCode::INVALID_PRECISION;
     }
 
-    blob = convertMatsToBlob(images, tensorInfo, isPipeline);
+    // validateTensor guarantees NHWC layout with 4 or 5 dimensions
+    const auto& shape = tensorInfo->getEffectiveShape();
+    const size_t offset = shape.size() - 4;
+    const int rows = shape[offset + 1];
+    const int cols = shape[offset + 2];
+    const int type = CV_MAKETYPE(getMatTypeFromTensorPrecision(tensorInfo->getPrecision()), shape[offset + 3]);
+    const size_t sliceSize = rows * cols * CV_ELEM_SIZE(type);
+    char* data = (char*)decodedBlob->buffer();
+
+    std::vector<Status> statuses(batchSize);
+    getDecodeThreadPool().parallelFor(batchSize, [&](size_t i) {
+        cv::Mat slice(rows, cols, type, data + i * sliceSize);
+        try {
+            statuses[i] = convertStringValToSlice(src.string_val(i), slice, tensorInfo);
+        } catch (const cv::Exception& e) {
+            SPDLOG_DEBUG("Binary data sent to input: {} could not be decoded: {}", tensorInfo->getMappedName(), e.what());
+            statuses[i] = StatusCode::IMAGE_PARSING_FAILED;
+        }
+    });
+    timer.stop("decode");
+    getDecodeDurationMetric().observe(timer.elapsed<std::chrono::microseconds>("decode"));
+
+    for (const auto& imageStatus : statuses) {
+        if (!imageStatus.ok()) {
+            return imageStatus;
+        }
+    }
+    blob = std::move(decodedBlob);
     return StatusCode::OK;
 }
 }  // namespace ovms
@@ -0,0 +1,264 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "cold_memory_state.hpp"
+
+#include <cerrno>
+#include <cstring>
+#include <filesystem>
+#include <utility>
+
+#include <fcntl.h>
+#include <spdlog/spdlog.h>
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include "logging.hpp"
+#include "ov_utils.hpp"
+
+using namespace InferenceEngine;
+
+namespace ovms {
+
+std::optional<ColdStateStorage> coldStateStorageFromString(const std::string& storage) {
+    if (storage == "fp16")
+        return ColdStateStorage::FP16;
+    if (storage == "file")
+        return ColdStateStorage::FILE;
+    return std::nullopt;
+}
+
+uint16_t floatToHalf(float value) {
+    uint32_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    const uint16_t sign = (bits >> 16) & 0x8000;
+    const uint32_t exponent = (bits >> 23) & 0xff;
+    uint32_t mantissa = bits & 0x7fffff;
+    if (exponent == 0xff) {
+        // infinity or NaN
+        return sign | 0x7c00 | (mantissa ? 0x200 : 0);
+    }
+    const int32_t halfExponent = static_cast<int32_t>(exponent) - 127 + 15;
+    if (halfExponent >= 0x1f) {
+        return sign | 0x7c00;
+    }
+    if (halfExponent <= 0) {
+        // subnormal half precision value or zero
+        if (halfExponent < -10) {
+            return sign;
+        }
+        mantissa |= 0x800000;
+        const uint32_t shift = 14 - halfExponent;
+        uint32_t halfMantissa = mantissa >> shift;
+        const uint32_t remainder = mantissa & ((1u << shift) - 1);
+        const uint32_t halfway = 1u << (shift - 1);
+        if (remainder > halfway || (remainder == halfway && (halfMantissa & 1))) {
+            halfMantissa++;
+        }
+        return sign | halfMantissa;
+    }
+    // Round to nearest even, carry into exponent gives the next power of two or infinity
+    uint32_t half = (static_cast<uint32_t>(halfExponent) << 10) | (mantissa >> 13);
+    const uint32_t remainder = mantissa & 0x1fff;
+    if (remainder > 0x1000 || (remainder == 0x1000 && (half & 1))) {
+        half++;
+    }
+    return sign | half;
+}
+
+float halfToFloat(uint16_t value) {
+    const uint32_t sign = static_cast<uint32_t>(value & 0x8000) << 16;
+    uint32_t exponent = (value >> 10) & 0x1f;
+    uint32_t mantissa = value & 0x3ff;
+    uint32_t bits;
+    if (exponent == 0x1f) {
+        bits = sign | 0x7f800000 | (mantissa << 13);
+    } else if (exponent == 0) {
+        if (mantissa == 0) {
+            bits = sign;
+        } else {
+            // subnormal half precision value is normal in single precision
+            exponent = 127 - 15 + 1;
+            while (!(mantissa & 0x400)) {
+                mantissa <<= 1;
+                exponent--;
+            }
+            bits = sign | (exponent << 23) | ((mantissa & 0x3ff) << 13);
+        }
+    } else {
+        bits = sign | ((exponent + 127 - 15) << 23) | (mantissa << 13);
+    }
+    float result;
+    std::memcpy(&result, &bits, sizeof(result));
+    return result;
+}
+
+size_t ColdMemoryState::writeBlob(const Blob::Ptr& blob, char* destination, bool halfPrecision) {
+    const size_t size = blob->byteSize();
+    if (size == 0) {
+        return 0;
+    }
+    const char* source = (const char*)(const void*)blob->cbuffer();
+    if (!halfPrecision) {
+        std::memcpy(destination, source, size);
+        return size;
+    }
+    const size_t elements = size / sizeof(float);
+    for (size_t i = 0; i < elements; i++) {
+        float value;
+        std::memcpy(&value, source + i * sizeof(float), sizeof(float));
+        const uint16_t half = floatToHalf(value);
+        std::memcpy(destination + i * sizeof(uint16_t), &half, sizeof(uint16_t));
+    }
+    return elements * sizeof(uint16_t);
+}
+
+Status ColdMemoryState::readBlob(const StoredBlob& storedBlob, const char* source, Blob::Ptr& blob) {
+    auto status = createSharedBlob(blob, storedBlob.tensorDesc);
+    if (!status.ok()) {
+        return status;
+    }
+    if (blob->byteSize() != storedBlob.size) {
+        blob = nullptr;
+        return StatusCode::SEQUENCE_MEMORY_STATE_ERROR;
+    }
+    if (storedBlob.size == 0) {
+        return StatusCode::OK;
+    }
+    char* destination = (char*)(void*)blob->buffer();
+    if (!storedBlob.halfPrecision) {
+        std::memcpy(destination, source + storedBlob.offset, storedBlob.size);
+        return StatusCode::OK;
+    }
+    const size_t elements = storedBlob.size / sizeof(float);
+    for (size_t i = 0; i < elements; i++) {
+        uint16_t half;
+        std::memcpy(&half, source + storedBlob.offset + i * sizeof(uint16_t), sizeof(uint16_t));
+        const float value = halfToFloat(half);
+        std::memcpy(destination + i * sizeof(float), &value, sizeof(float));
+    }
+    return StatusCode::OK;
+}
+
+Status ColdMemoryState::store(const sequence_memory_state_t& memoryState, ColdStateStorage storage, std::unique_ptr<ColdMemoryState>& coldMemoryState) {
+    Status status;
+    if (storage == ColdStateStorage::FP16) {
+        auto halfPrecisionMemoryState = std::make_unique<HalfPrecisionMemoryState>();
+        status = halfPrecisionMemoryState->store(memoryState);
+        coldMemoryState = std::move(halfPrecisionMemoryState);
+    } else {
+        auto fileMemoryState = std::make_unique<FileMemoryState>();
+        status = fileMemoryState->store(memoryState);
+        coldMemoryState = std::move(fileMemoryState);
+    }
+    if (!status.ok()) {
+        coldMemoryState = nullptr;
+    }
+    return status;
+}
+
+Status HalfPrecisionMemoryState::store(const sequence_memory_state_t& memoryState) {
+    size_t dataSize = 0;
+    for (auto& [name, blob] : memoryState) {
+        const bool halfPrecision = blob->getTensorDesc().getPrecision() == Precision::FP32;
+        storedBlobs.emplace(name, StoredBlob{blob->getTensorDesc(), dataSize, blob->byteSize(), halfPrecision});
+        dataSize += halfPrecision ? blob->byteSize() / 2 : blob->byteSize();
+    }
+    data.resize(dataSize);
+    for (auto& [name, blob] : memoryState) {
+        auto& storedBlob = storedBlobs.at(name);
+        writeBlob(blob, data.data() + storedBlob.offset, storedBlob.halfPrecision);
+    }
+    return StatusCode::OK;
+}
+
+Status HalfPrecisionMemoryState::restore(sequence_memory_state_t& memoryState) const {
+    for (auto& [name, storedBlob] : storedBlobs) {
+        Blob::Ptr blob;
+        auto status = readBlob(storedBlob, data.data(), blob);
+        if (!status.ok()) {
+            return status;
+        }
+        memoryState[name] = blob;
+    }
+    return StatusCode::OK;
+}
+
+FileMemoryState::~FileMemoryState() {
+    if (fd >= 0) {
+        close(fd);
+    }
+}
+
+Status FileMemoryState::store(const sequence_memory_state_t& memoryState) {
+    for (auto& [name, blob] : memoryState) {
+        storedBlobs.emplace(name, StoredBlob{blob->getTensorDesc(), fileSize, blob->byteSize(), false});
+        fileSize += blob->byteSize();
+    }
+    if (fileSize == 0) {
+        return StatusCode::OK;
+    }
+    std::string path = (std::filesystem::temp_directory_path() / "ovms_sequence_state_XXXXXX").string();
+    fd = mkostemp(path.data(), O_CLOEXEC);
+    if (fd < 0) {
+        SPDLOG_LOGGER_ERROR(sequence_manager_logger, "Could not create file {} for sequence memory state: {}", path, std::strerror(errno));
+        return StatusCode::SEQUENCE_MEMORY_STATE_ERROR;
+    }
+    // File is removed when the descriptor gets closed
+    unlink(path.c_str());
+    // Reserve blocks, so writing through mapping does not fail when disk gets full
+    int result = posix_fallocate(fd, 0, fileSize);
+    if (result != 0) {
+        SPDLOG_LOGGER_ERROR(sequence_manager_logger, "Could not allocate {} bytes for sequence memory state: {}", fileSize, std::strerror(result));
+        return StatusCode::SEQUENCE_MEMORY_STATE_ERROR;
+    }
+    void* mapping = mmap(nullptr, fileSize, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    if (mapping == MAP_FAILED) {
+        SPDLOG_LOGGER_ERROR(sequence_manager_logger, "Could not map file for sequence memory state: {}", std::strerror(errno));
+        return StatusCode::SEQUENCE_MEMORY_STATE_ERROR;
+    }
+    for (auto& [name, blob] : memoryState) {
+        writeBlob(blob, static_cast<char*>(mapping) + storedBlobs.at(name).offset, false);
+    }
+    // Written pages stay in page cache, kernel may write them back and reclaim under memory pressure
+    munmap(mapping, fileSize);
+    return StatusCode::OK;
+}
+
+Status FileMemoryState::restore(sequence_memory_state_t& memoryState) const {
+    void* mapping = nullptr;
+    if (fileSize > 0) {
+        mapping = mmap(nullptr, fileSize, PROT_READ, MAP_SHARED, fd, 0);
+        if (mapping == MAP_FAILED) {
+            SPDLOG_LOGGER_ERROR(sequence_manager_logger, "Could not map file with sequence memory state: {}", std::strerror(errno));
+            return StatusCode::SEQUENCE_MEMORY_STATE_ERROR;
+        }
+    }
+    Status status;
+    for (auto& [name, storedBlob] : storedBlobs) {
+        Blob::Ptr blob;
+        status = readBlob(storedBlob, static_cast<const char*>(mapping), blob);
+        if (!status.ok()) {
+            break;
+        }
+        memoryState[name] = blob;
+    }
+    if (mapping) {
+        munmap(mapping, fileSize);
+    }
+    return status;
+}
+
+}  // namespace ovms
@@ -0,0 +1,111 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include <inference_engine.hpp>
+
+#include "status.hpp"
+
+namespace ovms {
+
+using sequence_memory_state_t = std::unordered_map<std::string, InferenceEngine::Blob::Ptr>;
+
+enum class ColdStateStorage {
+    FP16,  // FP32 blobs are kept in memory in half precision, other blobs are kept unchanged
+    FILE   // blobs are written to unlinked temporary file and mapped back on restore
+};
+
+std::optional<ColdStateStorage> coldStateStorageFromString(const std::string& storage);
+
+/**
+ * @brief Memory state of a sequence which is not used recently, stored compactly until the next request of the sequence
+ */
+class ColdMemoryState {
+protected:
+    struct StoredBlob {
+        InferenceEngine::TensorDesc tensorDesc;
+        size_t offset;
+        size_t size;
+        bool halfPrecision;
+    };
+
+    std::unordered_map<std::string, StoredBlob> storedBlobs;
+
+    /**
+     * @brief Copies blob content to destination, converting FP32 to half precision if requested
+     *
+     * @return number of bytes written
+     */
+    static size_t writeBlob(const InferenceEngine::Blob::Ptr& blob, char* destination, bool halfPrecision);
+
+    static Status readBlob(const StoredBlob& storedBlob, const char* source, InferenceEngine::Blob::Ptr& blob);
+
+public:
+    virtual ~ColdMemoryState() = default;
+
+    /**
+     * @brief Recreates full precision blobs of stored memory state
+     */
+    virtual Status restore(sequence_memory_state_t& memoryState) const = 0;
+
+    /**
+     * @brief Number of bytes of process memory occupied by stored memory state
+     */
+    virtual size_t getSize() const = 0;
+
+    static Status store(const sequence_memory_state_t& memoryState, ColdStateStorage storage, std::unique_ptr<ColdMemoryState>& coldMemoryState);
+};
+
+class HalfPrecisionMemoryState : public ColdMemoryState {
+    std::vector<char> data;
+
+public:
+    Status store(const sequence_memory_state_t& memoryState);
+    Status restore(sequence_memory_state_t& memoryState) const override;
+    size_t getSize() const override {
+        return data.size();
+    }
+};
+
+class FileMemoryState : public ColdMemoryState {
+    int fd = -1;
+    size_t fileSize = 0;
+
+public:
+    FileMemoryState() = default;
+    ~FileMemoryState();
+
+    FileMemoryState(const FileMemoryState&) = delete;
+    FileMemoryState& operator=(const FileMemoryState&) = delete;
+
+    Status store(const sequence_memory_state_t& memoryState);
+    Status restore(sequence_memory_state_t& memoryState) const override;
+    size_t getSize() const override {
+        return 0;
+    }
+};
+
+uint16_t floatToHalf(float value);
+float halfToFloat(uint16_t value);
+
+}  // namespace ovms
@@ -23,6 +23,7 @@
 
 #include <boost/algorithm/string.hpp>
 #include <sysexits.h>
+#include <unistd.h>
 
 #include "version.hpp"
 
@@ -82,6 +83,17 @@ Config& Config::parse(int argc, char** argv) {
                 "Time interval between config and model versions changes detection. Default is 1. Zero or negative value disables changes monitoring.",
                 cxxopts::value<uint>()->default_value("1"),
                 "FILE_SYSTEM_POLL_WAIT_SECONDS")
+            ("file_system_watch_debounce_ms",
+                "Enables inotify based detection of changes in local config file and model directories when greater than 0. Changes are applied after no new events arrive for this many milliseconds. Directories which cannot be watched, like cloud storage paths, are polled every file_system_poll_wait_seconds. Default is 0.",
+                cxxopts::value<uint32_t>()->default_value("0"),
+                "FILE_SYSTEM_WATCH_DEBOUNCE_MS")
+            ("model_load_workers",
+                "Number of models and model versions loaded concurrently. Default is 1.",
+                cxxopts::value<uint32_t>()->default_value("1"),
+                "MODEL_LOAD_WORKERS")
+            ("cache_dir",
+                "Absolute path to the directory where compiled networks are cached and reused on subsequent loads. Caching is disabled when not set.",
+                cxxopts::value<std::string>(), "CACHE_DIR")
             ("sequence_cleaner_poll_wait_minutes",
                 "Time interval between two consecutive sequence cleaner scans. Default is 5. Zero value disables sequence cleaner.",
                 cxxopts::value<uint32_t>()->default_value("5"),
@@ -220,6 +232,12 @@ void Config::validate() {
         exit(EX_USAGE);
     }
 
+    // check model_load_workers value
+    if (result->count("model_load_workers") && ((this->modelLoadWorkers() > AVAILABLE_CORES) || (this->modelLoadWorkers() < 1))) {
+        std::cerr << "model_load_workers count should be from 1 to CPU core count : " << AVAILABLE_CORES << std::endl;
+        exit(EX_USAGE);
+    }
+
     // check rest_workers value
     if (result->count("rest_workers") && ((this->restWorkers() > MAX_REST_WORKERS) || (this->restWorkers() < 2))) {
         std::cerr << "rest_workers count should be from 2 to " << MAX_REST_WORKERS << std::endl;
@@ -267,6 +285,18 @@ void Config::validate() {
         exit(EX_USAGE);
     }
 
+    // check cache_dir path:
+    if (result->count("cache_dir") && std::filesystem::exists(this->cacheDir())) {
+        if (!std::filesystem::is_directory(this->cacheDir())) {
+            std::cerr << "Path provided as an --cache_dir parameter is not a directory: " << this->cacheDir() << std::endl;
+            exit(EX_USAGE);
+        }
+        if (access(this->cacheDir().c_str(), W_OK) != 0) {
+            std::cerr << "Directory provided as an --cache_dir parameter is not writable: " << this->cacheDir() << std::endl;
+            exit(EX_USAGE);
+        }
+    }
+
     // check log_level values
     if (result->count("log_level")) {
         std::vector v({"DEBUG", "INFO", "WARNING", "ERROR"});
@@ -348,6 +348,36 @@ public:
         return result->operator[]("file_system_poll_wait_seconds").as<uint>();
     }
 
+    /**
+     * @brief Get the debounce period of inotify based changes detection in milliseconds
+     * 
+     * @return uint32_t 
+     */
+    uint32_t filesystemWatchDebounceMs() {
+        return result->operator[]("file_system_watch_debounce_ms").as<uint32_t>();
+    }
+
+    /**
+     * @brief Get the number of models loaded concurrently
+     * 
+     * @return uint32_t 
+     */
+    uint32_t modelLoadWorkers() {
+        return result->operator[]("model_load_workers").as<uint32_t>();
+    }
+
+    /**
+     * @brief Get the compiled networks cache directory
+     * 
+     * @return const std::string 
+     */
+    const std::string cacheDir() {
+        if (result != nullptr && result->count("cache_dir")) {
+            return result->operator[]("cache_dir").as<std::string>();
+        }
+        return "";
+    }
+
     /**
      * @brief Get the sequence cleaner poll wait time in minutes
      * 
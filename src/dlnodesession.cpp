@@ -208,8 +208,15 @@ Status DLNodeSession::execute(PipelineEventQueue& notifyEndQueue, uint waitForSt
     }
     auto streamIdOpt = this->nodeStreamIdGuard->tryGetId(waitForStreamIdTimeoutMicroseconds);
     if (!streamIdOpt) {
-        SPDLOG_LOGGER_DEBUG(dag_executor_logger, "[Node: {}] Could not acquire stream Id right away", getName());
-        return StatusCode::PIPELINE_STREAM_ID_NOT_READY_YET;
+        // Pipeline is woken up with this node session key as soon as stream id is assigned
+        bool subscribed = this->nodeStreamIdGuard->notifyWhenReady([&notifyEndQueue, &node, sessionKey = getSessionKey()]() {
+            notifyEndQueue.push({node, sessionKey});
+        });
+        if (subscribed) {
+            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "[Node: {}] Could not acquire stream Id right away", getName());
+            return StatusCode::PIPELINE_STREAM_ID_NOT_READY_YET;
+        }
+        streamIdOpt = this->nodeStreamIdGuard->tryGetId();
     }
     auto& inferRequestsQueue = this->model->getInferRequestsQueue();
     auto& inferRequest = inferRequestsQueue.getInferRequest(streamIdOpt.value());
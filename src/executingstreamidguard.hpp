@@ -21,7 +21,7 @@ namespace ovms {
 struct ExecutingStreamIdGuard {
     ExecutingStreamIdGuard(ovms::OVInferRequestsQueue& inferRequestsQueue) :
         inferRequestsQueue_(inferRequestsQueue),
-        id_(inferRequestsQueue_.getIdleStream().get()),
+        id_(inferRequestsQueue_.waitForIdleStream()),
         inferRequest(inferRequestsQueue.getInferRequest(id_)) {}
     ~ExecutingStreamIdGuard() {
         inferRequestsQueue_.returnStream(id_);
@@ -44,6 +44,10 @@ Status ExitNode::fetchResults(const BlobMap& inputBlobs) {
     for (const auto& kv : inputBlobs) {
         const auto& output_name = kv.first;
         auto& blob = kv.second;
+        if (!outputFilter.empty() && outputFilter.count(output_name) == 0) {
+            SPDLOG_DEBUG("[Node: {}] Skipping serialization of output not requested by client: {}", getName(), output_name);
+            continue;
+        }
         SPDLOG_DEBUG("[Node: {}] Serializing response from pipeline. Output name: {}", getName(), output_name);
         auto& proto = (*this->response->mutable_outputs())[output_name];
         auto status = serialize(blob, proto);
@@ -17,6 +17,7 @@
 #include <memory>
 #include <set>
 #include <string>
+#include <utility>
 
 #pragma GCC diagnostic push
 #pragma GCC diagnostic ignored "-Wall"
@@ -32,11 +33,14 @@ const std::string EXIT_NODE_NAME = "response";
 
 class ExitNode : public Node {
     tensorflow::serving::PredictResponse* response;
+    // Pipeline outputs requested by client, empty means all of them
+    const std::set<std::string> outputFilter;
 
 public:
-    ExitNode(tensorflow::serving::PredictResponse* response, std::set<std::string> gatherFromNode = {}) :
+    ExitNode(tensorflow::serving::PredictResponse* response, std::set<std::string> gatherFromNode = {}, std::set<std::string> outputFilter = {}) :
         Node(EXIT_NODE_NAME, std::nullopt, gatherFromNode),
-        response(response) {
+        response(response),
+        outputFilter(std::move(outputFilter)) {
     }
 
     // Exit node does not have execute logic.
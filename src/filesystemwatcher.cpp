@@ -0,0 +1,198 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "filesystemwatcher.hpp"
+
+#include <algorithm>
+#include <cerrno>
+#include <cstring>
+
+#include <poll.h>
+#include <spdlog/spdlog.h>
+#include <sys/eventfd.h>
+#include <sys/inotify.h>
+#include <unistd.h>
+
+#include "logging.hpp"
+
+namespace ovms {
+
+static const uint32_t WATCHED_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE |
+                                       IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR;
+
+FileSystemWatcher::FileSystemWatcher() {
+    inotifyFd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC);
+    if (inotifyFd < 0) {
+        SPDLOG_LOGGER_WARN(modelmanager_logger, "Could not initialize inotify: {}", std::strerror(errno));
+    }
+    wakeUpFd = eventfd(0, EFD_NONBLOCK | EFD_CLOEXEC);
+    if (wakeUpFd < 0) {
+        SPDLOG_LOGGER_WARN(modelmanager_logger, "Could not create eventfd: {}", std::strerror(errno));
+    }
+}
+
+FileSystemWatcher::~FileSystemWatcher() {
+    if (inotifyFd >= 0) {
+        close(inotifyFd);
+    }
+    if (wakeUpFd >= 0) {
+        close(wakeUpFd);
+    }
+}
+
+bool FileSystemWatcher::watch(const std::string& directory) {
+    if (!isValid()) {
+        return false;
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    if (watchDescriptors.find(directory) != watchDescriptors.end()) {
+        return true;
+    }
+    int wd = inotify_add_watch(inotifyFd, directory.c_str(), WATCHED_EVENTS);
+    if (wd < 0) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Could not watch directory {}: {}", directory, std::strerror(errno));
+        return false;
+    }
+    // the same inode may be reachable through different paths
+    auto it = watchedDirectories.find(wd);
+    if (it != watchedDirectories.end()) {
+        watchDescriptors.erase(it->second);
+    }
+    watchedDirectories[wd] = directory;
+    watchDescriptors[directory] = wd;
+    SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Watching directory {} for changes", directory);
+    return true;
+}
+
+void FileSystemWatcher::unwatch(const std::string& directory) {
+    std::lock_guard<std::mutex> lock(mutex);
+    auto it = watchDescriptors.find(directory);
+    if (it == watchDescriptors.end()) {
+        return;
+    }
+    inotify_rm_watch(inotifyFd, it->second);
+    watchedDirectories.erase(it->second);
+    watchDescriptors.erase(it);
+}
+
+bool FileSystemWatcher::isWatched(const std::string& directory) {
+    std::lock_guard<std::mutex> lock(mutex);
+    return watchDescriptors.find(directory) != watchDescriptors.end();
+}
+
+std::set<std::string> FileSystemWatcher::getWatchedDirectories() {
+    std::lock_guard<std::mutex> lock(mutex);
+    std::set<std::string> directories;
+    for (auto& [directory, wd] : watchDescriptors) {
+        directories.insert(directory);
+    }
+    return directories;
+}
+
+bool FileSystemWatcher::readEvents(FileSystemChanges& changes) {
+    alignas(struct inotify_event) char buffer[4096];
+    bool anyEvent = false;
+    std::lock_guard<std::mutex> lock(mutex);
+    while (true) {
+        ssize_t length = read(inotifyFd, buffer, sizeof(buffer));
+        if (length <= 0) {
+            break;
+        }
+        for (char* ptr = buffer; ptr < buffer + length;) {
+            const struct inotify_event* event = reinterpret_cast<const struct inotify_event*>(ptr);
+            ptr += sizeof(struct inotify_event) + event->len;
+            anyEvent = true;
+            if (event->mask & IN_Q_OVERFLOW) {
+                SPDLOG_LOGGER_WARN(modelmanager_logger, "Filesystem events queue overflow, all watched directories will be checked");
+                changes.overflow = true;
+                continue;
+            }
+            auto it = watchedDirectories.find(event->wd);
+            if (it == watchedDirectories.end()) {
+                continue;
+            }
+            changes.directories.insert(it->second);
+            if (event->mask & IN_IGNORED) {
+                // directory was removed or unmounted, kernel dropped the watch
+                watchDescriptors.erase(it->second);
+                watchedDirectories.erase(it);
+            }
+        }
+    }
+    return anyEvent;
+}
+
+FileSystemChanges FileSystemWatcher::waitForChanges(std::chrono::milliseconds timeout, std::chrono::milliseconds debounce) {
+    FileSystemChanges changes;
+    if (!isValid()) {
+        return changes;
+    }
+    struct pollfd fds[2] = {{inotifyFd, POLLIN, 0}, {wakeUpFd, POLLIN, 0}};
+    const auto deadline = std::chrono::steady_clock::now() + timeout;
+    bool changed = false;
+    while (!changed) {
+        auto remaining = std::chrono::ceil<std::chrono::milliseconds>(deadline - std::chrono::steady_clock::now());
+        if (remaining.count() <= 0) {
+            return changes;
+        }
+        int result = poll(fds, 2, remaining.count());
+        if (result < 0 && errno != EINTR) {
+            SPDLOG_LOGGER_ERROR(modelmanager_logger, "Waiting for filesystem events failed: {}", std::strerror(errno));
+            return changes;
+        }
+        if (result > 0 && (fds[1].revents & POLLIN)) {
+            uint64_t value;
+            ssize_t bytesRead = read(wakeUpFd, &value, sizeof(value));
+            (void)bytesRead;
+            return changes;
+        }
+        if (result > 0 && (fds[0].revents & POLLIN)) {
+            changed = readEvents(changes);
+        }
+    }
+    // coalesce events of files being copied into single change
+    const auto debounceDeadline = std::chrono::steady_clock::now() + debounce * MAX_DEBOUNCE_MULTIPLIER;
+    while (true) {
+        auto remaining = std::chrono::ceil<std::chrono::milliseconds>(debounceDeadline - std::chrono::steady_clock::now());
+        if (remaining.count() <= 0) {
+            break;
+        }
+        int result = poll(fds, 2, std::min(debounce, remaining).count());
+        if (result == 0) {
+            break;
+        }
+        if (result < 0 && errno != EINTR) {
+            break;
+        }
+        if (result > 0 && (fds[1].revents & POLLIN)) {
+            break;
+        }
+        if (result > 0 && (fds[0].revents & POLLIN)) {
+            readEvents(changes);
+        }
+    }
+    return changes;
+}
+
+void FileSystemWatcher::wakeUp() {
+    if (wakeUpFd < 0) {
+        return;
+    }
+    uint64_t value = 1;
+    ssize_t bytesWritten = write(wakeUpFd, &value, sizeof(value));
+    (void)bytesWritten;
+}
+
+}  // namespace ovms
@@ -0,0 +1,98 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <mutex>
+#include <set>
+#include <string>
+#include <unordered_map>
+
+namespace ovms {
+
+/**
+ * @brief Directories reported by FileSystemWatcher
+ */
+struct FileSystemChanges {
+    /**
+     * @brief Watched directories with changed entries or removed directories
+     */
+    std::set<std::string> directories;
+
+    /**
+     * @brief Events were lost, every watched directory has to be rescanned
+     */
+    bool overflow = false;
+};
+
+/**
+ * @brief Reports changes in local directories using inotify
+ *
+ * Only direct entries of watched directories are reported, subdirectories have to be watched separately.
+ */
+class FileSystemWatcher {
+    int inotifyFd = -1;
+    int wakeUpFd = -1;
+
+    std::unordered_map<int, std::string> watchedDirectories;
+    std::unordered_map<std::string, int> watchDescriptors;
+    std::mutex mutex;
+
+    bool readEvents(FileSystemChanges& changes);
+
+public:
+    FileSystemWatcher();
+    ~FileSystemWatcher();
+
+    FileSystemWatcher(const FileSystemWatcher&) = delete;
+    FileSystemWatcher& operator=(const FileSystemWatcher&) = delete;
+
+    /**
+     * @brief Checks if inotify instance was created
+     */
+    bool isValid() const {
+        return inotifyFd >= 0 && wakeUpFd >= 0;
+    }
+
+    /**
+     * @brief Starts watching directory
+     *
+     * @return false if directory cannot be watched
+     */
+    bool watch(const std::string& directory);
+
+    void unwatch(const std::string& directory);
+
+    bool isWatched(const std::string& directory);
+
+    std::set<std::string> getWatchedDirectories();
+
+    /**
+     * @brief Blocks until first change, timeout or wakeUp. After the first change waits until there are no
+     * new events for debounce period, but not longer than MAX_DEBOUNCE_MULTIPLIER times debounce.
+     */
+    FileSystemChanges waitForChanges(std::chrono::milliseconds timeout, std::chrono::milliseconds debounce);
+
+    /**
+     * @brief Interrupts waitForChanges
+     */
+    void wakeUp();
+
+    static const uint32_t MAX_DEBOUNCE_MULTIPLIER = 10;
+};
+
+}  // namespace ovms
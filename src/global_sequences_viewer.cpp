@@ -16,6 +16,7 @@
 
 #include "global_sequences_viewer.hpp"
 
+#include <chrono>
 #include <limits>
 #include <memory>
 #include <utility>
@@ -63,7 +64,23 @@ Status GlobalSequencesViewer::removeIdleSequences() {
     std::unique_lock<std::mutex> viewerLock(viewerMutex);
     for (auto it = registeredSequenceManagers.begin(); it != registeredSequenceManagers.end();) {
         auto sequenceManager = it->second;
+        it++;
+        // Sequences of models with idle sequence timeout are removed by removeExpiredSequences
+        if (sequenceManager->getIdleSequenceTimeout() != std::chrono::seconds::zero())
+            continue;
         auto status = sequenceManager->removeIdleSequences();
+        if (status.getCode() != ovms::StatusCode::OK)
+            return status;
+    }
+
+    return ovms::StatusCode::OK;
+}
+
+Status GlobalSequencesViewer::removeExpiredSequences(std::chrono::steady_clock::time_point now) {
+    std::unique_lock<std::mutex> viewerLock(viewerMutex);
+    for (auto it = registeredSequenceManagers.begin(); it != registeredSequenceManagers.end();) {
+        auto sequenceManager = it->second;
+        auto status = sequenceManager->removeExpiredSequences(now);
         it++;
         if (status.getCode() != ovms::StatusCode::OK)
             return status;
@@ -75,12 +92,20 @@ Status GlobalSequencesViewer::removeIdleSequences() {
 void GlobalSequencesViewer::sequenceCleanerRoutine(uint32_t sequenceCleanerIntervalMinutes, std::future<void> exitSignal) {
     SPDLOG_LOGGER_INFO(modelmanager_logger, "Started sequence cleaner thread");
 
-    while (exitSignal.wait_for(std::chrono::minutes(sequenceCleanerIntervalMinutes)) == std::future_status::timeout) {
+    const std::chrono::minutes scanInterval(sequenceCleanerIntervalMinutes);
+    auto nextScan = std::chrono::steady_clock::now() + scanInterval;
+    while (exitSignal.wait_for(SequenceManager::EXPIRATION_TICK) == std::future_status::timeout) {
+        auto now = std::chrono::steady_clock::now();
+        removeExpiredSequences(now);
+
+        if (sequenceCleanerIntervalMinutes == 0 || now < nextScan)
+            continue;
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Sequence cleaner scan begin");
 
         removeIdleSequences();
 
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Sequence cleaner scan end");
+        nextScan = now + scanInterval;
     }
     SPDLOG_LOGGER_INFO(modelmanager_logger, "Stopped sequence cleaner thread");
 }
@@ -97,7 +122,7 @@ void GlobalSequencesViewer::join() {
 }
 
 void GlobalSequencesViewer::startCleanerThread(uint32_t sequenceCleanerIntervalMinutes) {
-    if ((!sequenceCleanerStarted) && (sequenceCleanerIntervalMinutes > 0)) {
+    if (!sequenceCleanerStarted) {
         std::future<void> exitSignal = exitTrigger.get_future();
         std::thread t(std::thread(&GlobalSequencesViewer::sequenceCleanerRoutine, this, sequenceCleanerIntervalMinutes, std::move(exitSignal)));
         sequenceCleanerStarted = true;
@@ -16,6 +16,7 @@
 
 #pragma once
 
+#include <chrono>
 #include <future>
 #include <limits>
 #include <map>
@@ -46,6 +47,8 @@ private:
 protected:
     Status removeIdleSequences();
 
+    Status removeExpiredSequences(std::chrono::steady_clock::time_point now);
+
 public:
     void startCleanerThread(uint32_t sequenceCleanerIntervalMinutes = DEFAULT_SEQUENCE_CLEANER_INTERVAL);
 
@@ -15,6 +15,8 @@
 //*****************************************************************************
 #include "http_rest_api_handler.hpp"
 
+#include <algorithm>
+#include <cctype>
 #include <map>
 #include <memory>
 #include <mutex>
@@ -28,6 +30,7 @@
 #include "config.hpp"
 #include "filesystem.hpp"
 #include "get_model_metadata_impl.hpp"
+#include "metrics.hpp"
 #include "model_service.hpp"
 #include "modelinstanceunloadguard.hpp"
 #include "pipelinedefinition.hpp"
@@ -47,6 +50,8 @@ const std::string HttpRestApiHandler::modelstatusRegexExp =
     R"((.?)\/v1\/models(?:\/([^\/:]+))?(?:(?:\/versions\/(\d+))|(?:\/labels\/(\w+)))?(?:\/(metadata))?)";
 const std::string HttpRestApiHandler::configReloadRegexExp = R"((.?)\/v1\/config\/reload)";
 const std::string HttpRestApiHandler::configStatusRegexExp = R"((.?)\/v1\/config)";
+const std::string HttpRestApiHandler::metricsRegexExp = R"((.?)\/metrics)";
+const std::string HttpRestApiHandler::inferenceHeaderContentLength = "Inference-Header-Content-Length";
 
 Status HttpRestApiHandler::parseModelVersion(std::string& model_version_str, std::optional<int64_t>& model_version) {
     if (!model_version_str.empty()) {
@@ -61,14 +66,16 @@ Status HttpRestApiHandler::parseModelVersion(std::string& model_version_str, std
 }
 
 Status HttpRestApiHandler::dispatchToProcessor(
-    const std::string& request_body,
+    std::string& request_body,
     std::string* response,
+    std::vector<std::pair<std::string, std::string>>* headers,
     const HttpRequestComponents& request_components) {
 
     if (request_components.type == Predict) {
         if (request_components.processing_method == "predict") {
             return processPredictRequest(request_components.model_name, request_components.model_version,
-                request_components.model_version_label, request_body, response);
+                request_components.model_version_label, request_body, response, headers,
+                request_components.inference_header_content_length);
         } else {
             SPDLOG_WARN("Requested REST resource not found");
             return StatusCode::REST_NOT_FOUND;
@@ -90,6 +97,9 @@ Status HttpRestApiHandler::dispatchToProcessor(
         auto& manager = ModelManager::getInstance();
         return processConfigStatusRequest(*response, manager);
     }
+    if (request_components.type == Metrics) {
+        return processMetricsRequest(*response);
+    }
     return StatusCode::UNKNOWN_REQUEST_COMPONENTS_TYPE;
 }
 
@@ -158,18 +168,37 @@ Status HttpRestApiHandler::parseRequestComponents(HttpRequestComponents& request
             requestComponents.type = ConfigStatus;
             return StatusCode::OK;
         }
+        if (std::regex_match(request_path, sm, metricsRegex)) {
+            requestComponents.type = Metrics;
+            return StatusCode::OK;
+        }
         if (std::regex_match(request_path, sm, predictionRegex))
             return StatusCode::REST_UNSUPPORTED_METHOD;
     }
     return StatusCode::REST_INVALID_URL;
 }
 
+Status HttpRestApiHandler::parseInferenceHeaderContentLength(const std::string_view value, std::optional<size_t>& length) {
+    if (!std::all_of(value.begin(), value.end(), ::isdigit)) {
+        SPDLOG_DEBUG("Invalid {} header value: {}", inferenceHeaderContentLength, value);
+        return StatusCode::REST_BINARY_INVALID_HEADER_LENGTH;
+    }
+    try {
+        length = std::stoull(std::string(value));
+    } catch (std::exception& e) {
+        SPDLOG_DEBUG("Invalid {} header value: {}", inferenceHeaderContentLength, value);
+        return StatusCode::REST_BINARY_INVALID_HEADER_LENGTH;
+    }
+    return StatusCode::OK;
+}
+
 Status HttpRestApiHandler::processRequest(
     const std::string_view http_method,
     const std::string_view request_path,
-    const std::string& request_body,
+    std::string& request_body,
     std::vector<std::pair<std::string, std::string>>* headers,
-    std::string* response) {
+    std::string* response,
+    const std::string_view inference_header_content_length) {
 
     std::smatch sm;
     std::string request_path_str(request_path);
@@ -186,17 +215,30 @@ Status HttpRestApiHandler::processRequest(
     auto status = parseRequestComponents(requestComponents, http_method, request_path_str);
     if (!status.ok())
         return status;
-    return dispatchToProcessor(request_body, response, requestComponents);
+    if (requestComponents.type == Metrics) {
+        headers->clear();
+        headers->push_back({"Content-Type", "text/plain; version=0.0.4"});
+    }
+    if (requestComponents.type == Predict && !inference_header_content_length.empty()) {
+        status = parseInferenceHeaderContentLength(inference_header_content_length, requestComponents.inference_header_content_length);
+        if (!status.ok())
+            return status;
+    }
+    return dispatchToProcessor(request_body, response, headers, requestComponents);
 }
 
 Status HttpRestApiHandler::processPredictRequest(
     const std::string& modelName,
     const std::optional<int64_t>& modelVersion,
     const std::optional<std::string_view>& modelVersionLabel,
-    const std::string& request,
-    std::string* response) {
+    std::string& request,
+    std::string* response,
+    std::vector<std::pair<std::string, std::string>>* headers,
+    const std::optional<size_t>& binaryHeaderLength) {
     // model_version_label currently is not in use
 
+    static RequestMetrics restRequestMetrics("rest");
+    RequestMetricsGuard requestMetrics(restRequestMetrics);
     Timer timer;
     timer.start("total");
     using std::chrono::microseconds;
@@ -211,29 +253,51 @@ Status HttpRestApiHandler::processPredictRequest(
 
     if (modelManager.modelExists(modelName)) {
         SPDLOG_DEBUG("Found model with name: {}. Searching for requested version...", modelName);
-        status = processSingleModelRequest(modelName, modelVersion, request, requestOrder, responseProto);
+        status = processSingleModelRequest(modelName, modelVersion, request, binaryHeaderLength, requestOrder, responseProto);
     } else if (modelManager.pipelineDefinitionExists(modelName)) {
         SPDLOG_DEBUG("Found pipeline with name: {}", modelName);
-        status = processPipelineRequest(modelName, request, requestOrder, responseProto);
+        status = processPipelineRequest(modelName, request, binaryHeaderLength, requestOrder, responseProto);
     } else {
         SPDLOG_WARN("Model or pipeline matching request parameters not found - name: {}, version: {}", modelName, modelVersion.value_or(0));
         status = StatusCode::MODEL_NAME_MISSING;
     }
-    if (!status.ok())
+    if (!status.ok()) {
+        requestMetrics.setStatus(status);
         return status;
+    }
 
-    status = makeJsonFromPredictResponse(responseProto, response, requestOrder);
-    if (!status.ok())
+    if (requestOrder == Order::BINARY) {
+        size_t headerLength = 0;
+        status = makeBinaryFromPredictResponse(responseProto, response, &headerLength);
+        if (status.ok()) {
+            headers->clear();
+            headers->push_back({"Content-Type", "application/octet-stream"});
+            headers->push_back({inferenceHeaderContentLength, std::to_string(headerLength)});
+        }
+    } else {
+        status = makeJsonFromPredictResponse(responseProto, response, requestOrder);
+    }
+    if (!status.ok()) {
+        requestMetrics.setStatus(status);
         return status;
+    }
 
     timer.stop("total");
     SPDLOG_DEBUG("Total REST request processing time: {} ms", timer.elapsed<std::chrono::microseconds>("total") / 1000);
     return StatusCode::OK;
 }
 
+static Status parseRequest(RestParser& requestParser, std::string& request, const std::optional<size_t>& binaryHeaderLength) {
+    if (binaryHeaderLength.has_value()) {
+        return requestParser.parseBinary(request, binaryHeaderLength.value());
+    }
+    return requestParser.parseInsitu(request.data());
+}
+
 Status HttpRestApiHandler::processSingleModelRequest(const std::string& modelName,
     const std::optional<int64_t>& modelVersion,
-    const std::string& request,
+    std::string& request,
+    const std::optional<size_t>& binaryHeaderLength,
     Order& requestOrder,
     tensorflow::serving::PredictResponse& responseProto) {
 
@@ -252,13 +316,13 @@ Status HttpRestApiHandler::processSingleModelRequest(const std::string& modelNam
     Timer timer;
     timer.start("parse");
     RestParser requestParser(modelInstance->getInputsInfo());
-    status = requestParser.parse(request.c_str());
+    status = parseRequest(requestParser, request, binaryHeaderLength);
     if (!status.ok()) {
         return status;
     }
     requestOrder = requestParser.getOrder();
     timer.stop("parse");
-    SPDLOG_DEBUG("JSON request parsing time: {} ms", timer.elapsed<std::chrono::microseconds>("parse") / 1000);
+    SPDLOG_DEBUG("Request parsing time: {} ms", timer.elapsed<std::chrono::microseconds>("parse") / 1000);
 
     tensorflow::serving::PredictRequest& requestProto = requestParser.getProto();
     requestProto.mutable_model_spec()->set_name(modelName);
@@ -285,7 +349,8 @@ Status getPipelineInputs(const std::string& modelName, ovms::tensor_map_t& input
 }
 
 Status HttpRestApiHandler::processPipelineRequest(const std::string& modelName,
-    const std::string& request,
+    std::string& request,
+    const std::optional<size_t>& binaryHeaderLength,
     Order& requestOrder,
     tensorflow::serving::PredictResponse& responseProto) {
 
@@ -300,13 +365,13 @@ Status HttpRestApiHandler::processPipelineRequest(const std::string& modelName,
     }
 
     RestParser requestParser(inputs);
-    status = requestParser.parse(request.c_str());
+    status = parseRequest(requestParser, request, binaryHeaderLength);
     if (!status.ok()) {
         return status;
     }
     requestOrder = requestParser.getOrder();
     timer.stop("parse");
-    SPDLOG_DEBUG("JSON request parsing time: {} ms", timer.elapsed<std::chrono::microseconds>("parse") / 1000);
+    SPDLOG_DEBUG("Request parsing time: {} ms", timer.elapsed<std::chrono::microseconds>("parse") / 1000);
 
     tensorflow::serving::PredictRequest& requestProto = requestParser.getProto();
     requestProto.mutable_model_spec()->set_name(modelName);
@@ -455,4 +520,10 @@ Status HttpRestApiHandler::processConfigStatusRequest(std::string& response, Mod
     return StatusCode::OK;
 }
 
+Status HttpRestApiHandler::processMetricsRequest(std::string& response) {
+    SPDLOG_DEBUG("Processing metrics request started.");
+    response = MetricRegistry::getInstance().collect();
+    return StatusCode::OK;
+}
+
 }  // namespace ovms
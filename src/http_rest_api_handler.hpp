@@ -34,7 +34,8 @@ enum RequestType { Predict,
     GetModelStatus,
     GetModelMetadata,
     ConfigReload,
-    ConfigStatus };
+    ConfigStatus,
+    Metrics };
 struct HttpRequestComponents {
     RequestType type;
     std::string_view http_method;
@@ -43,6 +44,7 @@ struct HttpRequestComponents {
     std::optional<std::string_view> model_version_label;
     std::string processing_method;
     std::string model_subresource;
+    std::optional<size_t> inference_header_content_length;
 };
 
 class HttpRestApiHandler {
@@ -51,6 +53,11 @@ public:
     static const std::string modelstatusRegexExp;
     static const std::string configReloadRegexExp;
     static const std::string configStatusRegexExp;
+    static const std::string metricsRegexExp;
+    /**
+     * @brief Request header with size of JSON header preceding binary tensor data, set also on binary responses
+     */
+    static const std::string inferenceHeaderContentLength;
 
     /**
      * @brief Construct a new HttpRest Api Handler
@@ -62,6 +69,7 @@ public:
         modelstatusRegex(modelstatusRegexExp),
         configReloadRegex(configReloadRegexExp),
         configStatusRegex(configStatusRegexExp),
+        metricsRegex(metricsRegexExp),
         timeout_in_ms(timeout_in_ms) {}
 
     Status parseRequestComponents(HttpRequestComponents& components,
@@ -70,9 +78,12 @@ public:
 
     Status parseModelVersion(std::string& model_version_str, std::optional<int64_t>& model_version);
 
+    Status parseInferenceHeaderContentLength(const std::string_view value, std::optional<size_t>& length);
+
     Status dispatchToProcessor(
-        const std::string& request_body,
+        std::string& request_body,
         std::string* response,
+        std::vector<std::pair<std::string, std::string>>* headers,
         const HttpRequestComponents& request_components);
 
     /**
@@ -80,18 +91,20 @@ public:
      * 
      * @param http_method 
      * @param request_path 
-     * @param request_body 
+     * @param request_body parsed in place, its content is not valid after processing
      * @param headers 
      * @param resposnse 
+     * @param inference_header_content_length value of Inference-Header-Content-Length header, empty if not sent
      *
      * @return StatusCode 
      */
     Status processRequest(
         const std::string_view http_method,
         const std::string_view request_path,
-        const std::string& request_body,
+        std::string& request_body,
         std::vector<std::pair<std::string, std::string>>* headers,
-        std::string* response);
+        std::string* response,
+        const std::string_view inference_header_content_length = "");
 
     /**
      * @brief Process predict request
@@ -101,6 +114,8 @@ public:
      * @param modelVersionLabel 
      * @param request 
      * @param response 
+     * @param headers 
+     * @param binaryHeaderLength size of JSON header when request carries binary tensor data, response is binary then as well
      *
      * @return StatusCode 
      */
@@ -108,19 +123,23 @@ public:
         const std::string& modelName,
         const std::optional<int64_t>& modelVersion,
         const std::optional<std::string_view>& modelVersionLabel,
-        const std::string& request,
-        std::string* response);
+        std::string& request,
+        std::string* response,
+        std::vector<std::pair<std::string, std::string>>* headers,
+        const std::optional<size_t>& binaryHeaderLength = std::nullopt);
 
     Status processSingleModelRequest(
         const std::string& modelName,
         const std::optional<int64_t>& modelVersion,
-        const std::string& request,
+        std::string& request,
+        const std::optional<size_t>& binaryHeaderLength,
         Order& requestOrder,
         tensorflow::serving::PredictResponse& responseProto);
 
     Status processPipelineRequest(
         const std::string& modelName,
-        const std::string& request,
+        std::string& request,
+        const std::optional<size_t>& binaryHeaderLength,
         Order& requestOrder,
         tensorflow::serving::PredictResponse& responseProto);
 
@@ -159,11 +178,21 @@ public:
 
     Status processConfigStatusRequest(std::string& response, ModelManager& manager);
 
+    /**
+     * @brief Process metrics request
+     *
+     * @param response Prometheus text exposition of all metrics
+     *
+     * @return StatusCode
+     */
+    Status processMetricsRequest(std::string& response);
+
 private:
     const std::regex predictionRegex;
     const std::regex modelstatusRegex;
     const std::regex configReloadRegex;
     const std::regex configStatusRegex;
+    const std::regex metricsRegex;
 
     int timeout_in_ms;
 };
@@ -15,9 +15,11 @@
 //*****************************************************************************
 #include "http_server.hpp"
 
+#include <algorithm>
 #include <memory>
 #include <regex>
 #include <string>
+#include <string_view>
 #include <utility>
 #include <vector>
 
@@ -38,6 +40,8 @@ namespace ovms {
 
 namespace net_http = tensorflow::serving::net_http;
 
+static const size_t MAX_RESERVED_BODY_SIZE = 1024 * 1024 * 1024;
+
 class RequestExecutor final : public net_http::EventExecutor {
 public:
     explicit RequestExecutor(int num_threads) :
@@ -62,9 +66,29 @@ public:
     }
 
 private:
+    /**
+     * @brief Reserves body memory upfront from Content-Length so that appending chunks does not reallocate and copy it
+     */
+    static void reserveRequestBody(net_http::ServerRequestInterface* req, std::string& body) {
+        auto contentLength = req->GetRequestHeader("Content-Length");
+        if (contentLength.empty()) {
+            return;
+        }
+        size_t length = 0;
+        try {
+            length = std::stoull(std::string(contentLength));
+        } catch (std::exception& e) {
+            SPDLOG_DEBUG("Could not parse Content-Length header: {}", std::string(contentLength));
+            return;
+        }
+        // Header is sent by the client, the body is still read chunk by chunk if it claims more
+        body.reserve(std::min(length, MAX_RESERVED_BODY_SIZE));
+    }
+
     void processRequest(net_http::ServerRequestInterface* req) {
         SPDLOG_DEBUG("REST request {}", req->uri_path());
         std::string body;
+        reserveRequestBody(req, body);
         int64_t num_bytes = 0;
         auto request_chunk = req->ReadRequestBytes(&num_bytes);
         while (request_chunk != nullptr) {
@@ -78,7 +102,9 @@ private:
             req->http_method(),
             req->uri_path(),
             body.size());
-        const auto status = handler_->processRequest(req->http_method(), req->uri_path(), body, &headers, &output);
+        auto inferenceHeaderContentLength = req->GetRequestHeader(HttpRestApiHandler::inferenceHeaderContentLength);
+        const auto status = handler_->processRequest(req->http_method(), req->uri_path(), body, &headers, &output,
+            std::string_view(inferenceHeaderContentLength.data(), inferenceHeaderContentLength.size()));
         if (!status.ok() && output.empty()) {
             output.append("{\"error\": \"" + status.string() + "\"}");
         }
@@ -0,0 +1,255 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "metrics.hpp"
+
+#include <algorithm>
+#include <sstream>
+
+namespace ovms {
+
+const std::vector<double> DEFAULT_DURATION_BUCKETS_US = {
+    10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 25000, 50000,
+    100000, 250000, 500000, 1000000, 2500000, 5000000, 10000000};
+
+static std::string formatValue(double value) {
+    std::ostringstream stream;
+    stream.precision(17);
+    stream << value;
+    return stream.str();
+}
+
+static std::string escapeLabelValue(const std::string& value) {
+    std::string escaped;
+    escaped.reserve(value.size());
+    for (char c : value) {
+        switch (c) {
+        case '\\':
+            escaped += "\\\\";
+            break;
+        case '"':
+            escaped += "\\\"";
+            break;
+        case '\n':
+            escaped += "\\n";
+            break;
+        default:
+            escaped += c;
+        }
+    }
+    return escaped;
+}
+
+// Renders labels as a comma separated list without braces, so that histograms can append the le label
+static std::string serializeLabels(const metric_labels_t& labels) {
+    std::string result;
+    for (const auto& [key, value] : labels) {
+        if (!result.empty()) {
+            result += ",";
+        }
+        result += key + "=\"" + escapeLabelValue(value) + "\"";
+    }
+    return result;
+}
+
+static std::string withBraces(const std::string& labels) {
+    return labels.empty() ? "" : "{" + labels + "}";
+}
+
+void MetricCounter::collect(const std::string& name, const std::string& labels, std::string& out) const {
+    out += name + withBraces(labels) + " " + std::to_string(get()) + "\n";
+}
+
+void MetricGauge::collect(const std::string& name, const std::string& labels, std::string& out) const {
+    out += name + withBraces(labels) + " " + std::to_string(get()) + "\n";
+}
+
+MetricHistogram::MetricHistogram(const std::vector<double>& bounds) :
+    bounds(bounds),
+    bucketCounts(new std::atomic<uint64_t>[bounds.size() + 1]) {
+    for (size_t i = 0; i <= bounds.size(); i++) {
+        bucketCounts[i].store(0, std::memory_order_relaxed);
+    }
+}
+
+void MetricHistogram::observe(double value) {
+    size_t bucket = std::lower_bound(bounds.begin(), bounds.end(), value) - bounds.begin();
+    bucketCounts[bucket].fetch_add(1, std::memory_order_relaxed);
+    double current = sum.load(std::memory_order_relaxed);
+    while (!sum.compare_exchange_weak(current, current + value, std::memory_order_relaxed)) {
+    }
+    count.fetch_add(1, std::memory_order_relaxed);
+}
+
+void MetricHistogram::collect(const std::string& name, const std::string& labels, std::string& out) const {
+    const std::string prefix = labels.empty() ? "" : labels + ",";
+    uint64_t cumulative = 0;
+    for (size_t i = 0; i < bounds.size(); i++) {
+        cumulative += bucketCounts[i].load(std::memory_order_relaxed);
+        out += name + "_bucket{" + prefix + "le=\"" + formatValue(bounds[i]) + "\"} " + std::to_string(cumulative) + "\n";
+    }
+    cumulative += bucketCounts[bounds.size()].load(std::memory_order_relaxed);
+    out += name + "_bucket{" + prefix + "le=\"+Inf\"} " + std::to_string(cumulative) + "\n";
+    out += name + "_sum" + withBraces(labels) + " " + formatValue(getSum()) + "\n";
+    out += name + "_count" + withBraces(labels) + " " + std::to_string(cumulative) + "\n";
+}
+
+template <>
+std::unique_ptr<MetricCounter> MetricFamily<MetricCounter>::create() const {
+    return std::make_unique<MetricCounter>();
+}
+
+template <>
+std::unique_ptr<MetricGauge> MetricFamily<MetricGauge>::create() const {
+    return std::make_unique<MetricGauge>();
+}
+
+template <>
+std::unique_ptr<MetricHistogram> MetricFamily<MetricHistogram>::create() const {
+    return std::make_unique<MetricHistogram>(bounds);
+}
+
+template <typename T>
+T& MetricFamily<T>::labeled(const metric_labels_t& labels) {
+    auto key = serializeLabels(labels);
+    std::lock_guard<std::mutex> lock(mtx);
+    auto it = series.find(key);
+    if (it == series.end()) {
+        it = series.emplace(key, create()).first;
+    }
+    return *it->second;
+}
+
+template <typename T>
+void MetricFamily<T>::collect(std::string& out) const {
+    std::lock_guard<std::mutex> lock(mtx);
+    if (series.empty()) {
+        return;
+    }
+    out += "# HELP " + name + " " + help + "\n";
+    out += "# TYPE " + name + " " + type + "\n";
+    for (const auto& [labels, metric] : series) {
+        metric->collect(name, labels, out);
+    }
+}
+
+template class MetricFamily<MetricCounter>;
+template class MetricFamily<MetricGauge>;
+template class MetricFamily<MetricHistogram>;
+
+MetricRegistry& MetricRegistry::getInstance() {
+    static MetricRegistry instance;
+    return instance;
+}
+
+template <typename T>
+static MetricFamily<T>& getOrCreateFamily(std::map<std::string, std::unique_ptr<MetricFamily<T>>>& families,
+    const std::string& name, const std::string& help, const std::string& type, const std::vector<double>& bounds = {}) {
+    auto it = families.find(name);
+    if (it == families.end()) {
+        it = families.emplace(name, std::make_unique<MetricFamily<T>>(name, help, type, bounds)).first;
+    }
+    return *it->second;
+}
+
+MetricFamily<MetricCounter>& MetricRegistry::counter(const std::string& name, const std::string& help) {
+    std::lock_guard<std::mutex> lock(mtx);
+    return getOrCreateFamily(counters, name, help, "counter");
+}
+
+MetricFamily<MetricGauge>& MetricRegistry::gauge(const std::string& name, const std::string& help) {
+    std::lock_guard<std::mutex> lock(mtx);
+    return getOrCreateFamily(gauges, name, help, "gauge");
+}
+
+MetricFamily<MetricHistogram>& MetricRegistry::histogram(const std::string& name, const std::string& help,
+    const std::vector<double>& bounds) {
+    std::lock_guard<std::mutex> lock(mtx);
+    return getOrCreateFamily(histograms, name, help, "histogram", bounds);
+}
+
+std::string MetricRegistry::collect() const {
+    std::string out;
+    std::lock_guard<std::mutex> lock(mtx);
+    for (const auto& [name, family] : counters) {
+        family->collect(out);
+    }
+    for (const auto& [name, family] : gauges) {
+        family->collect(out);
+    }
+    for (const auto& [name, family] : histograms) {
+        family->collect(out);
+    }
+    return out;
+}
+
+std::string statusCodeLabel(const Status& status) {
+    switch (status.grpc().error_code()) {
+    case grpc::StatusCode::OK:
+        return "OK";
+    case grpc::StatusCode::CANCELLED:
+        return "CANCELLED";
+    case grpc::StatusCode::INVALID_ARGUMENT:
+        return "INVALID_ARGUMENT";
+    case grpc::StatusCode::DEADLINE_EXCEEDED:
+        return "DEADLINE_EXCEEDED";
+    case grpc::StatusCode::NOT_FOUND:
+        return "NOT_FOUND";
+    case grpc::StatusCode::ALREADY_EXISTS:
+        return "ALREADY_EXISTS";
+    case grpc::StatusCode::PERMISSION_DENIED:
+        return "PERMISSION_DENIED";
+    case grpc::StatusCode::RESOURCE_EXHAUSTED:
+        return "RESOURCE_EXHAUSTED";
+    case grpc::StatusCode::FAILED_PRECONDITION:
+        return "FAILED_PRECONDITION";
+    case grpc::StatusCode::ABORTED:
+        return "ABORTED";
+    case grpc::StatusCode::OUT_OF_RANGE:
+        return "OUT_OF_RANGE";
+    case grpc::StatusCode::UNIMPLEMENTED:
+        return "UNIMPLEMENTED";
+    case grpc::StatusCode::UNAVAILABLE:
+        return "UNAVAILABLE";
+    case grpc::StatusCode::DATA_LOSS:
+        return "DATA_LOSS";
+    case grpc::StatusCode::UNAUTHENTICATED:
+        return "UNAUTHENTICATED";
+    case grpc::StatusCode::INTERNAL:
+        return "INTERNAL";
+    default:
+        return "UNKNOWN";
+    }
+}
+
+RequestMetrics::RequestMetrics(const std::string& api) :
+    inFlight(MetricRegistry::getInstance().gauge("ovms_requests_in_flight", "Number of predict requests being processed").labeled({{"api", api}})) {
+    auto& family = MetricRegistry::getInstance().counter("ovms_requests_total", "Number of predict requests by API and status code");
+    for (size_t code = 0; code < requests.size(); code++) {
+        requests[code] = &family.labeled({{"api", api}, {"code", statusCodeLabel(static_cast<StatusCode>(code))}});
+    }
+}
+
+RequestMetricsGuard::RequestMetricsGuard(RequestMetrics& metrics) :
+    metrics(metrics) {
+    metrics.getInFlight().increment();
+}
+
+RequestMetricsGuard::~RequestMetricsGuard() {
+    metrics.getInFlight().decrement();
+    metrics.getRequests(code).increment();
+}
+}  // namespace ovms
@@ -0,0 +1,160 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <array>
+#include <atomic>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "status.hpp"
+
+namespace ovms {
+
+using metric_labels_t = std::vector<std::pair<std::string, std::string>>;
+
+/**
+ * @brief Default histogram buckets for durations measured in microseconds, from 10us to 10s
+ */
+extern const std::vector<double> DEFAULT_DURATION_BUCKETS_US;
+
+class MetricCounter {
+    std::atomic<uint64_t> value{0};
+
+public:
+    void increment(uint64_t delta = 1) { value.fetch_add(delta, std::memory_order_relaxed); }
+    uint64_t get() const { return value.load(std::memory_order_relaxed); }
+    void collect(const std::string& name, const std::string& labels, std::string& out) const;
+};
+
+class MetricGauge {
+    std::atomic<int64_t> value{0};
+
+public:
+    void increment(int64_t delta = 1) { value.fetch_add(delta, std::memory_order_relaxed); }
+    void decrement(int64_t delta = 1) { value.fetch_sub(delta, std::memory_order_relaxed); }
+    void set(int64_t newValue) { value.store(newValue, std::memory_order_relaxed); }
+    int64_t get() const { return value.load(std::memory_order_relaxed); }
+    void collect(const std::string& name, const std::string& labels, std::string& out) const;
+};
+
+class MetricHistogram {
+    const std::vector<double> bounds;
+    std::unique_ptr<std::atomic<uint64_t>[]> bucketCounts;
+    std::atomic<uint64_t> count{0};
+    std::atomic<double> sum{0};
+
+public:
+    MetricHistogram(const std::vector<double>& bounds);
+    void observe(double value);
+    uint64_t getCount() const { return count.load(std::memory_order_relaxed); }
+    double getSum() const { return sum.load(std::memory_order_relaxed); }
+    void collect(const std::string& name, const std::string& labels, std::string& out) const;
+};
+
+/**
+ * @brief Metric of one name with a separate series for every set of label values
+ *
+ * Series are created on first use and live as long as the family, so references to them can be cached.
+ */
+template <typename T>
+class MetricFamily {
+    const std::string name;
+    const std::string help;
+    const std::string type;
+    const std::vector<double> bounds;
+    mutable std::mutex mtx;
+    std::map<std::string, std::unique_ptr<T>> series;
+
+    std::unique_ptr<T> create() const;
+
+public:
+    MetricFamily(const std::string& name, const std::string& help, const std::string& type, const std::vector<double>& bounds = {}) :
+        name(name),
+        help(help),
+        type(type),
+        bounds(bounds) {}
+
+    T& labeled(const metric_labels_t& labels = {});
+
+    void collect(std::string& out) const;
+};
+
+/**
+ * @brief Process wide collection of metrics exported in Prometheus text format
+ */
+class MetricRegistry {
+    mutable std::mutex mtx;
+    std::map<std::string, std::unique_ptr<MetricFamily<MetricCounter>>> counters;
+    std::map<std::string, std::unique_ptr<MetricFamily<MetricGauge>>> gauges;
+    std::map<std::string, std::unique_ptr<MetricFamily<MetricHistogram>>> histograms;
+
+public:
+    static MetricRegistry& getInstance();
+
+    /**
+     * @brief Get metric family of given name, creates it on first call
+     */
+    MetricFamily<MetricCounter>& counter(const std::string& name, const std::string& help);
+    MetricFamily<MetricGauge>& gauge(const std::string& name, const std::string& help);
+    MetricFamily<MetricHistogram>& histogram(const std::string& name, const std::string& help,
+        const std::vector<double>& bounds = DEFAULT_DURATION_BUCKETS_US);
+
+    /**
+     * @brief Renders all metrics in Prometheus text exposition format
+     */
+    std::string collect() const;
+};
+
+/**
+ * @brief Name of the gRPC status code used as a label of request counters
+ */
+std::string statusCodeLabel(const Status& status);
+
+/**
+ * @brief Request metric series of one API, resolved once so that counting a request touches only atomics
+ */
+class RequestMetrics {
+    MetricGauge& inFlight;
+    // indexed by status code, codes mapped to the same gRPC status code share the counter
+    std::array<MetricCounter*, static_cast<size_t>(StatusCode::STATUS_CODE_END) + 1> requests;
+
+public:
+    RequestMetrics(const std::string& api);
+
+    MetricGauge& getInFlight() { return inFlight; }
+    MetricCounter& getRequests(StatusCode code) { return *requests[static_cast<size_t>(code)]; }
+};
+
+/**
+ * @brief Counts request by API and status code and tracks number of requests in flight
+ */
+class RequestMetricsGuard {
+    RequestMetrics& metrics;
+    StatusCode code = StatusCode::OK;
+
+public:
+    RequestMetricsGuard(RequestMetrics& metrics);
+    ~RequestMetricsGuard();
+
+    void setStatus(const Status& status) { this->code = status.getCode(); }
+};
+}  // namespace ovms
@@ -26,6 +26,7 @@
 #include "logging.hpp"
 #include "modelmanager.hpp"
 #include "pipelinedefinition.hpp"
+#include "threadpool.hpp"
 
 namespace ovms {
 
@@ -81,8 +82,10 @@ const std::map<model_version_t, std::shared_ptr<ModelInstance>>& Model::getModel
 }
 
 void Model::updateDefaultVersion(int ignoredVersion) {
+    // versions may be loaded concurrently, the last update has to see all of them
+    std::unique_lock lock(modelVersionsMtx);
     model_version_t newDefaultVersion = 0;
-    SPDLOG_INFO("Updating default version for model: {}, from: {}", getName(), defaultVersion);
+    SPDLOG_INFO("Updating default version for model: {}, from: {}", getName(), defaultVersion.load());
     for (const auto& [version, versionInstance] : modelVersions) {
         if (version != ignoredVersion &&
             version > newDefaultVersion &&
@@ -137,23 +140,43 @@ Status Model::addVersion(const ModelConfig& config) {
     return StatusCode::OK;
 }
 
-Status Model::addVersions(std::shared_ptr<model_versions_t> versionsToStart, ovms::ModelConfig& config, std::shared_ptr<FileSystem>& fs, std::shared_ptr<model_versions_t> versionsFailed) {
+Status Model::addVersions(std::shared_ptr<model_versions_t> versionsToStart, ovms::ModelConfig& config, std::shared_ptr<FileSystem>& fs, std::shared_ptr<model_versions_t> versionsFailed, ThreadPool* loadThreadPool) {
     Status result = StatusCode::OK;
     downloadModels(fs, config, versionsToStart);
     versionsFailed->clear();
+    std::vector<ModelConfig> versionConfigs;
+    versionConfigs.reserve(versionsToStart->size());
     for (const auto version : *versionsToStart) {
         SPDLOG_INFO("Will add model: {}; version: {} ...", getName(), version);
         config.setVersion(version);
         config.parseModelMapping();
-        auto status = addVersion(config);
-        if (!status.ok()) {
+        versionConfigs.push_back(config);
+    }
+    std::vector<Status> statuses(versionConfigs.size(), StatusCode::OK);
+    auto addVersionAt = [this, &versionConfigs, &statuses](size_t i) {
+        try {
+            statuses[i] = addVersion(versionConfigs[i]);
+        } catch (std::exception& e) {
+            SPDLOG_ERROR("Exception occurred while loading model: {}; version: {}; {}", getName(), versionConfigs[i].getVersion(), e.what());
+            statuses[i] = StatusCode::UNKNOWN_ERROR;
+        }
+    };
+    if (loadThreadPool && versionConfigs.size() > 1) {
+        loadThreadPool->parallelFor(versionConfigs.size(), addVersionAt);
+    } else {
+        for (size_t i = 0; i < versionConfigs.size(); i++) {
+            addVersionAt(i);
+        }
+    }
+    for (size_t i = 0; i < versionConfigs.size(); i++) {
+        if (!statuses[i].ok()) {
             SPDLOG_ERROR("Error occurred while loading model: {}; version: {}; error: {}",
                 getName(),
-                version,
-                status.string());
-            versionsFailed->push_back(version);
-            result = status;
-            cleanupModelTmpFiles(config);
+                versionConfigs[i].getVersion(),
+                statuses[i].string());
+            versionsFailed->push_back(versionConfigs[i].getVersion());
+            result = statuses[i];
+            cleanupModelTmpFiles(versionConfigs[i]);
         }
     }
     return result;
@@ -15,6 +15,7 @@
 //*****************************************************************************
 #pragma once
 
+#include <atomic>
 #include <map>
 #include <memory>
 #include <shared_mutex>
@@ -28,6 +29,8 @@
 #include "statefulmodelinstance.hpp"
 
 namespace ovms {
+
+class ThreadPool;
 class PipelineDefinition;
 /*     * @brief This class represent inference models
      */
@@ -67,7 +70,7 @@ protected:
          * @brief Model default version
          *
          */
-    model_version_t defaultVersion = 0;
+    std::atomic<model_version_t> defaultVersion = 0;
 
     /**
          * @brief Get default version
@@ -75,8 +78,9 @@ protected:
          * @return default version
          */
     const model_version_t getDefaultVersion() const {
-        SPDLOG_DEBUG("Getting default version for model: {}, {}", getName(), defaultVersion);
-        return defaultVersion;
+        model_version_t version = defaultVersion;
+        SPDLOG_DEBUG("Getting default version for model: {}, {}", getName(), version);
+        return version;
     }
 
     /**
@@ -171,10 +175,11 @@ public:
          * @brief Adds new versions of ModelInstance
          *
          * @param config model configuration
+         * @param loadThreadPool when set, versions are loaded concurrently
          *
          * @return status
          */
-    Status addVersions(std::shared_ptr<model_versions_t> versions, ovms::ModelConfig& config, std::shared_ptr<FileSystem>& fs, std::shared_ptr<model_versions_t> versionsFailed);
+    Status addVersions(std::shared_ptr<model_versions_t> versions, ovms::ModelConfig& config, std::shared_ptr<FileSystem>& fs, std::shared_ptr<model_versions_t> versionsFailed, ThreadPool* loadThreadPool = nullptr);
 
     /**
          * @brief Retires versions of Model
@@ -16,11 +16,16 @@
 #include "modelchangesubscription.hpp"
 
 #include <exception>
+#include <mutex>
 #include <sstream>
+#include <utility>
 
 #include "pipelinedefinition.hpp"
 
 namespace ovms {
+
+// models and their versions may be loaded concurrently while pipeline definition state changes are not thread safe
+static std::mutex notificationsMtx;
 void ModelChangeSubscription::subscribe(PipelineDefinition& pd) {
     SPDLOG_INFO("Subscription to {} from {}", ownerName, pd.getName());
     if (subscriptions.find(pd.getName()) != subscriptions.end()) {
@@ -45,7 +50,35 @@ void ModelChangeSubscription::unsubscribe(PipelineDefinition& pd) {
     }
 }
 
+void ModelChangeSubscription::subscribe(const std::string& subscriberName, std::function<void()> callback) {
+    SPDLOG_DEBUG("Subscription to {} from {}", ownerName, subscriberName);
+    if (callbacks.find(subscriberName) != callbacks.end()) {
+        std::stringstream ss;
+        ss << "Tried to subscribe:" << subscriberName << " to:" << ownerName;
+        ss << ", but it was already subscribed";
+        SPDLOG_ERROR(ss.str().c_str());
+        throw std::logic_error(ss.str());
+    }
+    callbacks.emplace(subscriberName, std::move(callback));
+}
+
+void ModelChangeSubscription::unsubscribe(const std::string& subscriberName) {
+    SPDLOG_DEBUG("Subscription to {} from {} removed", ownerName, subscriberName);
+    auto numberOfErased = callbacks.erase(subscriberName);
+    if (0 == numberOfErased) {
+        std::stringstream ss;
+        ss << "Tried to unsubscribe:" << subscriberName << " to:" << ownerName;
+        ss << ", but it was never subscribed";
+        SPDLOG_ERROR(ss.str().c_str());
+        throw std::logic_error(ss.str());
+    }
+}
+
 void ModelChangeSubscription::notifySubscribers() {
+    std::lock_guard<std::mutex> lock(notificationsMtx);
+    for (auto& [subscriberName, callback] : callbacks) {
+        callback();
+    }
     if (subscriptions.size() == 0) {
         return;
     }
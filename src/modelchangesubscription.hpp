@@ -15,6 +15,7 @@
 //*****************************************************************************
 #pragma once
 #include <exception>
+#include <functional>
 #include <sstream>
 #include <string>
 #include <unordered_map>
@@ -26,6 +27,7 @@ class PipelineDefinition;
 class ModelChangeSubscription {
     const std::string ownerName;
     std::unordered_map<std::string, PipelineDefinition&> subscriptions;
+    std::unordered_map<std::string, std::function<void()>> callbacks;
 
 public:
     ModelChangeSubscription(const std::string& ownerName) :
@@ -35,6 +37,13 @@ public:
 
     void unsubscribe(PipelineDefinition& pd);
 
+    /**
+     * @brief Registers callback called on every model change, it is not counted as pipeline subscription
+     */
+    void subscribe(const std::string& subscriberName, std::function<void()> callback);
+
+    void unsubscribe(const std::string& subscriberName);
+
     void notifySubscribers();
 
     bool isSubscribed() const { return subscriptions.size() > 0; }
@@ -58,6 +58,22 @@ bool ModelConfig::isReloadRequired(const ModelConfig& rhs) const {
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to maxSequenceNumber mismatch", this->name);
         return true;
     }
+    if (this->inferRequestAffinity != rhs.inferRequestAffinity) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to inferRequestAffinity mismatch", this->name);
+        return true;
+    }
+    if (this->idleSequenceTimeout != rhs.idleSequenceTimeout) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to idleSequenceTimeout mismatch", this->name);
+        return true;
+    }
+    if (this->stateMemoryBudgetMb != rhs.stateMemoryBudgetMb) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to stateMemoryBudgetMb mismatch", this->name);
+        return true;
+    }
+    if (this->coldStateStorage != rhs.coldStateStorage) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to coldStateStorage mismatch", this->name);
+        return true;
+    }
     if (this->lowLatencyTransformation != rhs.lowLatencyTransformation) {
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to lowLatencyTransformation mismatch", this->name);
         return true;
@@ -78,6 +94,18 @@ bool ModelConfig::isReloadRequired(const ModelConfig& rhs) const {
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to batch size mismatch", this->name);
         return true;
     }
+    if (this->maxBatchSize != rhs.maxBatchSize) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to max batch size mismatch", this->name);
+        return true;
+    }
+    if (this->batchTimeoutUs != rhs.batchTimeoutUs) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to batch timeout mismatch", this->name);
+        return true;
+    }
+    if (this->cacheSizeMb != rhs.cacheSizeMb) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to cache size mismatch", this->name);
+        return true;
+    }
     if (this->nireq != rhs.nireq) {
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "ModelConfig {} reload required due to nireq mismatch", this->name);
         return true;
@@ -434,6 +462,17 @@ Status ModelConfig::parseNode(const rapidjson::Value& v) {
     }
     if (v.HasMember("nireq"))
         this->setNireq(v["nireq"].GetUint64());
+    if (v.HasMember("max_batch_size"))
+        this->setMaxBatchSize(v["max_batch_size"].GetUint64());
+    if (v.HasMember("batch_timeout_us")) {
+        if (!v["batch_timeout_us"].IsUint()) {
+            SPDLOG_ERROR("Batch timeout parameter was set above unsigned int value for model {}.", v["name"].GetString());
+            return StatusCode::INVALID_DYNAMIC_BATCHING_PARAMETER;
+        }
+        this->setBatchTimeoutUs(v["batch_timeout_us"].GetUint());
+    }
+    if (v.HasMember("cache_size_mb"))
+        this->setCacheSizeMb(v["cache_size_mb"].GetUint64());
 
     if (v.HasMember("shape")) {
         // Legacy format as string
@@ -531,6 +570,42 @@ Status ModelConfig::parseNode(const rapidjson::Value& v) {
         this->setIdleSequenceCleanup(v["idle_sequence_cleanup"].GetBool());
     }
 
+    if (v.HasMember("infer_request_affinity")) {
+        if (!this->isStateful()) {
+            SPDLOG_ERROR("Infer request affinity parameter was set for non stateful model {}.", v["name"].GetString());
+            return StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER;
+        }
+        this->setInferRequestAffinity(v["infer_request_affinity"].GetBool());
+    }
+
+    if (v.HasMember("idle_sequence_timeout_seconds")) {
+        if (!this->isStateful()) {
+            SPDLOG_ERROR("Idle sequence timeout parameter was set for non stateful model {}.", v["name"].GetString());
+            return StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER;
+        }
+        if (!v["idle_sequence_timeout_seconds"].IsUint()) {
+            SPDLOG_ERROR("Idle sequence timeout parameter was set above unsigned int value for model {}.", v["name"].GetString());
+            return StatusCode::INVALID_IDLE_SEQUENCE_TIMEOUT;
+        }
+        this->setIdleSequenceTimeout(v["idle_sequence_timeout_seconds"].GetUint());
+    }
+
+    if (v.HasMember("state_memory_budget_mb")) {
+        if (!this->isStateful()) {
+            SPDLOG_ERROR("State memory budget parameter was set for non stateful model {}.", v["name"].GetString());
+            return StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER;
+        }
+        this->setStateMemoryBudgetMb(v["state_memory_budget_mb"].GetUint());
+    }
+
+    if (v.HasMember("cold_state_storage")) {
+        if (!this->isStateful()) {
+            SPDLOG_ERROR("Cold state storage parameter was set for non stateful model {}.", v["name"].GetString());
+            return StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER;
+        }
+        this->setColdStateStorage(v["cold_state_storage"].GetString());
+    }
+
     if (v.HasMember("max_sequence_number")) {
         if (!this->isStateful()) {
             SPDLOG_ERROR("Max sequence number parameter was set for non stateful model {}.", v["name"].GetString());
@@ -591,11 +666,36 @@ Status ModelConfig::parseNode(const rapidjson::Value& v) {
         setBatchSize(0);
     }
 
+    if (isRequestBatchingEnabled()) {
+        if (isStateful() || isDynamicParameterEnabled() || shapeSet) {
+            SPDLOG_ERROR("Request batching for model {} cannot be used with stateful model, configured shape or auto batch size.", getName());
+            return StatusCode::INVALID_DYNAMIC_BATCHING_PARAMETER;
+        }
+        if (getBatchSize() != 0) {
+            SPDLOG_WARN("Both max_batch_size and batch_size have been defined. Batch size parameter will be ignored.");
+            setBatchSize(0);
+        }
+        SPDLOG_DEBUG("max_batch_size: {}", getMaxBatchSize());
+        SPDLOG_DEBUG("batch_timeout_us: {}", getBatchTimeoutUs());
+    }
+
+    if (isResponseCacheEnabled()) {
+        if (isStateful()) {
+            SPDLOG_ERROR("Response cache for model {} cannot be used with stateful model.", getName());
+            return StatusCode::INVALID_RESPONSE_CACHE_PARAMETER;
+        }
+        SPDLOG_DEBUG("cache_size_mb: {}", getCacheSizeMb());
+    }
+
     SPDLOG_DEBUG("stateful: {}", isStateful());
     if (isStateful()) {
         SPDLOG_DEBUG("idle_sequence_cleanup: {}", getIdleSequenceCleanup());
         SPDLOG_DEBUG("max_sequence_number: {}", getMaxSequenceNumber());
         SPDLOG_DEBUG("low_latency_transformation: {}", isLowLatencyTransformationUsed());
+        SPDLOG_DEBUG("infer_request_affinity: {}", isInferRequestAffinityUsed());
+        SPDLOG_DEBUG("idle_sequence_timeout_seconds: {}", getIdleSequenceTimeout());
+        SPDLOG_DEBUG("state_memory_budget_mb: {}", getStateMemoryBudgetMb());
+        SPDLOG_DEBUG("cold_state_storage: {}", getColdStateStorage());
     }
 
     // if the config has models which require custom loader to be used, then load the same here
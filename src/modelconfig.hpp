@@ -40,6 +40,7 @@ using custom_loader_options_config_t = std::map<std::string, std::string>;
 const std::string ANONYMOUS_INPUT_NAME = "ANONYMOUS_INPUT_NAME";
 const std::string MAPPING_CONFIG_JSON = "mapping_config.json";
 const uint32_t DEFAULT_MAX_SEQUENCE_NUMBER = 500;
+const uint32_t DEFAULT_BATCH_TIMEOUT_US = 1000;
 
 /**
      * @brief This class represents model configuration
@@ -76,6 +77,21 @@ private:
          */
     size_t batchSize;
 
+    /**
+         * @brief Maximum batch size of coalesced requests, 0 disables request batching
+         */
+    size_t maxBatchSize = 0;
+
+    /**
+         * @brief Time to wait for a batch to fill up
+         */
+    uint32_t batchTimeoutUs = DEFAULT_BATCH_TIMEOUT_US;
+
+    /**
+         * @brief Memory limit of predict response cache in megabytes, 0 disables the cache
+         */
+    size_t cacheSizeMb = 0;
+
     /**
          * @brief Model version policy
          */
@@ -106,6 +122,26 @@ private:
          */
     uint32_t maxSequenceNumber;
 
+    /**
+         * @brief Flag determining if sequences keep their infer requests between requests
+         */
+    bool inferRequestAffinity = false;
+
+    /**
+         * @brief Time in seconds after which inactive sequence is removed, 0 if sequences do not expire
+         */
+    uint32_t idleSequenceTimeout = 0;
+
+    /**
+         * @brief Size in megabytes of full precision memory state kept by sequences, 0 if not limited
+         */
+    uint32_t stateMemoryBudgetMb = 0;
+
+    /**
+         * @brief Storage of memory state of sequences exceeding state memory budget, "file" or "fp16"
+         */
+    std::string coldStateStorage = "file";
+
     /**
          * @brief Model version
          */
@@ -406,6 +442,78 @@ public:
          */
     static std::tuple<Mode, size_t> extractBatchingParams(std::string configBatchSize);
 
+    /**
+         * @brief Get the maximum batch size of coalesced requests
+         * 
+         * @return size_t 
+         */
+    size_t getMaxBatchSize() const {
+        return this->maxBatchSize;
+    }
+
+    /**
+         * @brief Set the maximum batch size of coalesced requests
+         * 
+         * @param maxBatchSize 
+         */
+    void setMaxBatchSize(size_t maxBatchSize) {
+        this->maxBatchSize = maxBatchSize;
+    }
+
+    /**
+         * @brief Checks if concurrent requests are coalesced into batches
+         * 
+         * @return bool
+         */
+    bool isRequestBatchingEnabled() const {
+        return this->maxBatchSize > 0;
+    }
+
+    /**
+         * @brief Get the memory limit of response cache in megabytes
+         * 
+         * @return size_t 
+         */
+    size_t getCacheSizeMb() const {
+        return this->cacheSizeMb;
+    }
+
+    /**
+         * @brief Set the memory limit of response cache in megabytes
+         * 
+         * @param cacheSizeMb 
+         */
+    void setCacheSizeMb(size_t cacheSizeMb) {
+        this->cacheSizeMb = cacheSizeMb;
+    }
+
+    /**
+         * @brief Checks if predict responses are cached
+         * 
+         * @return bool
+         */
+    bool isResponseCacheEnabled() const {
+        return this->cacheSizeMb > 0;
+    }
+
+    /**
+         * @brief Get the batch timeout in microseconds
+         * 
+         * @return uint32_t 
+         */
+    uint32_t getBatchTimeoutUs() const {
+        return this->batchTimeoutUs;
+    }
+
+    /**
+         * @brief Set the batch timeout in microseconds
+         * 
+         * @param batchTimeoutUs 
+         */
+    void setBatchTimeoutUs(uint32_t batchTimeoutUs) {
+        this->batchTimeoutUs = batchTimeoutUs;
+    }
+
     /**
          * @brief Get the model version policy
          * 
@@ -541,6 +649,78 @@ public:
         this->idleSequenceCleanup = idleSequenceCleanup;
     }
 
+    /**
+     * @brief Get infer request affinity flag
+     *
+     * @return bool
+     */
+    bool isInferRequestAffinityUsed() const {
+        return this->inferRequestAffinity;
+    }
+
+    /**
+     * @brief Set infer request affinity flag
+     *
+     * @param inferRequestAffinity
+     */
+    void setInferRequestAffinity(const bool inferRequestAffinity) {
+        this->inferRequestAffinity = inferRequestAffinity;
+    }
+
+    /**
+     * @brief Get idle sequence timeout in seconds
+     *
+     * @return uint
+     */
+    uint32_t getIdleSequenceTimeout() const {
+        return this->idleSequenceTimeout;
+    }
+
+    /**
+     * @brief Set idle sequence timeout in seconds
+     *
+     * @param idleSequenceTimeout
+     */
+    void setIdleSequenceTimeout(const uint32_t idleSequenceTimeout) {
+        this->idleSequenceTimeout = idleSequenceTimeout;
+    }
+
+    /**
+     * @brief Get state memory budget in megabytes
+     *
+     * @return uint
+     */
+    uint32_t getStateMemoryBudgetMb() const {
+        return this->stateMemoryBudgetMb;
+    }
+
+    /**
+     * @brief Set state memory budget in megabytes
+     *
+     * @param stateMemoryBudgetMb
+     */
+    void setStateMemoryBudgetMb(const uint32_t stateMemoryBudgetMb) {
+        this->stateMemoryBudgetMb = stateMemoryBudgetMb;
+    }
+
+    /**
+     * @brief Get cold state storage
+     *
+     * @return const std::string&
+     */
+    const std::string& getColdStateStorage() const {
+        return this->coldStateStorage;
+    }
+
+    /**
+     * @brief Set cold state storage
+     *
+     * @param coldStateStorage
+     */
+    void setColdStateStorage(const std::string& coldStateStorage) {
+        this->coldStateStorage = coldStateStorage;
+    }
+
     /**
          * @brief Parses json node for plugin config keys and values
          * 
@@ -277,6 +277,11 @@ uint ModelInstance::getNumOfParallelInferRequests(const ModelConfig& modelConfig
 
 void ModelInstance::loadOVEngine() {
     engine = std::make_unique<InferenceEngine::Core>();
+    if (ovms::Config::instance().cacheDir() != "") {
+        // compiled networks are stored under the hash of network topology, weights, shapes, device and plugin config
+        SPDLOG_DEBUG("Using compiled networks cache directory: {}", ovms::Config::instance().cacheDir());
+        engine->SetConfig({{CONFIG_KEY(CACHE_DIR), ovms::Config::instance().cacheDir()}});
+    }
     if (ovms::Config::instance().cpuExtensionLibraryPath() != "") {
         SPDLOG_INFO("Loading custom CPU extension from {}", ovms::Config::instance().cpuExtensionLibraryPath());
         try {
@@ -449,6 +454,17 @@ Status ModelInstance::prepareInferenceRequestsQueue(const ModelConfig& config) {
         return Status(StatusCode::INVALID_NIREQ, "Exceeded allowed nireq value");
     }
     inferRequestsQueue = std::make_unique<OVInferRequestsQueue>(*execNetwork, numberOfParallelInferRequests);
+    if (config.isRequestBatchingEnabled()) {
+        requestBatcher = std::make_unique<RequestBatcher>(getName(), getVersion(), config.getMaxBatchSize(),
+            std::chrono::microseconds(config.getBatchTimeoutUs()),
+            [this](const tensorflow::serving::PredictRequest& request, tensorflow::serving::PredictResponse& response) {
+                return this->inferBatch(request, response);
+            });
+        SPDLOG_INFO("Request batching enabled for model {}; version: {}; max batch size: {}; batch timeout: {} us",
+            getName(), getVersion(), config.getMaxBatchSize(), config.getBatchTimeoutUs());
+    } else {
+        requestBatcher.reset();
+    }
     SPDLOG_INFO("Loaded model {}; version: {}; batch size: {}; No of InferRequests: {}",
         getName(),
         getVersion(),
@@ -457,8 +473,33 @@ Status ModelInstance::prepareInferenceRequestsQueue(const ModelConfig& config) {
     return StatusCode::OK;
 }
 
+void ModelInstance::prepareResponseCache(const ModelConfig& config) {
+    size_t capacity = config.getCacheSizeMb() * 1024 * 1024;
+    if (responseCache && responseCache->getCapacity() == capacity) {
+        return;
+    }
+    releaseResponseCache();
+    if (!config.isResponseCacheEnabled()) {
+        return;
+    }
+    responseCache = std::make_unique<ResponseCache>(getName(), getVersion(), capacity);
+    subscriptionManager.subscribe("response cache", [this]() { this->responseCache->clear(); });
+    SPDLOG_INFO("Response cache enabled for model {}; version: {}; cache size: {} MB",
+        getName(), getVersion(), config.getCacheSizeMb());
+}
+
+void ModelInstance::releaseResponseCache() {
+    if (!responseCache) {
+        return;
+    }
+    subscriptionManager.unsubscribe("response cache");
+    responseCache.reset();
+}
+
 void ModelInstance::configureBatchSize(const ModelConfig& config, const DynamicModelParameter& parameter) {
-    if (parameter.isBatchSizeRequested()) {
+    if (config.isRequestBatchingEnabled()) {
+        network->setBatchSize(config.getMaxBatchSize());
+    } else if (parameter.isBatchSizeRequested()) {
         network->setBatchSize(parameter.getBatchSize());
     } else if (config.getBatchSize() > 0) {
         network->setBatchSize(config.getBatchSize());
@@ -510,6 +551,7 @@ Status ModelInstance::loadModelImpl(const ModelConfig& config, const DynamicMode
             this->status.setLoading(ModelVersionStatusErrorCode::UNKNOWN);
             return status;
         }
+        prepareResponseCache(this->config);
     } catch (const InferenceEngine::Exception& e) {
         SPDLOG_ERROR("exception occurred while loading network: {}", e.what());
         this->status.setLoading(ModelVersionStatusErrorCode::UNKNOWN);
@@ -531,7 +573,16 @@ Status ModelInstance::loadModel(const ModelConfig& config) {
     }
     this->status = ModelVersionStatus(config.getName(), config.getVersion());
     this->status.setLoading();
-    return loadModelImpl(config);
+    Timer timer;
+    timer.start("load");
+    auto status = loadModelImpl(config);
+    timer.stop("load");
+    if (status.ok()) {
+        double loadTimeMs = timer.elapsed<std::chrono::microseconds>("load") / 1000;
+        getLoadDurationMetric(getName(), getVersion()).set(static_cast<int64_t>(loadTimeMs));
+        SPDLOG_INFO("Loading model: {}, version: {} took {:.3f} ms", getName(), getVersion(), loadTimeMs);
+    }
+    return status;
 }
 
 Status ModelInstance::reloadModel(const ModelConfig& config, const DynamicModelParameter& parameter) {
@@ -695,6 +746,8 @@ void ModelInstance::unloadModel(bool isPermanent, bool isError) {
             getName(), getVersion(), predictRequestsHandlesCount);
         std::this_thread::sleep_for(std::chrono::milliseconds(UNLOAD_AVAILABILITY_CHECKING_INTERVAL_MILLISECONDS));
     }
+    requestBatcher.reset();
+    releaseResponseCache();
     inferRequestsQueue.reset();
     execNetwork.reset();
     network.reset();
@@ -742,6 +795,17 @@ const Status ModelInstance::validateNumberOfInputs(const tensorflow::serving::Pr
     return StatusCode::OK;
 }
 
+const Status ModelInstance::validateOutputFilter(const tensorflow::serving::PredictRequest* request) {
+    for (const auto& name : request->output_filter()) {
+        if (getOutputsInfo().count(name) == 0) {
+            const std::string details = "Requested output: " + name;
+            SPDLOG_DEBUG("[Model: {} version: {}] Missing output with specific name - {}", getName(), getVersion(), details);
+            return Status(StatusCode::INVALID_MISSING_OUTPUT, details);
+        }
+    }
+    return StatusCode::OK;
+}
+
 const Status ModelInstance::validatePrecision(const ovms::TensorInfo& networkInput,
     const tensorflow::TensorProto& requestInput) {
     // Network and request must have the same precision
@@ -882,6 +946,10 @@ const Status ModelInstance::validate(const tensorflow::serving::PredictRequest*
     if (!finalStatus.ok())
         return finalStatus;
 
+    finalStatus = validateOutputFilter(request);
+    if (!finalStatus.ok())
+        return finalStatus;
+
     for (const auto& pair : getInputsInfo()) {
         const auto& name = pair.first;
         auto networkInput = pair.second;
@@ -983,12 +1051,137 @@ Status ModelInstance::performInference(InferenceEngine::InferRequest& inferReque
     return StatusCode::OK;
 }
 
+const Status ModelInstance::validateForRequestBatching(const tensorflow::serving::PredictRequest* request) {
+    auto status = validateNumberOfInputs(request, getInputsInfo().size());
+    if (!status.ok())
+        return status;
+
+    status = validateOutputFilter(request);
+    if (!status.ok())
+        return status;
+
+    int64_t requestBatchSize = -1;
+    for (const auto& [name, networkInput] : getInputsInfo()) {
+        auto it = request->inputs().find(name);
+        if (it == request->inputs().end()) {
+            SPDLOG_DEBUG("[Model: {} version: {}] Missing input with specific name - Required input: {}", getName(), getVersion(), name);
+            return Status(StatusCode::INVALID_MISSING_INPUT, "Required input: " + name);
+        }
+        auto& requestInput = it->second;
+        status = checkIfShapeValuesNegative(requestInput);
+        if (!status.ok())
+            return status;
+
+        int64_t inputBatchSize;
+        if (requestInput.dtype() == tensorflow::DataType::DT_STRING) {
+            status = validateNumberOfBinaryInputShapeDimensions(*networkInput, requestInput);
+            if (!status.ok())
+                return status;
+            inputBatchSize = requestInput.string_val_size();
+        } else {
+            status = validatePrecision(*networkInput, requestInput);
+            if (!status.ok())
+                return status;
+            status = validateNumberOfShapeDimensions(*networkInput, requestInput);
+            if (!status.ok())
+                return status;
+            const auto& shape = networkInput->getEffectiveShape();
+            inputBatchSize = requestInput.tensor_shape().dim(0).size();
+            for (int i = 1; i < requestInput.tensor_shape().dim_size(); i++) {
+                if (requestInput.tensor_shape().dim(i).size() != static_cast<int64_t>(shape[i])) {
+                    std::stringstream ss;
+                    ss << "Expected: " << TensorInfo::shapeToString(shape)
+                       << "; Actual: " << TensorInfo::tensorShapeToString(requestInput.tensor_shape());
+                    const std::string details = ss.str();
+                    SPDLOG_DEBUG("[Model: {} version: {}] Invalid shape - {}", getName(), getVersion(), details);
+                    return Status(StatusCode::INVALID_SHAPE, details);
+                }
+            }
+            status = validateTensorContentSize(*networkInput, requestInput);
+            if (!status.ok())
+                return status;
+        }
+
+        if (inputBatchSize <= 0 || inputBatchSize > static_cast<int64_t>(getBatchSize()) ||
+            (requestBatchSize >= 0 && inputBatchSize != requestBatchSize)) {
+            std::stringstream ss;
+            ss << "Expected: 1 to " << getBatchSize() << " equal for all inputs; Actual: " << inputBatchSize;
+            const std::string details = ss.str();
+            SPDLOG_DEBUG("[Model: {} version: {}] Invalid batch size - {}", getName(), getVersion(), details);
+            return Status(StatusCode::INVALID_BATCH_SIZE, details);
+        }
+        requestBatchSize = inputBatchSize;
+    }
+    return StatusCode::OK;
+}
+
+MetricHistogram& ModelInstance::getStageDurationMetric(const std::string& name, model_version_t version, const std::string& stage) {
+    return MetricRegistry::getInstance()
+        .histogram("ovms_inference_stage_duration_microseconds", "Duration of predict request processing stages")
+        .labeled({{"name", name}, {"version", std::to_string(version)}, {"stage", stage}});
+}
+
+MetricGauge& ModelInstance::getLoadDurationMetric(const std::string& name, model_version_t version) {
+    return MetricRegistry::getInstance()
+        .gauge("ovms_model_load_duration_milliseconds", "Duration of the last successful load of model version")
+        .labeled({{"name", name}, {"version", std::to_string(version)}});
+}
+
+MetricGauge& ModelInstance::getPredictRequestsHandlesMetric(const std::string& name, model_version_t version) {
+    return MetricRegistry::getInstance()
+        .gauge("ovms_model_requests_in_progress", "Number of requests currently using model version")
+        .labeled({{"name", name}, {"version", std::to_string(version)}});
+}
+
+Status ModelInstance::inferBatch(const tensorflow::serving::PredictRequest& requestProto,
+    tensorflow::serving::PredictResponse& responseProto) {
+    ExecutingStreamIdGuard executingStreamIdGuard(getInferRequestsQueue());
+    InferenceEngine::InferRequest& inferRequest = executingStreamIdGuard.getInferRequest();
+    auto status = deserializePredictRequest<ConcreteTensorProtoDeserializator>(requestProto, getInputsInfo(), inferRequest);
+    if (!status.ok())
+        return status;
+    status = performInference(inferRequest);
+    if (!status.ok())
+        return status;
+    return serializePredictResponse(inferRequest, getOutputsInfo(), &responseProto, requestProto.output_filter());
+}
+
 Status ModelInstance::infer(const tensorflow::serving::PredictRequest* requestProto,
+    tensorflow::serving::PredictResponse* responseProto,
+    std::unique_ptr<ModelInstanceUnloadGuard>& modelUnloadGuardPtr) {
+    if (!responseCache) {
+        return inferUncached(requestProto, responseProto, modelUnloadGuardPtr);
+    }
+    ResponseCacheKey cacheKey = ResponseCache::computeKey(*requestProto);
+    if (responseCache->get(cacheKey, *responseProto)) {
+        SPDLOG_DEBUG("Response for model {}, version {} served from cache", getName(), getVersion());
+        return StatusCode::OK;
+    }
+    auto status = inferUncached(requestProto, responseProto, modelUnloadGuardPtr);
+    if (status.ok() && responseCache) {
+        responseCache->put(cacheKey, *responseProto);
+    }
+    return status;
+}
+
+Status ModelInstance::inferUncached(const tensorflow::serving::PredictRequest* requestProto,
     tensorflow::serving::PredictResponse* responseProto,
     std::unique_ptr<ModelInstanceUnloadGuard>& modelUnloadGuardPtr) {
     Timer timer;
     using std::chrono::microseconds;
 
+    if (requestBatcher) {
+        auto status = validateForRequestBatching(requestProto);
+        if (!status.ok())
+            return status;
+        timer.start("batched inference");
+        status = requestBatcher->infer(*requestProto, *responseProto);
+        timer.stop("batched inference");
+        SPDLOG_DEBUG("Batched inference duration in model {}, version {}: {:.3f} ms",
+            requestProto->model_spec().name(), getVersion(), timer.elapsed<microseconds>("batched inference") / 1000);
+        return status;
+    }
+
     auto status = validate(requestProto);
     status = reloadModelIfRequired(status, requestProto, modelUnloadGuardPtr);
     if (!status.ok())
@@ -998,12 +1191,14 @@ Status ModelInstance::infer(const tensorflow::serving::PredictRequest* requestPr
     int executingInferId = executingStreamIdGuard.getId();
     InferenceEngine::InferRequest& inferRequest = executingStreamIdGuard.getInferRequest();
     timer.stop("get infer request");
+    getInferRequestDurationMetric.observe(timer.elapsed<microseconds>("get infer request"));
     SPDLOG_DEBUG("Getting infer req duration in model {}, version {}, nireq {}: {:.3f} ms",
         requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("get infer request") / 1000);
 
     timer.start("deserialize");
     status = deserializePredictRequest<ConcreteTensorProtoDeserializator>(*requestProto, getInputsInfo(), inferRequest);
     timer.stop("deserialize");
+    deserializationDurationMetric.observe(timer.elapsed<microseconds>("deserialize"));
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Deserialization duration in model {}, version {}, nireq {}: {:.3f} ms",
@@ -1012,14 +1207,16 @@ Status ModelInstance::infer(const tensorflow::serving::PredictRequest* requestPr
     timer.start("prediction");
     status = performInference(inferRequest);
     timer.stop("prediction");
+    predictionDurationMetric.observe(timer.elapsed<microseconds>("prediction"));
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Prediction duration in model {}, version {}, nireq {}: {:.3f} ms",
         requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("prediction") / 1000);
 
     timer.start("serialize");
-    status = serializePredictResponse(inferRequest, getOutputsInfo(), responseProto);
+    status = serializePredictResponse(inferRequest, getOutputsInfo(), responseProto, requestProto->output_filter());
     timer.stop("serialize");
+    serializationDurationMetric.observe(timer.elapsed<microseconds>("serialize"));
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Serialization duration in model {}, version {}, nireq {}: {:.3f} ms",
@@ -33,11 +33,14 @@
 
 #include "customloaderconfig.hpp"
 #include "customloaderinterface.hpp"
+#include "metrics.hpp"
 #include "modelchangesubscription.hpp"
 #include "modelconfig.hpp"
 #include "modelinstanceunloadguard.hpp"
 #include "modelversionstatus.hpp"
 #include "ovinferrequestsqueue.hpp"
+#include "requestbatcher.hpp"
+#include "responsecache.hpp"
 #include "sequence_processing_spec.hpp"
 #include "status.hpp"
 #include "tensorinfo.hpp"
@@ -195,6 +198,16 @@ protected:
          */
     Status prepareInferenceRequestsQueue(const ModelConfig& config);
 
+    /**
+         * @brief Creates response cache when cache_size_mb is configured, cache with unchanged capacity is kept
+         */
+    void prepareResponseCache(const ModelConfig& config);
+
+    /**
+         * @brief Drops response cache and its model change subscription
+         */
+    void releaseResponseCache();
+
     /**
          * @brief Fetch model file paths
          *
@@ -221,6 +234,8 @@ protected:
     virtual const Status validateNumberOfInputs(const tensorflow::serving::PredictRequest* request,
         const size_t expectedNumberOfInputs);
 
+    const Status validateOutputFilter(const tensorflow::serving::PredictRequest* request);
+
     const Status validatePrecision(const ovms::TensorInfo& networkInput,
         const tensorflow::TensorProto& requestInput);
 
@@ -245,6 +260,26 @@ protected:
 
     virtual const Status validate(const tensorflow::serving::PredictRequest* request);
 
+    /**
+         * @brief Validates request which is going to be coalesced with other requests by the request batcher
+         *
+         * Request batch size may be lower than the network batch size, other dimensions have to match.
+         */
+    const Status validateForRequestBatching(const tensorflow::serving::PredictRequest* request);
+
+    /**
+         * @brief Runs single inference on request with full network batch size
+         */
+    Status inferBatch(const tensorflow::serving::PredictRequest& requestProto,
+        tensorflow::serving::PredictResponse& responseProto);
+
+    /**
+         * @brief Runs inference bypassing response cache
+         */
+    Status inferUncached(const tensorflow::serving::PredictRequest* requestProto,
+        tensorflow::serving::PredictResponse* responseProto,
+        std::unique_ptr<ModelInstanceUnloadGuard>& modelUnloadGuardPtr);
+
 private:
     /**
          * @brief Holds the information about inputs and it's parameters
@@ -266,6 +301,16 @@ private:
          */
     std::unique_ptr<OVInferRequestsQueue> inferRequestsQueue;
 
+    /**
+         * @brief Coalesces concurrent requests when max_batch_size is configured
+         */
+    std::unique_ptr<RequestBatcher> requestBatcher;
+
+    /**
+         * @brief Caches predict responses when cache_size_mb is configured
+         */
+    std::unique_ptr<ResponseCache> responseCache;
+
     /**
          * @brief Holds current usage count in predict requests
          * 
@@ -273,6 +318,19 @@ private:
          */
     std::atomic<uint64_t> predictRequestsHandlesCount = 0;
 
+    /**
+         * @brief Metrics exported on /metrics, series are owned by MetricRegistry
+         */
+    MetricGauge& predictRequestsHandlesMetric;
+    MetricHistogram& getInferRequestDurationMetric;
+    MetricHistogram& deserializationDurationMetric;
+    MetricHistogram& predictionDurationMetric;
+    MetricHistogram& serializationDurationMetric;
+
+    static MetricHistogram& getStageDurationMetric(const std::string& name, model_version_t version, const std::string& stage);
+    static MetricGauge& getPredictRequestsHandlesMetric(const std::string& name, model_version_t version);
+    static MetricGauge& getLoadDurationMetric(const std::string& name, model_version_t version);
+
     /**
          * @brief Internal method for loading inputs
          *
@@ -326,7 +384,12 @@ public:
     ModelInstance(const std::string& name, model_version_t version) :
         name(name),
         version(version),
-        subscriptionManager(std::string("model: ") + name + std::string(" version: ") + std::to_string(version)) { isCustomLoaderConfigChanged = false; }
+        subscriptionManager(std::string("model: ") + name + std::string(" version: ") + std::to_string(version)),
+        predictRequestsHandlesMetric(getPredictRequestsHandlesMetric(name, version)),
+        getInferRequestDurationMetric(getStageDurationMetric(name, version, "get_infer_request")),
+        deserializationDurationMetric(getStageDurationMetric(name, version, "deserialize")),
+        predictionDurationMetric(getStageDurationMetric(name, version, "prediction")),
+        serializationDurationMetric(getStageDurationMetric(name, version, "serialize")) { isCustomLoaderConfigChanged = false; }
 
     /**
          * @brief Destroy the Model Instance object
@@ -338,6 +401,7 @@ public:
          */
     void increasePredictRequestsHandlesCount() {
         ++predictRequestsHandlesCount;
+        predictRequestsHandlesMetric.increment();
     }
 
     /**
@@ -352,6 +416,14 @@ public:
          */
     void decreasePredictRequestsHandlesCount() {
         --predictRequestsHandlesCount;
+        predictRequestsHandlesMetric.decrement();
+    }
+
+    /**
+         * @brief Gets predict requests usage count
+         */
+    uint64_t getPredictRequestsHandlesCount() const {
+        return predictRequestsHandlesCount;
     }
 
     /**
@@ -453,6 +525,15 @@ public:
         return *inferRequestsQueue;
     }
 
+    /**
+         * @brief Get request batcher, nullptr when request batching is disabled
+         *
+         * @return RequestBatcher
+         */
+    const RequestBatcher* getRequestBatcher() const {
+        return requestBatcher.get();
+    }
+
     /**
          * @brief Combines plugin config from user with default config calculated at runtime
          *
@@ -38,6 +38,7 @@
 #include "entry_node.hpp"  // need for ENTRY_NODE_NAME
 #include "exit_node.hpp"   // need for EXIT_NODE_NAME
 #include "filesystem.hpp"
+#include "filesystemwatcher.hpp"
 #include "gcsfilesystem.hpp"
 #include "localfilesystem.hpp"
 #include "logging.hpp"
@@ -47,6 +48,8 @@
 #include "pipelinedefinition.hpp"
 #include "s3filesystem.hpp"
 #include "schema.hpp"
+#include "threadpool.hpp"
+#include "timer.hpp"
 
 namespace ovms {
 
@@ -62,6 +65,11 @@ ModelManager::~ModelManager() = default;
 Status ModelManager::start() {
     auto& config = ovms::Config::instance();
     watcherIntervalSec = config.filesystemPollWaitSeconds();
+    watcherDebounceMs = config.filesystemWatchDebounceMs();
+    if (config.modelLoadWorkers() > 1) {
+        // calling thread takes part in loading
+        modelLoadThreadPool = std::make_unique<ThreadPool>(config.modelLoadWorkers() - 1);
+    }
     sequenceCleanerIntervalMinutes = config.sequenceCleanerPollWaitMinutes();
     Status status;
     if (config.configPath() != "") {
@@ -79,6 +87,13 @@ Status ModelManager::start() {
 
 void ModelManager::startWatcher() {
     if ((!watcherStarted) && (watcherIntervalSec > 0)) {
+        if (watcherDebounceMs > 0) {
+            fileSystemWatcher = std::make_unique<FileSystemWatcher>();
+            if (!fileSystemWatcher->isValid()) {
+                SPDLOG_LOGGER_WARN(modelmanager_logger, "Filesystem changes will be detected by polling");
+                fileSystemWatcher.reset();
+            }
+        }
         std::future<void> exitSignal = exitTrigger.get_future();
         std::thread t(std::thread(&ModelManager::watcher, this, std::move(exitSignal)));
         watcherStarted = true;
@@ -463,6 +478,7 @@ Status ModelManager::loadModelsConfig(rapidjson::Document& configJson, std::vect
     std::set<std::string> modelsInConfigFile;
     std::set<std::string> modelsWithInvalidConfig;
     std::unordered_map<std::string, ModelConfig> newModelConfigs;
+    std::vector<ModelConfig> modelConfigsToLoad;
     for (const auto& configs : itr->value.GetArray()) {
         ModelConfig modelConfig;
         auto status = modelConfig.parseNode(configs["config"]);
@@ -484,10 +500,43 @@ Status ModelManager::loadModelsConfig(rapidjson::Document& configJson, std::vect
             SPDLOG_LOGGER_WARN(modelmanager_logger, "Duplicated model names: {} defined in config file. Only first definition will be loaded.", modelName);
             continue;
         }
-        status = reloadModelWithVersions(modelConfig);
-        IF_ERROR_NOT_OCCURRED_EARLIER_THEN_SET_FIRST_ERROR(status);
-
         modelsInConfigFile.emplace(modelName);
+        modelConfigsToLoad.emplace_back(std::move(modelConfig));
+    }
+
+    std::vector<Status> loadStatuses(modelConfigsToLoad.size(), StatusCode::OK);
+    auto reloadModelAt = [this, &modelConfigsToLoad, &loadStatuses](size_t i) {
+        Timer timer;
+        timer.start("load");
+        try {
+            loadStatuses[i] = reloadModelWithVersions(modelConfigsToLoad[i]);
+        } catch (std::exception& e) {
+            SPDLOG_LOGGER_ERROR(modelmanager_logger, "Exception occurred while loading model: {}; {}", modelConfigsToLoad[i].getName(), e.what());
+            loadStatuses[i] = StatusCode::UNKNOWN_ERROR;
+        }
+        timer.stop("load");
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Applying config of model: {} took {:.3f} ms",
+            modelConfigsToLoad[i].getName(), timer.elapsed<std::chrono::microseconds>("load") / 1000);
+    };
+    Timer timer;
+    timer.start("load");
+    if (modelLoadThreadPool) {
+        modelLoadThreadPool->parallelFor(modelConfigsToLoad.size(), reloadModelAt);
+    } else {
+        for (size_t i = 0; i < modelConfigsToLoad.size(); i++) {
+            reloadModelAt(i);
+        }
+    }
+    timer.stop("load");
+    SPDLOG_LOGGER_INFO(modelmanager_logger, "Applying config of {} models with {} load workers took {:.3f} ms",
+        modelConfigsToLoad.size(), modelLoadThreadPool ? modelLoadThreadPool->getThreadsCount() + 1 : 1,
+        timer.elapsed<std::chrono::microseconds>("load") / 1000);
+
+    for (size_t i = 0; i < modelConfigsToLoad.size(); i++) {
+        auto& modelConfig = modelConfigsToLoad[i];
+        const auto modelName = modelConfig.getName();
+        auto& status = loadStatuses[i];
+        IF_ERROR_NOT_OCCURRED_EARLIER_THEN_SET_FIRST_ERROR(status);
         if (!status.ok()) {
             SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Cannot reload model: {} with versions due to error: {}", modelName, status.string());
         }
@@ -661,6 +710,11 @@ Status ModelManager::configFileReloadNeeded(bool& isNeeded) {
 void ModelManager::watcher(std::future<void> exitSignal) {
     SPDLOG_LOGGER_INFO(modelmanager_logger, "Started model manager thread");
 
+    if (fileSystemWatcher) {
+        watchFileSystemChanges(exitSignal);
+        SPDLOG_LOGGER_INFO(modelmanager_logger, "Stopped model manager thread");
+        return;
+    }
     while (exitSignal.wait_for(std::chrono::seconds(watcherIntervalSec)) == std::future_status::timeout) {
         SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Models configuration and filesystem check cycle begin");
         std::lock_guard<std::recursive_mutex> loadingLock(configMtx);
@@ -676,9 +730,197 @@ void ModelManager::watcher(std::future<void> exitSignal) {
     SPDLOG_LOGGER_INFO(modelmanager_logger, "Stopped model manager thread");
 }
 
+static bool isLocalFilesystemPath(const std::string& basePath) {
+    return basePath.rfind(S3FileSystem::S3_URL_PREFIX, 0) != 0 &&
+           basePath.rfind(GCSFileSystem::GCS_URL_PREFIX, 0) != 0 &&
+           basePath.rfind(AzureFileSystem::AZURE_URL_FILE_PREFIX, 0) != 0 &&
+           basePath.rfind(AzureFileSystem::AZURE_URL_BLOB_PREFIX, 0) != 0;
+}
+
+void ModelManager::watchModelDirectories(const std::string& modelName, const ModelConfig& config) {
+    const std::string& basePath = config.getBasePath();
+    watchedModelBasePaths[modelName] = basePath;
+    if (!isLocalFilesystemPath(basePath) || !fileSystemWatcher->watch(basePath)) {
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Model {} base path {} will be polled for changes", modelName, basePath);
+        polledModels.insert(modelName);
+        return;
+    }
+    watchedDirectoryOwners[basePath].insert(modelName);
+    LocalFileSystem fs;
+    files_list_t subdirs;
+    if (fs.getDirectorySubdirs(basePath, &subdirs) != StatusCode::OK) {
+        return;
+    }
+    for (const auto& subdir : subdirs) {
+        // files of a new version are usually copied after its directory is created
+        auto versionPath = fs.joinPath({basePath, subdir});
+        if (fileSystemWatcher->watch(versionPath)) {
+            watchedDirectoryOwners[versionPath].insert(modelName);
+        }
+    }
+}
+
+void ModelManager::updateWatchedDirectories(const std::string& modelName) {
+    std::set<std::string> previouslyWatched;
+    for (auto it = watchedDirectoryOwners.begin(); it != watchedDirectoryOwners.end();) {
+        // directories shared with other models stay watched
+        if (it->second.erase(modelName) > 0 && it->second.empty()) {
+            previouslyWatched.insert(it->first);
+            it = watchedDirectoryOwners.erase(it);
+        } else {
+            ++it;
+        }
+    }
+    polledModels.erase(modelName);
+    watchedModelBasePaths.erase(modelName);
+    auto config = servedModelConfigs.find(modelName);
+    if (config != servedModelConfigs.end()) {
+        watchModelDirectories(modelName, config->second);
+    }
+    for (const auto& directory : previouslyWatched) {
+        if (watchedDirectoryOwners.find(directory) == watchedDirectoryOwners.end()) {
+            fileSystemWatcher->unwatch(directory);
+        }
+    }
+}
+
+void ModelManager::updateWatchedModels() {
+    std::set<std::string> modelsToUpdate;
+    for (auto& [name, config] : servedModelConfigs) {
+        auto watched = watchedModelBasePaths.find(name);
+        if (watched == watchedModelBasePaths.end() || watched->second != config.getBasePath()) {
+            modelsToUpdate.insert(name);
+        }
+    }
+    for (auto& [name, basePath] : watchedModelBasePaths) {
+        if (servedModelConfigs.find(name) == servedModelConfigs.end()) {
+            modelsToUpdate.insert(name);
+        }
+    }
+    for (const auto& name : modelsToUpdate) {
+        updateWatchedDirectories(name);
+    }
+}
+
+void ModelManager::updateWatchedDirectories() {
+    watchedDirectoryOwners.clear();
+    polledModels.clear();
+    watchedModelBasePaths.clear();
+    if (configFilename != "") {
+        auto configDirectory = std::filesystem::path(configFilename).parent_path().string();
+        if (configDirectory.empty()) {
+            configDirectory = ".";
+        }
+        if (fileSystemWatcher->watch(configDirectory)) {
+            watchedDirectoryOwners[configDirectory].insert("");
+        }
+    }
+    for (auto& [name, config] : servedModelConfigs) {
+        watchModelDirectories(name, config);
+    }
+    for (const auto& directory : fileSystemWatcher->getWatchedDirectories()) {
+        if (watchedDirectoryOwners.find(directory) == watchedDirectoryOwners.end()) {
+            fileSystemWatcher->unwatch(directory);
+        }
+    }
+}
+
+void ModelManager::watchFileSystemChanges(std::future<void>& exitSignal) {
+    {
+        std::lock_guard<std::recursive_mutex> loadingLock(configMtx);
+        updateWatchedDirectories();
+    }
+    const auto pollInterval = std::chrono::seconds(watcherIntervalSec);
+    const auto debounce = std::chrono::milliseconds(watcherDebounceMs);
+    auto nextPoll = std::chrono::steady_clock::now() + pollInterval;
+    while (exitSignal.wait_for(std::chrono::seconds(0)) == std::future_status::timeout) {
+        auto timeout = std::chrono::duration_cast<std::chrono::milliseconds>(nextPoll - std::chrono::steady_clock::now());
+        auto changes = fileSystemWatcher->waitForChanges(std::max(timeout, std::chrono::milliseconds(0)), debounce);
+        if (exitSignal.wait_for(std::chrono::seconds(0)) != std::future_status::timeout) {
+            break;
+        }
+        std::lock_guard<std::recursive_mutex> loadingLock(configMtx);
+        // config could be reloaded by API since last check
+        updateWatchedModels();
+        bool pollDue = std::chrono::steady_clock::now() >= nextPoll;
+        if (pollDue) {
+            nextPoll = std::chrono::steady_clock::now() + pollInterval;
+        }
+        if (changes.overflow) {
+            bool isNeeded;
+            configFileReloadNeeded(isNeeded);
+            if (isNeeded) {
+                loadConfig(configFilename);
+            }
+            updateConfigurationWithoutConfigFile();
+            updateWatchedDirectories();
+            continue;
+        }
+
+        bool configDirectoryChanged = false;
+        std::set<std::string> modelsToCheck;
+        for (const auto& directory : changes.directories) {
+            auto owners = watchedDirectoryOwners.find(directory);
+            if (owners == watchedDirectoryOwners.end()) {
+                continue;
+            }
+            for (const auto& owner : owners->second) {
+                if (owner.empty()) {
+                    configDirectoryChanged = true;
+                } else {
+                    modelsToCheck.insert(owner);
+                }
+            }
+            if (!fileSystemWatcher->isWatched(directory)) {
+                watchedDirectoryOwners.erase(owners);
+            }
+        }
+        bool configFileWatched = std::any_of(watchedDirectoryOwners.begin(), watchedDirectoryOwners.end(),
+            [](const auto& watched) { return watched.second.count("") > 0; });
+        if (configDirectoryChanged || (pollDue && configFilename != "" && !configFileWatched)) {
+            bool isNeeded;
+            configFileReloadNeeded(isNeeded);
+            if (isNeeded) {
+                SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Config file change detected");
+                loadConfig(configFilename);
+                updateWatchedDirectories();
+                continue;
+            }
+        }
+        if (pollDue) {
+            modelsToCheck.insert(polledModels.begin(), polledModels.end());
+            modelsToCheck.insert(modelsToRetry.begin(), modelsToRetry.end());
+        }
+        if (modelsToCheck.empty()) {
+            continue;
+        }
+        SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Checking if something changed with versions of {} models", modelsToCheck.size());
+        for (const auto& modelName : modelsToCheck) {
+            auto config = servedModelConfigs.find(modelName);
+            if (config == servedModelConfigs.end()) {
+                modelsToRetry.erase(modelName);
+                continue;
+            }
+            // files of the model may still be copied, so failed reload is retried until it succeeds
+            auto status = reloadModelWithVersions(config->second);
+            if (status.ok()) {
+                modelsToRetry.erase(modelName);
+            } else {
+                SPDLOG_LOGGER_DEBUG(modelmanager_logger, "Reloading model {} failed, it will be retried: {}", modelName, status.string());
+                modelsToRetry.insert(modelName);
+            }
+            updateWatchedDirectories(modelName);
+        }
+        pipelineFactory.revalidatePipelines(*this);
+    }
+}
+
 void ModelManager::join() {
     if (watcherStarted) {
         exitTrigger.set_value();
+        if (fileSystemWatcher) {
+            fileSystemWatcher->wakeUp();
+        }
         if (monitor.joinable()) {
             monitor.join();
             watcherStarted = false;
@@ -799,9 +1041,14 @@ std::shared_ptr<ovms::Model> ModelManager::getModelIfExistCreateElse(const std::
 
 std::shared_ptr<FileSystem> ModelManager::getFilesystem(const std::string& basePath) {
     if (basePath.rfind(S3FileSystem::S3_URL_PREFIX, 0) == 0) {
+        // models may be loaded concurrently
+        static std::mutex awsInitMtx;
+        std::lock_guard<std::mutex> lock(awsInitMtx);
         Aws::SDKOptions options;
         Aws::InitAPI(options);
-        return std::make_shared<S3FileSystem>(options, basePath);
+        // downloaded objects are kept next to compiled networks to be reused after restart
+        const std::string cacheDir = ovms::Config::instance().cacheDir();
+        return std::make_shared<S3FileSystem>(options, basePath, cacheDir.empty() ? "" : (std::filesystem::path(cacheDir) / "s3").string());
     }
     if (basePath.rfind(GCSFileSystem::GCS_URL_PREFIX, 0) == 0) {
         return std::make_shared<ovms::GCSFileSystem>();
@@ -867,7 +1114,7 @@ Status ModelManager::readAvailableVersions(std::shared_ptr<FileSystem>& fs, cons
 Status ModelManager::addModelVersions(std::shared_ptr<ovms::Model>& model, std::shared_ptr<FileSystem>& fs, ModelConfig& config, std::shared_ptr<model_versions_t>& versionsToStart, std::shared_ptr<model_versions_t> versionsFailed) {
     Status status = StatusCode::OK;
     try {
-        status = model->addVersions(versionsToStart, config, fs, versionsFailed);
+        status = model->addVersions(versionsToStart, config, fs, versionsFailed, modelLoadThreadPool.get());
         if (!status.ok()) {
             SPDLOG_LOGGER_ERROR(modelmanager_logger, "Error occurred while loading model: {} versions; error: {}",
                 config.getName(),
@@ -44,6 +44,8 @@ const uint32_t DEFAULT_WAIT_FOR_MODEL_LOADED_TIMEOUT_MS = 10000;
 
 class IVersionReader;
 class CustomNodeLibraryManager;
+class FileSystemWatcher;
+class ThreadPool;
 /**
  * @brief Model manager is managing the list of model topologies enabled for serving and their versions.
  */
@@ -71,6 +73,16 @@ protected:
     GlobalSequencesViewer globalSequencesViewer;
     uint32_t waitForModelLoadedTimeoutMs;
 
+    /**
+     * @brief Debounce period of inotify based changes detection, 0 disables inotify
+     */
+    uint32_t watcherDebounceMs = 0;
+
+    /**
+     * @brief Loads models and model versions concurrently, models are loaded one by one when not set
+     */
+    std::unique_ptr<ThreadPool> modelLoadThreadPool;
+
 private:
     /**
      * @brief Private copying constructor
@@ -98,6 +110,53 @@ private:
      */
     void watcher(std::future<void> exitSignal);
 
+    /**
+     * @brief Watcher loop rescanning only models with changes reported by inotify
+     */
+    void watchFileSystemChanges(std::future<void>& exitSignal);
+
+    /**
+     * @brief Synchronizes inotify watches with config file and served models directories
+     */
+    void updateWatchedDirectories();
+
+    /**
+     * @brief Synchronizes inotify watches of a model base path and its version directories
+     */
+    void updateWatchedDirectories(const std::string& modelName);
+
+    /**
+     * @brief Updates watches of models added, removed or with changed base path since last check
+     */
+    void updateWatchedModels();
+
+    void watchModelDirectories(const std::string& modelName, const ModelConfig& config);
+
+    /**
+     * @brief Reports changes in watched local directories
+     */
+    std::unique_ptr<FileSystemWatcher> fileSystemWatcher;
+
+    /**
+     * @brief Watched directories with names of models using them, config file directory is owned by empty name
+     */
+    std::map<std::string, std::set<std::string>> watchedDirectoryOwners;
+
+    /**
+     * @brief Models which failed to reload after change in their directories, retried on each poll
+     */
+    std::set<std::string> modelsToRetry;
+
+    /**
+     * @brief Models which directories cannot be watched and are polled instead
+     */
+    std::set<std::string> polledModels;
+
+    /**
+     * @brief Base paths of models tracked by watcher
+     */
+    std::map<std::string, std::string> watchedModelBasePaths;
+
     /**
      * @brief A JSON configuration filename
      */
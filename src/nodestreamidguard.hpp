@@ -15,8 +15,11 @@
 //*****************************************************************************
 #pragma once
 
+#include <functional>
 #include <future>
+#include <memory>
 #include <optional>
+#include <utility>
 
 #include <spdlog/spdlog.h>
 
@@ -25,10 +28,18 @@
 namespace ovms {
 struct NodeStreamIdGuard {
     NodeStreamIdGuard(ovms::OVInferRequestsQueue& inferRequestsQueue) :
-        inferRequestsQueue_(inferRequestsQueue),
-        futureStreamId(inferRequestsQueue_.getIdleStream()) {}
+        inferRequestsQueue_(inferRequestsQueue) {
+        streamId = inferRequestsQueue_.tryGetIdleStream();
+        if (!streamId) {
+            streamAssignedNotification = std::make_shared<StreamAssignedNotification>();
+            futureStreamId = inferRequestsQueue_.getIdleStream(streamAssignedNotification);
+        }
+    }
 
     ~NodeStreamIdGuard() {
+        if (streamAssignedNotification) {
+            streamAssignedNotification->unsubscribe();
+        }
         if (!disarmed) {
             if (!streamId) {
                 SPDLOG_DEBUG("Trying to disarm stream Id that is not needed anymore...");
@@ -48,10 +59,27 @@ struct NodeStreamIdGuard {
         return streamId;
     }
 
+    /**
+     * @brief Calls callback once stream id becomes available
+     *
+     * @return false if stream id is available already, callback is not called then
+     */
+    bool notifyWhenReady(std::function<void()> callback) {
+        if (streamId) {
+            return false;
+        }
+        return streamAssignedNotification->subscribe(std::move(callback));
+    }
+
     bool tryDisarm(const uint microseconds = 1) {
-        if (std::future_status::ready == futureStreamId.wait_for(std::chrono::microseconds(microseconds))) {
+        if (disarmed) {
+            return true;
+        }
+        if (!streamId && std::future_status::ready == futureStreamId.wait_for(std::chrono::microseconds(microseconds))) {
             streamId = futureStreamId.get();
-            SPDLOG_DEBUG("Returning streamId:", streamId.value());
+        }
+        if (streamId) {
+            SPDLOG_DEBUG("Returning streamId: {}", streamId.value());
             inferRequestsQueue_.returnStream(streamId.value());
             disarmed = true;
         }
@@ -60,6 +88,7 @@ struct NodeStreamIdGuard {
 
 private:
     ovms::OVInferRequestsQueue& inferRequestsQueue_;
+    std::shared_ptr<StreamAssignedNotification> streamAssignedNotification;
     std::future<int> futureStreamId;
     std::optional<int> streamId = std::nullopt;
     bool disarmed = false;
@@ -13,46 +13,144 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 //*****************************************************************************
-
 #include "ovinferrequestsqueue.hpp"
 
 #include <utility>
 
 namespace ovms {
-std::future<int> OVInferRequestsQueue::getIdleStream() {
-    int value;
-    std::promise<int> idleStreamPromise;
-    std::future<int> idleStreamFuture = idleStreamPromise.get_future();
-    std::unique_lock<std::mutex> lk(front_mut);
-    if (streams[front_idx] < 0) {  // we need to wait for any idle stream to be returned
-        std::unique_lock<std::mutex> queueLock(queue_mutex);
-        promises.push(std::move(idleStreamPromise));
-    } else {  // we can give idle stream right away
-        value = streams[front_idx];
-        streams[front_idx] = -1;  // negative value indicate consumed vector index
-        front_idx = (front_idx + 1) % streams.size();
-        lk.unlock();
-        idleStreamPromise.set_value(value);
+static std::uint64_t roundUpToPowerOfTwo(std::uint64_t value) {
+    std::uint64_t result = 1;
+    while (result < value) {
+        result <<= 1;
+    }
+    return result;
+}
+
+IdleStreamQueue::IdleStreamQueue(int streamsLength) :
+    cells(new Cell[roundUpToPowerOfTwo(streamsLength)]),
+    cellsMask(roundUpToPowerOfTwo(streamsLength) - 1),
+    available(0) {
+    for (std::uint64_t i = 0; i <= cellsMask; ++i) {
+        cells[i].sequence.store(i, std::memory_order_relaxed);
+    }
+    for (int i = 0; i < streamsLength; ++i) {
+        push(i);
+    }
+    available.store(streamsLength, std::memory_order_release);
+}
+
+// Bounded MPMC ring buffer push, it never finds the buffer full since it holds at most streamsLength ids
+void IdleStreamQueue::push(int streamID) {
+    std::uint64_t position = enqueuePosition.load(std::memory_order_relaxed);
+    while (true) {
+        Cell& cell = cells[position & cellsMask];
+        std::uint64_t sequence = cell.sequence.load(std::memory_order_acquire);
+        if (sequence == position) {
+            if (enqueuePosition.compare_exchange_weak(position, position + 1, std::memory_order_relaxed)) {
+                cell.streamId = streamID;
+                cell.sequence.store(position + 1, std::memory_order_release);
+                return;
+            }
+        } else if (sequence < position) {
+            // Cell is still being read by pop of the previous lap
+            std::this_thread::yield();
+            position = enqueuePosition.load(std::memory_order_relaxed);
+        } else {
+            position = enqueuePosition.load(std::memory_order_relaxed);
+        }
+    }
+}
+
+// Caller has to reserve an id by decrementing available counter first, so pop never finds the buffer empty.
+// It may only wait for a few instructions until concurrent push publishes the reserved id.
+int IdleStreamQueue::pop() {
+    std::uint64_t position = dequeuePosition.load(std::memory_order_relaxed);
+    while (true) {
+        Cell& cell = cells[position & cellsMask];
+        std::uint64_t sequence = cell.sequence.load(std::memory_order_acquire);
+        if (sequence == position + 1) {
+            if (dequeuePosition.compare_exchange_weak(position, position + 1, std::memory_order_relaxed)) {
+                int streamID = cell.streamId;
+                cell.sequence.store(position + cellsMask + 1, std::memory_order_release);
+                return streamID;
+            }
+        } else if (sequence < position + 1) {
+            std::this_thread::yield();
+            position = dequeuePosition.load(std::memory_order_relaxed);
+        } else {
+            position = dequeuePosition.load(std::memory_order_relaxed);
+        }
+    }
+}
+
+std::optional<int> IdleStreamQueue::tryGetIdleStream() {
+    std::int64_t current = available.load(std::memory_order_acquire);
+    while (current > 0) {
+        if (available.compare_exchange_weak(current, current - 1, std::memory_order_acq_rel)) {
+            return pop();
+        }
     }
-    return std::move(idleStreamFuture);
+    return std::nullopt;
 }
 
-void OVInferRequestsQueue::returnStream(int streamID) {
-    std::unique_lock<std::mutex> lk(queue_mutex);
-    if (promises.size()) {
-        std::promise<int> promise = std::move(promises.front());
-        promises.pop();
+void IdleStreamQueue::enqueueWaiter(std::promise<int> promise, std::shared_ptr<StreamAssignedNotification> notification) {
+    std::unique_lock<std::mutex> lk(waitersMutex);
+    if (handedOffStreams.size()) {
+        // Stream was returned between reserving place in line and taking the lock
+        int streamID = handedOffStreams.front();
+        handedOffStreams.pop();
         lk.unlock();
         promise.set_value(streamID);
+        if (notification) {
+            notification->notify();
+        }
+        return;
+    }
+    waiters.emplace(std::move(promise), std::move(notification));
+}
+
+int IdleStreamQueue::waitForIdleStream() {
+    if (available.fetch_sub(1, std::memory_order_acq_rel) > 0) {
+        return pop();
+    }
+    std::promise<int> idleStreamPromise;
+    std::future<int> idleStreamFuture = idleStreamPromise.get_future();
+    enqueueWaiter(std::move(idleStreamPromise), nullptr);
+    return idleStreamFuture.get();
+}
+
+std::future<int> IdleStreamQueue::getIdleStream(std::shared_ptr<StreamAssignedNotification> notification) {
+    std::promise<int> idleStreamPromise;
+    std::future<int> idleStreamFuture = idleStreamPromise.get_future();
+    if (available.fetch_sub(1, std::memory_order_acq_rel) > 0) {  // we can give idle stream right away
+        idleStreamPromise.set_value(pop());
+        if (notification) {
+            notification->notify();
+        }
+    } else {  // we need to wait for any idle stream to be returned
+        enqueueWaiter(std::move(idleStreamPromise), std::move(notification));
+    }
+    return idleStreamFuture;
+}
+
+void IdleStreamQueue::returnStream(int streamID) {
+    if (available.fetch_add(1, std::memory_order_acq_rel) >= 0) {
+        push(streamID);
+        return;
+    }
+    // Someone is waiting, stream is handed over directly to the oldest waiter
+    std::unique_lock<std::mutex> lk(waitersMutex);
+    if (waiters.empty()) {
+        handedOffStreams.push(streamID);
         return;
     }
-    std::uint32_t old_back = back_idx.load();
-    while (!back_idx.compare_exchange_weak(
-        old_back,
-        (old_back + 1) % streams.size(),
-        std::memory_order_relaxed)) {
+    auto [promise, notification] = std::move(waiters.front());
+    waiters.pop();
+    lk.unlock();
+    promise.set_value(streamID);
+    if (notification) {
+        notification->notify();
     }
-    streams[old_back] = streamID;
 }
 
 }  // namespace ovms
@@ -17,11 +17,15 @@
 
 #include <atomic>
 #include <condition_variable>
+#include <cstdint>
+#include <functional>
 #include <future>
 #include <memory>
 #include <mutex>
+#include <optional>
 #include <queue>
 #include <thread>
+#include <utility>
 #include <vector>
 
 #include <inference_engine.hpp>
@@ -29,29 +33,128 @@
 
 namespace ovms {
 /**
-* @brief Class representing circular buffer for managing IE streams
+* @brief Notifies a waiter of getIdleStream when stream id is assigned to it
 */
-class OVInferRequestsQueue {
+class StreamAssignedNotification {
 public:
+    /**
+    * @brief Registers callback called once stream id is assigned
+    *
+    * @return false if stream id was assigned already, callback is not registered then
+    */
+    bool subscribe(std::function<void()> callback) {
+        std::lock_guard<std::mutex> lock(mtx);
+        if (assigned) {
+            return false;
+        }
+        this->callback = std::move(callback);
+        return true;
+    }
+
+    /**
+    * @brief Removes registered callback, waits for the callback if it is being called
+    */
+    void unsubscribe() {
+        std::lock_guard<std::mutex> lock(mtx);
+        callback = nullptr;
+    }
+
+    void notify() {
+        std::lock_guard<std::mutex> lock(mtx);
+        assigned = true;
+        if (callback) {
+            auto toCall = std::move(callback);
+            callback = nullptr;
+            toCall();
+        }
+    }
+
+private:
+    std::mutex mtx;
+    std::function<void()> callback;
+    bool assigned = false;
+};
+
+/**
+* @brief Pool of idle stream ids
+*
+* Idle ids are kept in a lock-free bounded ring buffer. Getting a stream when one is idle only touches atomics,
+* callers have to wait only when all streams are in use. Waiters are served in FIFO order and streams returned
+* while anyone waits are handed directly to the oldest waiter, so new callers cannot overtake those already waiting.
+*/
+class IdleStreamQueue {
+public:
+    IdleStreamQueue(int streamsLength);
+
+    /**
+    * @brief Gets idle stream without waiting
+    *
+    * @return stream id or std::nullopt when there is no idle stream or other callers are already waiting for one
+    */
+    std::optional<int> tryGetIdleStream();
+
+    /**
+    * @brief Gets idle stream, blocks until one is returned if all are in use
+    */
+    int waitForIdleStream();
+
     /**
     * @brief Allocating idle stream for execution
+    *
+    * @param notification optional notification triggered when the stream id is assigned
     */
-    std::future<int> getIdleStream();
+    std::future<int> getIdleStream(std::shared_ptr<StreamAssignedNotification> notification = nullptr);
 
     /**
     * @brief Release stream after execution
     */
     void returnStream(int streamID);
 
+protected:
+    struct alignas(64) Cell {
+        std::atomic<std::uint64_t> sequence;
+        int streamId;
+    };
+
+    /**
+    * @brief Ring buffer of idle stream ids, size is a power of two not smaller than number of streams
+    */
+    std::unique_ptr<Cell[]> cells;
+    const std::uint64_t cellsMask;
+    alignas(64) std::atomic<std::uint64_t> enqueuePosition{0};
+    alignas(64) std::atomic<std::uint64_t> dequeuePosition{0};
+
+    /**
+    * @brief Number of idle streams in the ring buffer minus number of waiting callers
+    *
+    * Positive value reserves a stream in the ring buffer, non positive value means caller has to wait.
+    */
+    alignas(64) std::atomic<std::int64_t> available;
+
+    std::mutex waitersMutex;
+    std::queue<std::pair<std::promise<int>, std::shared_ptr<StreamAssignedNotification>>> waiters;
+
+    /**
+    * @brief Streams returned for callers which already reserved a place in line, but did not enqueue a promise yet
+    */
+    std::queue<int> handedOffStreams;
+
+    void push(int streamID);
+    int pop();
+    void enqueueWaiter(std::promise<int> promise, std::shared_ptr<StreamAssignedNotification> notification);
+};
+
+/**
+* @brief Class managing IE infer requests, each stream id owns one infer request
+*/
+class OVInferRequestsQueue : public IdleStreamQueue {
+public:
     /**
     * @brief Constructor with initialization
     */
     OVInferRequestsQueue(InferenceEngine::ExecutableNetwork& network, int streamsLength) :
-        streams(streamsLength),
-        front_idx{0},
-        back_idx{0} {
+        IdleStreamQueue(streamsLength) {
         for (int i = 0; i < streamsLength; ++i) {
-            streams[i] = i;
             inferRequests.push_back(network.CreateInferRequest());
         }
     }
@@ -63,31 +166,11 @@ public:
         return inferRequests[streamID];
     }
 
-protected:
-    /**
-    * @brief Vector representing circular buffer for infer queue
-    */
-    std::vector<int> streams;
-
-    /**
-    * @brief Index of the front of the idle streams list
-    */
-    std::uint32_t front_idx;
-
-    /**
-    * @brief Index of the back of the idle streams list
-    */
-    std::atomic<std::uint32_t> back_idx;
+    size_t getInferRequestsCount() const {
+        return inferRequests.size();
+    }
 
-    /**
-    * @brief Vector representing OV streams and used for notification about completed inference operations
-    */
-    std::mutex front_mut;
-    std::mutex queue_mutex;
-    /**
-     * 
-     */
+protected:
     std::vector<InferenceEngine::InferRequest> inferRequests;
-    std::queue<std::promise<int>> promises;
 };
 }  // namespace ovms
@@ -98,108 +98,84 @@ Status Pipeline::execute() {
         return status;
     }
     std::vector<std::pair<std::reference_wrapper<Node>, session_key_t>> deferredNodeSessions;
-    const uint WAIT_FOR_FINISHED_NODE_TIMEOUT_MICROSECONDS = 5000;
-    const uint WAIT_FOR_DEFERRED_NODE_DISARM_TIMEOUT_MICROSECONDS = 500;
-    // process finished session nodes and if no one is finished check if any node session with deferred execution
-    // has necessary resources already
+    const uint WAIT_FOR_PIPELINE_EVENT_TIMEOUT_MICROSECONDS = 1000000;
+    // Queue receives messages about finished node sessions and about deferred node sessions
+    // which got stream id assigned and are ready for execution
     while (true) {
-        spdlog::trace("Pipeline: {} waiting for message that node finished.", getName());
-        auto optionallyFinishedNode = finishedNodeQueue.tryPull(WAIT_FOR_FINISHED_NODE_TIMEOUT_MICROSECONDS);
-        if (optionallyFinishedNode) {
-            auto& [finishedNodeRef, sessionKey] = optionallyFinishedNode.value();
-            Node& finishedNode = finishedNodeRef.get();
-            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Pipeline: {} got message that node: {} session: {} finished.", getName(), finishedNode.getName(), sessionKey);
-            finishedSessions.emplace(finishedNode.getName() + sessionKey);
+        spdlog::trace("Pipeline: {} waiting for message that node finished or deferred node is ready.", getName());
+        auto optionallyFinishedNode = finishedNodeQueue.tryPull(WAIT_FOR_PIPELINE_EVENT_TIMEOUT_MICROSECONDS);
+        if (!optionallyFinishedNode) {
+            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Pipeline: {} still waiting for {} node sessions, {} deferred",
+                getName(), startedSessions.size() - finishedSessions.size(), deferredNodeSessions.size());
+            continue;
+        }
+        auto& [finishedNodeRef, sessionKey] = optionallyFinishedNode.value();
+        Node& finishedNode = finishedNodeRef.get();
+        auto deferredIt = std::find_if(deferredNodeSessions.begin(), deferredNodeSessions.end(),
+            [&finishedNode, &sessionKey = sessionKey](const auto& deferred) {
+                return &deferred.first.get() == &finishedNode && deferred.second == sessionKey;
+            });
+        if (deferredIt != deferredNodeSessions.end()) {
+            deferredNodeSessions.erase(deferredIt);
             if (!firstErrorStatus.ok()) {
-                finishedNode.release(sessionKey);
-            }
-            IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
-            BlobMap finishedNodeOutputBlobMap;
-            SessionResults sessionResults;
-            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Fetching results of pipeline: {} node: {} session: {}", getName(), finishedNode.getName(), sessionKey);
-            status = finishedNode.fetchResults(sessionKey, sessionResults);
-            CHECK_AND_LOG_ERROR(finishedNode)
-            IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
-            auto& nextNodesFromFinished = finishedNode.getNextNodes();
-            for (auto& nextNode : nextNodesFromFinished) {
-                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "setting pipeline: {} node: {} session: {} outputs as inputs for node: {}",
-                    getName(), finishedNode.getName(), sessionKey, nextNode.get().getName());
-                status = nextNode.get().setInputs(finishedNode, sessionResults);
-                CHECK_AND_LOG_ERROR(nextNode.get())
-                if (!firstErrorStatus.ok()) {
-                    break;
-                }
-            }
-            finishedNodeOutputBlobMap.clear();
-            for (auto& nextNode : nextNodesFromFinished) {
-                auto readySessions = nextNode.get().getReadySessions();
-                for (auto sessionKey : readySessions) {
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Started execution of pipeline: {} node: {} session: {}", getName(), nextNode.get().getName(), sessionKey);
-                    startedSessions.emplace(nextNode.get().getName() + sessionKey);
-                    status = nextNode.get().execute(sessionKey, finishedNodeQueue);
-                    if (status == StatusCode::PIPELINE_STREAM_ID_NOT_READY_YET) {
-                        SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Node: {} session: {} not ready for execution yet", nextNode.get().getName(), sessionKey);
-                        deferredNodeSessions.emplace_back(nextNode.get(), sessionKey);
-                        status = StatusCode::OK;
-                    }
-                    CHECK_AND_LOG_ERROR(nextNode.get())
-                    if (!firstErrorStatus.ok()) {
-                        break;
-                    }
-                }
+                // Stream id is already assigned so disarm does not wait
+                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Disarming stream id guard of node: {} session: {} due to previous error in pipeline", finishedNode.getName(), sessionKey);
+                finishedNode.tryDisarm(sessionKey);
+                finishedSessions.emplace(finishedNode.getName() + sessionKey);
+                IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
             }
-            if (startedSessions.size() == finishedSessions.size()) {
-                break;
+            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Node: {} session: {} is ready", finishedNode.getName(), sessionKey);
+            status = finishedNode.execute(sessionKey, finishedNodeQueue);
+            if (status == StatusCode::PIPELINE_STREAM_ID_NOT_READY_YET) {
+                deferredNodeSessions.emplace_back(finishedNode, sessionKey);
+                status = StatusCode::OK;
             }
-        } else {
-            // If error occurred earlier, disarm stream id guards of all deferred nodes and exit
+            CHECK_AND_LOG_ERROR(finishedNode)
+            continue;
+        }
+        SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Pipeline: {} got message that node: {} session: {} finished.", getName(), finishedNode.getName(), sessionKey);
+        finishedSessions.emplace(finishedNode.getName() + sessionKey);
+        if (!firstErrorStatus.ok()) {
+            finishedNode.release(sessionKey);
+        }
+        IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
+        BlobMap finishedNodeOutputBlobMap;
+        SessionResults sessionResults;
+        SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Fetching results of pipeline: {} node: {} session: {}", getName(), finishedNode.getName(), sessionKey);
+        status = finishedNode.fetchResults(sessionKey, sessionResults);
+        CHECK_AND_LOG_ERROR(finishedNode)
+        IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
+        auto& nextNodesFromFinished = finishedNode.getNextNodes();
+        for (auto& nextNode : nextNodesFromFinished) {
+            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "setting pipeline: {} node: {} session: {} outputs as inputs for node: {}",
+                getName(), finishedNode.getName(), sessionKey, nextNode.get().getName());
+            status = nextNode.get().setInputs(finishedNode, sessionResults);
+            CHECK_AND_LOG_ERROR(nextNode.get())
             if (!firstErrorStatus.ok()) {
-                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Will try to disarm all stream id guards of all {} deferred node sessions due to previous error in pipeline", deferredNodeSessions.size());
-                if (deferredNodeSessions.size() > 0) {
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Trying to disarm {} remaining deferred node sessions ...", deferredNodeSessions.size());
-                    for (auto it = deferredNodeSessions.begin(); it != deferredNodeSessions.end();) {
-                        auto& [nodeRef, sessionKey] = *it;
-                        auto& node = nodeRef.get();
-                        if (node.tryDisarm(sessionKey, WAIT_FOR_DEFERRED_NODE_DISARM_TIMEOUT_MICROSECONDS)) {
-                            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Stream id guard disarm of node {} session: {} has succeeded", node.getName(), sessionKey);
-                            finishedSessions.emplace(node.getName() + sessionKey);
-                            it = deferredNodeSessions.erase(it);
-                        } else {
-                            SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Cannot disarm stream id guard of node: {}, session: {} yet, will try again later", node.getName(), sessionKey);
-                            it++;
-                        }
-                    }
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Disarming iteration completed, remaining deferred node sessions count: {}", deferredNodeSessions.size());
-                }
-                // Check for deferred node queue size again to indicate if all nodes got freed
-                if (deferredNodeSessions.size() > 0) {
-                    continue;
-                } else {
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Disarming all stream id guards of deferred nodes completed, pipeline will shut down");
-                    IF_ERROR_OCCURRED_EARLIER_THEN_BREAK_IF_ALL_STARTED_FINISHED_CONTINUE_OTHERWISE
-                }
+                break;
             }
-            // else scope could be executed always however it seems most reasonable at the time to
-            // free blocked inferRequests from exeuction first rather than free models for reloading
-            for (auto it = deferredNodeSessions.begin(); it != deferredNodeSessions.end();) {
-                auto& [nodeRef, sessionKey] = *it;
-                auto& node = nodeRef.get();
-                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Trying to trigger node: {} session: {} execution", node.getName(), sessionKey);
-                status = node.execute(sessionKey, finishedNodeQueue);
-                if (status.ok()) {
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Node: {} session: {} is ready", node.getName(), sessionKey);
-                    it = deferredNodeSessions.erase(it);
-                    continue;
-                }
-                it++;
+        }
+        finishedNodeOutputBlobMap.clear();
+        for (auto& nextNode : nextNodesFromFinished) {
+            auto readySessions = nextNode.get().getReadySessions();
+            for (auto sessionKey : readySessions) {
+                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Started execution of pipeline: {} node: {} session: {}", getName(), nextNode.get().getName(), sessionKey);
+                startedSessions.emplace(nextNode.get().getName() + sessionKey);
+                status = nextNode.get().execute(sessionKey, finishedNodeQueue);
                 if (status == StatusCode::PIPELINE_STREAM_ID_NOT_READY_YET) {
-                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Node: {} session: {} not ready for execution yet", node.getName(), sessionKey);
+                    SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Node: {} session: {} not ready for execution yet", nextNode.get().getName(), sessionKey);
+                    deferredNodeSessions.emplace_back(nextNode.get(), sessionKey);
                     status = StatusCode::OK;
-                } else {
-                    CHECK_AND_LOG_ERROR(node)
+                }
+                CHECK_AND_LOG_ERROR(nextNode.get())
+                if (!firstErrorStatus.ok()) {
+                    break;
                 }
             }
         }
+        if (startedSessions.size() == finishedSessions.size()) {
+            break;
+        }
     }
     return firstErrorStatus;
 }
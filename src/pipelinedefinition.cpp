@@ -166,6 +166,18 @@ Status PipelineDefinition::create(std::unique_ptr<Pipeline>& pipeline,
         return status;
     }
 
+    std::set<std::string> outputFilter;
+    if (request != nullptr && request->output_filter_size() > 0) {
+        const auto outputsInfo = getOutputsInfo();
+        for (const auto& name : request->output_filter()) {
+            if (outputsInfo.count(name) == 0) {
+                SPDLOG_LOGGER_DEBUG(dag_executor_logger, "Requested pipeline: {} does not have output: {}", getName(), name);
+                return Status(StatusCode::INVALID_MISSING_OUTPUT, "Requested output: " + name);
+            }
+            outputFilter.insert(name);
+        }
+    }
+
     std::unordered_map<std::string, std::unique_ptr<Node>> nodes;
     EntryNode* entry = nullptr;
     ExitNode* exit = nullptr;
@@ -200,7 +212,7 @@ Status PipelineDefinition::create(std::unique_ptr<Pipeline>& pipeline,
                                              info.gatherFromNode));
             break;
         case NodeKind::EXIT: {
-            auto node = std::make_unique<ExitNode>(response, info.gatherFromNode);
+            auto node = std::make_unique<ExitNode>(response, info.gatherFromNode, outputFilter);
             exit = node.get();
             nodes.emplace(info.nodeName, std::move(node));
             break;
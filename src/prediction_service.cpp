@@ -29,6 +29,7 @@
 #pragma GCC diagnostic pop
 
 #include "get_model_metadata_impl.hpp"
+#include "metrics.hpp"
 #include "modelinstanceunloadguard.hpp"
 #include "modelmanager.hpp"
 #include "ovinferrequestsqueue.hpp"
@@ -66,6 +67,8 @@ grpc::Status ovms::PredictionServiceImpl::Predict(
     ServerContext* context,
     const PredictRequest* request,
     PredictResponse* response) {
+    static RequestMetrics grpcRequestMetrics("grpc");
+    RequestMetricsGuard requestMetrics(grpcRequestMetrics);
     Timer timer;
     timer.start("total");
     using std::chrono::microseconds;
@@ -85,6 +88,7 @@ grpc::Status ovms::PredictionServiceImpl::Predict(
     }
     if (!status.ok()) {
         SPDLOG_INFO("Getting modelInstance or pipeline failed. {}", status.string());
+        requestMetrics.setStatus(status);
         return status.grpc();
     }
 
@@ -95,6 +99,7 @@ grpc::Status ovms::PredictionServiceImpl::Predict(
     }
 
     if (!status.ok()) {
+        requestMetrics.setStatus(status);
         return status.grpc();
     }
 
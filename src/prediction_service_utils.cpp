@@ -15,6 +15,7 @@
 //*****************************************************************************
 #include "prediction_service_utils.hpp"
 
+#include <algorithm>
 #include <map>
 
 #include "deserialization.hpp"
@@ -54,4 +55,8 @@ std::map<std::string, shape_t> getRequestShapes(const tensorflow::serving::Predi
     return requestShapes;
 }
 
+bool isOutputRequested(const google::protobuf::RepeatedPtrField<std::string>& outputFilter, const std::string& name) {
+    return outputFilter.empty() || std::find(outputFilter.begin(), outputFilter.end(), name) != outputFilter.end();
+}
+
 }  // namespace ovms
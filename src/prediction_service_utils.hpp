@@ -31,4 +31,9 @@ namespace ovms {
 size_t getRequestBatchSize(const tensorflow::serving::PredictRequest* request);
 std::map<std::string, shape_t> getRequestShapes(const tensorflow::serving::PredictRequest* request);
 
+/**
+ * @brief Checks if output is selected by request output_filter, empty filter selects all outputs
+ */
+bool isOutputRequested(const google::protobuf::RepeatedPtrField<std::string>& outputFilter, const std::string& name);
+
 }  // namespace ovms
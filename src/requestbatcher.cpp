@@ -0,0 +1,252 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "requestbatcher.hpp"
+
+#include <algorithm>
+#include <set>
+#include <string>
+#include <utility>
+
+#include <spdlog/spdlog.h>
+
+#include "prediction_service_utils.hpp"
+
+namespace ovms {
+
+size_t RequestBatcher::getRequestBatchSize(const tensorflow::serving::PredictRequest& request) {
+    if (request.inputs().empty()) {
+        return 0;
+    }
+    const auto& tensor = request.inputs().begin()->second;
+    if (tensor.dtype() == tensorflow::DataType::DT_STRING) {
+        return tensor.string_val_size();
+    }
+    if (tensor.tensor_shape().dim_size() == 0) {
+        return 0;
+    }
+    return tensor.tensor_shape().dim(0).size();
+}
+
+Status RequestBatcher::mergeRequests(const std::vector<const tensorflow::serving::PredictRequest*>& requests,
+    size_t batchSize,
+    tensorflow::serving::PredictRequest& merged) {
+    merged.Clear();
+    if (requests.empty()) {
+        return StatusCode::OK;
+    }
+    const auto& first = *requests.front();
+    *merged.mutable_model_spec() = first.model_spec();
+    bool allOutputsRequested = false;
+    std::set<std::string> outputFilter;
+    for (const auto* request : requests) {
+        if (request->output_filter_size() == 0) {
+            allOutputsRequested = true;
+            break;
+        }
+        outputFilter.insert(request->output_filter().begin(), request->output_filter().end());
+    }
+    if (!allOutputsRequested) {
+        for (const auto& name : outputFilter) {
+            merged.add_output_filter(name);
+        }
+    }
+    for (const auto& [name, firstInput] : first.inputs()) {
+        auto& mergedInput = (*merged.mutable_inputs())[name];
+        mergedInput.set_dtype(firstInput.dtype());
+        *mergedInput.mutable_tensor_shape() = firstInput.tensor_shape();
+        if (mergedInput.tensor_shape().dim_size() > 0) {
+            mergedInput.mutable_tensor_shape()->mutable_dim(0)->set_size(batchSize);
+        }
+
+        size_t rowBytes = 0;
+        size_t rowValues = 0;
+        size_t filledRows = 0;
+        for (const auto* request : requests) {
+            auto it = request->inputs().find(name);
+            if (it == request->inputs().end()) {
+                return Status(StatusCode::INTERNAL_ERROR, "Batched requests have different inputs");
+            }
+            const auto& input = it->second;
+            size_t rows = firstInput.dtype() == tensorflow::DataType::DT_STRING ? input.string_val_size() : input.tensor_shape().dim(0).size();
+            if (rows == 0) {
+                continue;
+            }
+            filledRows += rows;
+            if (input.dtype() == tensorflow::DataType::DT_STRING) {
+                mergedInput.mutable_string_val()->MergeFrom(input.string_val());
+            } else if (!input.tensor_content().empty()) {
+                rowBytes = input.tensor_content().size() / rows;
+                mergedInput.mutable_tensor_content()->append(input.tensor_content());
+            } else if (input.half_val_size() > 0) {
+                rowValues = input.half_val_size() / rows;
+                mergedInput.mutable_half_val()->MergeFrom(input.half_val());
+            } else {
+                rowValues = input.int_val_size() / rows;
+                mergedInput.mutable_int_val()->MergeFrom(input.int_val());
+            }
+        }
+        if (filledRows > batchSize) {
+            return Status(StatusCode::INVALID_BATCH_SIZE, "Batched requests exceed maximum batch size");
+        }
+        size_t paddingRows = batchSize - filledRows;
+        if (paddingRows == 0) {
+            continue;
+        }
+        // Padding is never returned to clients, binary inputs repeat the last image so that it can still be decoded
+        if (firstInput.dtype() == tensorflow::DataType::DT_STRING) {
+            if (mergedInput.string_val_size() > 0) {
+                auto last = mergedInput.string_val(mergedInput.string_val_size() - 1);
+                for (size_t i = 0; i < paddingRows; i++) {
+                    mergedInput.add_string_val(last);
+                }
+            }
+        } else if (rowBytes > 0) {
+            mergedInput.mutable_tensor_content()->append(paddingRows * rowBytes, '\0');
+        } else if (mergedInput.half_val_size() > 0) {
+            mergedInput.mutable_half_val()->Resize(mergedInput.half_val_size() + paddingRows * rowValues, 0);
+        } else {
+            mergedInput.mutable_int_val()->Resize(mergedInput.int_val_size() + paddingRows * rowValues, 0);
+        }
+    }
+    return StatusCode::OK;
+}
+
+Status RequestBatcher::splitResponse(const tensorflow::serving::PredictResponse& merged,
+    const std::vector<const tensorflow::serving::PredictRequest*>& requests,
+    const std::vector<size_t>& batchSizes,
+    const std::vector<tensorflow::serving::PredictResponse*>& responses) {
+    size_t filledRows = 0;
+    for (auto rows : batchSizes) {
+        filledRows += rows;
+    }
+    for (const auto& [name, output] : merged.outputs()) {
+        if (output.tensor_shape().dim_size() == 0 ||
+            static_cast<size_t>(output.tensor_shape().dim(0).size()) < filledRows ||
+            output.tensor_shape().dim(0).size() == 0) {
+            SPDLOG_DEBUG("Output {} first dimension does not represent batch size and cannot be split", name);
+            return Status(StatusCode::INTERNAL_ERROR, "Output of batched inference cannot be split along batch dimension");
+        }
+        size_t rowBytes = output.tensor_content().size() / output.tensor_shape().dim(0).size();
+        size_t offset = 0;
+        for (size_t i = 0; i < responses.size(); i++) {
+            if (!isOutputRequested(requests[i]->output_filter(), name)) {
+                offset += batchSizes[i];
+                continue;
+            }
+            auto& part = (*responses[i]->mutable_outputs())[name];
+            part.Clear();
+            part.set_dtype(output.dtype());
+            *part.mutable_tensor_shape() = output.tensor_shape();
+            part.mutable_tensor_shape()->mutable_dim(0)->set_size(batchSizes[i]);
+            part.mutable_tensor_content()->assign(output.tensor_content(), offset * rowBytes, batchSizes[i] * rowBytes);
+            offset += batchSizes[i];
+        }
+    }
+    return StatusCode::OK;
+}
+
+void RequestBatcher::executeBatch(Batch& batch) {
+    auto start = std::chrono::steady_clock::now();
+    std::vector<const tensorflow::serving::PredictRequest*> requests;
+    std::vector<tensorflow::serving::PredictResponse*> responses;
+    std::vector<size_t> batchSizes;
+    uint64_t queueTimeUsSum = 0;
+    uint64_t queueTimeUsMax = 0;
+    for (const auto& task : batch.tasks) {
+        requests.push_back(task.request);
+        responses.push_back(task.response);
+        batchSizes.push_back(task.batchSize);
+        uint64_t queueTimeUs = std::chrono::duration_cast<std::chrono::microseconds>(start - task.enqueued).count();
+        queueTimeUsSum += queueTimeUs;
+        queueTimeUsMax = std::max(queueTimeUsMax, queueTimeUs);
+        queueTimeMetric.observe(queueTimeUs);
+    }
+    batchesMetric.increment();
+    filledSlotsMetric.increment(batch.filledSlots);
+    slotsMetric.increment(maxBatchSize);
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        metrics.batchesCount++;
+        metrics.requestsCount += batch.tasks.size();
+        metrics.filledSlotsCount += batch.filledSlots;
+        metrics.queueTimeUsSum += queueTimeUsSum;
+        metrics.queueTimeUsMax = std::max(metrics.queueTimeUsMax, queueTimeUsMax);
+    }
+    SPDLOG_DEBUG("Model {} version {} executing batch of {} requests; filled {}/{} slots; max queue time: {} us",
+        modelName, modelVersion, batch.tasks.size(), batch.filledSlots, maxBatchSize, queueTimeUsMax);
+
+    tensorflow::serving::PredictRequest mergedRequest;
+    tensorflow::serving::PredictResponse mergedResponse;
+    batch.status = mergeRequests(requests, maxBatchSize, mergedRequest);
+    if (!batch.status.ok()) {
+        return;
+    }
+    batch.status = executor(mergedRequest, mergedResponse);
+    if (!batch.status.ok()) {
+        return;
+    }
+    batch.status = splitResponse(mergedResponse, requests, batchSizes, responses);
+}
+
+Status RequestBatcher::infer(const tensorflow::serving::PredictRequest& request, tensorflow::serving::PredictResponse& response) {
+    size_t batchSize = getRequestBatchSize(request);
+    if (batchSize == 0 || batchSize > maxBatchSize) {
+        return Status(StatusCode::INVALID_BATCH_SIZE, "Expected batch size between 1 and " + std::to_string(maxBatchSize));
+    }
+    std::unique_lock<std::mutex> lock(mtx);
+    if (openBatch && openBatch->filledSlots + batchSize > maxBatchSize) {
+        // Request does not fit, current batch is executed right away and a new one is opened
+        openBatch->closed = true;
+        openBatch->cv.notify_all();
+        openBatch.reset();
+    }
+    bool isLeader = !openBatch;
+    if (isLeader) {
+        openBatch = std::make_shared<Batch>();
+    }
+    auto batch = openBatch;
+    batch->tasks.push_back(Task{&request, &response, batchSize, std::chrono::steady_clock::now()});
+    batch->filledSlots += batchSize;
+
+    if (!isLeader) {
+        if (batch->filledSlots == maxBatchSize) {
+            batch->cv.notify_all();
+        }
+        batch->cv.wait(lock, [&batch]() { return batch->done; });
+        return batch->status;
+    }
+
+    auto deadline = batch->tasks.front().enqueued + batchTimeout;
+    batch->cv.wait_until(lock, deadline, [this, &batch]() { return batch->closed || batch->filledSlots == maxBatchSize; });
+    batch->closed = true;
+    if (openBatch == batch) {
+        openBatch.reset();
+    }
+    lock.unlock();
+
+    executeBatch(*batch);
+
+    lock.lock();
+    batch->done = true;
+    batch->cv.notify_all();
+    return batch->status;
+}
+
+RequestBatcherMetrics RequestBatcher::getMetrics() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return metrics;
+}
+}  // namespace ovms
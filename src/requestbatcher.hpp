@@ -0,0 +1,148 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wall"
+#include "tensorflow_serving/apis/prediction_service.grpc.pb.h"
+#pragma GCC diagnostic pop
+
+#include "metrics.hpp"
+#include "modelversion.hpp"
+#include "status.hpp"
+
+namespace ovms {
+
+using batch_executor_t = std::function<Status(const tensorflow::serving::PredictRequest&, tensorflow::serving::PredictResponse&)>;
+
+/**
+ * @brief Snapshot of request batcher counters
+ */
+struct RequestBatcherMetrics {
+    size_t maxBatchSize = 0;
+    uint64_t batchesCount = 0;
+    uint64_t requestsCount = 0;
+    uint64_t filledSlotsCount = 0;
+    uint64_t queueTimeUsSum = 0;
+    uint64_t queueTimeUsMax = 0;
+
+    double averageBatchFill() const {
+        return batchesCount ? static_cast<double>(filledSlotsCount) / (batchesCount * maxBatchSize) : 0.0;
+    }
+
+    double averageQueueTimeUs() const {
+        return requestsCount ? static_cast<double>(queueTimeUsSum) / requestsCount : 0.0;
+    }
+};
+
+/**
+ * @brief Coalesces concurrent predict requests of one model into a single inference
+ *
+ * Requests are gathered along the batch dimension until maxBatchSize slots are filled or batchTimeout
+ * passes since the first request of the batch arrived. The thread which opened the batch executes it,
+ * the others wait for their part of the outputs. Unused slots are padded.
+ */
+class RequestBatcher {
+    struct Task {
+        const tensorflow::serving::PredictRequest* request;
+        tensorflow::serving::PredictResponse* response;
+        size_t batchSize;
+        std::chrono::steady_clock::time_point enqueued;
+    };
+
+    struct Batch {
+        std::vector<Task> tasks;
+        size_t filledSlots = 0;
+        bool closed = false;
+        bool done = false;
+        Status status = StatusCode::OK;
+        std::condition_variable cv;
+    };
+
+    const std::string modelName;
+    const model_version_t modelVersion;
+    const size_t maxBatchSize;
+    const std::chrono::microseconds batchTimeout;
+    batch_executor_t executor;
+
+    mutable std::mutex mtx;
+    std::shared_ptr<Batch> openBatch;
+    RequestBatcherMetrics metrics;
+
+    MetricCounter& batchesMetric;
+    MetricCounter& filledSlotsMetric;
+    MetricCounter& slotsMetric;
+    MetricHistogram& queueTimeMetric;
+
+    void executeBatch(Batch& batch);
+
+public:
+    RequestBatcher(const std::string& modelName, model_version_t modelVersion, size_t maxBatchSize, std::chrono::microseconds batchTimeout, batch_executor_t executor) :
+        modelName(modelName),
+        modelVersion(modelVersion),
+        maxBatchSize(maxBatchSize),
+        batchTimeout(batchTimeout),
+        executor(std::move(executor)),
+        batchesMetric(MetricRegistry::getInstance().counter("ovms_batches_total", "Number of batches executed by request batcher").labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+        filledSlotsMetric(MetricRegistry::getInstance().counter("ovms_batch_filled_slots_total", "Number of batch slots filled with requests").labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+        slotsMetric(MetricRegistry::getInstance().counter("ovms_batch_slots_total", "Number of batch slots executed including padding").labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+        queueTimeMetric(MetricRegistry::getInstance().histogram("ovms_batch_queue_time_microseconds", "Time requests wait for their batch to be executed").labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})) {
+        metrics.maxBatchSize = maxBatchSize;
+    }
+
+    size_t getMaxBatchSize() const { return maxBatchSize; }
+
+    /**
+     * @brief Runs request as part of a batch and fills response with its slice of the outputs
+     *
+     * Request has to be validated before, all its inputs have to share the batch dimension.
+     */
+    Status infer(const tensorflow::serving::PredictRequest& request, tensorflow::serving::PredictResponse& response);
+
+    RequestBatcherMetrics getMetrics() const;
+
+    static size_t getRequestBatchSize(const tensorflow::serving::PredictRequest& request);
+
+    /**
+     * @brief Concatenates inputs of requests along the first dimension and pads them to batchSize
+     *
+     * Merged output filter selects outputs requested by any of the requests.
+     */
+    static Status mergeRequests(const std::vector<const tensorflow::serving::PredictRequest*>& requests,
+        size_t batchSize,
+        tensorflow::serving::PredictRequest& merged);
+
+    /**
+     * @brief Splits outputs of merged response along the first dimension, batchSizes[i] rows go to responses[i]
+     *
+     * Response gets only outputs selected by output filter of its request.
+     */
+    static Status splitResponse(const tensorflow::serving::PredictResponse& merged,
+        const std::vector<const tensorflow::serving::PredictRequest*>& requests,
+        const std::vector<size_t>& batchSizes,
+        const std::vector<tensorflow::serving::PredictResponse*>& responses);
+};
+}  // namespace ovms
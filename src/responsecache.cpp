@@ -0,0 +1,258 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "responsecache.hpp"
+
+#include <algorithm>
+#include <cstring>
+#include <vector>
+
+#include <spdlog/spdlog.h>
+
+namespace ovms {
+
+namespace {
+
+inline uint64_t rotl64(uint64_t x, int8_t r) {
+    return (x << r) | (x >> (64 - r));
+}
+
+inline uint64_t fmix64(uint64_t k) {
+    k ^= k >> 33;
+    k *= 0xff51afd7ed558ccdULL;
+    k ^= k >> 33;
+    k *= 0xc4ceb9fe1a85ec53ULL;
+    k ^= k >> 33;
+    return k;
+}
+
+/**
+ * @brief MurmurHash3 x64 128 bit variant, the previous state is used as seed so consecutive buffers can be chained
+ */
+class InputsHasher {
+    ResponseCacheKey state;
+
+public:
+    void update(const void* data, size_t len) {
+        static constexpr uint64_t c1 = 0x87c37b91114253d5ULL;
+        static constexpr uint64_t c2 = 0x4cf5ad432745937fULL;
+        const uint8_t* bytes = static_cast<const uint8_t*>(data);
+        const size_t nblocks = len / 16;
+        uint64_t h1 = state.low;
+        uint64_t h2 = state.high;
+
+        for (size_t i = 0; i < nblocks; i++) {
+            uint64_t k1, k2;
+            std::memcpy(&k1, bytes + i * 16, sizeof(k1));
+            std::memcpy(&k2, bytes + i * 16 + 8, sizeof(k2));
+
+            k1 *= c1;
+            k1 = rotl64(k1, 31);
+            k1 *= c2;
+            h1 ^= k1;
+            h1 = rotl64(h1, 27);
+            h1 += h2;
+            h1 = h1 * 5 + 0x52dce729;
+
+            k2 *= c2;
+            k2 = rotl64(k2, 33);
+            k2 *= c1;
+            h2 ^= k2;
+            h2 = rotl64(h2, 31);
+            h2 += h1;
+            h2 = h2 * 5 + 0x38495ab5;
+        }
+
+        const uint8_t* tail = bytes + nblocks * 16;
+        uint64_t k1 = 0;
+        uint64_t k2 = 0;
+        const size_t tailLen = len & 15;
+        for (size_t i = tailLen; i > 8; i--) {
+            k2 ^= static_cast<uint64_t>(tail[i - 1]) << ((i - 9) * 8);
+        }
+        if (tailLen > 8) {
+            k2 *= c2;
+            k2 = rotl64(k2, 33);
+            k2 *= c1;
+            h2 ^= k2;
+        }
+        for (size_t i = std::min<size_t>(tailLen, 8); i > 0; i--) {
+            k1 ^= static_cast<uint64_t>(tail[i - 1]) << ((i - 1) * 8);
+        }
+        if (tailLen > 0) {
+            k1 *= c1;
+            k1 = rotl64(k1, 31);
+            k1 *= c2;
+            h1 ^= k1;
+        }
+
+        h1 ^= len;
+        h2 ^= len;
+        h1 += h2;
+        h2 += h1;
+        h1 = fmix64(h1);
+        h2 = fmix64(h2);
+        h1 += h2;
+        h2 += h1;
+        state.low = h1;
+        state.high = h2;
+    }
+
+    void update(const std::string& value) {
+        update(value.data(), value.size());
+    }
+
+    template <typename T>
+    void update(const google::protobuf::RepeatedField<T>& field) {
+        update(field.data(), field.size() * sizeof(T));
+    }
+
+    void update(const google::protobuf::RepeatedPtrField<std::string>& field) {
+        uint64_t count = field.size();
+        update(&count, sizeof(count));
+        for (const auto& value : field) {
+            update(value);
+        }
+    }
+
+    const ResponseCacheKey& getKey() const {
+        return state;
+    }
+};
+
+void hashTensor(InputsHasher& hasher, const tensorflow::TensorProto& tensor) {
+    int32_t dtype = tensor.dtype();
+    hasher.update(&dtype, sizeof(dtype));
+    std::vector<int64_t> shape;
+    shape.reserve(tensor.tensor_shape().dim_size());
+    for (const auto& dim : tensor.tensor_shape().dim()) {
+        shape.push_back(dim.size());
+    }
+    hasher.update(shape.data(), shape.size() * sizeof(int64_t));
+    hasher.update(tensor.tensor_content());
+    hasher.update(tensor.half_val());
+    hasher.update(tensor.float_val());
+    hasher.update(tensor.double_val());
+    hasher.update(tensor.int_val());
+    hasher.update(tensor.int64_val());
+    hasher.update(tensor.bool_val());
+    hasher.update(tensor.uint32_val());
+    hasher.update(tensor.uint64_val());
+    hasher.update(tensor.scomplex_val());
+    hasher.update(tensor.dcomplex_val());
+    hasher.update(tensor.string_val());
+}
+
+}  // namespace
+
+ResponseCache::ResponseCache(const std::string& modelName, model_version_t modelVersion, size_t capacityBytes) :
+    capacity(capacityBytes),
+    hitsMetric(MetricRegistry::getInstance()
+                   .counter("ovms_response_cache_hits_total", "Number of predict requests served from response cache")
+                   .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    missesMetric(MetricRegistry::getInstance()
+                     .counter("ovms_response_cache_misses_total", "Number of predict requests not found in response cache")
+                     .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    sizeMetric(MetricRegistry::getInstance()
+                   .gauge("ovms_response_cache_size_bytes", "Serialized size of responses stored in response cache")
+                   .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})) {}
+
+ResponseCache::~ResponseCache() {
+    sizeMetric.set(0);
+}
+
+ResponseCacheKey ResponseCache::computeKey(const tensorflow::serving::PredictRequest& request) {
+    std::vector<google::protobuf::Map<std::string, tensorflow::TensorProto>::const_iterator> inputs;
+    inputs.reserve(request.inputs_size());
+    for (auto it = request.inputs().begin(); it != request.inputs().end(); ++it) {
+        inputs.push_back(it);
+    }
+    std::sort(inputs.begin(), inputs.end(), [](const auto& lhs, const auto& rhs) { return lhs->first < rhs->first; });
+
+    InputsHasher hasher;
+    for (const auto& input : inputs) {
+        hasher.update(input->first);
+        hashTensor(hasher, input->second);
+    }
+    std::vector<std::string> outputFilter(request.output_filter().begin(), request.output_filter().end());
+    std::sort(outputFilter.begin(), outputFilter.end());
+    uint64_t outputFilterSize = outputFilter.size();
+    hasher.update(&outputFilterSize, sizeof(outputFilterSize));
+    for (const auto& name : outputFilter) {
+        hasher.update(name);
+    }
+    return hasher.getKey();
+}
+
+bool ResponseCache::get(const ResponseCacheKey& key, tensorflow::serving::PredictResponse& response) {
+    std::lock_guard<std::mutex> lock(mutex);
+    auto it = index.find(key);
+    if (it == index.end()) {
+        missesMetric.increment();
+        return false;
+    }
+    entries.splice(entries.begin(), entries, it->second);
+    const auto& outputs = it->second->response.outputs();
+    response.mutable_outputs()->insert(outputs.begin(), outputs.end());
+    hitsMetric.increment();
+    return true;
+}
+
+void ResponseCache::evict(size_t requiredSpace) {
+    while (!entries.empty() && size + requiredSpace > capacity) {
+        const auto& entry = entries.back();
+        size -= entry.size;
+        index.erase(entry.key);
+        entries.pop_back();
+    }
+}
+
+void ResponseCache::put(const ResponseCacheKey& key, const tensorflow::serving::PredictResponse& response) {
+    size_t entrySize = response.ByteSizeLong();
+    if (entrySize > capacity) {
+        SPDLOG_DEBUG("Response of size {} bytes exceeds response cache capacity {} bytes", entrySize, capacity);
+        return;
+    }
+    std::lock_guard<std::mutex> lock(mutex);
+    if (index.find(key) != index.end()) {
+        return;
+    }
+    evict(entrySize);
+    entries.push_front(Entry{key, entrySize, tensorflow::serving::PredictResponse()});
+    entries.front().response.mutable_outputs()->insert(response.outputs().begin(), response.outputs().end());
+    index.emplace(key, entries.begin());
+    size += entrySize;
+    sizeMetric.set(size);
+}
+
+void ResponseCache::clear() {
+    std::lock_guard<std::mutex> lock(mutex);
+    entries.clear();
+    index.clear();
+    size = 0;
+    sizeMetric.set(0);
+}
+
+size_t ResponseCache::getSize() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return size;
+}
+
+size_t ResponseCache::getEntriesCount() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return entries.size();
+}
+
+}  // namespace ovms
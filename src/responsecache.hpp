@@ -0,0 +1,117 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <cstdint>
+#include <list>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wall"
+#include "tensorflow_serving/apis/prediction_service.grpc.pb.h"
+#pragma GCC diagnostic pop
+
+#include "metrics.hpp"
+#include "modelversion.hpp"
+
+namespace ovms {
+
+/**
+ * @brief 128 bit hash of predict request inputs
+ */
+struct ResponseCacheKey {
+    uint64_t low = 0;
+    uint64_t high = 0;
+
+    bool operator==(const ResponseCacheKey& rhs) const {
+        return low == rhs.low && high == rhs.high;
+    }
+};
+
+struct ResponseCacheKeyHash {
+    size_t operator()(const ResponseCacheKey& key) const {
+        return static_cast<size_t>(key.low);
+    }
+};
+
+/**
+ * @brief Caches predict responses of one model version
+ *
+ * Responses are keyed on a hash of input names, precisions, shapes and contents together with the
+ * output filter. Least recently used entries are evicted when the serialized size of stored responses
+ * exceeds the capacity.
+ */
+class ResponseCache {
+    struct Entry {
+        ResponseCacheKey key;
+        size_t size;
+        tensorflow::serving::PredictResponse response;
+    };
+
+    const size_t capacity;
+    size_t size = 0;
+    std::list<Entry> entries;
+    std::unordered_map<ResponseCacheKey, std::list<Entry>::iterator, ResponseCacheKeyHash> index;
+    std::mutex mutex;
+
+    MetricCounter& hitsMetric;
+    MetricCounter& missesMetric;
+    MetricGauge& sizeMetric;
+
+    void evict(size_t requiredSpace);
+
+public:
+    ResponseCache(const std::string& modelName, model_version_t modelVersion, size_t capacityBytes);
+
+    ResponseCache(const ResponseCache&) = delete;
+    ResponseCache& operator=(const ResponseCache&) = delete;
+
+    ~ResponseCache();
+
+    /**
+     * @brief Computes the cache key of request
+     */
+    static ResponseCacheKey computeKey(const tensorflow::serving::PredictRequest& request);
+
+    /**
+     * @brief Copies cached response into response, updates hit/miss counters
+     *
+     * @return true if response was found
+     */
+    bool get(const ResponseCacheKey& key, tensorflow::serving::PredictResponse& response);
+
+    /**
+     * @brief Stores copy of the response, responses larger than the capacity are not stored
+     */
+    void put(const ResponseCacheKey& key, const tensorflow::serving::PredictResponse& response);
+
+    /**
+     * @brief Drops all entries
+     */
+    void clear();
+
+    size_t getCapacity() const {
+        return capacity;
+    }
+
+    size_t getSize();
+
+    size_t getEntriesCount();
+};
+
+}  // namespace ovms
@@ -15,8 +15,11 @@
 //*****************************************************************************
 #include "rest_parser.hpp"
 
+#include <cstring>
 #include <functional>
+#include <limits>
 #include <string>
+#include <string_view>
 
 #include "rest_utils.hpp"
 
@@ -135,12 +138,7 @@ bool RestParser::parseArray(rapidjson::Value& doc, int dim, tensorflow::TensorPr
         if (!setDTypeIfNotSet(doc.GetArray()[0], proto, tensorName)) {
             return false;
         }
-        for (auto& value : doc.GetArray()) {
-            if (!addValue(proto, value)) {
-                return false;
-            }
-        }
-        return true;
+        return addValues(proto, doc);
     }
     return false;
 }
@@ -262,6 +260,18 @@ Status RestParser::parse(const char* json) {
     if (doc.Parse(json).HasParseError()) {
         return StatusCode::JSON_INVALID;
     }
+    return parseDocument(doc);
+}
+
+Status RestParser::parseInsitu(char* json) {
+    rapidjson::Document doc;
+    if (doc.ParseInsitu(json).HasParseError()) {
+        return StatusCode::JSON_INVALID;
+    }
+    return parseDocument(doc);
+}
+
+Status RestParser::parseDocument(rapidjson::Document& doc) {
     if (!doc.IsObject()) {
         return StatusCode::REST_BODY_IS_NOT_AN_OBJECT;
     }
@@ -270,6 +280,10 @@ Status RestParser::parse(const char* json) {
     if (instancesItr != doc.MemberEnd() && inputsItr != doc.MemberEnd()) {
         return StatusCode::REST_PREDICT_UNKNOWN_ORDER;
     }
+    auto status = parseOutputFilter(doc);
+    if (!status.ok()) {
+        return status;
+    }
     if (instancesItr != doc.MemberEnd()) {
         return parseRowFormat(instancesItr->value);
     }
@@ -279,6 +293,129 @@ Status RestParser::parse(const char* json) {
     return StatusCode::REST_PREDICT_UNKNOWN_ORDER;
 }
 
+Status RestParser::parseOutputFilter(const rapidjson::Value& doc) {
+    auto outputFilterItr = doc.FindMember("output_filter");
+    if (outputFilterItr == doc.MemberEnd()) {
+        return StatusCode::OK;
+    }
+    if (!outputFilterItr->value.IsArray()) {
+        return StatusCode::REST_INVALID_OUTPUT_FILTER;
+    }
+    for (const auto& name : outputFilterItr->value.GetArray()) {
+        if (!name.IsString()) {
+            return StatusCode::REST_INVALID_OUTPUT_FILTER;
+        }
+        requestProto.add_output_filter(name.GetString(), name.GetStringLength());
+    }
+    return StatusCode::OK;
+}
+
+Status RestParser::parseBinary(const std::string& body, size_t headerLength) {
+    order = Order::BINARY;
+    if (headerLength > body.size()) {
+        return StatusCode::REST_BINARY_INVALID_HEADER_LENGTH;
+    }
+    rapidjson::Document doc;
+    if (doc.Parse(body.data(), headerLength).HasParseError()) {
+        return StatusCode::JSON_INVALID;
+    }
+    if (!doc.IsObject()) {
+        return StatusCode::REST_BODY_IS_NOT_AN_OBJECT;
+    }
+    auto inputsItr = doc.FindMember("inputs");
+    if (inputsItr == doc.MemberEnd() || !inputsItr->value.IsArray() || inputsItr->value.Empty()) {
+        return StatusCode::REST_NO_INPUTS_FOUND;
+    }
+    auto status = parseOutputFilter(doc);
+    if (!status.ok()) {
+        return status;
+    }
+    const char* data = body.data() + headerLength;
+    const size_t dataSize = body.size() - headerLength;
+    size_t nextOffset = 0;
+    for (const auto& input : inputsItr->value.GetArray()) {
+        status = parseBinaryInput(input, data, dataSize, nextOffset);
+        if (!status.ok()) {
+            return status;
+        }
+    }
+    removeUnusedInputs();
+    format = Format::NAMED;
+    return StatusCode::OK;
+}
+
+Status RestParser::parseBinaryInput(const rapidjson::Value& input, const char* data, size_t dataSize, size_t& nextOffset) {
+    if (!input.IsObject()) {
+        return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+    }
+    auto nameItr = input.FindMember("name");
+    auto shapeItr = input.FindMember("shape");
+    if (nameItr == input.MemberEnd() || !nameItr->value.IsString() ||
+        shapeItr == input.MemberEnd() || !shapeItr->value.IsArray()) {
+        return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+    }
+    const std::string tensorName(nameItr->value.GetString(), nameItr->value.GetStringLength());
+    auto& proto = (*requestProto.mutable_inputs())[tensorName];
+
+    // dtype defaults to the precision of model input
+    auto dtypeItr = input.FindMember("dtype");
+    if (dtypeItr != input.MemberEnd()) {
+        tensorflow::DataType dtype;
+        if (!dtypeItr->value.IsString() || !tensorflow::DataType_Parse(dtypeItr->value.GetString(), &dtype)) {
+            return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+        }
+        proto.set_dtype(dtype);
+    }
+    if (DataTypeSize(proto.dtype()) == 0) {
+        SPDLOG_DEBUG("Binary request input {} has no dtype or its dtype has no fixed size", tensorName);
+        return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+    }
+
+    size_t expectedSize = DataTypeSize(proto.dtype());
+    proto.mutable_tensor_shape()->clear_dim();
+    for (const auto& dim : shapeItr->value.GetArray()) {
+        if (!dim.IsUint64()) {
+            return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+        }
+        if (dim.GetUint64() > 0 && expectedSize > std::numeric_limits<size_t>::max() / dim.GetUint64()) {
+            return StatusCode::REST_BINARY_INVALID_TENSOR_DATA;
+        }
+        proto.mutable_tensor_shape()->add_dim()->set_size(dim.GetUint64());
+        expectedSize *= dim.GetUint64();
+    }
+
+    size_t offset = nextOffset;
+    auto offsetItr = input.FindMember("offset");
+    if (offsetItr != input.MemberEnd()) {
+        if (!offsetItr->value.IsUint64()) {
+            return StatusCode::REST_BINARY_INVALID_INPUT_HEADER;
+        }
+        offset = offsetItr->value.GetUint64();
+    }
+    auto sizeItr = input.FindMember("size");
+    if (sizeItr != input.MemberEnd() && (!sizeItr->value.IsUint64() || sizeItr->value.GetUint64() != expectedSize)) {
+        SPDLOG_DEBUG("Binary request input {} size does not match shape and dtype, expected: {}", tensorName, expectedSize);
+        return StatusCode::REST_BINARY_INVALID_TENSOR_DATA;
+    }
+    if (offset > dataSize || expectedSize > dataSize - offset) {
+        SPDLOG_DEBUG("Binary request input {} data of {} bytes at offset {} exceeds request body", tensorName, expectedSize, offset);
+        return StatusCode::REST_BINARY_INVALID_TENSOR_DATA;
+    }
+    nextOffset = offset + expectedSize;
+
+    // Special inputs are read from value fields
+    if (tensorName == "sequence_id" && proto.dtype() == tensorflow::DataType::DT_UINT64) {
+        proto.mutable_uint64_val()->Resize(expectedSize / sizeof(uint64_t), 0);
+        std::memcpy(proto.mutable_uint64_val()->mutable_data(), data + offset, expectedSize);
+    } else if (tensorName == "sequence_control_input" && proto.dtype() == tensorflow::DataType::DT_UINT32) {
+        proto.mutable_uint32_val()->Resize(expectedSize / sizeof(uint32_t), 0);
+        std::memcpy(proto.mutable_uint32_val()->mutable_data(), data + offset, expectedSize);
+    } else {
+        proto.mutable_tensor_content()->assign(data + offset, expectedSize);
+    }
+    return StatusCode::OK;
+}
+
 void RestParser::increaseBatchSize(tensorflow::TensorProto& proto) {
     if (proto.tensor_shape().dim_size() < 1) {
         proto.mutable_tensor_shape()->add_dim()->set_size(0);
@@ -298,15 +435,6 @@ bool RestParser::setDimOrValidate(tensorflow::TensorProto& proto, int dim, int s
     }
 }
 
-bool getB64FromValue(const rapidjson::Value& value, std::string& b64Val) {
-    if (!isBinary(value)) {
-        return false;
-    }
-
-    b64Val = value["b64"].GetString();
-    return true;
-}
-
 template <typename T>
 bool addToTensorContent(tensorflow::TensorProto& proto, T value) {
     if (sizeof(T) != DataTypeSize(proto.dtype())) {
@@ -387,14 +515,84 @@ bool addToIntVal(tensorflow::TensorProto& proto, const rapidjson::Value& value)
     return false;
 }
 
+template <typename T>
+bool getNumber(const rapidjson::Value& value, T& result) {
+    if (value.IsDouble()) {
+        result = static_cast<T>(value.GetDouble());
+    } else if (value.IsInt64()) {
+        result = static_cast<T>(value.GetInt64());
+    } else if (value.IsUint64()) {
+        result = static_cast<T>(value.GetUint64());
+    } else if (value.IsInt()) {
+        result = static_cast<T>(value.GetInt());
+    } else if (value.IsUint()) {
+        result = static_cast<T>(value.GetUint());
+    } else {
+        return false;
+    }
+    return true;
+}
+
+// Grows tensor content once for the whole array and writes values in place.
+// Tensor content is preallocated for the model input shape and later wrapped by the blob without copying.
+template <typename T>
+bool addValuesToTensorContent(tensorflow::TensorProto& proto, const rapidjson::Value& array) {
+    if (sizeof(T) != DataTypeSize(proto.dtype())) {
+        return false;
+    }
+    auto& content = *proto.mutable_tensor_content();
+    const size_t offset = content.size();
+    content.resize(offset + array.Size() * sizeof(T));
+    char* destination = content.data() + offset;
+    for (const auto& value : array.GetArray()) {
+        T number;
+        if (!getNumber(value, number)) {
+            content.resize(offset);
+            return false;
+        }
+        std::memcpy(destination, &number, sizeof(T));
+        destination += sizeof(T);
+    }
+    return true;
+}
+
+bool RestParser::addValues(tensorflow::TensorProto& proto, const rapidjson::Value& array) {
+    // Binary inputs change tensor type, they are handled value by value
+    const auto dtype = array.GetArray()[0].IsNumber() ? proto.dtype() : tensorflow::DataType::DT_INVALID;
+    switch (dtype) {
+    case tensorflow::DataType::DT_FLOAT:
+        return addValuesToTensorContent<float>(proto, array);
+    case tensorflow::DataType::DT_INT32:
+        return addValuesToTensorContent<int32_t>(proto, array);
+    case tensorflow::DataType::DT_INT8:
+        return addValuesToTensorContent<int8_t>(proto, array);
+    case tensorflow::DataType::DT_UINT8:
+        return addValuesToTensorContent<uint8_t>(proto, array);
+    case tensorflow::DataType::DT_DOUBLE:
+        return addValuesToTensorContent<double>(proto, array);
+    case tensorflow::DataType::DT_INT16:
+        return addValuesToTensorContent<int16_t>(proto, array);
+    case tensorflow::DataType::DT_INT64:
+        return addValuesToTensorContent<int64_t>(proto, array);
+    case tensorflow::DataType::DT_UINT32:
+        return addValuesToTensorContent<uint32_t>(proto, array);
+    case tensorflow::DataType::DT_UINT64:
+        return addValuesToTensorContent<uint64_t>(proto, array);
+    default:
+        for (const auto& value : array.GetArray()) {
+            if (!addValue(proto, value)) {
+                return false;
+            }
+        }
+        return true;
+    }
+}
+
 bool RestParser::addValue(tensorflow::TensorProto& proto, const rapidjson::Value& value) {
     if (isBinary(value)) {
-        std::string b64Val;
-        if (!getB64FromValue(value, b64Val))
-            return false;
-        std::string decodedBytes;
-        if (decodeBase64(b64Val, decodedBytes) == StatusCode::OK) {
-            proto.add_string_val(decodedBytes.c_str(), decodedBytes.length());
+        const auto& b64 = value["b64"];
+        // Decoded straight into the proto, without intermediate copies of encoded and decoded bytes
+        if (decodeBase64(std::string_view(b64.GetString(), b64.GetStringLength()), *proto.add_string_val()) == StatusCode::OK) {
             proto.set_dtype(tensorflow::DataType::DT_STRING);
             return true;
         } else {
@@ -37,7 +37,8 @@ namespace ovms {
 enum class Order {
     UNKNOWN,
     ROW,
-    COLUMN
+    COLUMN,
+    BINARY
 };
 
 /**
@@ -92,6 +93,11 @@ class RestParser {
      */
     static bool addValue(tensorflow::TensorProto& proto, const rapidjson::Value& value);
 
+    /**
+     * Parses and adds all values of rapidjson array to tensor proto
+     */
+    static bool addValues(tensorflow::TensorProto& proto, const rapidjson::Value& array);
+
     bool parseSequenceIdInput(rapidjson::Value& doc, tensorflow::TensorProto& proto, const std::string& tensorName);
     bool parseSequenceControlInput(rapidjson::Value& doc, tensorflow::TensorProto& proto, const std::string& tensorName);
     bool parseSpecialInput(rapidjson::Value& doc, tensorflow::TensorProto& proto, const std::string& tensorName);
@@ -167,6 +173,23 @@ class RestParser {
      */
     Status parseColumnFormat(rapidjson::Value& node);
 
+    Status parseDocument(rapidjson::Document& doc);
+
+    /**
+     * @brief Copies optional output_filter array of output names to request proto
+     */
+    Status parseOutputFilter(const rapidjson::Value& doc);
+
+    /**
+     * @brief Parses single input description from binary request header and copies its data to request proto
+     *
+     * @param input rapidjson Node describing input
+     * @param data tensor data following JSON header in request body
+     * @param dataSize size of tensor data
+     * @param nextOffset offset of input data when not given explicitly, moved past this input data
+     */
+    Status parseBinaryInput(const rapidjson::Value& input, const char* data, size_t dataSize, size_t& nextOffset);
+
 public:
     bool setDTypeIfNotSet(const rapidjson::Value& value, tensorflow::TensorProto& proto, const std::string& tensorName);
     /**
@@ -213,6 +236,33 @@ public:
      * }
      */
     Status parse(const char* json);
+
+    /**
+     * @brief Parses http request body in place, without copying strings into separate memory
+     *
+     * @param json null terminated request string, it is modified and cannot be used after parsing
+     *
+     * @return Status indicating error code or success
+     */
+    Status parseInsitu(char* json);
+
+    /**
+     * @brief Parses http request body with binary tensor data
+     *
+     * @param body request body starting with JSON header followed by raw little endian tensor data
+     * @param headerLength size of JSON header in bytes
+     *
+     * @return Status indicating error code or success
+     *
+     * JSON header expected to be passed in following structure, offsets are relative to the end of header:
+     * {
+     *     "inputs": [
+     *         {"name": "input1", "dtype": "DT_FLOAT", "shape": [1, 10], "offset": 0, "size": 40},
+     *         ...
+     *     ]
+     * }
+     */
+    Status parseBinary(const std::string& body, size_t headerLength);
 };
 
 }  // namespace ovms
@@ -15,25 +15,66 @@
 //*****************************************************************************
 #include "rest_utils.hpp"
 
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <vector>
+
+#include <rapidjson/internal/dtoa.h>
+#include <rapidjson/prettywriter.h>
+#include <rapidjson/stringbuffer.h>
+#include <rapidjson/writer.h>
 #include <spdlog/spdlog.h>
 
 #include "absl/strings/escaping.h"
 
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wall"
-#include "tensorflow_serving/util/json_tensor.h"
-#pragma GCC diagnostic pop
-
 #include "timer.hpp"
 
 using tensorflow::DataType;
 using tensorflow::DataTypeSize;
-using tensorflow::serving::JsonPredictRequestFormat;
-using tensorflow::serving::MakeJsonFromTensors;
+using tensorflow::TensorProto;
 using tensorflow::serving::PredictResponse;
 
 namespace ovms {
 
+namespace {
+/**
+ * @brief Rapidjson output stream appending directly to the response string
+ */
+class StringOutputStream {
+    std::string& output;
+
+public:
+    typedef char Ch;
+
+    StringOutputStream(std::string& output) :
+        output(output) {}
+
+    void Put(char c) { output.push_back(c); }
+    void Flush() {}
+};
+
+using JsonWriter = rapidjson::PrettyWriter<StringOutputStream>;
+
+// Upper bound of characters needed to write a single value including separator and indentation
+const size_t ESTIMATED_VALUE_SIZE = 16;
+const size_t MAX_NUMBER_SIZE = 32;
+
+/**
+ * @brief Output tensor data validated and prepared for serialization
+ *
+ * Data points either to tensor_content or to the *_val field of the tensor proto.
+ * Storage type is the type of elements data points to, which for *_val fields might differ from tensor dtype.
+ */
+struct OutputData {
+    const std::string* name;
+    std::vector<size_t> shape;
+    size_t elementsCount;
+    DataType dtype;
+    DataType storageType;
+    const void* data;
+};
+
 Status checkValField(const size_t& fieldSize, const size_t& expectedElementsNumber) {
     if (fieldSize == 0)
         return StatusCode::REST_SERIALIZE_NO_DATA;
@@ -42,6 +83,301 @@ Status checkValField(const size_t& fieldSize, const size_t& expectedElementsNumb
     return StatusCode::OK;
 }
 
+template <typename T>
+Status setValFieldData(OutputData& output, DataType storageType, const google::protobuf::RepeatedField<T>& field) {
+    auto status = checkValField(field.size(), output.elementsCount);
+    if (!status.ok())
+        return status;
+    output.storageType = storageType;
+    output.data = field.data();
+    return StatusCode::OK;
+}
+
+Status prepareOutputData(const std::string& name, const TensorProto& tensor, OutputData& output) {
+    output.name = &name;
+    output.dtype = tensor.dtype();
+    output.elementsCount = 1;
+    output.shape.reserve(tensor.tensor_shape().dim_size());
+    for (int i = 0; i < tensor.tensor_shape().dim_size(); i++) {
+        output.shape.push_back(tensor.tensor_shape().dim(i).size());
+        output.elementsCount *= output.shape.back();
+    }
+
+    switch (tensor.dtype()) {
+    case DataType::DT_FLOAT:
+    case DataType::DT_DOUBLE:
+    case DataType::DT_INT8:
+    case DataType::DT_UINT8:
+    case DataType::DT_INT16:
+    case DataType::DT_INT32:
+    case DataType::DT_INT64:
+    case DataType::DT_UINT32:
+    case DataType::DT_UINT64:
+        break;
+    default:
+        return StatusCode::REST_UNSUPPORTED_PRECISION;
+    }
+
+    if (tensor.tensor_content().size() > 0) {
+        if (tensor.tensor_content().size() != output.elementsCount * DataTypeSize(tensor.dtype()))
+            return StatusCode::REST_SERIALIZE_TENSOR_CONTENT_INVALID_SIZE;
+        output.storageType = tensor.dtype();
+        output.data = tensor.tensor_content().data();
+        return StatusCode::OK;
+    }
+
+    switch (tensor.dtype()) {
+    case DataType::DT_FLOAT:
+        return setValFieldData(output, DataType::DT_FLOAT, tensor.float_val());
+    case DataType::DT_DOUBLE:
+        return setValFieldData(output, DataType::DT_DOUBLE, tensor.double_val());
+    case DataType::DT_INT8:
+    case DataType::DT_UINT8:
+    case DataType::DT_INT16:
+    case DataType::DT_INT32:
+        return setValFieldData(output, DataType::DT_INT32, tensor.int_val());
+    case DataType::DT_INT64:
+        return setValFieldData(output, DataType::DT_INT64, tensor.int64_val());
+    case DataType::DT_UINT32:
+        return setValFieldData(output, DataType::DT_UINT32, tensor.uint32_val());
+    case DataType::DT_UINT64:
+        return setValFieldData(output, DataType::DT_UINT64, tensor.uint64_val());
+    default:
+        return StatusCode::REST_UNSUPPORTED_PRECISION;
+    }
+}
+
+Status prepareOutputsData(const PredictResponse& response_proto, std::vector<OutputData>& outputs) {
+    outputs.resize(response_proto.outputs().size());
+    size_t i = 0;
+    for (const auto& kv : response_proto.outputs()) {
+        auto status = prepareOutputData(kv.first, kv.second, outputs[i++]);
+        if (!status.ok())
+            return status;
+    }
+    if (outputs.empty()) {
+        SPDLOG_ERROR("Serializing response failed: response has no outputs");
+        return StatusCode::REST_PROTO_TO_STRING_ERROR;
+    }
+    return StatusCode::OK;
+}
+
+bool writeNonFinite(JsonWriter& writer, double value) {
+    if (std::isnan(value))
+        return writer.RawValue("NaN", 3, rapidjson::kNumberType);
+    if (value > 0)
+        return writer.RawValue("Infinity", 8, rapidjson::kNumberType);
+    return writer.RawValue("-Infinity", 9, rapidjson::kNumberType);
+}
+
+/**
+ * @brief Writes shortest representation of float which parses back to the same value
+ *
+ * Runs Grisu2 digit generation with rounding boundaries of single precision value, so that 0.1f
+ * is written as 0.1 instead of 0.10000000149011612 which would be printed for value promoted to double.
+ */
+char* writeFloat(float value, char* buffer) {
+    using rapidjson::internal::DiyFp;
+    uint32_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    if (bits & 0x80000000u) {
+        *buffer++ = '-';
+        bits &= 0x7FFFFFFFu;
+    }
+    if (bits == 0) {
+        std::memcpy(buffer, "0.0", 3);
+        return buffer + 3;
+    }
+    const uint32_t biasedExponent = bits >> 23;
+    const uint32_t fraction = bits & 0x7FFFFFu;
+    const DiyFp v = biasedExponent ? DiyFp(fraction | 0x800000u, static_cast<int>(biasedExponent) - 150) : DiyFp(fraction, -149);
+    const DiyFp plus = DiyFp((v.f << 1) + 1, v.e - 1).Normalize();
+    // Lower boundary is closer for powers of two
+    DiyFp minus = (fraction == 0 && biasedExponent > 1) ? DiyFp((v.f << 2) - 1, v.e - 2) : DiyFp((v.f << 1) - 1, v.e - 1);
+    minus.f <<= minus.e - plus.e;
+    minus.e = plus.e;
+
+    int length, K;
+    const DiyFp cachedPower = rapidjson::internal::GetCachedPower(plus.e, &K);
+    const DiyFp w = v.Normalize() * cachedPower;
+    DiyFp wPlus = plus * cachedPower;
+    DiyFp wMinus = minus * cachedPower;
+    wMinus.f++;
+    wPlus.f--;
+    rapidjson::internal::DigitGen(w, wPlus, wPlus.f - wMinus.f, buffer, &length, &K);
+    return rapidjson::internal::Prettify(buffer, length, K, 324);
+}
+
+inline bool writeValue(JsonWriter& writer, float value) {
+    if (!std::isfinite(value))
+        return writeNonFinite(writer, value);
+    char buffer[MAX_NUMBER_SIZE];
+    const char* end = writeFloat(value, buffer);
+    return writer.RawValue(buffer, end - buffer, rapidjson::kNumberType);
+}
+
+inline bool writeValue(JsonWriter& writer, double value) {
+    if (!std::isfinite(value))
+        return writeNonFinite(writer, value);
+    char buffer[MAX_NUMBER_SIZE];
+    const char* end = rapidjson::internal::dtoa(value, buffer);
+    return writer.RawValue(buffer, end - buffer, rapidjson::kNumberType);
+}
+
+inline bool writeValue(JsonWriter& writer, int8_t value) { return writer.Int(value); }
+inline bool writeValue(JsonWriter& writer, uint8_t value) { return writer.Uint(value); }
+inline bool writeValue(JsonWriter& writer, int16_t value) { return writer.Int(value); }
+inline bool writeValue(JsonWriter& writer, int32_t value) { return writer.Int(value); }
+inline bool writeValue(JsonWriter& writer, int64_t value) { return writer.Int64(value); }
+inline bool writeValue(JsonWriter& writer, uint32_t value) { return writer.Uint(value); }
+inline bool writeValue(JsonWriter& writer, uint64_t value) { return writer.Uint64(value); }
+
+/**
+ * @brief Writes tensor data as nested arrays starting from given dimension, returns pointer past the last written element
+ */
+template <typename T>
+const T* writeValues(JsonWriter& writer, const T* data, const std::vector<size_t>& shape, size_t dimension) {
+    if (dimension == shape.size()) {
+        writeValue(writer, *data);
+        return data + 1;
+    }
+    writer.StartArray();
+    if (dimension + 1 == shape.size()) {
+        for (size_t i = 0; i < shape[dimension]; i++) {
+            writeValue(writer, data[i]);
+        }
+        data += shape[dimension];
+    } else {
+        for (size_t i = 0; i < shape[dimension]; i++) {
+            data = writeValues(writer, data, shape, dimension + 1);
+        }
+    }
+    writer.EndArray();
+    return data;
+}
+
+template <typename T>
+void writeTensor(JsonWriter& writer, const OutputData& output, size_t offset, size_t dimension) {
+    writeValues(writer, static_cast<const T*>(output.data) + offset, output.shape, dimension);
+}
+
+/**
+ * @brief Writes elements of output starting at given offset, shaped by output dimensions starting from given dimension
+ */
+void writeOutput(JsonWriter& writer, const OutputData& output, size_t offset, size_t dimension) {
+    switch (output.storageType) {
+    case DataType::DT_FLOAT:
+        return writeTensor<float>(writer, output, offset, dimension);
+    case DataType::DT_DOUBLE:
+        return writeTensor<double>(writer, output, offset, dimension);
+    case DataType::DT_INT8:
+        return writeTensor<int8_t>(writer, output, offset, dimension);
+    case DataType::DT_UINT8:
+        return writeTensor<uint8_t>(writer, output, offset, dimension);
+    case DataType::DT_INT16:
+        return writeTensor<int16_t>(writer, output, offset, dimension);
+    case DataType::DT_INT32:
+        return writeTensor<int32_t>(writer, output, offset, dimension);
+    case DataType::DT_INT64:
+        return writeTensor<int64_t>(writer, output, offset, dimension);
+    case DataType::DT_UINT32:
+        return writeTensor<uint32_t>(writer, output, offset, dimension);
+    case DataType::DT_UINT64:
+        return writeTensor<uint64_t>(writer, output, offset, dimension);
+    default:
+        return;
+    }
+}
+
+size_t estimateJsonSize(const std::vector<OutputData>& outputs, Order order) {
+    size_t size = 64;
+    for (const auto& output : outputs) {
+        size_t valueSize = ESTIMATED_VALUE_SIZE;
+        if (order == Order::COLUMN) {
+            // Every value is written in new line indented by its depth
+            valueSize += 4 * (output.shape.size() + 2);
+        }
+        size += output.name->size() + output.elementsCount * valueSize;
+    }
+    return size;
+}
+
+Status writeColumns(JsonWriter& writer, const std::vector<OutputData>& outputs) {
+    const bool elideOutputName = outputs.size() == 1;
+    writer.Key("outputs");
+    if (!elideOutputName)
+        writer.StartObject();
+    for (const auto& output : outputs) {
+        if (!elideOutputName)
+            writer.Key(output.name->c_str(), output.name->size());
+        writeOutput(writer, output, 0, 0);
+    }
+    if (!elideOutputName)
+        writer.EndObject();
+    return StatusCode::OK;
+}
+
+Status writeRows(JsonWriter& writer, const std::vector<OutputData>& outputs) {
+    size_t batchSize = 0;
+    for (const auto& output : outputs) {
+        if (output.shape.size() == 0 || output.shape[0] < 1) {
+            SPDLOG_ERROR("Creating json from tensors failed: output {} has no batch dimension", *output.name);
+            return StatusCode::REST_PROTO_TO_STRING_ERROR;
+        }
+        if (batchSize != 0 && batchSize != output.shape[0]) {
+            SPDLOG_ERROR("Creating json from tensors failed: output {} has inconsistent batch size: {} expecting: {}", *output.name, output.shape[0], batchSize);
+            return StatusCode::REST_PROTO_TO_STRING_ERROR;
+        }
+        batchSize = output.shape[0];
+    }
+
+    const bool elideOutputName = outputs.size() == 1;
+    writer.Key("predictions");
+    writer.StartArray();
+    for (size_t instance = 0; instance < batchSize; instance++) {
+        if (!elideOutputName)
+            writer.StartObject();
+        for (const auto& output : outputs) {
+            if (!elideOutputName)
+                writer.Key(output.name->c_str(), output.name->size());
+            writer.SetFormatOptions(rapidjson::kFormatSingleLineArray);
+            writeOutput(writer, output, instance * (output.elementsCount / batchSize), 1);
+            writer.SetFormatOptions(rapidjson::kFormatDefault);
+        }
+        if (!elideOutputName)
+            writer.EndObject();
+    }
+    writer.EndArray();
+    return StatusCode::OK;
+}
+template <typename T>
+void appendNarrowed(std::string& output, const int32_t* values, size_t count) {
+    for (size_t i = 0; i < count; i++) {
+        T value = static_cast<T>(values[i]);
+        output.append(reinterpret_cast<const char*>(&value), sizeof(T));
+    }
+}
+
+void appendRawData(std::string& output, const OutputData& data) {
+    if (data.storageType == data.dtype) {
+        output.append(static_cast<const char*>(data.data), data.elementsCount * DataTypeSize(data.dtype));
+        return;
+    }
+    // Values of types narrower than 32 bits are kept in int_val field
+    const int32_t* values = static_cast<const int32_t*>(data.data);
+    switch (data.dtype) {
+    case DataType::DT_INT8:
+        return appendNarrowed<int8_t>(output, values, data.elementsCount);
+    case DataType::DT_UINT8:
+        return appendNarrowed<uint8_t>(output, values, data.elementsCount);
+    case DataType::DT_INT16:
+        return appendNarrowed<int16_t>(output, values, data.elementsCount);
+    default:
+        return;
+    }
+}
+}  // namespace
+
 Status makeJsonFromPredictResponse(
     PredictResponse& response_proto,
     std::string* response_json,
@@ -53,142 +389,77 @@ Status makeJsonFromPredictResponse(
     Timer timer;
     using std::chrono::microseconds;
 
-    timer.start("convert");
+    std::vector<OutputData> outputs;
+    auto status = prepareOutputsData(response_proto, outputs);
+    if (!status.ok())
+        return status;
 
-    for (auto& kv : *response_proto.mutable_outputs()) {
-        auto& tensor = kv.second;
+    timer.start("serialize");
+    response_json->clear();
+    response_json->reserve(estimateJsonSize(outputs, order));
+    StringOutputStream stream(*response_json);
+    JsonWriter writer(stream);
+    writer.StartObject();
+    status = order == Order::ROW ? writeRows(writer, outputs) : writeColumns(writer, outputs);
+    if (!status.ok())
+        return status;
+    writer.EndObject();
+    timer.stop("serialize");
+    SPDLOG_DEBUG("Serializing response to json: {:.3f} ms", timer.elapsed<microseconds>("serialize") / 1000);
 
-        size_t expectedContentSize = DataTypeSize(tensor.dtype());
-        for (int i = 0; i < tensor.tensor_shape().dim_size(); i++) {
-            expectedContentSize *= tensor.tensor_shape().dim(i).size();
-        }
-        size_t dataTypeSize = DataTypeSize(tensor.dtype());
-        size_t expectedElementsNumber = dataTypeSize > 0 ? expectedContentSize / dataTypeSize : 0;
-        bool seekDataInValField = false;
+    return StatusCode::OK;
+}
 
-        if (tensor.tensor_content().size() == 0)
-            seekDataInValField = true;
-        else if (tensor.tensor_content().size() != expectedContentSize)
-            return StatusCode::REST_SERIALIZE_TENSOR_CONTENT_INVALID_SIZE;
+Status makeBinaryFromPredictResponse(
+    PredictResponse& response_proto,
+    std::string* response,
+    size_t* headerLength) {
+    std::vector<OutputData> outputs;
+    auto status = prepareOutputsData(response_proto, outputs);
+    if (!status.ok())
+        return status;
 
-        switch (tensor.dtype()) {
-        case DataType::DT_FLOAT:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.float_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(float))
-                    tensor.add_float_val(*reinterpret_cast<float*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_INT32:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.int_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(int32_t))
-                    tensor.add_int_val(*reinterpret_cast<int32_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_INT8:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.int_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(int8_t))
-                    tensor.add_int_val(*reinterpret_cast<int8_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_UINT8:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.int_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(uint8_t))
-                    tensor.add_int_val(*reinterpret_cast<uint8_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_DOUBLE:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.double_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(double))
-                    tensor.add_double_val(*reinterpret_cast<double*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_INT16:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.int_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(int16_t))
-                    tensor.add_int_val(*reinterpret_cast<int16_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_INT64:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.int64_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(int64_t))
-                    tensor.add_int64_val(*reinterpret_cast<int64_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_UINT32:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.uint32_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(uint32_t))
-                    tensor.add_uint32_val(*reinterpret_cast<uint32_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        case DataType::DT_UINT64:
-            if (seekDataInValField) {
-                auto status = checkValField(tensor.uint64_val_size(), expectedElementsNumber);
-                if (!status.ok())
-                    return status;
-            } else {
-                for (size_t i = 0; i < tensor.tensor_content().size(); i += sizeof(uint64_t))
-                    tensor.add_uint64_val(*reinterpret_cast<uint64_t*>(tensor.mutable_tensor_content()->data() + i));
-            }
-            break;
-        default:
-            return StatusCode::REST_UNSUPPORTED_PRECISION;
+    rapidjson::StringBuffer header;
+    rapidjson::Writer<rapidjson::StringBuffer> writer(header);
+    size_t offset = 0;
+    writer.StartObject();
+    writer.Key("outputs");
+    writer.StartArray();
+    for (const auto& output : outputs) {
+        const size_t size = output.elementsCount * DataTypeSize(output.dtype);
+        writer.StartObject();
+        writer.Key("name");
+        writer.String(output.name->c_str(), output.name->size());
+        writer.Key("dtype");
+        writer.String(tensorflow::DataType_Name(output.dtype).c_str());
+        writer.Key("shape");
+        writer.StartArray();
+        for (size_t dim : output.shape) {
+            writer.Uint64(dim);
         }
+        writer.EndArray();
+        writer.Key("offset");
+        writer.Uint64(offset);
+        writer.Key("size");
+        writer.Uint64(size);
+        writer.EndObject();
+        offset += size;
     }
+    writer.EndArray();
+    writer.EndObject();
 
-    timer.stop("convert");
-    timer.start("MakeJsonFromTensors");
-
-    const auto& tf_status = MakeJsonFromTensors(
-        response_proto.outputs(),
-        order == Order::ROW ? JsonPredictRequestFormat::kRow : JsonPredictRequestFormat::kColumnar,
-        response_json);
-
-    timer.stop("MakeJsonFromTensors");
-    SPDLOG_DEBUG("tensor_content to *_val container conversion: {:.3f} ms", timer.elapsed<microseconds>("convert") / 1000);
-    SPDLOG_DEBUG("MakeJsonFromTensors call: {:.3f} ms", timer.elapsed<microseconds>("MakeJsonFromTensors") / 1000);
-
-    if (!tf_status.ok()) {
-        SPDLOG_ERROR("Creating json from tensors failed: {}", tf_status.error_message());
-        return StatusCode::REST_PROTO_TO_STRING_ERROR;
+    response->clear();
+    response->reserve(header.GetSize() + offset);
+    response->append(header.GetString(), header.GetSize());
+    for (const auto& output : outputs) {
+        appendRawData(*response, output);
     }
-
+    *headerLength = header.GetSize();
     return StatusCode::OK;
 }
 
-Status decodeBase64(std::string& bytes, std::string& decodedBytes) {
-    auto status = Status(absl::Base64Unescape(bytes, &decodedBytes) ? StatusCode::OK : StatusCode::REST_BASE64_DECODE_ERROR);
+Status decodeBase64(std::string_view bytes, std::string& decodedBytes) {
+    auto status = Status(absl::Base64Unescape(absl::string_view(bytes.data(), bytes.size()), &decodedBytes) ? StatusCode::OK : StatusCode::REST_BASE64_DECODE_ERROR);
     if (!status.ok()) {
         return status;
     }
@@ -16,6 +16,7 @@
 #pragma once
 
 #include <string>
+#include <string_view>
 
 #pragma GCC diagnostic push
 #pragma GCC diagnostic ignored "-Wall"
@@ -31,6 +32,16 @@ Status makeJsonFromPredictResponse(
     std::string* response_json,
     Order order);
 
-Status decodeBase64(std::string& bytes, std::string& decodedBytes);
+/**
+ * @brief Serializes response to JSON header describing outputs followed by raw output data
+ *
+ * @param headerLength set to size of JSON header at the beginning of response
+ */
+Status makeBinaryFromPredictResponse(
+    tensorflow::serving::PredictResponse& response_proto,
+    std::string* response,
+    size_t* headerLength);
+
+Status decodeBase64(std::string_view bytes, std::string& decodedBytes);
 
 }  // namespace ovms
@@ -25,13 +25,18 @@
 // OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #include "s3filesystem.hpp"
 
+#include <algorithm>
 #include <filesystem>
 #include <fstream>
 #include <memory>
 #include <set>
 #include <string>
+#include <thread>
 #include <vector>
 
+#include <fcntl.h>
+#include <unistd.h>
+
 #include <aws/core/Aws.h>
 #include <aws/core/auth/AWSCredentialsProvider.h>
 #include <aws/s3/S3Client.h>
@@ -42,6 +47,7 @@
 
 #include "logging.hpp"
 #include "stringutils.hpp"
+#include "threadpool.hpp"
 
 namespace ovms {
 
@@ -83,8 +89,9 @@ StatusCode S3FileSystem::parsePath(const std::string& path, std::string* bucket,
     return StatusCode::OK;
 }
 
-S3FileSystem::S3FileSystem(const Aws::SDKOptions& options, const std::string& s3_path) :
+S3FileSystem::S3FileSystem(const Aws::SDKOptions& options, const std::string& s3_path, const std::string& cache_dir) :
     options_(options),
+    cache_dir_(cache_dir),
     s3_regex_(S3_URL_PREFIX + "([0-9a-zA-Z-.]+):([0-9]+)/([0-9a-z.-]+)(((/"
                               "[0-9a-zA-Z.-_]+)*)?)"),
     proxy_regex_("^(https?)://(([^:]{1,128}):([^@]{1,256})@)?([^:/]{1,255})(:([0-9]{1,5}))?/?") {
@@ -133,6 +140,8 @@ S3FileSystem::S3FileSystem(const Aws::SDKOptions& options, const std::string& s3
         config.scheme = Aws::Http::Scheme::HTTP;
     }
 
+    config.maxConnections = S3_DOWNLOAD_WORKERS;
+
     if (!default_proxy.empty()) {
         if (std::regex_match(default_proxy, sm, proxy_regex_)) {
             config.proxyHost = sm[5].str();
@@ -390,6 +399,15 @@ StatusCode S3FileSystem::readTextFile(const std::string& path, std::string* cont
 }
 
 StatusCode S3FileSystem::downloadFileFolder(const std::string& path, const std::string& local_path) {
+    std::vector<ObjectToDownload> objects;
+    auto status = listObjectsToDownload(path, local_path, &objects);
+    if (status != StatusCode::OK) {
+        return status;
+    }
+    return downloadObjects(objects);
+}
+
+StatusCode S3FileSystem::listObjectsToDownload(const std::string& path, const std::string& local_path, std::vector<ObjectToDownload>* objects) {
     bool exists;
     auto status = fileExists(path, &exists);
     if (status != StatusCode::OK) {
@@ -459,59 +477,204 @@ StatusCode S3FileSystem::downloadFileFolder(const std::string& path, const std::
             if (std::any_of(acceptedFiles.begin(), acceptedFiles.end(), [&iter](const std::string& x) {
                     return iter->size() > 0 && endsWith(*iter, x);
                 })) {
-                std::string bucket, object;
-                status = parsePath(*iter, &bucket, &object);
+                ObjectToDownload objectToDownload;
+                status = parsePath(*iter, &objectToDownload.bucket, &objectToDownload.object);
                 if (status != StatusCode::OK) {
                     return status;
                 }
-
-                // Send a request for the objects metadata
-                s3::Model::GetObjectRequest object_request;
-                object_request.SetBucket(bucket.c_str());
-                object_request.SetKey(object.c_str());
-
-                auto get_object_outcome = client_.GetObject(object_request);
-                if (get_object_outcome.IsSuccess()) {
-                    auto& retrieved_file =
-                        get_object_outcome.GetResultWithOwnership().GetBody();
-                    std::string s3_removed_path = (*iter).substr(effective_path.size());
-                    std::string local_file_path = joinPath({local_path, s3_removed_path});
-                    std::ofstream output_file(local_file_path.c_str(), std::ios::binary);
-                    output_file << retrieved_file.rdbuf();
-                    output_file.close();
-                } else {
-                    SPDLOG_LOGGER_ERROR(s3_logger, "Failed to get object at {}", *iter);
-                    return StatusCode::S3_FAILED_GET_OBJECT;
-                }
+                std::string s3_removed_path = (*iter).substr(effective_path.size());
+                objectToDownload.localPath = joinPath({local_path, s3_removed_path});
+                objects->push_back(std::move(objectToDownload));
             }
         }
     } else {
-        std::string bucket, object;
-        auto s = parsePath(effective_path, &bucket, &object);
+        ObjectToDownload objectToDownload;
+        auto s = parsePath(effective_path, &objectToDownload.bucket, &objectToDownload.object);
         if (s != StatusCode::OK) {
             return s;
         }
+        objectToDownload.localPath = local_path;
+        objects->push_back(std::move(objectToDownload));
+    }
 
-        // Send a request for the objects metadata
-        s3::Model::GetObjectRequest object_request;
-        object_request.SetBucket(bucket.c_str());
-        object_request.SetKey(object.c_str());
-
-        auto get_object_outcome = client_.GetObject(object_request);
-        if (get_object_outcome.IsSuccess()) {
-            auto& retrieved_file = get_object_outcome.GetResultWithOwnership().GetBody();
-            std::ofstream output_file(local_path.c_str(), std::ios::binary);
-            output_file << retrieved_file.rdbuf();
-            output_file.close();
-        } else {
-            SPDLOG_LOGGER_ERROR(s3_logger, "Failed to get object at {}", effective_path);
-            return StatusCode::S3_FAILED_GET_OBJECT;
+    return StatusCode::OK;
+}
+
+StatusCode S3FileSystem::downloadObjects(std::vector<ObjectToDownload>& objects) {
+    if (objects.empty()) {
+        return StatusCode::OK;
+    }
+    // calling thread takes part in downloading
+    ThreadPool threadPool(S3_DOWNLOAD_WORKERS - 1);
+
+    // Read sizes and ETags, objects which did not change since last download are taken from the cache
+    std::vector<StatusCode> statuses(objects.size(), StatusCode::OK);
+    threadPool.parallelFor(objects.size(), [this, &objects, &statuses](size_t i) {
+        auto& object = objects[i];
+        s3::Model::HeadObjectRequest head_request;
+        head_request.SetBucket(object.bucket.c_str());
+        head_request.SetKey(object.object.c_str());
+        auto head_object_outcome = client_.HeadObject(head_request);
+        if (!head_object_outcome.IsSuccess()) {
+            SPDLOG_LOGGER_ERROR(s3_logger, "Failed to get metadata of object {} in bucket {}", object.object, object.bucket);
+            statuses[i] = StatusCode::S3_METADATA_FAIL;
+            return;
+        }
+        object.etag = head_object_outcome.GetResult().GetETag().c_str();
+        object.size = head_object_outcome.GetResult().GetContentLength();
+        object.restoredFromCache = restoreFromCache(object);
+    });
+    for (auto& status : statuses) {
+        if (status != StatusCode::OK) {
+            return status;
+        }
+    }
+
+    // Split objects into ranges fetched concurrently, each range is written at its offset
+    struct ObjectPart {
+        size_t objectIndex;
+        uint64_t offset;
+        uint64_t length;
+    };
+    std::vector<ObjectPart> parts;
+    std::vector<int> fds(objects.size(), -1);
+    StatusCode result = StatusCode::OK;
+    for (size_t i = 0; i < objects.size() && result == StatusCode::OK; i++) {
+        auto& object = objects[i];
+        if (object.restoredFromCache) {
+            continue;
+        }
+        fds[i] = open(object.localPath.c_str(), O_WRONLY | O_CREAT | O_TRUNC | O_CLOEXEC, S_IRUSR | S_IWUSR);
+        if (fds[i] < 0 || ftruncate(fds[i], object.size) != 0) {
+            SPDLOG_LOGGER_ERROR(s3_logger, "Failed to create local file: {} {}", object.localPath, strerror(errno));
+            result = StatusCode::PATH_INVALID;
+            break;
+        }
+        uint64_t partSize = object.size < S3_MULTIPART_THRESHOLD ? object.size : std::max<uint64_t>(S3_PART_SIZE, (object.size + S3_MAX_PARTS_PER_OBJECT - 1) / S3_MAX_PARTS_PER_OBJECT);
+        for (uint64_t offset = 0; offset < object.size; offset += partSize) {
+            parts.push_back({i, offset, std::min<uint64_t>(partSize, object.size - offset)});
+        }
+    }
+    if (result == StatusCode::OK) {
+        std::vector<StatusCode> partStatuses(parts.size(), StatusCode::OK);
+        threadPool.parallelFor(parts.size(), [this, &objects, &parts, &fds, &partStatuses](size_t i) {
+            auto& part = parts[i];
+            partStatuses[i] = downloadObjectPart(objects[part.objectIndex], fds[part.objectIndex], part.offset, part.length);
+        });
+        for (auto& status : partStatuses) {
+            if (status != StatusCode::OK) {
+                result = status;
+                break;
+            }
         }
     }
+    for (size_t i = 0; i < objects.size(); i++) {
+        if (fds[i] >= 0) {
+            close(fds[i]);
+            if (result == StatusCode::OK) {
+                storeInCache(objects[i]);
+            }
+        }
+    }
+    SPDLOG_LOGGER_DEBUG(s3_logger, "Downloaded {} parts, {} of {} objects taken from cache", parts.size(),
+        std::count_if(objects.begin(), objects.end(), [](const ObjectToDownload& object) { return object.restoredFromCache; }), objects.size());
+    return result;
+}
 
+StatusCode S3FileSystem::downloadObjectPart(const ObjectToDownload& object, int fd, uint64_t offset, uint64_t length) {
+    s3::Model::GetObjectRequest object_request;
+    object_request.SetBucket(object.bucket.c_str());
+    object_request.SetKey(object.object.c_str());
+    object_request.SetRange(("bytes=" + std::to_string(offset) + "-" + std::to_string(offset + length - 1)).c_str());
+    // Parts of an object replaced during the download must not be mixed
+    object_request.SetIfMatch(object.etag.c_str());
+
+    auto get_object_outcome = client_.GetObject(object_request);
+    if (!get_object_outcome.IsSuccess()) {
+        SPDLOG_LOGGER_ERROR(s3_logger, "Failed to get object {} range {}-{}: {}", object.object, offset, offset + length - 1, get_object_outcome.GetError().GetMessage());
+        return StatusCode::S3_FAILED_GET_OBJECT;
+    }
+    auto& retrieved_file = get_object_outcome.GetResultWithOwnership().GetBody();
+    std::vector<char> buffer(S3_READ_BUFFER_SIZE);
+    uint64_t written = 0;
+    while (retrieved_file.read(buffer.data(), buffer.size()) || retrieved_file.gcount() > 0) {
+        ssize_t count = retrieved_file.gcount();
+        if (written + count > length || pwrite(fd, buffer.data(), count, offset + written) != count) {
+            SPDLOG_LOGGER_ERROR(s3_logger, "Failed to write object {} to local file: {}", object.object, object.localPath);
+            return StatusCode::S3_FAILED_GET_OBJECT;
+        }
+        written += count;
+    }
+    if (written != length) {
+        SPDLOG_LOGGER_ERROR(s3_logger, "Received {} bytes of object {} range {}-{}", written, object.object, offset, offset + length - 1);
+        return StatusCode::S3_FAILED_GET_OBJECT;
+    }
     return StatusCode::OK;
 }
 
+static bool linkOrCopy(const std::string& from, const std::string& to) {
+    std::error_code ec;
+    fs::create_hard_link(from, to, ec);
+    if (ec) {
+        fs::copy_file(from, to, fs::copy_options::overwrite_existing, ec);
+    }
+    return !ec;
+}
+
+bool S3FileSystem::restoreFromCache(const ObjectToDownload& object) {
+    if (cache_dir_.empty() || object.etag.empty()) {
+        return false;
+    }
+    std::string cached_path = joinPath({cache_dir_, object.bucket, object.object});
+    std::ifstream etag_file(cached_path + ".etag");
+    std::string cached_etag;
+    if (!std::getline(etag_file, cached_etag) || cached_etag != object.etag) {
+        return false;
+    }
+    std::error_code ec;
+    if (fs::file_size(cached_path, ec) != object.size || ec) {
+        return false;
+    }
+    fs::remove(object.localPath, ec);
+    if (!linkOrCopy(cached_path, object.localPath)) {
+        SPDLOG_LOGGER_WARN(s3_logger, "Failed to copy cached object {} to {}", cached_path, object.localPath);
+        return false;
+    }
+    SPDLOG_LOGGER_DEBUG(s3_logger, "Object {} with ETag {} taken from cache", object.object, object.etag);
+    return true;
+}
+
+void S3FileSystem::storeInCache(const ObjectToDownload& object) {
+    if (cache_dir_.empty() || object.etag.empty()) {
+        return;
+    }
+    std::string cached_path = joinPath({cache_dir_, object.bucket, object.object});
+    std::string etag_path = cached_path + ".etag";
+    // Files are replaced with rename, so servers sharing the cache never see partially written files
+    std::string tmp_suffix = ".tmp" + std::to_string(getpid()) + "_" + std::to_string(std::hash<std::thread::id>{}(std::this_thread::get_id()));
+    std::error_code ec;
+    fs::create_directories(fs::path(cached_path).parent_path(), ec);
+    fs::remove(etag_path, ec);
+    if (!linkOrCopy(object.localPath, cached_path + tmp_suffix)) {
+        SPDLOG_LOGGER_WARN(s3_logger, "Failed to store object {} in cache {}", object.object, cache_dir_);
+        return;
+    }
+    fs::rename(cached_path + tmp_suffix, cached_path, ec);
+    if (ec) {
+        SPDLOG_LOGGER_WARN(s3_logger, "Failed to store object {} in cache {}: {}", object.object, cache_dir_, ec.message());
+        fs::remove(cached_path + tmp_suffix, ec);
+        return;
+    }
+    {
+        std::ofstream etag_file(etag_path + tmp_suffix);
+        etag_file << object.etag;
+    }
+    fs::rename(etag_path + tmp_suffix, etag_path, ec);
+    if (ec) {
+        fs::remove(etag_path + tmp_suffix, ec);
+    }
+}
+
 StatusCode S3FileSystem::downloadModelVersions(const std::string& path,
     std::string* local_path,
     const std::vector<model_version_t>& versions) {
@@ -521,7 +684,9 @@ StatusCode S3FileSystem::downloadModelVersions(const std::string& path,
         return sc;
     }
 
+    // Objects of all versions are downloaded together to use all connections
     StatusCode result = StatusCode::OK;
+    std::vector<ObjectToDownload> objects;
     for (auto& ver : versions) {
         std::string versionpath = path;
         if (!endsWith(versionpath, "/")) {
@@ -534,12 +699,17 @@ StatusCode S3FileSystem::downloadModelVersions(const std::string& path,
         }
         lpath.append(std::to_string(ver));
         fs::create_directory(lpath);
-        auto status = downloadFileFolder(versionpath, lpath);
+        auto status = listObjectsToDownload(versionpath, lpath, &objects);
         if (status != StatusCode::OK) {
             result = status;
             SPDLOG_LOGGER_ERROR(s3_logger, "Failed to download model version {}", versionpath);
         }
     }
+    auto status = downloadObjects(objects);
+    if (status != StatusCode::OK) {
+        result = status;
+        SPDLOG_LOGGER_ERROR(s3_logger, "Failed to download model versions from {}", path);
+    }
 
     return result;
 }
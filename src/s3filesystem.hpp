@@ -15,6 +15,7 @@
 //*****************************************************************************
 #pragma once
 
+#include <cstdint>
 #include <regex>
 #include <string>
 #include <vector>
@@ -34,8 +35,9 @@ public:
      * 
      * @param options 
      * @param s3_path 
+     * @param cache_dir directory where downloaded objects are kept with their ETags, caching is disabled when empty
      */
-    S3FileSystem(const Aws::SDKOptions& options, const std::string& s3_path);
+    S3FileSystem(const Aws::SDKOptions& options, const std::string& s3_path, const std::string& cache_dir = "");
 
     /**
      * @brief Destroy the S3FileSystem object
@@ -126,7 +128,51 @@ public:
 
     static const std::string S3_URL_PREFIX;
 
+    /**
+     * @brief Number of concurrent connections used for downloading objects
+     */
+    static constexpr size_t S3_DOWNLOAD_WORKERS = 8;
+
+    /**
+     * @brief Objects larger than this are downloaded in multiple ranges
+     */
+    static constexpr uint64_t S3_MULTIPART_THRESHOLD = 16 * 1024 * 1024;
+
+    static constexpr uint64_t S3_PART_SIZE = 8 * 1024 * 1024;
+
+    static constexpr uint64_t S3_MAX_PARTS_PER_OBJECT = 64;
+
+    static constexpr size_t S3_READ_BUFFER_SIZE = 256 * 1024;
+
 private:
+    struct ObjectToDownload {
+        std::string bucket;
+        std::string object;
+        std::string localPath;
+        std::string etag;
+        uint64_t size = 0;
+        bool restoredFromCache = false;
+    };
+
+    /**
+     * @brief Lists objects of a remote directory or a single object and creates local mirror of sub-directories
+     */
+    StatusCode listObjectsToDownload(const std::string& path, const std::string& local_path, std::vector<ObjectToDownload>* objects);
+
+    /**
+     * @brief Downloads objects concurrently, large objects are split into ranges
+     */
+    StatusCode downloadObjects(std::vector<ObjectToDownload>& objects);
+
+    StatusCode downloadObjectPart(const ObjectToDownload& object, int fd, uint64_t offset, uint64_t length);
+
+    /**
+     * @brief Copies object to its local path if the cache holds it with the same ETag and size
+     */
+    bool restoreFromCache(const ObjectToDownload& object);
+
+    void storeInCache(const ObjectToDownload& object);
+
     /**
      * @brief 
      * 
@@ -143,6 +189,8 @@ private:
      */
     Aws::SDKOptions options_;
 
+    std::string cache_dir_;
+
     /**
      * @brief 
      * 
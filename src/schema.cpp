@@ -81,6 +81,18 @@ const char* MODELS_CONFIG_SCHEMA = R"({
 							"type": "integer",
 							"minimum": 0
 						},
+						"max_batch_size": {
+							"type": "integer",
+							"minimum": 0
+						},
+						"batch_timeout_us": {
+							"type": "integer",
+							"minimum": 0
+						},
+						"cache_size_mb": {
+							"type": "integer",
+							"minimum": 0
+						},
 						"target_device": {
 							"type": "string"
 						},
@@ -96,6 +108,22 @@ const char* MODELS_CONFIG_SCHEMA = R"({
 						"low_latency_transformation": {
 							"type": "boolean"
 						},
+						"infer_request_affinity": {
+							"type": "boolean"
+						},
+						"idle_sequence_timeout_seconds": {
+							"type": "integer",
+							"minimum": 0
+						},
+						"state_memory_budget_mb": {
+							"type": "integer",
+							"minimum": 0,
+							"maximum": 4294967295
+						},
+						"cold_state_storage": {
+							"type": "string",
+							"enum": ["file", "fp16"]
+						},
 						"max_sequence_number": {
 							"type": "integer",
 							"minimum": 0
@@ -29,6 +29,49 @@ const sequence_memory_state_t& Sequence::getMemoryState() const {
     return memoryState;
 }
 
+size_t Sequence::getMemoryStateSize() const {
+    return memoryStateSize;
+}
+
+bool Sequence::isMemoryStateCold() const {
+    return coldMemoryState != nullptr;
+}
+
+Status Sequence::storeMemoryState(ColdStateStorage storage) {
+    if (isMemoryStateCold()) {
+        return StatusCode::OK;
+    }
+    auto status = ColdMemoryState::store(memoryState, storage, coldMemoryState);
+    if (!status.ok()) {
+        return status;
+    }
+    memoryState.clear();
+    memoryStateSize = 0;
+    return StatusCode::OK;
+}
+
+Status Sequence::restoreMemoryState() {
+    if (!isMemoryStateCold()) {
+        return StatusCode::OK;
+    }
+    sequence_memory_state_t restoredMemoryState;
+    auto status = coldMemoryState->restore(restoredMemoryState);
+    if (!status.ok()) {
+        return status;
+    }
+    memoryState = std::move(restoredMemoryState);
+    coldMemoryState = nullptr;
+    updateMemoryStateSize();
+    return StatusCode::OK;
+}
+
+void Sequence::updateMemoryStateSize() {
+    memoryStateSize = 0;
+    for (auto& [name, blob] : memoryState) {
+        memoryStateSize += blob->byteSize();
+    }
+}
+
 const bool Sequence::isIdle() const {
     return idle;
 }
@@ -48,6 +91,9 @@ Status Sequence::updateMemoryState(model_memory_state_t& newState) {
         }
         memoryState[stateName] = copyBlobPtr;
     }
+    // New state replaces the whole stored one
+    coldMemoryState = nullptr;
+    updateMemoryStateSize();
     setIdle(false);
     return StatusCode::OK;
 }
@@ -64,4 +110,32 @@ void Sequence::setTerminated() {
     this->terminated = true;
 }
 
+bool Sequence::isStreamed() const {
+    return streamed;
+}
+
+void Sequence::setStreamed() {
+    this->streamed = true;
+}
+
+bool Sequence::isRemoved() const {
+    return removed.load();
+}
+
+void Sequence::setRemoved() {
+    this->removed = true;
+}
+
+const std::chrono::steady_clock::time_point Sequence::getCreationTime() const {
+    return creationTime;
+}
+
+const std::chrono::steady_clock::time_point Sequence::getLastActivityTime() const {
+    return lastActivityTime;
+}
+
+void Sequence::setLastActivityTime(std::chrono::steady_clock::time_point lastActivityTime) {
+    this->lastActivityTime = lastActivityTime;
+}
+
 }  // namespace ovms
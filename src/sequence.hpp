@@ -15,6 +15,7 @@
 //*****************************************************************************
 #pragma once
 
+#include <atomic>
 #include <chrono>
 #include <memory>
 #include <mutex>
@@ -24,28 +25,46 @@
 
 #include <spdlog/spdlog.h>
 
+#include "cold_memory_state.hpp"
 #include "ov_utils.hpp"
 #include "status.hpp"
 
 namespace ovms {
 
-using sequence_memory_state_t = std::unordered_map<std::string, InferenceEngine::Blob::Ptr>;
 using model_memory_state_t = std::vector<InferenceEngine::VariableState>;
 
 class Sequence {
 private:
     uint64_t sequenceId;
     sequence_memory_state_t memoryState;
+    size_t memoryStateSize = 0;
+    std::unique_ptr<ColdMemoryState> coldMemoryState;
     std::mutex mutex;
     bool terminated;
     bool idle;
+    bool streamed;
+    std::atomic<bool> removed{false};
+    const std::chrono::steady_clock::time_point creationTime;
+    std::chrono::steady_clock::time_point lastActivityTime;
+
+    void updateMemoryStateSize();
 
 public:
     Sequence(uint64_t sequenceId) :
         sequenceId(sequenceId),
         terminated(false),
-        idle(false) {}
+        idle(false),
+        streamed(false),
+        creationTime(std::chrono::steady_clock::now()),
+        lastActivityTime(creationTime) {}
+    // Cold memory state has to be restored first
     const sequence_memory_state_t& getMemoryState() const;
+    // Number of bytes of memory state kept in full precision blobs
+    size_t getMemoryStateSize() const;
+    bool isMemoryStateCold() const;
+    // Replaces memory state blobs with compact cold memory state
+    Status storeMemoryState(ColdStateStorage storage);
+    Status restoreMemoryState();
     const uint64_t getId() const;
     const bool isIdle() const;
     void setIdle(bool idle = true);
@@ -54,6 +73,15 @@ public:
     std::mutex& getMutex();
     bool isTerminated() const;
     void setTerminated();
+    // Streamed sequence is accessed only by requests of its stream and is never removed as idle
+    bool isStreamed() const;
+    void setStreamed();
+    // Removed sequence may still be referenced, e.g. by infer request kept for it, but must not be accounted anymore
+    bool isRemoved() const;
+    void setRemoved();
+    const std::chrono::steady_clock::time_point getCreationTime() const;
+    const std::chrono::steady_clock::time_point getLastActivityTime() const;
+    void setLastActivityTime(std::chrono::steady_clock::time_point lastActivityTime);
 };
 
 }  // namespace ovms
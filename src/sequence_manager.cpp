@@ -17,60 +17,267 @@
 #include "sequence_manager.hpp"
 
 #include <utility>
+#include <vector>
 
 #include "logging.hpp"
 
 namespace ovms {
 
+static const std::vector<double> SEQUENCE_STATE_AGE_BUCKETS_SECONDS = {1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, 21600, 86400};
+
+SequenceManager::SequenceManager(uint32_t maxSequenceNumber, std::string modelName, model_version_t modelVersion, uint32_t idleSequenceTimeoutSeconds,
+    uint64_t stateMemoryBudget, ColdStateStorage coldStateStorage) :
+    maxSequenceNumber(maxSequenceNumber),
+    modelName(modelName),
+    modelVersion(modelVersion),
+    idleSequenceTimeout(idleSequenceTimeoutSeconds),
+    expirationWheel(EXPIRATION_TICK),
+    stateMemoryBudget(stateMemoryBudget),
+    coldStateStorage(coldStateStorage),
+    idleEvictionsMetric(MetricRegistry::getInstance()
+                            .counter("ovms_sequence_idle_evictions_total", "Sequences removed after being inactive")
+                            .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    stateAgeMetric(MetricRegistry::getInstance()
+                       .histogram("ovms_sequence_state_age_seconds", "Time sequence memory state was held, observed when sequence is removed", SEQUENCE_STATE_AGE_BUCKETS_SECONDS)
+                       .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    stateMemoryMetric(MetricRegistry::getInstance()
+                          .gauge("ovms_sequence_state_memory_bytes", "Size of full precision memory state kept by sequences")
+                          .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    coldStateStoresMetric(MetricRegistry::getInstance()
+                              .counter("ovms_sequence_cold_state_stores_total", "Memory states of sequences moved to cold state storage to stay within state memory budget")
+                              .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    coldStateRestoresMetric(MetricRegistry::getInstance()
+                                .counter("ovms_sequence_cold_state_restores_total", "Memory states of sequences restored from cold state storage")
+                                .labeled({{"name", modelName}, {"version", std::to_string(modelVersion)}})),
+    sequenceIdCounter(1) {}
+
 uint64_t SequenceManager::getUniqueSequenceId() {
     SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "No sequence id has been provided on SEQUENCE_START. Seeking unique sequence id...");
-    bool uniqueIdFound = false;
-    while (!uniqueIdFound) {
-        if (sequenceExists(this->sequenceIdCounter) || this->sequenceIdCounter == 0)
-            this->sequenceIdCounter++;
-        else
-            uniqueIdFound = true;
+    while (true) {
+        // Each caller reserves different id, only ids taken by sequences started with explicit id are skipped
+        uint64_t sequenceId = this->sequenceIdCounter.fetch_add(1);
+        if (sequenceId == 0)
+            continue;
+        std::lock_guard<std::mutex> bucketLock(getMutex(sequenceId));
+        if (!sequenceExists(sequenceId)) {
+            SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Found unique sequence id: {}", sequenceId);
+            return sequenceId;
+        }
     }
-    SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Found unique sequence id: {}", this->sequenceIdCounter);
-    return this->sequenceIdCounter;
 }
 
 const uint32_t SequenceManager::getMaxSequenceNumber() const {
-    return maxSequenceNumber;
+    return maxSequenceNumber.load();
 }
 
 void SequenceManager::setMaxSequenceNumber(uint32_t maxSequenceNumber) {
     this->maxSequenceNumber = maxSequenceNumber;
 }
 
-std::mutex& SequenceManager::getMutex() {
-    return mutex;
+std::mutex& SequenceManager::getMutex(const uint64_t sequenceId) {
+    return getBucket(sequenceId).mutex;
+}
+
+std::unique_lock<std::mutex> SequenceManager::lockSequencesBucket(SequenceProcessingSpec& sequenceProcessingSpec) {
+    if (sequenceProcessingSpec.getSequenceControlInput() != SEQUENCE_START || sequenceProcessingSpec.getSequenceId() != 0) {
+        return std::unique_lock<std::mutex>(getMutex(sequenceProcessingSpec.getSequenceId()));
+    }
+    while (true) {
+        uint64_t sequenceId = getUniqueSequenceId();
+        std::unique_lock<std::mutex> bucketLock(getMutex(sequenceId));
+        // Id could have been taken by sequence started with explicit id after it was reserved
+        if (!sequenceExists(sequenceId)) {
+            sequenceProcessingSpec.setSequenceId(sequenceId);
+            return bucketLock;
+        }
+    }
 }
 
 bool SequenceManager::sequenceExists(const uint64_t sequenceId) const {
+    const auto& sequences = getBucket(sequenceId).sequences;
     return sequences.find(sequenceId) != sequences.end();
 }
 
 Status SequenceManager::removeIdleSequences() {
-    std::unique_lock<std::mutex> sequenceManagerLock(mutex);
-    for (auto it = sequences.begin(); it != sequences.end();) {
-        Sequence& sequence = it->second;
-        // Non blocking try to get mutex
-        std::unique_lock<std::mutex> sequenceLock(sequence.getMutex(), std::try_to_lock);
-        if (!sequence.isTerminated() && sequenceLock.owns_lock()) {
-            sequenceLock.unlock();
-            // We hold sequence manager lock before lock and after unlock so no other thread even attempts accessing that sequence at that moment
-            if (sequence.isIdle()) {
-                SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "[Idle sequence cleanup] Removing sequence with id: {} on model {}, version: {}", sequence.getId(), modelName, modelVersion);
-                it = sequences.erase(it);
+    for (auto& bucket : buckets) {
+        std::unique_lock<std::mutex> bucketLock(bucket.mutex);
+        for (auto it = bucket.sequences.begin(); it != bucket.sequences.end();) {
+            Sequence& sequence = *it->second;
+            // Streamed sequence is removed when its stream ends
+            if (sequence.isStreamed()) {
+                ++it;
+                continue;
+            }
+            // Non blocking try to get mutex
+            std::unique_lock<std::mutex> sequenceLock(sequence.getMutex(), std::try_to_lock);
+            if (!sequence.isTerminated() && sequenceLock.owns_lock()) {
+                sequenceLock.unlock();
+                // We hold bucket lock before lock and after unlock so no other thread even attempts accessing that sequence at that moment
+                if (sequence.isIdle()) {
+                    SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "[Idle sequence cleanup] Removing sequence with id: {} on model {}, version: {}", sequence.getId(), modelName, modelVersion);
+                    onSequenceRemoved(sequence, true);
+                    it = bucket.sequences.erase(it);
+                    continue;
+                } else {
+                    sequence.setIdle();
+                }
+            }
+            ++it;
+        }
+    }
+
+    return StatusCode::OK;
+}
+
+Status SequenceManager::removeExpiredSequences(std::chrono::steady_clock::time_point now) {
+    if (idleSequenceTimeout == std::chrono::seconds::zero())
+        return StatusCode::OK;
+    std::vector<std::weak_ptr<Sequence>> expired;
+    {
+        std::lock_guard<std::mutex> expirationLock(expirationMutex);
+        expirationWheel.advance(now, expired);
+    }
+    for (auto& weakSequence : expired) {
+        std::shared_ptr<Sequence> sequence = weakSequence.lock();
+        if (!sequence)
+            continue;
+        const uint64_t sequenceId = sequence->getId();
+        std::unique_lock<std::mutex> bucketLock(getMutex(sequenceId));
+        auto& sequences = getBucket(sequenceId).sequences;
+        auto it = sequences.find(sequenceId);
+        // Sequence was already removed, other sequence may have been started with the same id since then
+        if (it == sequences.end() || it->second != sequence)
+            continue;
+        // Streamed sequence does not expire, it is removed when its stream ends
+        if (sequence->isStreamed())
+            continue;
+        std::unique_lock<std::mutex> sequenceLock(sequence->getMutex(), std::try_to_lock);
+        if (!sequenceLock.owns_lock() || sequence->isTerminated()) {
+            // Sequence is being processed right now
+            scheduleExpiration(sequence, now + idleSequenceTimeout);
+            continue;
+        }
+        sequenceLock.unlock();
+        const auto expiration = sequence->getLastActivityTime() + idleSequenceTimeout;
+        if (expiration > now) {
+            scheduleExpiration(sequence, expiration);
+            continue;
+        }
+        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "[Idle sequence timeout] Removing sequence with id: {} on model {}, version: {}", sequenceId, modelName, modelVersion);
+        onSequenceRemoved(*sequence, true);
+        sequences.erase(it);
+    }
+    return StatusCode::OK;
+}
+
+void SequenceManager::scheduleExpiration(const std::shared_ptr<Sequence>& sequence, std::chrono::steady_clock::time_point expiration) {
+    std::lock_guard<std::mutex> expirationLock(expirationMutex);
+    expirationWheel.schedule(sequence, expiration);
+}
+
+void SequenceManager::onSequenceRemoved(Sequence& sequence, bool idle) {
+    sequencesCount--;
+    sequence.setRemoved();
+    releaseHotMemoryState(sequence.getId());
+    if (sequenceRemovedCallback) {
+        sequenceRemovedCallback(sequence);
+    }
+    if (idle) {
+        idleEvictionsMetric.increment();
+    }
+    std::chrono::duration<double> age = std::chrono::steady_clock::now() - sequence.getCreationTime();
+    stateAgeMetric.observe(age.count());
+}
+
+void SequenceManager::releaseHotMemoryState(uint64_t sequenceId) {
+    if (stateMemoryBudget == 0)
+        return;
+    std::lock_guard<std::mutex> stateMemoryLock(stateMemoryMutex);
+    auto it = hotMemoryStatesIndex.find(sequenceId);
+    if (it == hotMemoryStatesIndex.end())
+        return;
+    hotMemoryStateSize -= it->second->size;
+    hotMemoryStates.erase(it->second);
+    hotMemoryStatesIndex.erase(it);
+    stateMemoryMetric.set(hotMemoryStateSize);
+}
+
+void SequenceManager::setSequenceRemovedCallback(std::function<void(const Sequence&)> callback) {
+    sequenceRemovedCallback = std::move(callback);
+}
+
+uint64_t SequenceManager::getHotMemoryStateSize() {
+    std::lock_guard<std::mutex> stateMemoryLock(stateMemoryMutex);
+    return hotMemoryStateSize;
+}
+
+void SequenceManager::updateStateMemoryUsage(const std::shared_ptr<Sequence>& sequence) {
+    if (stateMemoryBudget == 0)
+        return;
+    const uint64_t sequenceId = sequence->getId();
+    std::vector<std::pair<std::shared_ptr<Sequence>, std::unique_lock<std::mutex>>> coldSequences;
+    releaseHotMemoryState(sequenceId);
+    {
+        std::lock_guard<std::mutex> stateMemoryLock(stateMemoryMutex);
+        const size_t size = sequence->getMemoryStateSize();
+        // Sequence is marked removed before its memory state is released, so removed sequence is never accounted again
+        if (size > 0 && !sequence->isRemoved()) {
+            hotMemoryStates.push_back(HotMemoryState{sequenceId, sequence, size});
+            hotMemoryStatesIndex[sequenceId] = std::prev(hotMemoryStates.end());
+            hotMemoryStateSize += size;
+        }
+        for (auto it = hotMemoryStates.begin(); hotMemoryStateSize > stateMemoryBudget && it != hotMemoryStates.end();) {
+            std::shared_ptr<Sequence> coldSequence = it->sequence.lock();
+            if (!coldSequence) {
+                // Memory state of destroyed sequence is not held anymore
+                hotMemoryStateSize -= it->size;
+                auto indexIt = hotMemoryStatesIndex.find(it->sequenceId);
+                if (indexIt != hotMemoryStatesIndex.end() && indexIt->second == it) {
+                    hotMemoryStatesIndex.erase(indexIt);
+                }
+                it = hotMemoryStates.erase(it);
                 continue;
-            } else {
-                sequence.setIdle();
             }
+            if (coldSequence == sequence) {
+                ++it;
+                continue;
+            }
+            // Only try locking, sequence being processed will be accounted again after its request
+            std::unique_lock<std::mutex> sequenceLock(coldSequence->getMutex(), std::try_to_lock);
+            if (!sequenceLock.owns_lock()) {
+                ++it;
+                continue;
+            }
+            hotMemoryStateSize -= it->size;
+            hotMemoryStatesIndex.erase(coldSequence->getId());
+            it = hotMemoryStates.erase(it);
+            coldSequences.emplace_back(std::move(coldSequence), std::move(sequenceLock));
         }
-        ++it;
+        stateMemoryMetric.set(hotMemoryStateSize);
     }
+    // Selected sequences stay locked, so they are stored outside of state memory lock
+    for (auto& [coldSequence, sequenceLock] : coldSequences) {
+        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Moving memory state of sequence with ID: {} to cold state storage", modelName, modelVersion, coldSequence->getId());
+        auto status = coldSequence->storeMemoryState(coldStateStorage);
+        if (!status.ok()) {
+            SPDLOG_LOGGER_WARN(sequence_manager_logger, "Model {} version {} Could not move memory state of sequence with ID: {} to cold state storage: {}",
+                modelName, modelVersion, coldSequence->getId(), status.string());
+            continue;
+        }
+        coldStateStoresMetric.increment();
+    }
+}
 
+Status SequenceManager::restoreMemoryState(Sequence& sequence) {
+    if (!sequence.isMemoryStateCold())
+        return StatusCode::OK;
+    auto status = sequence.restoreMemoryState();
+    if (!status.ok()) {
+        SPDLOG_LOGGER_ERROR(sequence_manager_logger, "Model {} version {} Could not restore memory state of sequence with ID: {}: {}",
+            modelName, modelVersion, sequence.getId(), status.string());
+        return status;
+    }
+    coldStateRestoresMetric.increment();
     return StatusCode::OK;
 }
 
@@ -78,6 +285,9 @@ Status SequenceManager::hasSequence(const uint64_t sequenceId) {
     if (!sequenceExists(sequenceId))
         return StatusCode::SEQUENCE_MISSING;
 
+    if (getSequence(sequenceId).isStreamed())
+        return StatusCode::SEQUENCE_STREAMED;
+
     if (getSequence(sequenceId).isTerminated())
         return StatusCode::SEQUENCE_MISSING;
 
@@ -85,19 +295,12 @@ Status SequenceManager::hasSequence(const uint64_t sequenceId) {
 }
 
 Status SequenceManager::createSequence(SequenceProcessingSpec& sequenceProcessingSpec) {
-    if (sequences.size() >= this->maxSequenceNumber) {
-        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Max sequence number has been reached. Could not create new sequence.", modelName, modelVersion);
-        return StatusCode::MAX_SEQUENCE_NUMBER_REACHED;
-    }
-
-    uint64_t sequenceId = sequenceProcessingSpec.getSequenceId();
+    const uint64_t sequenceId = sequenceProcessingSpec.getSequenceId();
 
+    // Id is assigned by lockSequencesBucket, so the bucket the sequence is added to is already locked
     if (sequenceId == 0) {
-        uint64_t uniqueSequenceId = getUniqueSequenceId();
-        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Adding new sequence with ID: {}", modelName, modelVersion, uniqueSequenceId);
-        sequences.emplace(uniqueSequenceId, uniqueSequenceId);
-        sequenceProcessingSpec.setSequenceId(uniqueSequenceId);
-        return StatusCode::OK;
+        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Sequence ID has not been assigned before creating sequence", modelName, modelVersion);
+        return StatusCode::SEQUENCE_ID_NOT_PROVIDED;
     }
 
     if (sequenceExists(sequenceId)) {
@@ -107,9 +310,22 @@ Status SequenceManager::createSequence(SequenceProcessingSpec& sequenceProcessin
         }
         SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Sequence with provided ID already exists", modelName, modelVersion);
         return StatusCode::SEQUENCE_ALREADY_EXISTS;
-    } else {
-        SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Adding new sequence with ID: {}", modelName, modelVersion, sequenceId);
-        sequences.emplace(sequenceId, sequenceId);
+    }
+
+    // Reserve place for the sequence without locking other buckets
+    uint64_t currentSequencesCount = sequencesCount.load();
+    do {
+        if (currentSequencesCount >= this->maxSequenceNumber) {
+            SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Max sequence number has been reached. Could not create new sequence.", modelName, modelVersion);
+            return StatusCode::MAX_SEQUENCE_NUMBER_REACHED;
+        }
+    } while (!sequencesCount.compare_exchange_weak(currentSequencesCount, currentSequencesCount + 1));
+
+    SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Adding new sequence with ID: {}", modelName, modelVersion, sequenceId);
+    auto sequence = std::make_shared<Sequence>(sequenceId);
+    getBucket(sequenceId).sequences.emplace(sequenceId, sequence);
+    if (idleSequenceTimeout != std::chrono::seconds::zero()) {
+        scheduleExpiration(sequence, sequence->getCreationTime() + idleSequenceTimeout);
     }
     return StatusCode::OK;
 }
@@ -124,13 +340,19 @@ Status SequenceManager::terminateSequence(const uint64_t sequenceId) {
 }
 
 Sequence& SequenceManager::getSequence(const uint64_t sequenceId) {
-    return sequences.at(sequenceId);
+    return *getBucket(sequenceId).sequences.at(sequenceId);
+}
+
+std::shared_ptr<Sequence> SequenceManager::getSequencePtr(const uint64_t sequenceId) {
+    return getBucket(sequenceId).sequences.at(sequenceId);
 }
 
 Status SequenceManager::removeSequence(const uint64_t sequenceId) {
+    auto& sequences = getBucket(sequenceId).sequences;
     auto it = sequences.find(sequenceId);
     if (it != sequences.end()) {
         SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} versions {} Removing sequence with ID: {}", modelName, modelVersion, sequenceId);
+        onSequenceRemoved(*it->second, false);
         sequences.erase(it);
     } else {
         SPDLOG_LOGGER_DEBUG(sequence_manager_logger, "Model {} version {} Sequence with provided ID does not exists", modelName, modelVersion);
@@ -151,6 +373,9 @@ Status SequenceManager::processRequestedSpec(SequenceProcessingSpec& sequencePro
     } else {  // sequenceControlInput == SEQUENCE_END
         status = terminateSequence(sequenceId);
     }
+    if (status.ok() && sequenceControlInput != SEQUENCE_START) {
+        getSequence(sequenceId).setLastActivityTime(std::chrono::steady_clock::now());
+    }
     return status;
 }
 
@@ -16,15 +16,22 @@
 
 #pragma once
 
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <functional>
+#include <list>
 #include <memory>
 #include <mutex>
 #include <string>
 #include <unordered_map>
 
+#include "metrics.hpp"
 #include "modelversion.hpp"
 #include "sequence.hpp"
 #include "sequence_processing_spec.hpp"
 #include "status.hpp"
+#include "timingwheel.hpp"
 
 namespace ovms {
 
@@ -33,51 +40,183 @@ const uint32_t SEQUENCE_START = 1;
 const uint32_t SEQUENCE_END = 2;
 
 class SequenceManager {
+public:
+    /**
+     * @brief Number of lock striped buckets sequences are distributed into by their ids
+     */
+    static constexpr uint32_t SEQUENCES_BUCKETS_COUNT = 64;
+
+    /**
+     * @brief Granularity of idle sequence timeouts
+     */
+    static constexpr std::chrono::seconds EXPIRATION_TICK{1};
+
 private:
-    uint32_t maxSequenceNumber;
+    struct SequencesBucket {
+        std::mutex mutex;
+        std::unordered_map<uint64_t, std::shared_ptr<Sequence>> sequences;
+    };
+
+    std::atomic<uint32_t> maxSequenceNumber;
     std::string modelName;
     model_version_t modelVersion;
-    std::mutex mutex;
+    std::array<SequencesBucket, SEQUENCES_BUCKETS_COUNT> buckets;
+    std::atomic<uint64_t> sequencesCount{0};
+
+    const std::chrono::seconds idleSequenceTimeout;
+    // used to block parallel access to expiration wheel, may be locked while holding bucket lock
+    std::mutex expirationMutex;
+    TimingWheel<std::weak_ptr<Sequence>> expirationWheel;
+
+    struct HotMemoryState {
+        uint64_t sequenceId;
+        std::weak_ptr<Sequence> sequence;
+        size_t size;
+    };
+
+    const uint64_t stateMemoryBudget;
+    const ColdStateStorage coldStateStorage;
+    // used to block parallel access to hot memory states, may be locked while holding bucket or sequence lock
+    std::mutex stateMemoryMutex;
+    // sequences with full precision memory state, least recently used first
+    std::list<HotMemoryState> hotMemoryStates;
+    std::unordered_map<uint64_t, std::list<HotMemoryState>::iterator> hotMemoryStatesIndex;
+    uint64_t hotMemoryStateSize = 0;
+
+    // called under the bucket lock for every sequence removed from the manager
+    std::function<void(const Sequence&)> sequenceRemovedCallback;
+
+    MetricCounter& idleEvictionsMetric;
+    MetricHistogram& stateAgeMetric;
+    MetricGauge& stateMemoryMetric;
+    MetricCounter& coldStateStoresMetric;
+    MetricCounter& coldStateRestoresMetric;
+
+    SequencesBucket& getBucket(const uint64_t sequenceId) {
+        return buckets[sequenceId % SEQUENCES_BUCKETS_COUNT];
+    }
 
-protected:
-    std::unordered_map<uint64_t, Sequence> sequences;
+    const SequencesBucket& getBucket(const uint64_t sequenceId) const {
+        return buckets[sequenceId % SEQUENCES_BUCKETS_COUNT];
+    }
+
+    void scheduleExpiration(const std::shared_ptr<Sequence>& sequence, std::chrono::steady_clock::time_point expiration);
+
+    /**
+     * @brief Marks sequence removed from the bucket, updates sequences count and metrics
+     */
+    void onSequenceRemoved(Sequence& sequence, bool idle);
 
-    uint64_t sequenceIdCounter;
+    void releaseHotMemoryState(uint64_t sequenceId);
 
+protected:
+    std::atomic<uint64_t> sequenceIdCounter;
+
+    /**
+     * @brief Reserves id not used by any sequence, must not be called while holding any bucket lock
+     */
     uint64_t getUniqueSequenceId();
 
     Status hasSequence(const uint64_t sequenceId);
 
+    /**
+     * @brief Creates sequence, reserving place for it within max sequence number
+     *
+     * Sequence id has to be assigned by lockSequencesBucket first, sequence without id is rejected.
+     */
     Status createSequence(SequenceProcessingSpec& sequenceProcessingSpec);
 
     Status terminateSequence(const uint64_t sequenceId);
 
 public:
-    SequenceManager() = default;
-    SequenceManager(uint32_t maxSequenceNumber, std::string modelName, model_version_t modelVersion) :
-        maxSequenceNumber(maxSequenceNumber),
-        modelName(modelName),
-        modelVersion(modelVersion),
-        sequenceIdCounter(1) {}
-
-    uint64_t getSequencesCount() {
-        return sequences.size();
+    SequenceManager(uint32_t maxSequenceNumber, std::string modelName, model_version_t modelVersion, uint32_t idleSequenceTimeoutSeconds = 0,
+        uint64_t stateMemoryBudget = 0, ColdStateStorage coldStateStorage = ColdStateStorage::FILE);
+
+    uint64_t getSequencesCount() const {
+        return sequencesCount.load();
     }
 
     const uint32_t getMaxSequenceNumber() const;
 
     void setMaxSequenceNumber(uint32_t maxSequenceNumber);
 
-    std::mutex& getMutex();
+    /**
+     * @brief Time after which inactive sequence is removed by removeExpiredSequences, zero if sequences do not expire
+     */
+    std::chrono::seconds getIdleSequenceTimeout() const {
+        return idleSequenceTimeout;
+    }
+
+    /**
+     * @brief Number of bytes of full precision memory state kept by sequences, zero if not limited
+     */
+    uint64_t getStateMemoryBudget() const {
+        return stateMemoryBudget;
+    }
+
+    uint64_t getHotMemoryStateSize();
+
+    /**
+     * @brief Sets function called for every removed sequence while its bucket is locked
+     *
+     * Has to be set before sequences are processed. The callback must not lock any bucket or sequence.
+     */
+    void setSequenceRemovedCallback(std::function<void(const Sequence&)> callback);
+
+    /**
+     * @brief Accounts memory state of sequence locked by the caller as the most recently used
+     *
+     * When state memory budget is exceeded, memory state of least recently used sequences which are not locked
+     * is moved to cold state storage.
+     */
+    void updateStateMemoryUsage(const std::shared_ptr<Sequence>& sequence);
+
+    /**
+     * @brief Restores cold memory state of sequence locked by the caller
+     */
+    Status restoreMemoryState(Sequence& sequence);
+
+    /**
+     * @brief Gets mutex of the bucket holding sequence with provided id
+     *
+     * Bucket lock has to be held while accessing sequences of the bucket. Sequence mutex may be locked while holding
+     * the bucket lock, not the other way round.
+     */
+    std::mutex& getMutex(const uint64_t sequenceId);
+
+    /**
+     * @brief Locks bucket of the requested sequence
+     *
+     * On SEQUENCE_START without sequence id, unique id is assigned to the spec first.
+     */
+    std::unique_lock<std::mutex> lockSequencesBucket(SequenceProcessingSpec& sequenceProcessingSpec);
 
     bool sequenceExists(const uint64_t sequenceId) const;
 
     Sequence& getSequence(const uint64_t sequenceId);
 
+    /**
+     * @brief Gets shared ownership of the sequence, which keeps it alive after removal from the manager
+     */
+    std::shared_ptr<Sequence> getSequencePtr(const uint64_t sequenceId);
+
     Status removeSequence(const uint64_t sequenceId);
 
+    /**
+     * @brief Removes idle sequences and marks remaining ones as idle, locking one bucket at a time
+     */
     Status removeIdleSequences();
 
+    /**
+     * @brief Removes sequences inactive for longer than idle sequence timeout
+     *
+     * Only sequences which could have expired until now are checked, sequences active in the meantime are scheduled again.
+     */
+    Status removeExpiredSequences(std::chrono::steady_clock::time_point now = std::chrono::steady_clock::now());
+
+    /**
+     * @brief Processes control input of the request, bucket of the sequence has to be locked by the caller
+     */
     Status processRequestedSpec(SequenceProcessingSpec& sequenceProcessingSpec);
 };
 }  // namespace ovms
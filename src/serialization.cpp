@@ -15,6 +15,8 @@
 //*****************************************************************************
 #include "serialization.hpp"
 
+#include "prediction_service_utils.hpp"
+
 namespace ovms {
 
 Status serializeBlobToTensorProto(
@@ -72,10 +74,14 @@ Status serializeBlobToTensorProto(
 Status serializePredictResponse(
     InferenceEngine::InferRequest& inferRequest,
     const tensor_map_t& outputMap,
-    tensorflow::serving::PredictResponse* response) {
+    tensorflow::serving::PredictResponse* response,
+    const google::protobuf::RepeatedPtrField<std::string>& outputFilter) {
 
     for (const auto& pair : outputMap) {
         auto networkOutput = pair.second;
+        if (!isOutputRequested(outputFilter, networkOutput->getMappedName())) {
+            continue;
+        }
         InferenceEngine::Blob::Ptr blob;
         try {
             blob = inferRequest.GetBlob(networkOutput->getName());
@@ -37,9 +37,13 @@ Status serializeBlobToTensorProto(
     const std::shared_ptr<TensorInfo>& networkOutput,
     InferenceEngine::Blob::Ptr blob);
 
+/**
+ * @brief Serializes network outputs selected by output filter to response
+ */
 Status serializePredictResponse(
     InferenceEngine::InferRequest& inferRequest,
     const tensor_map_t& outputMap,
-    tensorflow::serving::PredictResponse* response);
+    tensorflow::serving::PredictResponse* response,
+    const google::protobuf::RepeatedPtrField<std::string>& outputFilter);
 
 }  // namespace ovms
@@ -35,6 +35,7 @@
 #include "model_service.hpp"
 #include "modelmanager.hpp"
 #include "prediction_service.hpp"
+#include "stateful_prediction_service.hpp"
 #include "stringutils.hpp"
 #include "version.hpp"
 
@@ -168,7 +169,8 @@ void installSignalHandlers() {
 
 std::vector<std::unique_ptr<Server>> startGRPCServer(
     PredictionServiceImpl& predict_service,
-    ModelServiceImpl& model_service) {
+    ModelServiceImpl& model_service,
+    StatefulPredictionServiceImpl& stateful_predict_service) {
     const int GIGABYTE = 1024 * 1024 * 1024;
 
     std::vector<GrpcChannelArgument> channel_arguments;
@@ -193,6 +195,7 @@ std::vector<std::unique_ptr<Server>> startGRPCServer(
     builder.AddListeningPort(config.grpcBindAddress() + ":" + std::to_string(config.port()), grpc::InsecureServerCredentials());
     builder.RegisterService(&predict_service);
     builder.RegisterService(&model_service);
+    builder.RegisterService(&stateful_predict_service);
     for (const GrpcChannelArgument& channel_argument : channel_arguments) {
         // gRPC accept arguments of two types, int and string. We will attempt to
         // parse each arg as int and pass it on as such if successful. Otherwise we
@@ -257,8 +260,9 @@ int server_main(int argc, char** argv) {
 
         PredictionServiceImpl predict_service;
         ModelServiceImpl model_service;
+        StatefulPredictionServiceImpl stateful_predict_service;
 
-        auto grpc = startGRPCServer(predict_service, model_service);
+        auto grpc = startGRPCServer(predict_service, model_service, stateful_predict_service);
         auto rest = startRESTServer();
 
         while (!shutdown_request) {
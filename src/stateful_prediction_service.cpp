@@ -0,0 +1,102 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "stateful_prediction_service.hpp"
+
+#include <memory>
+
+#include <spdlog/spdlog.h>
+
+#include "metrics.hpp"
+#include "modelinstanceunloadguard.hpp"
+#include "modelmanager.hpp"
+#include "statefulmodelinstance.hpp"
+#include "status.hpp"
+#include "timer.hpp"
+
+using grpc::ServerContext;
+using grpc::ServerReaderWriter;
+
+using tensorflow::serving::PredictRequest;
+using tensorflow::serving::PredictResponse;
+
+namespace ovms {
+
+grpc::Status StatefulPredictionServiceImpl::PredictStream(
+    ServerContext* context,
+    ServerReaderWriter<PredictResponse, PredictRequest>* stream) {
+    PredictRequest request;
+    if (!stream->Read(&request))
+        return grpc::Status::OK;
+    SPDLOG_DEBUG("Processing gRPC stream for model: {}; version: {}",
+        request.model_spec().name(),
+        request.model_spec().version().value());
+
+    // Model instance is resolved once for the whole stream, model_spec of following requests is ignored
+    std::shared_ptr<ModelInstance> modelInstance;
+    std::unique_ptr<ModelInstanceUnloadGuard> modelInstanceUnloadGuard;
+    auto status = ModelManager::getInstance().getModelInstance(request.model_spec().name(), request.model_spec().version().value(), modelInstance, modelInstanceUnloadGuard);
+    if (!status.ok()) {
+        SPDLOG_INFO("Getting modelInstance failed. {}", status.string());
+        return status.grpc();
+    }
+    auto statefulModelInstance = std::dynamic_pointer_cast<StatefulModelInstance>(modelInstance);
+    if (!statefulModelInstance) {
+        status = StatusCode::MODEL_NOT_STATEFUL;
+        SPDLOG_INFO("Model: {} version: {} cannot be streamed. {}", modelInstance->getName(), modelInstance->getVersion(), status.string());
+        return status.grpc();
+    }
+
+    Timer timer;
+    using std::chrono::microseconds;
+    SequenceStream sequenceStream;
+    static RequestMetrics grpcStreamRequestMetrics("grpc_stream");
+    grpc::Status result = grpc::Status::OK;
+    do {
+        RequestMetricsGuard requestMetrics(grpcStreamRequestMetrics);
+        timer.start("total");
+        // Model is not guarded between requests, so it can be reloaded while the stream is open
+        if (!modelInstanceUnloadGuard) {
+            status = statefulModelInstance->waitForLoaded(0, modelInstanceUnloadGuard);
+        }
+        PredictResponse response;
+        if (status.ok()) {
+            status = statefulModelInstance->inferSequenceStream(&request, &response, sequenceStream);
+        }
+        modelInstanceUnloadGuard.reset();
+        if (!status.ok()) {
+            SPDLOG_DEBUG("Processing request of gRPC stream failed. {}", status.string());
+            requestMetrics.setStatus(status);
+            result = status.grpc();
+            break;
+        }
+        if (!stream->Write(response)) {
+            SPDLOG_DEBUG("Writing response of gRPC stream failed, stream was closed by the client");
+            result = grpc::Status::CANCELLED;
+            break;
+        }
+        timer.stop("total");
+        SPDLOG_DEBUG("Total gRPC stream request processing time: {} ms", timer.elapsed<microseconds>("total") / 1000);
+    } while (stream->Read(&request));
+
+    // Sequence ends with the stream, also when it was closed without SEQUENCE_END request
+    if (sequenceStream.sequence && !sequenceStream.ended &&
+        statefulModelInstance->waitForLoaded(0, modelInstanceUnloadGuard).ok()) {
+        statefulModelInstance->endSequenceStream(sequenceStream);
+    }
+    return result;
+}
+
+}  // namespace ovms
@@ -15,6 +15,8 @@
 //*****************************************************************************
 #include "statefulmodelinstance.hpp"
 
+#include <future>
+
 #include "deserialization.hpp"
 #include "executingstreamidguard.hpp"
 #include "logging.hpp"
@@ -110,12 +112,26 @@ void StatefulModelInstance::unloadModel(bool isPermanent, bool isError) {
         globalSequencesViewer->unregisterFromCleanup(getName(), getVersion());
     }
     ModelInstance::unloadModel(isPermanent, isError);
+    clearSequencesInferRequests();
     sequenceManager.reset();
 }
 
 Status StatefulModelInstance::loadModelImpl(const ModelConfig& config, const DynamicModelParameter& parameter) {
     performLowLatencyTransformation = config.isLowLatencyTransformationUsed();
-    sequenceManager = std::make_shared<SequenceManager>(config.getMaxSequenceNumber(), config.getName(), config.getVersion());
+    inferRequestAffinity = config.isInferRequestAffinityUsed();
+    clearSequencesInferRequests();
+    auto coldStateStorage = coldStateStorageFromString(config.getColdStateStorage());
+    if (!coldStateStorage) {
+        SPDLOG_LOGGER_ERROR(modelmanager_logger, "[Model: {} version: {}] Invalid cold state storage: {}", getName(), getVersion(), config.getColdStateStorage());
+        return StatusCode::MODEL_CONFIG_INVALID;
+    }
+    sequenceManager = std::make_shared<SequenceManager>(config.getMaxSequenceNumber(), config.getName(), config.getVersion(), config.getIdleSequenceTimeout(),
+        static_cast<uint64_t>(config.getStateMemoryBudgetMb()) * 1024 * 1024, coldStateStorage.value());
+    if (inferRequestAffinity) {
+        sequenceManager->setSequenceRemovedCallback([this](const Sequence& sequence) {
+            releaseSequenceInferRequest(sequence);
+        });
+    }
     return ModelInstance::loadModelImpl(config, parameter);
 }
 
@@ -142,7 +158,7 @@ const Status StatefulModelInstance::validateNumberOfInputs(const tensorflow::ser
     return ModelInstance::validateNumberOfInputs(request, completeInputsNumber);
 }
 
-const Status StatefulModelInstance::validateSpecialKeys(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec) {
+const Status StatefulModelInstance::extractSpecialKeys(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec) {
     uint64_t sequenceId = 0;
     uint32_t sequenceControlInput = 0;
     Status status;
@@ -162,9 +178,6 @@ const Status StatefulModelInstance::validateSpecialKeys(const tensorflow::servin
     if (sequenceControlInput != SEQUENCE_END && sequenceControlInput != NO_CONTROL_INPUT && sequenceControlInput != SEQUENCE_START) {
         return StatusCode::INVALID_SEQUENCE_CONTROL_INPUT;
     }
-    if ((sequenceControlInput == SEQUENCE_END || sequenceControlInput == NO_CONTROL_INPUT) && sequenceId == 0) {
-        return StatusCode::SEQUENCE_ID_NOT_PROVIDED;
-    }
 
     sequenceProcessingSpec.setSequenceId(sequenceId);
     sequenceProcessingSpec.setSequenceControlInput(sequenceControlInput);
@@ -172,6 +185,19 @@ const Status StatefulModelInstance::validateSpecialKeys(const tensorflow::servin
     return StatusCode::OK;
 }
 
+const Status StatefulModelInstance::validateSpecialKeys(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec) {
+    auto status = extractSpecialKeys(request, sequenceProcessingSpec);
+    if (!status.ok())
+        return status;
+
+    const uint32_t sequenceControlInput = sequenceProcessingSpec.getSequenceControlInput();
+    if ((sequenceControlInput == SEQUENCE_END || sequenceControlInput == NO_CONTROL_INPUT) && sequenceProcessingSpec.getSequenceId() == 0) {
+        return StatusCode::SEQUENCE_ID_NOT_PROVIDED;
+    }
+
+    return StatusCode::OK;
+}
+
 const Status StatefulModelInstance::validate(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec) {
     auto status = validateSpecialKeys(request, sequenceProcessingSpec);
     if (!status.ok())
@@ -180,27 +206,126 @@ const Status StatefulModelInstance::validate(const tensorflow::serving::PredictR
     return ModelInstance::validate(request);
 }
 
+const Status StatefulModelInstance::validateStreamRequest(const tensorflow::serving::PredictRequest* request, const SequenceStream& stream, SequenceProcessingSpec& sequenceProcessingSpec) {
+    auto status = extractSpecialKeys(request, sequenceProcessingSpec);
+    if (!status.ok())
+        return status;
+
+    const uint32_t sequenceControlInput = sequenceProcessingSpec.getSequenceControlInput();
+    if (!stream.sequence) {
+        // First request of the stream starts the sequence
+        if (sequenceControlInput == SEQUENCE_END)
+            return StatusCode::INVALID_SEQUENCE_CONTROL_INPUT;
+        sequenceProcessingSpec.setSequenceControlInput(SEQUENCE_START);
+    } else {
+        if (sequenceControlInput == SEQUENCE_START)
+            return StatusCode::INVALID_SEQUENCE_CONTROL_INPUT;
+        const uint64_t sequenceId = sequenceProcessingSpec.getSequenceId();
+        if (sequenceId != 0 && sequenceId != stream.sequence->getId()) {
+            SPDLOG_DEBUG("[Model: {} version: {}] Sequence id: {} does not match sequence id: {} of the stream", getName(), getVersion(), sequenceId, stream.sequence->getId());
+            return StatusCode::SEQUENCE_MISSING;
+        }
+        sequenceProcessingSpec.setSequenceId(stream.sequence->getId());
+    }
+
+    return ModelInstance::validate(request);
+}
+
 Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* requestProto,
     tensorflow::serving::PredictResponse* responseProto,
     std::unique_ptr<ModelInstanceUnloadGuard>& modelUnloadGuardPtr) {
-    Timer timer;
-    using std::chrono::microseconds;
     SequenceProcessingSpec sequenceProcessingSpec;
     auto status = validate(requestProto, sequenceProcessingSpec);
     if (!status.ok())
         return status;
 
-    std::unique_lock<std::mutex> sequenceManagerLock(sequenceManager->getMutex());
+    std::unique_lock<std::mutex> sequencesBucketLock = sequenceManager->lockSequencesBucket(sequenceProcessingSpec);
     status = sequenceManager->processRequestedSpec(sequenceProcessingSpec);
     if (!status.ok())
         return status;
     const uint64_t sequenceId = sequenceProcessingSpec.getSequenceId();
     if (!sequenceManager->sequenceExists(sequenceId))
         return StatusCode::INTERNAL_ERROR;
-    Sequence& sequence = sequenceManager->getSequence(sequenceId);
+    std::shared_ptr<Sequence> sequencePtr = sequenceManager->getSequencePtr(sequenceId);
 
-    std::unique_lock<std::mutex> sequenceLock(sequence.getMutex());
-    sequenceManagerLock.unlock();
+    std::unique_lock<std::mutex> sequenceLock(sequencePtr->getMutex());
+    sequencesBucketLock.unlock();
+
+    status = inferSequence(requestProto, responseProto, sequencePtr, sequenceProcessingSpec, sequenceLock);
+    if (!status.ok())
+        return status;
+    if (sequenceProcessingSpec.getSequenceControlInput() == SEQUENCE_END) {
+        sequencesBucketLock.lock();
+        status = sequenceManager->removeSequence(sequenceId);
+        if (!status.ok())
+            return status;
+    }
+
+    return StatusCode::OK;
+}
+
+Status StatefulModelInstance::inferSequenceStream(const tensorflow::serving::PredictRequest* requestProto,
+    tensorflow::serving::PredictResponse* responseProto,
+    SequenceStream& stream) {
+    if (stream.ended)
+        return StatusCode::SEQUENCE_TERMINATED;
+    if (stream.sequence && stream.sequenceManager != sequenceManager) {
+        SPDLOG_DEBUG("[Model: {} version: {}] Sequence with id: {} was removed when the model was reloaded", getName(), getVersion(), stream.sequence->getId());
+        return StatusCode::SEQUENCE_MISSING;
+    }
+    SequenceProcessingSpec sequenceProcessingSpec;
+    auto status = validateStreamRequest(requestProto, stream, sequenceProcessingSpec);
+    if (!status.ok())
+        return status;
+
+    if (!stream.sequence) {
+        std::unique_lock<std::mutex> sequencesBucketLock = sequenceManager->lockSequencesBucket(sequenceProcessingSpec);
+        status = sequenceManager->processRequestedSpec(sequenceProcessingSpec);
+        if (!status.ok())
+            return status;
+        stream.sequence = sequenceManager->getSequencePtr(sequenceProcessingSpec.getSequenceId());
+        stream.sequence->setStreamed();
+        stream.sequenceManager = sequenceManager;
+    }
+
+    // Streamed sequence cannot be removed by anyone else, so it is used without locking its bucket
+    std::unique_lock<std::mutex> sequenceLock(stream.sequence->getMutex());
+    status = inferSequence(requestProto, responseProto, stream.sequence, sequenceProcessingSpec, sequenceLock);
+    if (!status.ok())
+        return status;
+    if (sequenceProcessingSpec.getSequenceControlInput() == SEQUENCE_END) {
+        endSequenceStream(stream);
+    }
+
+    return StatusCode::OK;
+}
+
+void StatefulModelInstance::endSequenceStream(SequenceStream& stream) {
+    if (!stream.sequence || stream.ended)
+        return;
+    stream.ended = true;
+    // Sequences are dropped on model reload together with the sequence manager
+    if (stream.sequenceManager != sequenceManager)
+        return;
+    const uint64_t sequenceId = stream.sequence->getId();
+    // Infer request kept by the sequence is released on its removal
+    std::unique_lock<std::mutex> sequencesBucketLock(sequenceManager->getMutex(sequenceId));
+    SPDLOG_DEBUG("[Model: {} version: {}] Stream of sequence with id: {} ended", getName(), getVersion(), sequenceId);
+    sequenceManager->removeSequence(sequenceId);
+}
+
+Status StatefulModelInstance::inferSequence(const tensorflow::serving::PredictRequest* requestProto,
+    tensorflow::serving::PredictResponse* responseProto,
+    const std::shared_ptr<Sequence>& sequencePtr,
+    SequenceProcessingSpec& sequenceProcessingSpec,
+    std::unique_lock<std::mutex>& sequenceLock) {
+    if (inferRequestAffinity)
+        return inferWithInferRequestAffinity(requestProto, responseProto, sequencePtr, sequenceProcessingSpec, sequenceLock);
+
+    Timer timer;
+    using std::chrono::microseconds;
+    Sequence& sequence = *sequencePtr;
+    Status status;
 
     timer.start("get infer request");
     ExecutingStreamIdGuard executingStreamIdGuard(getInferRequestsQueue());
@@ -208,7 +333,7 @@ Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* r
     InferenceEngine::InferRequest& inferRequest = executingStreamIdGuard.getInferRequest();
     timer.stop("get infer request");
     SPDLOG_DEBUG("Getting infer req duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("get infer request") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("get infer request") / 1000);
 
     timer.start("preprocess");
     status = preInferenceProcessing(inferRequest, sequence, sequenceProcessingSpec);
@@ -216,7 +341,7 @@ Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* r
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Preprocessing duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("preprocess") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("preprocess") / 1000);
 
     timer.start("deserialize");
     status = deserializePredictRequest<ConcreteTensorProtoDeserializator>(*requestProto, getInputsInfo(), inferRequest);
@@ -224,7 +349,7 @@ Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* r
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Deserialization duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("deserialize") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("deserialize") / 1000);
 
     timer.start("prediction");
     status = performInference(inferRequest);
@@ -232,15 +357,15 @@ Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* r
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Prediction duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("prediction") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("prediction") / 1000);
 
     timer.start("serialize");
-    status = serializePredictResponse(inferRequest, getOutputsInfo(), responseProto);
+    status = serializePredictResponse(inferRequest, getOutputsInfo(), responseProto, requestProto->output_filter());
     timer.stop("serialize");
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Serialization duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("serialize") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("serialize") / 1000);
 
     timer.start("postprocess");
     status = postInferenceProcessing(responseProto, inferRequest, sequence, sequenceProcessingSpec);
@@ -248,28 +373,243 @@ Status StatefulModelInstance::infer(const tensorflow::serving::PredictRequest* r
     if (!status.ok())
         return status;
     SPDLOG_DEBUG("Postprocessing duration in model {}, version {}, nireq {}: {:.3f} ms",
-        requestProto->model_spec().name(), getVersion(), executingInferId, timer.elapsed<microseconds>("postprocess") / 1000);
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("postprocess") / 1000);
 
+    if (sequenceProcessingSpec.getSequenceControlInput() != SEQUENCE_END) {
+        sequenceManager->updateStateMemoryUsage(sequencePtr);
+    }
     sequenceLock.unlock();
-    if (sequenceProcessingSpec.getSequenceControlInput() == SEQUENCE_END) {
-        sequenceManagerLock.lock();
-        status = sequenceManager->removeSequence(sequenceId);
-        if (!status.ok())
-            return status;
+
+    return StatusCode::OK;
+}
+
+Status StatefulModelInstance::inferWithInferRequestAffinity(const tensorflow::serving::PredictRequest* requestProto,
+    tensorflow::serving::PredictResponse* responseProto,
+    const std::shared_ptr<Sequence>& sequencePtr,
+    SequenceProcessingSpec& sequenceProcessingSpec,
+    std::unique_lock<std::mutex>& sequenceLock) {
+    Timer timer;
+    using std::chrono::microseconds;
+    auto& inferRequestsQueue = getInferRequestsQueue();
+
+    Sequence& sequence = *sequencePtr;
+    const uint64_t sequenceId = sequence.getId();
+    const uint64_t sequencesCount = sequenceManager->getSequencesCount();
+    Status status;
+
+    // Kept infer request is taken right after locking the sequence, so evicting thread finds only infer requests of unlocked sequences
+    timer.start("get infer request");
+    int executingInferId = -1;
+    bool stateInInferRequest = false;
+    if (!takeSequenceInferRequest(sequence, executingInferId, stateInInferRequest)) {
+        executingInferId = acquireInferRequest();
+    }
+    InferenceEngine::InferRequest& inferRequest = inferRequestsQueue.getInferRequest(executingInferId);
+    timer.stop("get infer request");
+    SPDLOG_DEBUG("Getting infer req duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("get infer request") / 1000);
+
+    const uint32_t sequenceControlInput = sequenceProcessingSpec.getSequenceControlInput();
+    if (sequenceControlInput == SEQUENCE_START) {
+        stateInInferRequest = false;
+    }
+    // On failure infer request is returned, memory state kept in it has to be saved in the sequence first
+    auto returnInferRequest = [&inferRequestsQueue, &inferRequest, &sequence, stateInInferRequest, executingInferId]() {
+        if (stateInInferRequest) {
+            auto modelState = inferRequest.QueryState();
+            sequence.updateMemoryState(modelState);
+        }
+        inferRequestsQueue.returnStream(executingInferId);
+    };
+
+    timer.start("preprocess");
+    if (stateInInferRequest) {
+        stateCopiesAvoidedMetric.increment();
+    }
+    status = preInferenceProcessing(inferRequest, sequence, sequenceProcessingSpec, !stateInInferRequest);
+    timer.stop("preprocess");
+    if (!status.ok()) {
+        returnInferRequest();
+        return status;
     }
+    SPDLOG_DEBUG("Preprocessing duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("preprocess") / 1000);
+
+    timer.start("deserialize");
+    status = deserializePredictRequest<ConcreteTensorProtoDeserializator>(*requestProto, getInputsInfo(), inferRequest);
+    timer.stop("deserialize");
+    if (!status.ok()) {
+        returnInferRequest();
+        return status;
+    }
+    SPDLOG_DEBUG("Deserialization duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("deserialize") / 1000);
+
+    timer.start("prediction");
+    status = performInference(inferRequest);
+    timer.stop("prediction");
+    if (!status.ok()) {
+        returnInferRequest();
+        return status;
+    }
+    SPDLOG_DEBUG("Prediction duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("prediction") / 1000);
+
+    timer.start("serialize");
+    status = serializePredictResponse(inferRequest, getOutputsInfo(), responseProto, requestProto->output_filter());
+    timer.stop("serialize");
+    if (!status.ok()) {
+        returnInferRequest();
+        return status;
+    }
+    SPDLOG_DEBUG("Serialization duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("serialize") / 1000);
+
+    timer.start("postprocess");
+    // Sequence keeps infer request only while every sequence can have its own one and nobody waits for it.
+    // Sequence is unlocked under affinity lock, so evicting thread never finds kept infer request of locked sequence.
+    std::unique_lock<std::mutex> affinityLock(inferRequestAffinityMutex);
+    const bool keepInferRequest = sequenceControlInput != SEQUENCE_END &&
+                                  sequencesCount <= inferRequestsQueue.getInferRequestsCount() &&
+                                  inferRequestWaiters == 0;
+    if (keepInferRequest) {
+        sequencesInferRequests.emplace(sequenceId, KeptInferRequest{executingInferId, sequencePtr});
+        stateCopiesAvoidedMetric.increment();
+    } else {
+        affinityLock.unlock();
+    }
+    status = postInferenceProcessing(responseProto, inferRequest, sequence, sequenceProcessingSpec, !keepInferRequest);
+    timer.stop("postprocess");
+    if (status.ok() && sequenceControlInput != SEQUENCE_END) {
+        sequenceManager->updateStateMemoryUsage(sequencePtr);
+    }
+    sequenceLock.unlock();
+    if (keepInferRequest) {
+        affinityLock.unlock();
+    } else {
+        inferRequestsQueue.returnStream(executingInferId);
+    }
+    if (!status.ok())
+        return status;
+    SPDLOG_DEBUG("Postprocessing duration in model {}, version {}, nireq {}: {:.3f} ms",
+        getName(), getVersion(), executingInferId, timer.elapsed<microseconds>("postprocess") / 1000);
 
     return StatusCode::OK;
 }
 
+bool StatefulModelInstance::takeSequenceInferRequest(Sequence& sequence, int& streamId, bool& stateInInferRequest) {
+    std::lock_guard<std::mutex> affinityLock(inferRequestAffinityMutex);
+    auto it = sequencesInferRequests.find(sequence.getId());
+    if (it == sequencesInferRequests.end()) {
+        return false;
+    }
+    streamId = it->second.streamId;
+    stateInInferRequest = it->second.sequence.get() == &sequence;
+    sequencesInferRequests.erase(it);
+    return true;
+}
+
+int StatefulModelInstance::acquireInferRequest() {
+    auto& inferRequestsQueue = getInferRequestsQueue();
+    auto streamId = inferRequestsQueue.tryGetIdleStream();
+    if (streamId) {
+        return streamId.value();
+    }
+    {
+        std::lock_guard<std::mutex> affinityLock(inferRequestAffinityMutex);
+        inferRequestWaiters++;
+    }
+    auto streamIdFuture = inferRequestsQueue.getIdleStream();
+    // Evicting may fail while sequences are being checked by the cleaner, then it is retried
+    while (streamIdFuture.wait_for(std::chrono::milliseconds(0)) != std::future_status::ready) {
+        if (!evictSequenceInferRequest()) {
+            streamIdFuture.wait_for(INFER_REQUEST_EVICTION_RETRY_INTERVAL);
+        }
+    }
+    int id = streamIdFuture.get();
+    {
+        std::lock_guard<std::mutex> affinityLock(inferRequestAffinityMutex);
+        inferRequestWaiters--;
+    }
+    return id;
+}
+
+bool StatefulModelInstance::evictSequenceInferRequest() {
+    std::unique_lock<std::mutex> affinityLock(inferRequestAffinityMutex);
+    for (auto it = sequencesInferRequests.begin(); it != sequencesInferRequests.end(); ++it) {
+        const int streamId = it->second.streamId;
+        std::shared_ptr<Sequence> sequence = it->second.sequence;
+        // Only try locking, sequence locks are never awaited while holding affinity lock
+        std::unique_lock<std::mutex> sequenceLock(sequence->getMutex(), std::try_to_lock);
+        if (!sequenceLock.owns_lock()) {
+            continue;
+        }
+        sequencesInferRequests.erase(it);
+        affinityLock.unlock();
+        // Sequence removed in the meantime does not need its memory state anymore
+        if (sequence->isRemoved()) {
+            sequenceLock.unlock();
+            getInferRequestsQueue().returnStream(streamId);
+            return true;
+        }
+        SPDLOG_DEBUG("[Model: {} version: {}] Evicting infer request: {} kept by sequence: {}", getName(), getVersion(), streamId, sequence->getId());
+        // Eviction is not sequence activity, idle sequence can still be removed by the cleaner
+        const bool idle = sequence->isIdle();
+        auto modelState = getInferRequestsQueue().getInferRequest(streamId).QueryState();
+        sequence->updateMemoryState(modelState);
+        sequence->setIdle(idle);
+        sequenceManager->updateStateMemoryUsage(sequence);
+        sequenceLock.unlock();
+        inferRequestEvictionsMetric.increment();
+        getInferRequestsQueue().returnStream(streamId);
+        return true;
+    }
+    return false;
+}
+
+void StatefulModelInstance::releaseSequenceInferRequest(const Sequence& sequence) {
+    std::unique_lock<std::mutex> affinityLock(inferRequestAffinityMutex);
+    auto it = sequencesInferRequests.find(sequence.getId());
+    if (it == sequencesInferRequests.end() || it->second.sequence.get() != &sequence) {
+        return;
+    }
+    const int streamId = it->second.streamId;
+    sequencesInferRequests.erase(it);
+    affinityLock.unlock();
+    SPDLOG_DEBUG("[Model: {} version: {}] Releasing infer request: {} kept by removed sequence: {}", getName(), getVersion(), streamId, sequence.getId());
+    getInferRequestsQueue().returnStream(streamId);
+}
+
+void StatefulModelInstance::clearSequencesInferRequests() {
+    std::lock_guard<std::mutex> affinityLock(inferRequestAffinityMutex);
+    sequencesInferRequests.clear();
+    inferRequestWaiters = 0;
+}
+
+MetricCounter& StatefulModelInstance::getStateCopiesAvoidedMetric(const std::string& name, model_version_t version) {
+    return MetricRegistry::getInstance()
+        .counter("ovms_sequence_state_copies_avoided_total", "Memory state copies between sequences and infer requests avoided by infer request affinity")
+        .labeled({{"name", name}, {"version", std::to_string(version)}});
+}
+
+MetricCounter& StatefulModelInstance::getInferRequestEvictionsMetric(const std::string& name, model_version_t version) {
+    return MetricRegistry::getInstance()
+        .counter("ovms_sequence_infer_request_evictions_total", "Infer requests taken from idle sequences to serve other sequences")
+        .labeled({{"name", name}, {"version", std::to_string(version)}});
+}
+
 const Status StatefulModelInstance::preInferenceProcessing(InferenceEngine::InferRequest& inferRequest, Sequence& sequence,
-    SequenceProcessingSpec& sequenceProcessingSpec) {
+    SequenceProcessingSpec& sequenceProcessingSpec, bool loadMemoryState) {
     if (sequenceProcessingSpec.getSequenceControlInput() == SEQUENCE_START) {
         // On SEQUENCE_START reset memory state of infer request to default
         for (auto&& state : inferRequest.QueryState()) {
             state.Reset();
         }
-    } else {
+    } else if (loadMemoryState) {
         // For next requests in the sequence set infer request memory state to the last state saved by the sequence
+        auto status = sequenceManager->restoreMemoryState(sequence);
+        if (!status.ok())
+            return status;
         const sequence_memory_state_t& sequenceMemoryState = sequence.getMemoryState();
         for (auto&& state : inferRequest.QueryState()) {
             auto stateName = state.GetName();
@@ -282,16 +622,18 @@ const Status StatefulModelInstance::preInferenceProcessing(InferenceEngine::Infe
 }
 
 const Status StatefulModelInstance::postInferenceProcessing(tensorflow::serving::PredictResponse* response,
-    InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec) {
+    InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec, bool saveMemoryState) {
     // Reset inferRequest states on SEQUENCE_END
     if (sequenceProcessingSpec.getSequenceControlInput() == SEQUENCE_END) {
         spdlog::debug("Received SEQUENCE_END signal. Reseting model state and removing sequence");
         for (auto&& state : inferRequest.QueryState()) {
             state.Reset();
         }
-    } else {
+    } else if (saveMemoryState) {
         auto modelState = inferRequest.QueryState();
         sequence.updateMemoryState(modelState);
+    } else {
+        sequence.setIdle(false);
     }
 
     // Include sequence_id in server response
@@ -15,16 +15,29 @@
 //*****************************************************************************
 #pragma once
 
+#include <chrono>
 #include <memory>
+#include <mutex>
 #include <string>
+#include <unordered_map>
 
 #include "global_sequences_viewer.hpp"
+#include "metrics.hpp"
 #include "modelconfig.hpp"
 #include "modelinstance.hpp"
 #include "sequence_manager.hpp"
 
 namespace ovms {
 
+/**
+ * @brief Sequence bound to a stream of requests, resolved once by the first request of the stream
+ */
+struct SequenceStream {
+    std::shared_ptr<SequenceManager> sequenceManager;
+    std::shared_ptr<Sequence> sequence;
+    bool ended = false;
+};
+
 class StatefulModelInstance : public ModelInstance {
     static constexpr std::array<const char*, 2> SPECIAL_INPUT_NAMES{"sequence_id", "sequence_control_input"};
 
@@ -34,7 +47,9 @@ public:
          */
     StatefulModelInstance(const std::string& name, model_version_t version, GlobalSequencesViewer* globalSequencesViewer) :
         ModelInstance(name, version),
-        globalSequencesViewer(globalSequencesViewer) {
+        globalSequencesViewer(globalSequencesViewer),
+        stateCopiesAvoidedMetric(getStateCopiesAvoidedMetric(name, version)),
+        inferRequestEvictionsMetric(getInferRequestEvictionsMetric(name, version)) {
         sequenceManager = std::make_shared<SequenceManager>(config.getMaxSequenceNumber(), name, version);
     }
 
@@ -48,27 +63,48 @@ public:
     /*
     Performs pre inference operations:
         - for SEQUENCE_START control input - reset InferRequest memory state
-        - for SEQUENCE_END control input or for no control input - load sequence memory state into InferRequest
+        - for SEQUENCE_END control input or for no control input - load sequence memory state into InferRequest,
+          unless InferRequest already holds it (loadMemoryState is false). Cold memory state is restored first.
 
-        Always returns StatusCode::OK
+        Returns StatusCode::SEQUENCE_MEMORY_STATE_ERROR if cold memory state could not be restored
     */
-    const Status preInferenceProcessing(InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec);
+    const Status preInferenceProcessing(InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec, bool loadMemoryState = true);
 
     /*
     Performs pre inference operations:
-        - for SEQUENCE_START or for no control input - save InferRequest memory state in sequence memory state
+        - for SEQUENCE_START or for no control input - save InferRequest memory state in sequence memory state,
+          unless InferRequest is kept by the sequence (saveMemoryState is false)
         - for SEQUENCE_END control input - reset InferRequest memory state
         - for all requests - append sequence id to the response
 
         Always returns StatusCode::OK
     */
     const Status postInferenceProcessing(tensorflow::serving::PredictResponse* response,
-        InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec);
+        InferenceEngine::InferRequest& inferRequest, Sequence& sequence, SequenceProcessingSpec& sequenceProcessingSpec, bool saveMemoryState = true);
 
     Status infer(const tensorflow::serving::PredictRequest* requestProto,
         tensorflow::serving::PredictResponse* responseProto,
         std::unique_ptr<ModelInstanceUnloadGuard>& modelUnloadGuardPtr) override;
 
+    /**
+         * @brief Performs inference on the next request of the stream
+         *
+         * The first request starts the sequence, with id taken from the request or assigned by the manager. Following requests
+         * continue it without looking the sequence up, request with SEQUENCE_END control input ends the stream.
+         * Streamed sequence can be accessed only by requests of its stream and it is not removed as idle.
+         * Model instance has to be guarded against unloading by the caller.
+         */
+    Status inferSequenceStream(const tensorflow::serving::PredictRequest* requestProto,
+        tensorflow::serving::PredictResponse* responseProto,
+        SequenceStream& stream);
+
+    /**
+         * @brief Removes sequence of the stream closed without SEQUENCE_END request
+         *
+         * Model instance has to be guarded against unloading by the caller.
+         */
+    void endSequenceStream(SequenceStream& stream);
+
     Status loadModel(const ModelConfig& config) override;
 
     Status reloadModel(const ModelConfig& config, const DynamicModelParameter& parameter = DynamicModelParameter()) override;
@@ -84,8 +120,89 @@ protected:
 
     GlobalSequencesViewer* globalSequencesViewer;
 
+    bool inferRequestAffinity = false;
+
+    struct KeptInferRequest {
+        int streamId;
+        /**
+             * @brief Keeps sequence alive, so its memory state can be saved on eviction without locking sequences bucket
+             */
+        std::shared_ptr<Sequence> sequence;
+    };
+
+    /**
+         * @brief Infer requests kept by sequences between their requests, keyed by sequence id
+         *
+         * Kept infer request holds the current memory state of the sequence, memory state saved in the sequence is outdated.
+         */
+    std::unordered_map<uint64_t, KeptInferRequest> sequencesInferRequests;
+
+    /**
+         * @brief Number of requests waiting for an infer request, sequences do not keep infer requests while anyone waits
+         */
+    uint32_t inferRequestWaiters = 0;
+
+    std::mutex inferRequestAffinityMutex;
+
+    MetricCounter& stateCopiesAvoidedMetric;
+
+    MetricCounter& inferRequestEvictionsMetric;
+
+    /**
+         * @brief Performs inference on the sequence locked by the caller, sequence lock is released on success
+         */
+    Status inferSequence(const tensorflow::serving::PredictRequest* requestProto,
+        tensorflow::serving::PredictResponse* responseProto,
+        const std::shared_ptr<Sequence>& sequencePtr,
+        SequenceProcessingSpec& sequenceProcessingSpec,
+        std::unique_lock<std::mutex>& sequenceLock);
+
+    /**
+         * @brief Performs inference keeping infer request assigned to the sequence while there are no more sequences than infer requests
+         */
+    Status inferWithInferRequestAffinity(const tensorflow::serving::PredictRequest* requestProto,
+        tensorflow::serving::PredictResponse* responseProto,
+        const std::shared_ptr<Sequence>& sequencePtr,
+        SequenceProcessingSpec& sequenceProcessingSpec,
+        std::unique_lock<std::mutex>& sequenceLock);
+
+    /**
+         * @brief Takes infer request kept by the sequence, sequence lock has to be held by the caller
+         *
+         * @param stateInInferRequest set to false if infer request was kept by removed sequence with the same id
+         *
+         * @return false if sequence does not keep any infer request
+         */
+    bool takeSequenceInferRequest(Sequence& sequence, int& streamId, bool& stateInInferRequest);
+
+    /**
+         * @brief Gets idle infer request, evicts infer requests kept by other sequences until one is available
+         */
+    int acquireInferRequest();
+
+    /**
+         * @brief Saves memory state of one unlocked sequence and returns its infer request to the queue
+         *
+         * @return false if no infer request could be evicted
+         */
+    bool evictSequenceInferRequest();
+
+    static constexpr std::chrono::milliseconds INFER_REQUEST_EVICTION_RETRY_INTERVAL{10};
+
+    /**
+         * @brief Returns infer request kept by the sequence removed from sequence manager to the queue, without saving its memory state
+         */
+    void releaseSequenceInferRequest(const Sequence& sequence);
+
+    void clearSequencesInferRequests();
+
     const Status validate(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& processingSpec);
 
+    /**
+         * @brief Validates request of the stream, sequence control input is optional and sequence id is taken from the stream
+         */
+    const Status validateStreamRequest(const tensorflow::serving::PredictRequest* request, const SequenceStream& stream, SequenceProcessingSpec& processingSpec);
+
     const Status validateNumberOfInputs(const tensorflow::serving::PredictRequest* request,
         const size_t expectedNumberOfInputs) override;
 
@@ -94,6 +211,11 @@ protected:
     Status loadOVExecutableNetwork(const ModelConfig& config) override;
 
 private:
+    static MetricCounter& getStateCopiesAvoidedMetric(const std::string& name, model_version_t version);
+    static MetricCounter& getInferRequestEvictionsMetric(const std::string& name, model_version_t version);
+
+    const Status extractSpecialKeys(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec);
+
     const Status validateSpecialKeys(const tensorflow::serving::PredictRequest* request, SequenceProcessingSpec& sequenceProcessingSpec);
 };
 }  // namespace ovms
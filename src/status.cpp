@@ -58,6 +58,9 @@ const std::unordered_map<const StatusCode, const std::string> Status::statusMess
     {StatusCode::REQUESTED_STATEFUL_PARAMETERS_ON_SUBSCRIBED_MODEL, "Stateful model cannot be subscribed to pipeline"},
     {StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER, "Stateful model config parameter used for non stateful model"},
     {StatusCode::INVALID_MAX_SEQUENCE_NUMBER, "Sequence max number parameter too high"},
+    {StatusCode::INVALID_IDLE_SEQUENCE_TIMEOUT, "Idle sequence timeout parameter too high"},
+    {StatusCode::INVALID_DYNAMIC_BATCHING_PARAMETER, "Request batching parameters are invalid for the model"},
+    {StatusCode::INVALID_RESPONSE_CACHE_PARAMETER, "Response cache parameters are invalid for the model"},
 
     // Sequence management
     {StatusCode::SEQUENCE_MISSING, "Sequence with provided ID does not exist"},
@@ -69,10 +72,14 @@ const std::unordered_map<const StatusCode, const std::string> Status::statusMess
     {StatusCode::SEQUENCE_TERMINATED, "Sequence last request is being processed and it's not available anymore"},
     {StatusCode::SPECIAL_INPUT_NO_TENSOR_SHAPE, "Special input proto does not contain tensor shape information"},
     {StatusCode::MAX_SEQUENCE_NUMBER_REACHED, "Max sequence number has been reached. Could not create new sequence."},
+    {StatusCode::SEQUENCE_MEMORY_STATE_ERROR, "Sequence memory state could not be stored or restored"},
+    {StatusCode::SEQUENCE_STREAMED, "Sequence with provided ID is bound to a stream and can be accessed only by its requests"},
+    {StatusCode::MODEL_NOT_STATEFUL, "Sequence streams are supported only by stateful models"},
 
     // Predict request validation
     {StatusCode::INVALID_NO_OF_INPUTS, "Invalid number of inputs"},
     {StatusCode::INVALID_MISSING_INPUT, "Missing input with specific name"},
+    {StatusCode::INVALID_MISSING_OUTPUT, "Missing output with specific name"},
     {StatusCode::INVALID_NO_OF_SHAPE_DIMENSIONS, "Invalid number of shape dimensions"},
     {StatusCode::INVALID_BATCH_SIZE, "Invalid input batch size"},
     {StatusCode::INVALID_SHAPE, "Invalid input shape"},
@@ -118,6 +125,10 @@ const std::unordered_map<const StatusCode, const std::string> Status::statusMess
     {StatusCode::REST_SERIALIZE_TENSOR_CONTENT_INVALID_SIZE, "Size of data in tensor_content does not match declared tensor shape"},
     {StatusCode::REST_SERIALIZE_VAL_FIELD_INVALID_SIZE, "Number of elements in xxx_val field does not match declared tensor shape"},
     {StatusCode::REST_SERIALIZE_NO_DATA, "No data found in tensor_content or xxx_val field matching tensor dtype"},
+    {StatusCode::REST_BINARY_INVALID_HEADER_LENGTH, "Invalid Inference-Header-Content-Length. Expected size of JSON header not exceeding request body"},
+    {StatusCode::REST_BINARY_INVALID_INPUT_HEADER, "Invalid binary request header. Each input requires name and shape, optionally dtype, offset and size"},
+    {StatusCode::REST_BINARY_INVALID_TENSOR_DATA, "Binary tensor data exceeds request body or does not match declared shape and dtype"},
+    {StatusCode::REST_INVALID_OUTPUT_FILTER, "Invalid output_filter. Expected array of output names"},
 
     // Pipeline validation errors
     {StatusCode::PIPELINE_DEFINITION_ALREADY_EXIST, "Pipeline definition with the same name already exists"},
@@ -234,10 +245,14 @@ const std::unordered_map<const StatusCode, grpc::StatusCode> Status::grpcStatusM
     {StatusCode::SEQUENCE_TERMINATED, grpc::StatusCode::FAILED_PRECONDITION},
     {StatusCode::SPECIAL_INPUT_NO_TENSOR_SHAPE, grpc::StatusCode::INVALID_ARGUMENT},
     {StatusCode::MAX_SEQUENCE_NUMBER_REACHED, grpc::StatusCode::UNAVAILABLE},
+    {StatusCode::SEQUENCE_MEMORY_STATE_ERROR, grpc::StatusCode::INTERNAL},
+    {StatusCode::SEQUENCE_STREAMED, grpc::StatusCode::FAILED_PRECONDITION},
+    {StatusCode::MODEL_NOT_STATEFUL, grpc::StatusCode::INVALID_ARGUMENT},
 
     // Predict request validation
     {StatusCode::INVALID_NO_OF_INPUTS, grpc::StatusCode::INVALID_ARGUMENT},
     {StatusCode::INVALID_MISSING_INPUT, grpc::StatusCode::INVALID_ARGUMENT},
+    {StatusCode::INVALID_MISSING_OUTPUT, grpc::StatusCode::INVALID_ARGUMENT},
     {StatusCode::INVALID_NO_OF_SHAPE_DIMENSIONS, grpc::StatusCode::INVALID_ARGUMENT},
     {StatusCode::INVALID_BATCH_SIZE, grpc::StatusCode::INVALID_ARGUMENT},
     {StatusCode::INVALID_SHAPE, grpc::StatusCode::INVALID_ARGUMENT},
@@ -290,6 +305,10 @@ const std::unordered_map<const StatusCode, net_http::HTTPStatusCode> Status::htt
     {StatusCode::REST_PROTO_TO_STRING_ERROR, net_http::HTTPStatusCode::ERROR},
     {StatusCode::REST_UNSUPPORTED_PRECISION, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::REST_SERIALIZE_TENSOR_CONTENT_INVALID_SIZE, net_http::HTTPStatusCode::ERROR},
+    {StatusCode::REST_BINARY_INVALID_HEADER_LENGTH, net_http::HTTPStatusCode::BAD_REQUEST},
+    {StatusCode::REST_BINARY_INVALID_INPUT_HEADER, net_http::HTTPStatusCode::BAD_REQUEST},
+    {StatusCode::REST_BINARY_INVALID_TENSOR_DATA, net_http::HTTPStatusCode::BAD_REQUEST},
+    {StatusCode::REST_INVALID_OUTPUT_FILTER, net_http::HTTPStatusCode::BAD_REQUEST},
 
     {StatusCode::PATH_INVALID, net_http::HTTPStatusCode::ERROR},
     {StatusCode::FILE_INVALID, net_http::HTTPStatusCode::ERROR},
@@ -325,10 +344,14 @@ const std::unordered_map<const StatusCode, net_http::HTTPStatusCode> Status::htt
     {StatusCode::SEQUENCE_TERMINATED, net_http::HTTPStatusCode::PRECOND_FAILED},
     {StatusCode::SPECIAL_INPUT_NO_TENSOR_SHAPE, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::MAX_SEQUENCE_NUMBER_REACHED, net_http::HTTPStatusCode::SERVICE_UNAV},
+    {StatusCode::SEQUENCE_MEMORY_STATE_ERROR, net_http::HTTPStatusCode::ERROR},
+    {StatusCode::SEQUENCE_STREAMED, net_http::HTTPStatusCode::PRECOND_FAILED},
+    {StatusCode::MODEL_NOT_STATEFUL, net_http::HTTPStatusCode::BAD_REQUEST},
 
     // Predict request validation
     {StatusCode::INVALID_NO_OF_INPUTS, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::INVALID_MISSING_INPUT, net_http::HTTPStatusCode::BAD_REQUEST},
+    {StatusCode::INVALID_MISSING_OUTPUT, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::INVALID_NO_OF_SHAPE_DIMENSIONS, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::INVALID_BATCH_SIZE, net_http::HTTPStatusCode::BAD_REQUEST},
     {StatusCode::INVALID_SHAPE, net_http::HTTPStatusCode::BAD_REQUEST},
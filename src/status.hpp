@@ -76,6 +76,9 @@ enum class StatusCode {
     REQUESTED_MODEL_TYPE_CHANGE,                       /*!< Model type cannot be changed after it's loaded */
     INVALID_NON_STATEFUL_MODEL_PARAMETER,              /*!< Stateful model config parameter used for non stateful model */
     INVALID_MAX_SEQUENCE_NUMBER,                       /*!< Sequence max number parameter too high */
+    INVALID_IDLE_SEQUENCE_TIMEOUT,                     /*!< Idle sequence timeout parameter too high */
+    INVALID_DYNAMIC_BATCHING_PARAMETER,                /*!< Request batching parameters are invalid for the model */
+    INVALID_RESPONSE_CACHE_PARAMETER,                  /*!< Response cache parameters are invalid for the model */
 
     // Sequence management
     SEQUENCE_MISSING,                /*!< Sequence with provided ID does not exist */
@@ -87,6 +90,9 @@ enum class StatusCode {
     SEQUENCE_TERMINATED,             /*!< Sequence last request is being processed and it's not available anymore */
     SPECIAL_INPUT_NO_TENSOR_SHAPE,   /*!< Special input proto does not contain tensor shape information */
     MAX_SEQUENCE_NUMBER_REACHED,     /*!< Model handles maximum number of sequences and will not accept new ones */
+    SEQUENCE_MEMORY_STATE_ERROR,     /*!< Sequence memory state could not be stored or restored */
+    SEQUENCE_STREAMED,               /*!< Sequence is bound to a stream and can be accessed only by its requests */
+    MODEL_NOT_STATEFUL,              /*!< Sequence streams are supported only by stateful models */
 
     // Predict request validation
     INVALID_NO_OF_INPUTS,           /*!< Invalid number of inputs */
@@ -184,6 +190,10 @@ enum class StatusCode {
     REST_SERIALIZE_TENSOR_CONTENT_INVALID_SIZE, /*!< Size of data in tensor_content does not match declared tensor shape */
     REST_SERIALIZE_VAL_FIELD_INVALID_SIZE,      /*!< Number of elements in xxx_val field does not match declared tensor shape */
     REST_SERIALIZE_NO_DATA,                     /*!< No data found in tensor_content or xxx_val field matching tensor dtype */
+    REST_BINARY_INVALID_HEADER_LENGTH,          /*!< Binary request header length is not a number or exceeds request body */
+    REST_BINARY_INVALID_INPUT_HEADER,           /*!< Input description in binary request header is invalid */
+    REST_BINARY_INVALID_TENSOR_DATA,            /*!< Binary tensor data exceeds request body or does not match declared shape and dtype */
+    REST_INVALID_OUTPUT_FILTER,                 /*!< output_filter is not an array of output names */
 
     // Pipeline validation errors
     PIPELINE_DEFINITION_ALREADY_EXIST,
@@ -15,6 +15,8 @@
 //*****************************************************************************
 
 #include <fstream>
+#include <tuple>
+#include <vector>
 
 #include "../binaryutils.hpp"
 #include "gtest/gtest.h"
@@ -185,4 +187,97 @@ TEST_F(BinaryUtilsTest, positive_resizing) {
     uint8_t* ptr = blob->buffer();
     EXPECT_EQ(std::equal(ptr, ptr + blob->size(), rgb_expected_blob), true);
 }
+
+TEST_F(BinaryUtilsTest, positive_batch_resizing_precision_changed) {
+    const size_t batchSize = 16;
+    for (size_t i = 1; i < batchSize; i++) {
+        stringVal.add_string_val(image_bytes.get(), filesize);
+    }
+
+    InferenceEngine::Blob::Ptr blob;
+
+    std::shared_ptr<TensorInfo> tensorInfo = std::make_shared<TensorInfo>("", InferenceEngine::Precision::FP32, shape_t{batchSize, 3, 2, 2}, InferenceEngine::Layout::NHWC);
+
+    ASSERT_EQ(convertStringValToBlob(stringVal, blob, tensorInfo, false), ovms::StatusCode::OK);
+    ASSERT_EQ(blob->size(), batchSize * 12);
+    float* ptr = blob->buffer().as<float*>();
+    for (size_t i = 0; i < batchSize * 4; i++) {
+        EXPECT_EQ(ptr[i * 3], 0x24);
+        EXPECT_EQ(ptr[i * 3 + 1], 0x1b);
+        EXPECT_EQ(ptr[i * 3 + 2], 0xed);
+    }
+}
+
+TEST_F(BinaryUtilsTest, tensorWithInvalidImageInBatch) {
+    const size_t batchSize = 8;
+    for (size_t i = 1; i < batchSize; i++) {
+        if (i == 5) {
+            stringVal.add_string_val("INVALID_IMAGE");
+        } else {
+            stringVal.add_string_val(image_bytes.get(), filesize);
+        }
+    }
+
+    InferenceEngine::Blob::Ptr blob;
+
+    std::shared_ptr<TensorInfo> tensorInfo = std::make_shared<TensorInfo>("", InferenceEngine::Precision::U8, shape_t{batchSize, 3, 1, 1}, InferenceEngine::Layout::NHWC);
+
+    EXPECT_EQ(convertStringValToBlob(stringVal, blob, tensorInfo, false), ovms::StatusCode::IMAGE_PARSING_FAILED);
+    EXPECT_EQ(blob, nullptr);
+}
+
+class BinaryUtilsReducedDecodeTest : public ::testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    tensorflow::TensorProto encode(const cv::Mat& image) {
+        std::vector<uchar> encoded;
+        EXPECT_TRUE(cv::imencode(".jpg", image, encoded));
+        tensorflow::TensorProto stringVal;
+        stringVal.set_dtype(tensorflow::DataType::DT_STRING);
+        stringVal.add_string_val(encoded.data(), encoded.size());
+        return stringVal;
+    }
+};
+
+TEST_P(BinaryUtilsReducedDecodeTest, rgb) {
+    auto [rows, cols] = GetParam();
+    const uint8_t color[] = {0x24, 0x1b, 0xed};
+    auto stringVal = encode(cv::Mat(480, 640, CV_8UC3, cv::Scalar(color[0], color[1], color[2])));
+
+    InferenceEngine::Blob::Ptr blob;
+    std::shared_ptr<TensorInfo> tensorInfo = std::make_shared<TensorInfo>("", InferenceEngine::Precision::U8, shape_t{1, 3, rows, cols}, InferenceEngine::Layout::NHWC);
+
+    ASSERT_EQ(convertStringValToBlob(stringVal, blob, tensorInfo, false), ovms::StatusCode::OK);
+    ASSERT_EQ(blob->size(), rows * cols * 3);
+    uint8_t* ptr = blob->buffer();
+    for (size_t i = 0; i < blob->size(); i++) {
+        EXPECT_NEAR(ptr[i], color[i % 3], 3) << "index: " << i;
+    }
+}
+
+TEST_P(BinaryUtilsReducedDecodeTest, grayscale) {
+    auto [rows, cols] = GetParam();
+    auto stringVal = encode(cv::Mat(480, 640, CV_8UC1, cv::Scalar(0x7f)));
+
+    InferenceEngine::Blob::Ptr blob;
+    std::shared_ptr<TensorInfo> tensorInfo = std::make_shared<TensorInfo>("", InferenceEngine::Precision::FP32, shape_t{1, 1, rows, cols}, InferenceEngine::Layout::NHWC);
+
+    ASSERT_EQ(convertStringValToBlob(stringVal, blob, tensorInfo, false), ovms::StatusCode::OK);
+    ASSERT_EQ(blob->size(), rows * cols);
+    float* ptr = blob->buffer().as<float*>();
+    for (size_t i = 0; i < blob->size(); i++) {
+        EXPECT_NEAR(ptr[i], 0x7f, 3) << "index: " << i;
+    }
+}
+
+// Targets matching 1/8, 1/4 and 1/2 scale exactly, between scales, larger than the image and non proportional
+INSTANTIATE_TEST_SUITE_P(
+    Scales,
+    BinaryUtilsReducedDecodeTest,
+    ::testing::Values(
+        std::make_tuple<size_t, size_t>(60, 80),
+        std::make_tuple<size_t, size_t>(120, 160),
+        std::make_tuple<size_t, size_t>(240, 320),
+        std::make_tuple<size_t, size_t>(224, 224),
+        std::make_tuple<size_t, size_t>(500, 700),
+        std::make_tuple<size_t, size_t>(30, 600)));
 }  // namespace
@@ -0,0 +1,142 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <limits>
+#include <memory>
+#include <numeric>
+#include <vector>
+
+#include <gtest/gtest.h>
+#include <inference_engine.hpp>
+
+#include "../cold_memory_state.hpp"
+
+using namespace InferenceEngine;
+using ovms::ColdMemoryState;
+using ovms::ColdStateStorage;
+
+template <typename T>
+static Blob::Ptr createBlob(Precision precision, std::vector<T>& values) {
+    const TensorDesc desc{precision, {1, values.size()}, Layout::NC};
+    Blob::Ptr blob = make_shared_blob<T>(desc);
+    blob->allocate();
+    std::memcpy((void*)blob->buffer(), values.data(), values.size() * sizeof(T));
+    return blob;
+}
+
+template <typename T>
+static std::vector<T> blobData(const Blob::Ptr& blob) {
+    const T* data = (T*)blob->buffer();
+    return std::vector<T>(data, data + blob->byteSize() / sizeof(T));
+}
+
+TEST(ColdMemoryState, HalfPrecisionConversionRoundTrip) {
+    for (uint32_t half = 0; half <= 0xffff; half++) {
+        const float value = ovms::halfToFloat(static_cast<uint16_t>(half));
+        if (std::isnan(value)) {
+            EXPECT_TRUE(std::isnan(ovms::halfToFloat(ovms::floatToHalf(value))));
+            continue;
+        }
+        ASSERT_EQ(ovms::floatToHalf(value), half) << "half: " << half;
+    }
+}
+
+TEST(ColdMemoryState, HalfPrecisionConversionRounding) {
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(1.0f)), 1.0f);
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(-2.5f)), -2.5f);
+    // halfway between 1 and 1 + 2^-10 is rounded to even
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(1.0f + std::ldexp(1.0f, -11))), 1.0f);
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(1.0f + 3 * std::ldexp(1.0f, -11))), 1.0f + std::ldexp(1.0f, -9));
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(65520.0f)), std::numeric_limits<float>::infinity());
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(std::ldexp(1.0f, -24))), std::ldexp(1.0f, -24));
+    EXPECT_EQ(ovms::halfToFloat(ovms::floatToHalf(std::ldexp(1.0f, -26))), 0.0f);
+}
+
+TEST(ColdMemoryState, ColdStateStorageFromString) {
+    EXPECT_EQ(ovms::coldStateStorageFromString("fp16"), ColdStateStorage::FP16);
+    EXPECT_EQ(ovms::coldStateStorageFromString("file"), ColdStateStorage::FILE);
+    EXPECT_FALSE(ovms::coldStateStorageFromString("FP16").has_value());
+}
+
+TEST(ColdMemoryState, HalfPrecisionStoreRestore) {
+    std::vector<float> floats(100);
+    std::iota(floats.begin(), floats.end(), -50);
+    std::vector<int32_t> ints(10);
+    std::iota(ints.begin(), ints.end(), 1 << 20);
+    ovms::sequence_memory_state_t memoryState{
+        {"floats", createBlob<float>(Precision::FP32, floats)},
+        {"ints", createBlob<int32_t>(Precision::I32, ints)}};
+
+    std::unique_ptr<ColdMemoryState> coldMemoryState;
+    ASSERT_EQ(ColdMemoryState::store(memoryState, ColdStateStorage::FP16, coldMemoryState), ovms::StatusCode::OK);
+    ASSERT_NE(coldMemoryState, nullptr);
+    EXPECT_EQ(coldMemoryState->getSize(), floats.size() * sizeof(uint16_t) + ints.size() * sizeof(int32_t));
+
+    ovms::sequence_memory_state_t restoredMemoryState;
+    ASSERT_EQ(coldMemoryState->restore(restoredMemoryState), ovms::StatusCode::OK);
+    ASSERT_EQ(restoredMemoryState.size(), 2);
+    EXPECT_EQ(restoredMemoryState.at("floats")->getTensorDesc(), memoryState.at("floats")->getTensorDesc());
+    EXPECT_EQ(blobData<float>(restoredMemoryState.at("floats")), floats);
+    EXPECT_EQ(blobData<int32_t>(restoredMemoryState.at("ints")), ints);
+}
+
+TEST(ColdMemoryState, HalfPrecisionStoreLosesPrecision) {
+    std::vector<float> floats{0.1f, 1000.3f};
+    ovms::sequence_memory_state_t memoryState{{"state", createBlob<float>(Precision::FP32, floats)}};
+
+    std::unique_ptr<ColdMemoryState> coldMemoryState;
+    ASSERT_EQ(ColdMemoryState::store(memoryState, ColdStateStorage::FP16, coldMemoryState), ovms::StatusCode::OK);
+    ovms::sequence_memory_state_t restoredMemoryState;
+    ASSERT_EQ(coldMemoryState->restore(restoredMemoryState), ovms::StatusCode::OK);
+    auto restored = blobData<float>(restoredMemoryState.at("state"));
+    EXPECT_NEAR(restored[0], floats[0], floats[0] / 1024);
+    EXPECT_NEAR(restored[1], floats[1], floats[1] / 1024);
+}
+
+TEST(ColdMemoryState, FileStoreRestore) {
+    std::vector<float> floats{0.1f, 1000.3f, -1e-30f, 3.4e38f};
+    std::vector<uint8_t> bytes{1, 2, 3};
+    ovms::sequence_memory_state_t memoryState{
+        {"floats", createBlob<float>(Precision::FP32, floats)},
+        {"bytes", createBlob<uint8_t>(Precision::U8, bytes)}};
+
+    std::unique_ptr<ColdMemoryState> coldMemoryState;
+    ASSERT_EQ(ColdMemoryState::store(memoryState, ColdStateStorage::FILE, coldMemoryState), ovms::StatusCode::OK);
+    ASSERT_NE(coldMemoryState, nullptr);
+    EXPECT_EQ(coldMemoryState->getSize(), 0);
+
+    // State can be restored many times
+    for (int i = 0; i < 2; i++) {
+        ovms::sequence_memory_state_t restoredMemoryState;
+        ASSERT_EQ(coldMemoryState->restore(restoredMemoryState), ovms::StatusCode::OK);
+        ASSERT_EQ(restoredMemoryState.size(), 2);
+        EXPECT_EQ(blobData<float>(restoredMemoryState.at("floats")), floats);
+        EXPECT_EQ(blobData<uint8_t>(restoredMemoryState.at("bytes")), bytes);
+    }
+}
+
+TEST(ColdMemoryState, StoreEmptyMemoryState) {
+    ovms::sequence_memory_state_t memoryState;
+    for (auto storage : {ColdStateStorage::FP16, ColdStateStorage::FILE}) {
+        std::unique_ptr<ColdMemoryState> coldMemoryState;
+        ASSERT_EQ(ColdMemoryState::store(memoryState, storage, coldMemoryState), ovms::StatusCode::OK);
+        ovms::sequence_memory_state_t restoredMemoryState;
+        ASSERT_EQ(coldMemoryState->restore(restoredMemoryState), ovms::StatusCode::OK);
+        EXPECT_TRUE(restoredMemoryState.empty());
+    }
+}
@@ -14,7 +14,10 @@
 // limitations under the License.
 //*****************************************************************************
 #include <cstdio>
+#include <set>
 #include <sstream>
+#include <utility>
+#include <vector>
 
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
@@ -149,6 +152,35 @@ TEST_F(EnsembleFlowTest, DummyModel) {
     checkDummyResponse(dummySeriallyConnectedCount);
 }
 
+TEST_F(EnsembleFlowTest, DummyModelOutputFilter) {
+    // Exit node serializes only outputs selected by output filter
+    // input   dummy    output
+    //  O------->O------->O
+    ConstructorEnabledModelManager managerWithDummyModel;
+    managerWithDummyModel.reloadModelWithVersions(config);
+
+    for (const auto& [outputFilter, expectedCount] : std::vector<std::pair<std::set<std::string>, size_t>>{
+             {{customPipelineOutputName}, 1},
+             {{"other_output"}, 0}}) {
+        response.Clear();
+        const tensor_map_t inputsInfo{{customPipelineInputName, nullptr}};
+        auto input_node = std::make_unique<EntryNode>(&request, inputsInfo);
+        auto model_node = std::make_unique<DLNode>("dummy_node", dummyModelName, requestedModelVersion, managerWithDummyModel);
+        auto output_node = std::make_unique<ExitNode>(&response, std::set<std::string>{}, outputFilter);
+
+        Pipeline pipeline(*input_node, *output_node);
+        pipeline.connect(*input_node, *model_node, {{customPipelineInputName, DUMMY_MODEL_INPUT_NAME}});
+        pipeline.connect(*model_node, *output_node, {{DUMMY_MODEL_OUTPUT_NAME, customPipelineOutputName}});
+
+        pipeline.push(std::move(input_node));
+        pipeline.push(std::move(model_node));
+        pipeline.push(std::move(output_node));
+
+        ASSERT_EQ(pipeline.execute(), ovms::StatusCode::OK);
+        EXPECT_EQ(response.outputs().count(customPipelineOutputName), expectedCount);
+    }
+}
+
 TEST_F(EnsembleFlowTest, DummyModelDirectAndPipelineInference) {
     ConstructorEnabledModelManager managerWithDummyModel;
     config.setNireq(1);
@@ -0,0 +1,133 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <chrono>
+#include <filesystem>
+#include <fstream>
+#include <string>
+#include <thread>
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "../filesystemwatcher.hpp"
+
+using namespace ovms;
+using namespace std::chrono_literals;
+
+using ::testing::ElementsAre;
+
+class FileSystemWatcherTest : public ::testing::Test {
+protected:
+    std::string directory;
+
+    void SetUp() override {
+        const ::testing::TestInfo* const testInfo = ::testing::UnitTest::GetInstance()->current_test_info();
+        directory = std::string("/tmp/ovms_filesystemwatcher_") + testInfo->name();
+        std::filesystem::remove_all(directory);
+        std::filesystem::create_directories(directory);
+    }
+
+    void TearDown() override {
+        std::filesystem::remove_all(directory);
+    }
+
+    void writeFile(const std::string& path) {
+        std::ofstream file(path);
+        file << "content";
+    }
+};
+
+TEST_F(FileSystemWatcherTest, TimeoutWithoutChanges) {
+    FileSystemWatcher watcher;
+    ASSERT_TRUE(watcher.isValid());
+    ASSERT_TRUE(watcher.watch(directory));
+    auto start = std::chrono::steady_clock::now();
+    auto changes = watcher.waitForChanges(100ms, 10ms);
+    EXPECT_GE(std::chrono::steady_clock::now() - start, 100ms);
+    EXPECT_TRUE(changes.directories.empty());
+    EXPECT_FALSE(changes.overflow);
+}
+
+TEST_F(FileSystemWatcherTest, ReportsChangedDirectory) {
+    FileSystemWatcher watcher;
+    std::string other = directory + "/other";
+    std::filesystem::create_directories(other);
+    ASSERT_TRUE(watcher.watch(directory));
+    ASSERT_TRUE(watcher.watch(other));
+    std::filesystem::create_directories(directory + "/1");
+    auto changes = watcher.waitForChanges(1s, 10ms);
+    EXPECT_THAT(changes.directories, ElementsAre(directory));
+}
+
+TEST_F(FileSystemWatcherTest, DebounceCoalescesEvents) {
+    FileSystemWatcher watcher;
+    std::string version = directory + "/1";
+    std::filesystem::create_directories(version);
+    ASSERT_TRUE(watcher.watch(directory));
+    ASSERT_TRUE(watcher.watch(version));
+    std::thread writer([&]() {
+        for (int i = 0; i < 5; i++) {
+            writeFile(version + "/file" + std::to_string(i));
+            std::this_thread::sleep_for(20ms);
+        }
+        writeFile(directory + "/last");
+    });
+    auto changes = watcher.waitForChanges(1s, 100ms);
+    writer.join();
+    EXPECT_THAT(changes.directories, ElementsAre(directory, version));
+}
+
+TEST_F(FileSystemWatcherTest, RemovedDirectoryIsNoLongerWatched) {
+    FileSystemWatcher watcher;
+    std::string version = directory + "/1";
+    std::filesystem::create_directories(version);
+    ASSERT_TRUE(watcher.watch(version));
+    std::filesystem::remove_all(version);
+    auto changes = watcher.waitForChanges(1s, 10ms);
+    EXPECT_THAT(changes.directories, ElementsAre(version));
+    EXPECT_FALSE(watcher.isWatched(version));
+}
+
+TEST_F(FileSystemWatcherTest, Unwatch) {
+    FileSystemWatcher watcher;
+    ASSERT_TRUE(watcher.watch(directory));
+    watcher.unwatch(directory);
+    EXPECT_FALSE(watcher.isWatched(directory));
+    EXPECT_TRUE(watcher.getWatchedDirectories().empty());
+    writeFile(directory + "/file");
+    auto changes = watcher.waitForChanges(50ms, 10ms);
+    EXPECT_TRUE(changes.directories.empty());
+}
+
+TEST_F(FileSystemWatcherTest, WatchNonExistingDirectoryFails) {
+    FileSystemWatcher watcher;
+    EXPECT_FALSE(watcher.watch(directory + "/not_existing"));
+    EXPECT_TRUE(watcher.getWatchedDirectories().empty());
+}
+
+TEST_F(FileSystemWatcherTest, WakeUpInterruptsWaiting) {
+    FileSystemWatcher watcher;
+    ASSERT_TRUE(watcher.watch(directory));
+    std::thread waker([&watcher]() {
+        std::this_thread::sleep_for(50ms);
+        watcher.wakeUp();
+    });
+    auto start = std::chrono::steady_clock::now();
+    auto changes = watcher.waitForChanges(10s, 10ms);
+    waker.join();
+    EXPECT_LT(std::chrono::steady_clock::now() - start, 5s);
+    EXPECT_TRUE(changes.directories.empty());
+}
@@ -924,3 +924,22 @@ TEST_F(ConfigStatus, configWithPipelines) {
     EXPECT_EQ(expectedJson, response);
     EXPECT_EQ(status, ovms::StatusCode::OK);
 }
+
+TEST(HttpRestApiHandler, parseInferenceHeaderContentLength) {
+    ovms::HttpRestApiHandler handler(10);
+    std::optional<size_t> length;
+    ASSERT_EQ(handler.parseInferenceHeaderContentLength("128", length), ovms::StatusCode::OK);
+    EXPECT_EQ(length, 128);
+    EXPECT_EQ(handler.parseInferenceHeaderContentLength("-1", length), ovms::StatusCode::REST_BINARY_INVALID_HEADER_LENGTH);
+    EXPECT_EQ(handler.parseInferenceHeaderContentLength("12a", length), ovms::StatusCode::REST_BINARY_INVALID_HEADER_LENGTH);
+    EXPECT_EQ(handler.parseInferenceHeaderContentLength("99999999999999999999999", length), ovms::StatusCode::REST_BINARY_INVALID_HEADER_LENGTH);
+}
+
+TEST(HttpRestApiHandler, predictWithInvalidInferenceHeaderContentLength) {
+    ovms::HttpRestApiHandler handler(10);
+    std::vector<std::pair<std::string, std::string>> headers;
+    std::string body = R"({"inputs":[]})";
+    std::string response;
+    EXPECT_EQ(handler.processRequest("POST", "/v1/models/dummy:predict", body, &headers, &response, "abc"),
+        ovms::StatusCode::REST_BINARY_INVALID_HEADER_LENGTH);
+}
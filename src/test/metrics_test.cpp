@@ -0,0 +1,143 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <string>
+#include <thread>
+#include <vector>
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "../http_rest_api_handler.hpp"
+#include "../metrics.hpp"
+
+using namespace ovms;
+
+using testing::HasSubstr;
+
+TEST(Metrics, CounterFamilyReturnsSameSeriesForSameLabels) {
+    auto& family = MetricRegistry::getInstance().counter("test_counter_same_series", "help");
+    auto& first = family.labeled({{"name", "dummy"}});
+    auto& second = family.labeled({{"name", "dummy"}});
+    auto& other = family.labeled({{"name", "other"}});
+    EXPECT_EQ(&first, &second);
+    EXPECT_NE(&first, &other);
+    first.increment();
+    second.increment(2);
+    EXPECT_EQ(first.get(), 3);
+    EXPECT_EQ(other.get(), 0);
+}
+
+TEST(Metrics, CollectCounterAndGauge) {
+    auto& registry = MetricRegistry::getInstance();
+    registry.counter("test_collect_counter", "Test counter").labeled({{"api", "grpc"}, {"code", "OK"}}).increment(5);
+    auto& gauge = registry.gauge("test_collect_gauge", "Test gauge").labeled();
+    gauge.increment(3);
+    gauge.decrement();
+    auto text = registry.collect();
+    EXPECT_THAT(text, HasSubstr("# HELP test_collect_counter Test counter\n# TYPE test_collect_counter counter\n"));
+    EXPECT_THAT(text, HasSubstr("test_collect_counter{api=\"grpc\",code=\"OK\"} 5\n"));
+    EXPECT_THAT(text, HasSubstr("# TYPE test_collect_gauge gauge\ntest_collect_gauge 2\n"));
+}
+
+TEST(Metrics, LabelValuesAreEscaped) {
+    auto& registry = MetricRegistry::getInstance();
+    registry.counter("test_escaped_counter", "help").labeled({{"name", "a\"b\\c\nd"}}).increment();
+    EXPECT_THAT(registry.collect(), HasSubstr("test_escaped_counter{name=\"a\\\"b\\\\c\\nd\"} 1\n"));
+}
+
+TEST(Metrics, HistogramBucketsAreCumulative) {
+    auto& registry = MetricRegistry::getInstance();
+    auto& histogram = registry.histogram("test_histogram", "Test histogram", {10, 100}).labeled({{"stage", "prediction"}});
+    histogram.observe(5);
+    histogram.observe(10);
+    histogram.observe(50);
+    histogram.observe(1000);
+    EXPECT_EQ(histogram.getCount(), 4);
+    EXPECT_DOUBLE_EQ(histogram.getSum(), 1065);
+    auto text = registry.collect();
+    EXPECT_THAT(text, HasSubstr("# TYPE test_histogram histogram\n"));
+    EXPECT_THAT(text, HasSubstr("test_histogram_bucket{stage=\"prediction\",le=\"10\"} 2\n"));
+    EXPECT_THAT(text, HasSubstr("test_histogram_bucket{stage=\"prediction\",le=\"100\"} 3\n"));
+    EXPECT_THAT(text, HasSubstr("test_histogram_bucket{stage=\"prediction\",le=\"+Inf\"} 4\n"));
+    EXPECT_THAT(text, HasSubstr("test_histogram_sum{stage=\"prediction\"} 1065\n"));
+    EXPECT_THAT(text, HasSubstr("test_histogram_count{stage=\"prediction\"} 4\n"));
+}
+
+TEST(Metrics, HistogramConcurrentObserve) {
+    auto& histogram = MetricRegistry::getInstance().histogram("test_histogram_concurrent", "help").labeled();
+    const size_t threadsCount = 8;
+    const size_t observations = 10000;
+    std::vector<std::thread> threads;
+    for (size_t i = 0; i < threadsCount; i++) {
+        threads.emplace_back([&histogram]() {
+            for (size_t j = 0; j < observations; j++) {
+                histogram.observe(1);
+            }
+        });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    EXPECT_EQ(histogram.getCount(), threadsCount * observations);
+    EXPECT_DOUBLE_EQ(histogram.getSum(), threadsCount * observations);
+}
+
+TEST(Metrics, StatusCodeLabel) {
+    EXPECT_EQ(statusCodeLabel(StatusCode::OK), "OK");
+    EXPECT_EQ(statusCodeLabel(StatusCode::MODEL_NAME_MISSING), "NOT_FOUND");
+    EXPECT_EQ(statusCodeLabel(StatusCode::INVALID_SHAPE), "INVALID_ARGUMENT");
+}
+
+TEST(Metrics, RequestMetricsGuardCountsRequestsByStatus) {
+    auto& registry = MetricRegistry::getInstance();
+    auto& inFlight = registry.gauge("ovms_requests_in_flight", "Number of predict requests being processed").labeled({{"api", "test"}});
+    auto& okRequests = registry.counter("ovms_requests_total", "Number of predict requests by API and status code").labeled({{"api", "test"}, {"code", "OK"}});
+    auto& notFoundRequests = registry.counter("ovms_requests_total", "Number of predict requests by API and status code").labeled({{"api", "test"}, {"code", "NOT_FOUND"}});
+    RequestMetrics requestMetrics("test");
+    EXPECT_EQ(&requestMetrics.getInFlight(), &inFlight);
+    EXPECT_EQ(&requestMetrics.getRequests(StatusCode::MODEL_VERSION_MISSING), &notFoundRequests);
+    {
+        RequestMetricsGuard guard(requestMetrics);
+        EXPECT_EQ(inFlight.get(), 1);
+    }
+    {
+        RequestMetricsGuard guard(requestMetrics);
+        guard.setStatus(StatusCode::MODEL_NAME_MISSING);
+    }
+    EXPECT_EQ(inFlight.get(), 0);
+    EXPECT_EQ(okRequests.get(), 1);
+    EXPECT_EQ(notFoundRequests.get(), 1);
+}
+
+TEST(Metrics, RestApiParsesMetricsRequest) {
+    HttpRestApiHandler handler(10);
+    HttpRequestComponents components;
+    ASSERT_EQ(handler.parseRequestComponents(components, "GET", "/metrics"), StatusCode::OK);
+    EXPECT_EQ(components.type, Metrics);
+    EXPECT_EQ(handler.parseRequestComponents(components, "POST", "/metrics"), StatusCode::REST_INVALID_URL);
+}
+
+TEST(Metrics, RestApiReturnsPlainTextMetrics) {
+    MetricRegistry::getInstance().counter("test_rest_counter", "help").labeled().increment();
+    HttpRestApiHandler handler(10);
+    std::vector<std::pair<std::string, std::string>> headers;
+    std::string body;
+    std::string response;
+    ASSERT_EQ(handler.processRequest("GET", "/metrics", body, &headers, &response), StatusCode::OK);
+    ASSERT_EQ(headers.size(), 1);
+    EXPECT_EQ(headers[0].second, "text/plain; version=0.0.4");
+    EXPECT_THAT(response, HasSubstr("test_rest_counter 1\n"));
+}
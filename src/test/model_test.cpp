@@ -21,6 +21,7 @@
 #include "../filesystem.hpp"
 #include "../model.hpp"
 #include "../modelmanager.hpp"
+#include "../threadpool.hpp"
 #include "mockmodelinstancechangingstates.hpp"
 #include "test_utils.hpp"
 
@@ -82,6 +83,28 @@ TEST_F(ModelDefaultVersions, DefaultVersionShouldReturnHighest) {
     EXPECT_EQ(2, defaultInstance->getVersion());
 }
 
+TEST_F(ModelDefaultVersions, DefaultVersionShouldReturnHighestWhenVersionsLoadedConcurrently) {
+    MockModelWithInstancesJustChangingStates mockModel;
+    std::shared_ptr<ovms::model_versions_t> versionsToChange = std::make_shared<ovms::model_versions_t>();
+    std::shared_ptr<ovms::model_versions_t> versionsFailed = std::make_shared<ovms::model_versions_t>();
+    *versionsToChange = {1, 2, 3, 4};
+    ovms::ModelConfig config = DUMMY_MODEL_CONFIG;
+    auto fs = ovms::ModelManager::getFilesystem(config.getBasePath());
+    ovms::ThreadPool loadThreadPool(3);
+    ASSERT_EQ(mockModel.addVersions(versionsToChange, config, fs, versionsFailed, &loadThreadPool), ovms::StatusCode::OK);
+    EXPECT_TRUE(versionsFailed->empty());
+
+    ASSERT_EQ(mockModel.getModelVersions().size(), 4);
+    for (auto& [version, instance] : mockModel.getModelVersions()) {
+        EXPECT_EQ(version, instance->getVersion());
+        EXPECT_EQ(ovms::ModelVersionState::AVAILABLE, instance->getStatus().getState());
+    }
+    std::shared_ptr<ovms::ModelInstance> defaultInstance;
+    defaultInstance = mockModel.getDefaultModelInstance();
+    ASSERT_TRUE(nullptr != defaultInstance);
+    EXPECT_EQ(4, defaultInstance->getVersion());
+}
+
 TEST_F(ModelDefaultVersions, DefaultVersionShouldReturnHighestNonRetired) {
     MockModelWithInstancesJustChangingStates mockModel;
     std::shared_ptr<ovms::model_versions_t> versionsToChange = std::make_shared<ovms::model_versions_t>();
@@ -68,6 +68,19 @@ TEST(ModelConfig, getters_setters) {
     config.setMaxSequenceNumber(11);
     auto seq = config.getMaxSequenceNumber();
     EXPECT_EQ(seq, 11);
+
+    config.setInferRequestAffinity(true);
+    is = config.isInferRequestAffinityUsed();
+    EXPECT_EQ(is, true);
+
+    config.setIdleSequenceTimeout(30);
+    EXPECT_EQ(config.getIdleSequenceTimeout(), 30);
+
+    EXPECT_EQ(config.getColdStateStorage(), "file");
+    config.setStateMemoryBudgetMb(256);
+    EXPECT_EQ(config.getStateMemoryBudgetMb(), 256);
+    config.setColdStateStorage("fp16");
+    EXPECT_EQ(config.getColdStateStorage(), "fp16");
 }
 
 TEST(ModelConfig, layout_single) {
@@ -644,6 +657,66 @@ static std::string config_idle_sequence_cleanup_non_stateful = R"#(
 }
 )#";
 
+static std::string config_infer_request_affinity_non_stateful = R"#(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "config_infer_request_affinity_stateful",
+                "base_path": "/tmp/models/dummy1",
+                "stateful": false,
+                "infer_request_affinity": true
+            }
+        }
+    ]
+}
+)#";
+
+static std::string config_idle_sequence_timeout_non_stateful = R"#(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "config_idle_sequence_timeout_stateful",
+                "base_path": "/tmp/models/dummy1",
+                "stateful": false,
+                "idle_sequence_timeout_seconds": 60
+            }
+        }
+    ]
+}
+)#";
+
+static std::string config_state_memory_budget_non_stateful = R"#(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "config_state_memory_budget_stateful",
+                "base_path": "/tmp/models/dummy1",
+                "stateful": false,
+                "state_memory_budget_mb": 64
+            }
+        }
+    ]
+}
+)#";
+
+static std::string config_cold_state_storage_non_stateful = R"#(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "config_cold_state_storage_stateful",
+                "base_path": "/tmp/models/dummy1",
+                "stateful": false,
+                "cold_state_storage": "fp16"
+            }
+        }
+    ]
+}
+)#";
+
 static std::string config_max_sequence_number_non_stateful = R"#(
     {
     "model_config_list": [
@@ -705,6 +778,22 @@ static std::string config_low_invalid_max_seq = R"#(
 }
 )#";
 
+static std::string config_invalid_idle_sequence_timeout = R"#(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "config_invalid_idle_sequence_timeout",
+                "base_path": "/tmp/models/dummy1",
+                "stateful": true,
+                "idle_sequence_timeout_seconds": 5294967295,
+                "low_latency_transformation": true
+            }
+        }
+    ]
+}
+)#";
+
 class ModelConfigParseModel : public ::testing::TestWithParam<std::pair<std::string, ovms::StatusCode>> {
 };
 
@@ -738,10 +827,97 @@ std::vector<std::pair<std::string, ovms::StatusCode>> configs = {
     {config_max_sequence_number_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
     {config_idle_sequence_cleanup_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
     {config_low_latency_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
+    {config_infer_request_affinity_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
+    {config_idle_sequence_timeout_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
+    {config_state_memory_budget_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
+    {config_cold_state_storage_non_stateful, ovms::StatusCode::INVALID_NON_STATEFUL_MODEL_PARAMETER},
     {config_low_invalid_max_seq, ovms::StatusCode::INVALID_MAX_SEQUENCE_NUMBER},
+    {config_invalid_idle_sequence_timeout, ovms::StatusCode::INVALID_IDLE_SEQUENCE_TIMEOUT},
     {config_stateful_should_pass, ovms::StatusCode::OK}};
 
 INSTANTIATE_TEST_SUITE_P(
     Test,
     ModelConfigParseModel,
     ::testing::ValuesIn(configs));
+
+TEST(ModelConfig, ConfigParseNodeWithRequestBatching) {
+    std::string config = R"#(
+        {
+            "name": "alpha",
+            "base_path": "/tmp/models/dummy1",
+            "batch_size": 4,
+            "max_batch_size": 8,
+            "batch_timeout_us": 500
+        }
+    )#";
+
+    rapidjson::Document configJson;
+    rapidjson::ParseResult parsingSucceeded = configJson.Parse(config.c_str());
+    ASSERT_EQ(parsingSucceeded, true);
+    ovms::ModelConfig modelConfig;
+    auto status = modelConfig.parseNode(configJson);
+
+    ASSERT_EQ(status, ovms::StatusCode::OK);
+    EXPECT_TRUE(modelConfig.isRequestBatchingEnabled());
+    EXPECT_EQ(modelConfig.getMaxBatchSize(), 8);
+    EXPECT_EQ(modelConfig.getBatchTimeoutUs(), 500);
+    EXPECT_EQ(modelConfig.getBatchSize(), 0);
+}
+
+TEST(ModelConfig, ConfigParseNodeWithRequestBatchingAndAutoBatchSize) {
+    std::string config = R"#(
+        {
+            "name": "alpha",
+            "base_path": "/tmp/models/dummy1",
+            "batch_size": "auto",
+            "max_batch_size": 8
+        }
+    )#";
+
+    rapidjson::Document configJson;
+    rapidjson::ParseResult parsingSucceeded = configJson.Parse(config.c_str());
+    ASSERT_EQ(parsingSucceeded, true);
+    ovms::ModelConfig modelConfig;
+    auto status = modelConfig.parseNode(configJson);
+
+    EXPECT_EQ(status, ovms::StatusCode::INVALID_DYNAMIC_BATCHING_PARAMETER);
+}
+
+TEST(ModelConfig, ConfigParseNodeWithResponseCache) {
+    std::string config = R"#(
+        {
+            "name": "alpha",
+            "base_path": "/tmp/models/dummy1",
+            "cache_size_mb": 16
+        }
+    )#";
+
+    rapidjson::Document configJson;
+    rapidjson::ParseResult parsingSucceeded = configJson.Parse(config.c_str());
+    ASSERT_EQ(parsingSucceeded, true);
+    ovms::ModelConfig modelConfig;
+    auto status = modelConfig.parseNode(configJson);
+
+    ASSERT_EQ(status, ovms::StatusCode::OK);
+    EXPECT_TRUE(modelConfig.isResponseCacheEnabled());
+    EXPECT_EQ(modelConfig.getCacheSizeMb(), 16);
+}
+
+TEST(ModelConfig, ConfigParseNodeWithResponseCacheAndStateful) {
+    std::string config = R"#(
+        {
+            "name": "alpha",
+            "base_path": "/tmp/models/dummy1",
+            "stateful": true,
+            "cache_size_mb": 16
+        }
+    )#";
+
+    rapidjson::Document configJson;
+    rapidjson::ParseResult parsingSucceeded = configJson.Parse(config.c_str());
+    ASSERT_EQ(parsingSucceeded, true);
+    ovms::ModelConfig modelConfig;
+    auto status = modelConfig.parseNode(configJson);
+
+    EXPECT_EQ(status, ovms::StatusCode::INVALID_RESPONSE_CACHE_PARAMETER);
+}
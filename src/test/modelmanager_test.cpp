@@ -13,6 +13,8 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 //*****************************************************************************
+#include <atomic>
+
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
 
@@ -26,6 +28,7 @@
 
 using testing::_;
 using testing::ContainerEq;
+using testing::Invoke;
 using testing::Return;
 using testing::ReturnRef;
 using testing::UnorderedElementsAre;
@@ -505,6 +508,103 @@ TEST(ModelManager, ConfigReloadingShouldAddNewModel) {
     modelMock.reset();
 }
 
+class MockModelManagerWithFileSystemWatcher : public MockModelManager {
+public:
+    MockModelManagerWithFileSystemWatcher() {
+        watcherDebounceMs = 50;
+    }
+};
+
+TEST(ModelManager, ConfigReloadingWithFileSystemWatcherShouldAddNewModelBeforePollInterval) {
+    std::filesystem::create_directories(model_1_path);
+    std::filesystem::create_directories(model_2_path);
+    std::string fileToReload = "/tmp/ovms_config_file2.json";
+    createConfigFileWithContent(config_1_model, fileToReload);
+    modelMock = std::make_shared<MockModel>();
+    MockModelManagerWithFileSystemWatcher manager;
+    EXPECT_CALL(*modelMock, addVersion(_))
+        .WillRepeatedly(Return(ovms::Status(ovms::StatusCode::OK)));
+
+    auto status = manager.startFromFile(fileToReload);
+    ASSERT_EQ(status, ovms::StatusCode::OK);
+    manager.startWatcher();
+    EXPECT_EQ(manager.getModels().size(), 1);
+    // let watcher thread register inotify watches
+    std::this_thread::sleep_for(std::chrono::milliseconds(100));
+    createConfigFileWithContent(config_2_models, fileToReload);
+    std::this_thread::sleep_for(std::chrono::milliseconds(500));
+    EXPECT_EQ(manager.getModels().size(), 2);
+    manager.join();
+    modelMock.reset();
+}
+
+TEST(ModelManager, FileSystemWatcherReloadsAllModelsSharingBasePathAndRetriesFailedReload) {
+    const char* configSharedBasePath = R"({
+       "model_config_list": [
+        {
+          "config": {
+            "name": "resnet",
+            "base_path": "/tmp/models/shared",
+            "target_device": "CPU",
+            "model_version_policy": {"all": {}}
+          }
+        },
+        {
+          "config": {
+            "name": "alpha",
+            "base_path": "/tmp/models/shared",
+            "target_device": "CPU",
+            "model_version_policy": {"all": {}}
+          }
+        }]
+    })";
+    const std::string newVersionPath = "/tmp/models/shared/2";
+    std::filesystem::remove_all("/tmp/models/shared");
+    std::filesystem::create_directories("/tmp/models/shared/1");
+    std::string fileToReload = "/tmp/ovms_config_file_shared.json";
+    createConfigFileWithContent(configSharedBasePath, fileToReload);
+    modelMock = std::make_shared<MockModel>();
+    MockModelManagerWithFileSystemWatcher manager;
+    std::atomic<int> firstModelNewVersionLoads{0};
+    std::atomic<int> secondModelNewVersionLoads{0};
+    std::atomic<int> secondModelLoadsAfterChange{0};
+    EXPECT_CALL(*modelMock, addVersion(_))
+        .WillRepeatedly(Invoke([&](const ovms::ModelConfig& config) -> ovms::Status {
+            if (!std::filesystem::exists(newVersionPath)) {
+                return ovms::StatusCode::OK;
+            }
+            if (config.getName() == FIRST_MODEL_NAME) {
+                if (config.getVersion() == 2) {
+                    firstModelNewVersionLoads++;
+                }
+                return ovms::StatusCode::OK;
+            }
+            if (config.getVersion() == 2) {
+                secondModelNewVersionLoads++;
+            }
+            // first reload of both versions fails, as if files were still being copied
+            return ++secondModelLoadsAfterChange <= 2 ? ovms::StatusCode::FILE_INVALID : ovms::StatusCode::OK;
+        }));
+
+    auto status = manager.startFromFile(fileToReload);
+    ASSERT_EQ(status, ovms::StatusCode::OK);
+    manager.startWatcher();
+    EXPECT_EQ(manager.getModels().size(), 2);
+    // let watcher thread register inotify watches
+    std::this_thread::sleep_for(std::chrono::milliseconds(100));
+    std::filesystem::create_directories(newVersionPath);
+    std::this_thread::sleep_for(std::chrono::milliseconds(500));
+    EXPECT_EQ(firstModelNewVersionLoads, 1);
+    EXPECT_EQ(secondModelNewVersionLoads, 1);
+    // failed model is retried on poll although its directory does not change anymore
+    std::this_thread::sleep_for(std::chrono::seconds(2));
+    EXPECT_EQ(firstModelNewVersionLoads, 1);
+    EXPECT_GE(secondModelNewVersionLoads, 2);
+    manager.join();
+    modelMock.reset();
+    std::filesystem::remove_all("/tmp/models/shared");
+}
+
 TEST(ModelManager, ConfigReloadingWithWrongInputName) {
     ConstructorEnabledModelManager manager;
     ovms::ModelConfig config;
@@ -0,0 +1,152 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <future>
+#include <iomanip>
+#include <iostream>
+#include <mutex>
+#include <queue>
+#include <thread>
+#include <utility>
+#include <vector>
+
+#include <gtest/gtest.h>
+
+#include "../ovinferrequestsqueue.hpp"
+
+// Microbenchmark of stream id allocation, run with:
+// bazel test //src:ovms_test --test_filter="*IdleStreamQueueBenchmark*" --test_arg=--gtest_also_run_disabled_tests --test_output=streamed
+
+namespace {
+/**
+ * @brief Previous implementation based on mutexes and a promise per request, kept as a baseline
+ */
+class MutexIdleStreamQueue {
+public:
+    MutexIdleStreamQueue(int streamsLength) :
+        streams(streamsLength),
+        front_idx{0},
+        back_idx{0} {
+        for (int i = 0; i < streamsLength; ++i) {
+            streams[i] = i;
+        }
+    }
+
+    std::future<int> getIdleStream() {
+        int value;
+        std::promise<int> idleStreamPromise;
+        std::future<int> idleStreamFuture = idleStreamPromise.get_future();
+        std::unique_lock<std::mutex> lk(front_mut);
+        if (streams[front_idx] < 0) {
+            std::unique_lock<std::mutex> queueLock(queue_mutex);
+            promises.push(std::move(idleStreamPromise));
+        } else {
+            value = streams[front_idx];
+            streams[front_idx] = -1;
+            front_idx = (front_idx + 1) % streams.size();
+            lk.unlock();
+            idleStreamPromise.set_value(value);
+        }
+        return idleStreamFuture;
+    }
+
+    void returnStream(int streamID) {
+        std::unique_lock<std::mutex> lk(queue_mutex);
+        if (promises.size()) {
+            std::promise<int> promise = std::move(promises.front());
+            promises.pop();
+            lk.unlock();
+            promise.set_value(streamID);
+            return;
+        }
+        std::uint32_t old_back = back_idx.load();
+        while (!back_idx.compare_exchange_weak(
+            old_back,
+            (old_back + 1) % streams.size(),
+            std::memory_order_relaxed)) {
+        }
+        streams[old_back] = streamID;
+    }
+
+private:
+    std::vector<int> streams;
+    std::uint32_t front_idx;
+    std::atomic<std::uint32_t> back_idx;
+    std::mutex front_mut;
+    std::mutex queue_mutex;
+    std::queue<std::promise<int>> promises;
+};
+
+template <typename GetStream, typename ReturnStream>
+double measureOperationsPerSecond(int threadsCount, int iterations, GetStream getStream, ReturnStream returnStream) {
+    std::atomic<bool> start{false};
+    std::vector<std::thread> threads;
+    for (int i = 0; i < threadsCount; ++i) {
+        threads.emplace_back([&]() {
+            while (!start.load()) {
+                std::this_thread::yield();
+            }
+            for (int j = 0; j < iterations; ++j) {
+                returnStream(getStream());
+            }
+        });
+    }
+    auto begin = std::chrono::steady_clock::now();
+    start.store(true);
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - begin;
+    return threadsCount * iterations / elapsed.count();
+}
+}  // namespace
+
+TEST(DISABLED_IdleStreamQueueBenchmark, GetAndReturnStream) {
+    const int iterations = 20000;
+    const std::vector<int> threadsCounts = {1, 2, 4, 8, 16, 32, 64};
+    const std::vector<int> nireqs = {4, 64};
+    std::cout << std::setw(6) << "nireq" << std::setw(9) << "threads"
+              << std::setw(16) << "mutex ops/s" << std::setw(16) << "future ops/s"
+              << std::setw(16) << "wait ops/s" << std::setw(10) << "speedup" << std::endl;
+    for (int nireq : nireqs) {
+        for (int threadsCount : threadsCounts) {
+            MutexIdleStreamQueue mutexQueue(nireq);
+            double mutexOps = measureOperationsPerSecond(
+                threadsCount, iterations,
+                [&mutexQueue]() { return mutexQueue.getIdleStream().get(); },
+                [&mutexQueue](int streamId) { mutexQueue.returnStream(streamId); });
+
+            ovms::IdleStreamQueue futureQueue(nireq);
+            double futureOps = measureOperationsPerSecond(
+                threadsCount, iterations,
+                [&futureQueue]() { return futureQueue.getIdleStream().get(); },
+                [&futureQueue](int streamId) { futureQueue.returnStream(streamId); });
+
+            ovms::IdleStreamQueue waitQueue(nireq);
+            double waitOps = measureOperationsPerSecond(
+                threadsCount, iterations,
+                [&waitQueue]() { return waitQueue.waitForIdleStream(); },
+                [&waitQueue](int streamId) { waitQueue.returnStream(streamId); });
+
+            std::cout << std::setw(6) << nireq << std::setw(9) << threadsCount
+                      << std::fixed << std::setprecision(0)
+                      << std::setw(16) << mutexOps << std::setw(16) << futureOps << std::setw(16) << waitOps
+                      << std::setprecision(2) << std::setw(9) << waitOps / mutexOps << "x" << std::endl;
+        }
+    }
+}
@@ -14,11 +14,13 @@
 // limitations under the License.
 //*****************************************************************************
 
+#include <atomic>
 #include <chrono>
 #include <filesystem>
 #include <random>
 #include <string>
 #include <thread>
+#include <vector>
 
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
@@ -126,3 +128,90 @@ TEST(OVInferRequestQueue, AsyncGetInferRequest) {
     const int secondStreamId = secondStreamRequest.get();
     EXPECT_EQ(firstStreamId, secondStreamId);
 }
+
+TEST(OVInferRequestQueue, StreamAssignedNotification) {
+    InferenceEngine::Core engine;
+    InferenceEngine::CNNNetwork network = engine.ReadNetwork(DUMMY_MODEL_PATH);
+    InferenceEngine::ExecutableNetwork execNetwork = engine.LoadNetwork(network, "CPU");
+    const int nireq = 1;
+    ovms::OVInferRequestsQueue inferRequestsQueue(execNetwork, nireq);
+
+    auto firstNotification = std::make_shared<ovms::StreamAssignedNotification>();
+    auto secondNotification = std::make_shared<ovms::StreamAssignedNotification>();
+    std::future<int> firstStreamRequest = inferRequestsQueue.getIdleStream(firstNotification);
+    std::future<int> secondStreamRequest = inferRequestsQueue.getIdleStream(secondNotification);
+
+    // Stream was assigned right away, there is nothing to wait for
+    EXPECT_FALSE(firstNotification->subscribe([]() { FAIL() << "Notification of already assigned stream"; }));
+
+    bool notified = false;
+    EXPECT_TRUE(secondNotification->subscribe([&notified, &secondStreamRequest]() {
+        EXPECT_EQ(std::future_status::ready, secondStreamRequest.wait_for(std::chrono::microseconds(1)));
+        notified = true;
+    }));
+    EXPECT_FALSE(notified);
+    inferRequestsQueue.returnStream(firstStreamRequest.get());
+    EXPECT_TRUE(notified);
+    EXPECT_FALSE(secondNotification->subscribe([]() {}));
+}
+
+TEST(IdleStreamQueue, TryGetIdleStreamDoesNotOvertakeWaiters) {
+    ovms::IdleStreamQueue idleStreamQueue(1);
+    auto streamId = idleStreamQueue.tryGetIdleStream();
+    ASSERT_TRUE(streamId);
+    EXPECT_EQ(streamId.value(), 0);
+    EXPECT_FALSE(idleStreamQueue.tryGetIdleStream());
+
+    std::future<int> waitingRequest = idleStreamQueue.getIdleStream();
+    idleStreamQueue.returnStream(streamId.value());
+    // Returned stream goes to the waiting request
+    EXPECT_FALSE(idleStreamQueue.tryGetIdleStream());
+    ASSERT_EQ(std::future_status::ready, waitingRequest.wait_for(std::chrono::microseconds(1)));
+    idleStreamQueue.returnStream(waitingRequest.get());
+    EXPECT_TRUE(idleStreamQueue.tryGetIdleStream());
+}
+
+TEST(IdleStreamQueue, WaitersAreServedInOrder) {
+    ovms::IdleStreamQueue idleStreamQueue(2);
+    const int first = idleStreamQueue.waitForIdleStream();
+    const int second = idleStreamQueue.waitForIdleStream();
+    std::future<int> firstWaiter = idleStreamQueue.getIdleStream();
+    std::future<int> secondWaiter = idleStreamQueue.getIdleStream();
+    idleStreamQueue.returnStream(second);
+    ASSERT_EQ(std::future_status::ready, firstWaiter.wait_for(std::chrono::microseconds(1)));
+    EXPECT_EQ(firstWaiter.get(), second);
+    EXPECT_EQ(std::future_status::timeout, secondWaiter.wait_for(std::chrono::microseconds(1)));
+    idleStreamQueue.returnStream(first);
+    ASSERT_EQ(std::future_status::ready, secondWaiter.wait_for(std::chrono::microseconds(1)));
+    EXPECT_EQ(secondWaiter.get(), first);
+}
+
+TEST(IdleStreamQueue, MultiThreadStreamsAreExclusive) {
+    const int nireq = 3;
+    const int threadsCount = 16;
+    const int iterations = 10000;
+    ovms::IdleStreamQueue idleStreamQueue(nireq);
+    std::vector<std::atomic<int>> owners(nireq);
+    std::atomic<int> violations{0};
+    std::vector<std::thread> threads;
+    for (int i = 0; i < threadsCount; ++i) {
+        threads.emplace_back([&, i]() {
+            for (int j = 0; j < iterations; ++j) {
+                int streamId = (j % 2) ? idleStreamQueue.waitForIdleStream() : idleStreamQueue.getIdleStream().get();
+                if (owners[streamId].exchange(i + 1) != 0) {
+                    violations++;
+                }
+                owners[streamId].store(0);
+                idleStreamQueue.returnStream(streamId);
+            }
+        });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    EXPECT_EQ(violations.load(), 0);
+    for (int i = 0; i < nireq; ++i) {
+        EXPECT_TRUE(idleStreamQueue.tryGetIdleStream());
+    }
+    EXPECT_FALSE(idleStreamQueue.tryGetIdleStream());
+}
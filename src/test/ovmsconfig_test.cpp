@@ -21,6 +21,7 @@
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
 #include <sysexits.h>
+#include <unistd.h>
 
 #include "spdlog/spdlog.h"
 
@@ -176,6 +177,48 @@ TEST_F(DISABLED_OvmsConfigTest, negativeUint64Max) {
     EXPECT_EXIT(ovms::Config::instance().parse(arg_count, n_argv), ::testing::ExitedWithCode(EX_USAGE), "rest_port number out of range from 0 to 65535");
 }
 
+class OvmsConfigCacheDirTest : public ::testing::Test {
+public:
+    const std::string cacheDir = "/tmp/ovms_config_cache_dir";
+
+    void SetUp() override {
+        std::filesystem::remove_all(cacheDir);
+    }
+    void TearDown() override {
+        std::filesystem::remove_all(cacheDir);
+    }
+};
+
+TEST_F(OvmsConfigCacheDirTest, parsed) {
+    std::filesystem::create_directories(cacheDir);
+    char* n_argv[] = {"ovms", "--model_path", "/path1", "--model_name", "model", "--cache_dir", (char*)cacheDir.c_str()};
+    int arg_count = 7;
+    EXPECT_EXIT({
+        auto& config = ovms::Config::instance().parse(arg_count, n_argv);
+        exit(config.cacheDir() == cacheDir ? EX_OK : EX_SOFTWARE);
+    },
+        ::testing::ExitedWithCode(EX_OK), "");
+}
+
+TEST_F(OvmsConfigCacheDirTest, notDirectory) {
+    std::ofstream(cacheDir) << "not a directory";
+    char* n_argv[] = {"ovms", "--model_path", "/path1", "--model_name", "model", "--cache_dir", (char*)cacheDir.c_str()};
+    int arg_count = 7;
+    EXPECT_EXIT(ovms::Config::instance().parse(arg_count, n_argv), ::testing::ExitedWithCode(EX_USAGE), "is not a directory");
+}
+
+TEST_F(OvmsConfigCacheDirTest, notWritable) {
+    std::filesystem::create_directories(cacheDir);
+    std::filesystem::permissions(cacheDir, std::filesystem::perms::owner_read | std::filesystem::perms::owner_exec);
+    if (access(cacheDir.c_str(), W_OK) == 0) {
+        // permissions are not enforced e.g. for root
+        return;
+    }
+    char* n_argv[] = {"ovms", "--model_path", "/path1", "--model_name", "model", "--cache_dir", (char*)cacheDir.c_str()};
+    int arg_count = 7;
+    EXPECT_EXIT(ovms::Config::instance().parse(arg_count, n_argv), ::testing::ExitedWithCode(EX_USAGE), "is not writable");
+}
+
 class OvmsParamsTest : public ::testing::Test {
 };
 
@@ -35,6 +35,7 @@ class PredictValidation : public ::testing::Test {
         MockModelInstance() :
             ModelInstance("UNUSED_NAME", 42) {}
         MOCK_METHOD(const ovms::tensor_map_t&, getInputsInfo, (), (const, override));
+        MOCK_METHOD(const ovms::tensor_map_t&, getOutputsInfo, (), (const, override));
         MOCK_METHOD(size_t, getBatchSize, (), (const, override));
         MOCK_METHOD(const ovms::ModelConfig&, getModelConfig, (), (const, override));
         const ovms::Status mockValidate(const tensorflow::serving::PredictRequest* request) {
@@ -49,6 +50,7 @@ protected:
     tensorflow::serving::PredictRequest request;
     ovms::ModelConfig modelConfig{"model_name", "model_path"};
     ovms::tensor_map_t networkInputs;
+    ovms::tensor_map_t networkOutputs;
     std::unordered_map<std::string, InferenceEngine::TensorDesc> tensors;
 
     void SetUp() override {
@@ -67,7 +69,11 @@ protected:
                 pair.second.getLayout());
         }
 
+        networkOutputs["Output_FP32_1_10"] = std::make_shared<ovms::TensorInfo>(
+            "Output_FP32_1_10", InferenceEngine::Precision::FP32, ovms::shape_t{1, 10}, InferenceEngine::Layout::NC);
+
         ON_CALL(instance, getInputsInfo()).WillByDefault(ReturnRef(networkInputs));
+        ON_CALL(instance, getOutputsInfo()).WillByDefault(ReturnRef(networkOutputs));
         ON_CALL(instance, getBatchSize()).WillByDefault(Return(1));
         ON_CALL(instance, getModelConfig()).WillByDefault(ReturnRef(modelConfig));
 
@@ -131,6 +137,15 @@ TEST_F(PredictValidation, RequestWrongInputName) {
     EXPECT_EQ(status, ovms::StatusCode::INVALID_MISSING_INPUT);
 }
 
+TEST_F(PredictValidation, RequestOutputFilter) {
+    request.add_output_filter("Output_FP32_1_10");
+    EXPECT_TRUE(instance.mockValidate(&request).ok());
+
+    request.add_output_filter("Some_Output");
+    auto status = instance.mockValidate(&request);
+    EXPECT_EQ(status, ovms::StatusCode::INVALID_MISSING_OUTPUT);
+}
+
 TEST_F(PredictValidation, RequestTooManyShapeDimensions) {
     auto& input = (*request.mutable_inputs())["Input_FP32_1_3_224_224_NHWC"];
     input.mutable_tensor_shape()->add_dim()->set_size(16);
@@ -0,0 +1,225 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <atomic>
+#include <chrono>
+#include <cstring>
+#include <thread>
+#include <vector>
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "../metrics.hpp"
+#include "../requestbatcher.hpp"
+
+using ovms::RequestBatcher;
+using ovms::Status;
+using ovms::StatusCode;
+using testing::HasSubstr;
+using tensorflow::serving::PredictRequest;
+using tensorflow::serving::PredictResponse;
+
+static void prepareRequest(PredictRequest& request, const std::vector<float>& data, size_t rows) {
+    auto& input = (*request.mutable_inputs())["input"];
+    input.set_dtype(tensorflow::DataType::DT_FLOAT);
+    input.mutable_tensor_shape()->add_dim()->set_size(rows);
+    input.mutable_tensor_shape()->add_dim()->set_size(data.size() / rows);
+    input.mutable_tensor_content()->assign(reinterpret_cast<const char*>(data.data()), data.size() * sizeof(float));
+}
+
+static std::vector<float> readOutput(const PredictResponse& response, const std::string& name = "output") {
+    const auto& content = response.outputs().at(name).tensor_content();
+    std::vector<float> result(content.size() / sizeof(float));
+    std::memcpy(result.data(), content.data(), content.size());
+    return result;
+}
+
+// Returns input incremented by one under "output" name
+static Status incrementExecutor(const PredictRequest& request, PredictResponse& response) {
+    const auto& input = request.inputs().at("input");
+    auto& output = (*response.mutable_outputs())["output"];
+    output = input;
+    float* data = reinterpret_cast<float*>(output.mutable_tensor_content()->data());
+    for (size_t i = 0; i < input.tensor_content().size() / sizeof(float); i++) {
+        data[i] += 1;
+    }
+    return StatusCode::OK;
+}
+
+TEST(RequestBatcher, MergeRequestsPadsToBatchSize) {
+    PredictRequest first, second, merged;
+    prepareRequest(first, {1, 2}, 1);
+    prepareRequest(second, {3, 4, 5, 6}, 2);
+    auto status = RequestBatcher::mergeRequests({&first, &second}, 4, merged);
+    ASSERT_EQ(status, StatusCode::OK);
+    const auto& input = merged.inputs().at("input");
+    ASSERT_EQ(input.tensor_shape().dim(0).size(), 4);
+    ASSERT_EQ(input.tensor_shape().dim(1).size(), 2);
+    ASSERT_EQ(input.tensor_content().size(), 8 * sizeof(float));
+    std::vector<float> values(8);
+    std::memcpy(values.data(), input.tensor_content().data(), input.tensor_content().size());
+    EXPECT_EQ(values, std::vector<float>({1, 2, 3, 4, 5, 6, 0, 0}));
+}
+
+TEST(RequestBatcher, MergeRequestsRejectsTooManyRows) {
+    PredictRequest first, second, merged;
+    prepareRequest(first, {1, 2}, 2);
+    prepareRequest(second, {3, 4}, 2);
+    EXPECT_EQ(RequestBatcher::mergeRequests({&first, &second}, 3, merged), StatusCode::INVALID_BATCH_SIZE);
+}
+
+TEST(RequestBatcher, MergeRequestsRepeatsLastBinaryInput) {
+    PredictRequest first, merged;
+    auto& input = (*first.mutable_inputs())["input"];
+    input.set_dtype(tensorflow::DataType::DT_STRING);
+    input.mutable_tensor_shape()->add_dim()->set_size(1);
+    input.add_string_val("image");
+    ASSERT_EQ(RequestBatcher::mergeRequests({&first}, 3, merged), StatusCode::OK);
+    const auto& mergedInput = merged.inputs().at("input");
+    ASSERT_EQ(mergedInput.string_val_size(), 3);
+    EXPECT_EQ(mergedInput.string_val(2), "image");
+    EXPECT_EQ(mergedInput.tensor_shape().dim(0).size(), 3);
+}
+
+TEST(RequestBatcher, SplitResponse) {
+    PredictRequest request;
+    prepareRequest(request, {1, 2, 3, 4, 5, 6, 7, 8}, 4);
+    PredictResponse merged, first, second;
+    auto& output = (*merged.mutable_outputs())["output"];
+    output = request.inputs().at("input");
+    ASSERT_EQ(RequestBatcher::splitResponse(merged, {&request, &request}, {1, 2}, {&first, &second}), StatusCode::OK);
+    EXPECT_EQ(first.outputs().at("output").tensor_shape().dim(0).size(), 1);
+    EXPECT_EQ(readOutput(first), std::vector<float>({1, 2}));
+    EXPECT_EQ(second.outputs().at("output").tensor_shape().dim(0).size(), 2);
+    EXPECT_EQ(readOutput(second), std::vector<float>({3, 4, 5, 6}));
+}
+
+TEST(RequestBatcher, SplitResponseRejectsOutputWithoutBatchDimension) {
+    PredictRequest request;
+    prepareRequest(request, {1, 2}, 1);
+    PredictResponse merged, first, second;
+    (*merged.mutable_outputs())["output"] = request.inputs().at("input");
+    EXPECT_EQ(RequestBatcher::splitResponse(merged, {&request, &request}, {1, 1}, {&first, &second}), StatusCode::INTERNAL_ERROR);
+}
+
+TEST(RequestBatcher, MergeRequestsMergesOutputFilters) {
+    PredictRequest first, second, third, merged;
+    prepareRequest(first, {1}, 1);
+    prepareRequest(second, {2}, 1);
+    prepareRequest(third, {3}, 1);
+    first.add_output_filter("b");
+    second.add_output_filter("a");
+    second.add_output_filter("b");
+    ASSERT_EQ(RequestBatcher::mergeRequests({&first, &second}, 2, merged), StatusCode::OK);
+    ASSERT_EQ(merged.output_filter_size(), 2);
+    EXPECT_EQ(merged.output_filter(0), "a");
+    EXPECT_EQ(merged.output_filter(1), "b");
+    ASSERT_EQ(RequestBatcher::mergeRequests({&first, &third}, 2, merged), StatusCode::OK);
+    EXPECT_EQ(merged.output_filter_size(), 0);
+}
+
+TEST(RequestBatcher, SplitResponseSkipsFilteredOutputs) {
+    PredictRequest request, first, second;
+    prepareRequest(request, {1, 2, 3}, 3);
+    first.add_output_filter("other");
+    PredictResponse merged, firstResponse, secondResponse;
+    (*merged.mutable_outputs())["output"] = request.inputs().at("input");
+    (*merged.mutable_outputs())["other"] = request.inputs().at("input");
+    ASSERT_EQ(RequestBatcher::splitResponse(merged, {&first, &second}, {1, 2}, {&firstResponse, &secondResponse}), StatusCode::OK);
+    ASSERT_EQ(firstResponse.outputs_size(), 1);
+    EXPECT_EQ(readOutput(firstResponse, "other"), std::vector<float>({1}));
+    ASSERT_EQ(secondResponse.outputs_size(), 2);
+    EXPECT_EQ(readOutput(secondResponse, "output"), std::vector<float>({2, 3}));
+    EXPECT_EQ(readOutput(secondResponse, "other"), std::vector<float>({2, 3}));
+}
+
+TEST(RequestBatcher, SingleRequestExecutedAfterTimeout) {
+    RequestBatcher batcher("dummy", 1, 4, std::chrono::microseconds(1000), incrementExecutor);
+    PredictRequest request;
+    PredictResponse response;
+    prepareRequest(request, {1, 2}, 1);
+    ASSERT_EQ(batcher.infer(request, response), StatusCode::OK);
+    EXPECT_EQ(readOutput(response), std::vector<float>({2, 3}));
+    auto metrics = batcher.getMetrics();
+    EXPECT_EQ(metrics.batchesCount, 1);
+    EXPECT_EQ(metrics.requestsCount, 1);
+    EXPECT_EQ(metrics.filledSlotsCount, 1);
+    EXPECT_DOUBLE_EQ(metrics.averageBatchFill(), 0.25);
+}
+
+TEST(RequestBatcher, ConcurrentRequestsAreCoalesced) {
+    const size_t maxBatchSize = 4;
+    const size_t requestsCount = 16;
+    std::atomic<int> executions{0};
+    RequestBatcher batcher("dummy", 1, maxBatchSize, std::chrono::microseconds(1000000),
+        [&executions](const PredictRequest& request, PredictResponse& response) {
+            executions++;
+            return incrementExecutor(request, response);
+        });
+    std::vector<PredictRequest> requests(requestsCount);
+    std::vector<PredictResponse> responses(requestsCount);
+    std::vector<Status> statuses(requestsCount);
+    std::vector<std::thread> threads;
+    for (size_t i = 0; i < requestsCount; i++) {
+        prepareRequest(requests[i], {float(i), float(i) * 10}, 1);
+        threads.emplace_back([&, i]() { statuses[i] = batcher.infer(requests[i], responses[i]); });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    for (size_t i = 0; i < requestsCount; i++) {
+        ASSERT_EQ(statuses[i], StatusCode::OK);
+        EXPECT_EQ(readOutput(responses[i]), std::vector<float>({float(i) + 1, float(i) * 10 + 1}));
+    }
+    // Batches are closed as soon as they are full, long timeout would fail the test otherwise
+    EXPECT_EQ(executions.load(), requestsCount / maxBatchSize);
+    EXPECT_EQ(batcher.getMetrics().filledSlotsCount, requestsCount);
+}
+
+TEST(RequestBatcher, ExecutorErrorIsReturnedToAllRequests) {
+    RequestBatcher batcher("dummy", 1, 2, std::chrono::microseconds(1000000),
+        [](const PredictRequest&, PredictResponse&) { return Status(StatusCode::OV_INTERNAL_INFERENCE_ERROR); });
+    PredictRequest first, second;
+    PredictResponse firstResponse, secondResponse;
+    prepareRequest(first, {1}, 1);
+    prepareRequest(second, {2}, 1);
+    Status secondStatus;
+    std::thread thread([&]() { secondStatus = batcher.infer(second, secondResponse); });
+    EXPECT_EQ(batcher.infer(first, firstResponse), StatusCode::OV_INTERNAL_INFERENCE_ERROR);
+    thread.join();
+    EXPECT_EQ(secondStatus, StatusCode::OV_INTERNAL_INFERENCE_ERROR);
+}
+
+TEST(RequestBatcher, RequestLargerThanMaxBatchSizeIsRejected) {
+    RequestBatcher batcher("dummy", 1, 2, std::chrono::microseconds(1000), incrementExecutor);
+    PredictRequest request;
+    PredictResponse response;
+    prepareRequest(request, {1, 2, 3}, 3);
+    EXPECT_EQ(batcher.infer(request, response), StatusCode::INVALID_BATCH_SIZE);
+}
+
+TEST(RequestBatcher, MetricsAreLabeledWithModelVersion) {
+    RequestBatcher batcher("batcher_metrics_dummy", 3, 2, std::chrono::microseconds(1000), incrementExecutor);
+    PredictRequest request;
+    PredictResponse response;
+    prepareRequest(request, {1, 2}, 1);
+    ASSERT_EQ(batcher.infer(request, response), StatusCode::OK);
+    auto text = ovms::MetricRegistry::getInstance().collect();
+    EXPECT_THAT(text, HasSubstr("ovms_batches_total{name=\"batcher_metrics_dummy\",version=\"3\"} 1\n"));
+    EXPECT_THAT(text, HasSubstr("ovms_batch_filled_slots_total{name=\"batcher_metrics_dummy\",version=\"3\"} 1\n"));
+    EXPECT_THAT(text, HasSubstr("ovms_batch_slots_total{name=\"batcher_metrics_dummy\",version=\"3\"} 2\n"));
+    EXPECT_THAT(text, HasSubstr("ovms_batch_queue_time_microseconds_count{name=\"batcher_metrics_dummy\",version=\"3\"} 1\n"));
+}
@@ -0,0 +1,176 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <string>
+#include <vector>
+
+#include <gtest/gtest.h>
+
+#include "../metrics.hpp"
+#include "../responsecache.hpp"
+
+using ovms::MetricRegistry;
+using ovms::ResponseCache;
+using ovms::ResponseCacheKey;
+using tensorflow::serving::PredictRequest;
+using tensorflow::serving::PredictResponse;
+
+static void prepareRequest(PredictRequest& request, const std::string& name, const std::vector<float>& data) {
+    auto& input = (*request.mutable_inputs())[name];
+    input.set_dtype(tensorflow::DataType::DT_FLOAT);
+    input.mutable_tensor_shape()->add_dim()->set_size(1);
+    input.mutable_tensor_shape()->add_dim()->set_size(data.size());
+    input.mutable_tensor_content()->assign(reinterpret_cast<const char*>(data.data()), data.size() * sizeof(float));
+}
+
+static void prepareResponse(PredictResponse& response, size_t contentSize, char value = 'a') {
+    auto& output = (*response.mutable_outputs())["output"];
+    output.set_dtype(tensorflow::DataType::DT_UINT8);
+    output.mutable_tensor_shape()->add_dim()->set_size(contentSize);
+    output.mutable_tensor_content()->assign(contentSize, value);
+}
+
+static ResponseCacheKey keyOf(const std::vector<float>& data) {
+    PredictRequest request;
+    prepareRequest(request, "input", data);
+    return ResponseCache::computeKey(request);
+}
+
+TEST(ResponseCache, KeyDependsOnInputContent) {
+    EXPECT_EQ(keyOf({1.0f, 2.0f, 3.0f}), keyOf({1.0f, 2.0f, 3.0f}));
+    EXPECT_FALSE(keyOf({1.0f, 2.0f, 3.0f}) == keyOf({1.0f, 2.0f, 4.0f}));
+    EXPECT_FALSE(keyOf({1.0f, 2.0f, 3.0f}) == keyOf({1.0f, 2.0f}));
+}
+
+TEST(ResponseCache, KeyDependsOnShapeAndPrecision) {
+    PredictRequest request;
+    prepareRequest(request, "input", {1.0f, 2.0f, 3.0f, 4.0f});
+    auto key = ResponseCache::computeKey(request);
+
+    PredictRequest reshaped = request;
+    auto& reshapedInput = (*reshaped.mutable_inputs())["input"];
+    reshapedInput.mutable_tensor_shape()->mutable_dim(0)->set_size(2);
+    reshapedInput.mutable_tensor_shape()->mutable_dim(1)->set_size(2);
+    EXPECT_FALSE(key == ResponseCache::computeKey(reshaped));
+
+    PredictRequest retyped = request;
+    (*retyped.mutable_inputs())["input"].set_dtype(tensorflow::DataType::DT_INT32);
+    EXPECT_FALSE(key == ResponseCache::computeKey(retyped));
+}
+
+TEST(ResponseCache, KeyDependsOnValFieldsAndOutputFilter) {
+    PredictRequest request;
+    auto& input = (*request.mutable_inputs())["image"];
+    input.set_dtype(tensorflow::DataType::DT_STRING);
+    input.mutable_tensor_shape()->add_dim()->set_size(1);
+    input.add_string_val("first image");
+    auto key = ResponseCache::computeKey(request);
+
+    PredictRequest other = request;
+    (*other.mutable_inputs())["image"].set_string_val(0, "other image");
+    EXPECT_FALSE(key == ResponseCache::computeKey(other));
+
+    PredictRequest filtered = request;
+    filtered.add_output_filter("output");
+    EXPECT_FALSE(key == ResponseCache::computeKey(filtered));
+}
+
+TEST(ResponseCache, KeyDoesNotDependOnInputsOrder) {
+    PredictRequest first, second;
+    prepareRequest(first, "a", {1.0f});
+    prepareRequest(first, "b", {2.0f});
+    prepareRequest(second, "b", {2.0f});
+    prepareRequest(second, "a", {1.0f});
+    EXPECT_EQ(ResponseCache::computeKey(first), ResponseCache::computeKey(second));
+
+    PredictRequest swapped;
+    prepareRequest(swapped, "a", {2.0f});
+    prepareRequest(swapped, "b", {1.0f});
+    EXPECT_FALSE(ResponseCache::computeKey(first) == ResponseCache::computeKey(swapped));
+}
+
+TEST(ResponseCache, GetReturnsStoredResponse) {
+    ResponseCache cache("response_cache_get", 1, 1024 * 1024);
+    auto key = keyOf({1.0f});
+    PredictResponse response, cached;
+    prepareResponse(response, 16, 'x');
+
+    EXPECT_FALSE(cache.get(key, cached));
+    cache.put(key, response);
+    ASSERT_TRUE(cache.get(key, cached));
+    ASSERT_EQ(cached.outputs().count("output"), 1);
+    EXPECT_EQ(cached.outputs().at("output").tensor_content(), std::string(16, 'x'));
+    EXPECT_EQ(cache.getEntriesCount(), 1);
+    EXPECT_EQ(cache.getSize(), response.ByteSizeLong());
+}
+
+TEST(ResponseCache, EvictsLeastRecentlyUsed) {
+    PredictResponse response;
+    prepareResponse(response, 100);
+    ResponseCache cache("response_cache_evict", 1, response.ByteSizeLong() * 2);
+    auto first = keyOf({1.0f});
+    auto second = keyOf({2.0f});
+    auto third = keyOf({3.0f});
+
+    cache.put(first, response);
+    cache.put(second, response);
+    PredictResponse cached;
+    ASSERT_TRUE(cache.get(first, cached));
+    cache.put(third, response);
+
+    EXPECT_EQ(cache.getEntriesCount(), 2);
+    EXPECT_TRUE(cache.get(first, cached));
+    EXPECT_FALSE(cache.get(second, cached));
+    EXPECT_TRUE(cache.get(third, cached));
+    EXPECT_LE(cache.getSize(), cache.getCapacity());
+}
+
+TEST(ResponseCache, ResponseLargerThanCapacityIsNotStored) {
+    ResponseCache cache("response_cache_large", 1, 64);
+    PredictResponse response, cached;
+    prepareResponse(response, 128);
+    auto key = keyOf({1.0f});
+    cache.put(key, response);
+    EXPECT_EQ(cache.getEntriesCount(), 0);
+    EXPECT_FALSE(cache.get(key, cached));
+}
+
+TEST(ResponseCache, Clear) {
+    ResponseCache cache("response_cache_clear", 1, 1024 * 1024);
+    PredictResponse response, cached;
+    prepareResponse(response, 16);
+    auto key = keyOf({1.0f});
+    cache.put(key, response);
+    cache.clear();
+    EXPECT_EQ(cache.getEntriesCount(), 0);
+    EXPECT_EQ(cache.getSize(), 0);
+    EXPECT_FALSE(cache.get(key, cached));
+}
+
+TEST(ResponseCache, HitAndMissCounters) {
+    ResponseCache cache("response_cache_counters", 3, 1024 * 1024);
+    auto& hits = MetricRegistry::getInstance().counter("ovms_response_cache_hits_total", "").labeled({{"name", "response_cache_counters"}, {"version", "3"}});
+    auto& misses = MetricRegistry::getInstance().counter("ovms_response_cache_misses_total", "").labeled({{"name", "response_cache_counters"}, {"version", "3"}});
+    PredictResponse response, cached;
+    prepareResponse(response, 16);
+    auto key = keyOf({1.0f});
+
+    cache.get(key, cached);
+    cache.put(key, response);
+    cache.get(key, cached);
+    cache.get(key, cached);
+    EXPECT_EQ(hits.get(), 2);
+    EXPECT_EQ(misses.get(), 1);
+}
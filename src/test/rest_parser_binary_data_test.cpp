@@ -0,0 +1,175 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <cstring>
+#include <string>
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "../rest_parser.hpp"
+#include "test_utils.hpp"
+
+using namespace ovms;
+
+using ::testing::ElementsAre;
+
+class RestParserBinaryData : public ::testing::Test {
+protected:
+    std::string body;
+
+    void prepareBody(const std::string& header, const void* data, size_t size) {
+        body = header;
+        body.append(static_cast<const char*>(data), size);
+    }
+};
+
+TEST_F(RestParserBinaryData, TwoInputs) {
+    float a[4] = {1.0f, 2.5f, -3.0f, 4.0f};
+    int32_t b[2] = {7, -8};
+    std::string data(reinterpret_cast<const char*>(a), sizeof(a));
+    data.append(reinterpret_cast<const char*>(b), sizeof(b));
+    std::string header = R"({"inputs":[{"name":"a","dtype":"DT_FLOAT","shape":[1,4],"offset":0,"size":16},{"name":"b","dtype":"DT_INT32","shape":[1,2],"offset":16,"size":8}]})";
+    prepareBody(header, data.data(), data.size());
+
+    RestParser parser(prepareTensors({{"a", {1, 4}}, {"b", {1, 2}}}));
+    ASSERT_EQ(parser.parseBinary(body, header.size()), StatusCode::OK);
+    EXPECT_EQ(parser.getOrder(), Order::BINARY);
+    EXPECT_EQ(parser.getFormat(), Format::NAMED);
+    ASSERT_EQ(parser.getProto().inputs_size(), 2);
+    const auto& protoA = parser.getProto().inputs().at("a");
+    const auto& protoB = parser.getProto().inputs().at("b");
+    EXPECT_EQ(protoA.dtype(), tensorflow::DataType::DT_FLOAT);
+    EXPECT_THAT(asVector(protoA.tensor_shape()), ElementsAre(1, 4));
+    ASSERT_EQ(protoA.tensor_content().size(), sizeof(a));
+    EXPECT_EQ(std::memcmp(protoA.tensor_content().data(), a, sizeof(a)), 0);
+    EXPECT_EQ(protoB.dtype(), tensorflow::DataType::DT_INT32);
+    EXPECT_THAT(asVector(protoB.tensor_shape()), ElementsAre(1, 2));
+    ASSERT_EQ(protoB.tensor_content().size(), sizeof(b));
+    EXPECT_EQ(std::memcmp(protoB.tensor_content().data(), b, sizeof(b)), 0);
+}
+
+TEST_F(RestParserBinaryData, DefaultDtypeAndOffsets) {
+    float data[6] = {1.0f, 2.0f, 3.0f, 4.0f, 5.0f, 6.0f};
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,2]},{"name":"b","shape":[1,4]}]})";
+    prepareBody(header, data, sizeof(data));
+
+    RestParser parser(prepareTensors({{"a", {1, 2}}, {"b", {1, 4}}}));
+    ASSERT_EQ(parser.parseBinary(body, header.size()), StatusCode::OK);
+    const auto& protoA = parser.getProto().inputs().at("a");
+    const auto& protoB = parser.getProto().inputs().at("b");
+    EXPECT_EQ(protoA.dtype(), tensorflow::DataType::DT_FLOAT);
+    EXPECT_EQ(std::memcmp(protoA.tensor_content().data(), data, 2 * sizeof(float)), 0);
+    EXPECT_EQ(protoB.dtype(), tensorflow::DataType::DT_FLOAT);
+    EXPECT_EQ(std::memcmp(protoB.tensor_content().data(), data + 2, 4 * sizeof(float)), 0);
+}
+
+TEST_F(RestParserBinaryData, UnusedInputsAreRemoved) {
+    float data[2] = {1.0f, 2.0f};
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,2]}]})";
+    prepareBody(header, data, sizeof(data));
+
+    RestParser parser(prepareTensors({{"a", {1, 2}}, {"b", {1, 4}}}));
+    ASSERT_EQ(parser.parseBinary(body, header.size()), StatusCode::OK);
+    ASSERT_EQ(parser.getProto().inputs_size(), 1);
+    EXPECT_EQ(parser.getProto().inputs().count("a"), 1);
+}
+
+TEST_F(RestParserBinaryData, SequenceInputsAreStoredInValFields) {
+    uint64_t sequenceId = 42;
+    uint32_t sequenceControl = 1;
+    std::string header = R"({"inputs":[{"name":"sequence_id","dtype":"DT_UINT64","shape":[1]},{"name":"sequence_control_input","dtype":"DT_UINT32","shape":[1]}]})";
+    std::string data(reinterpret_cast<const char*>(&sequenceId), sizeof(sequenceId));
+    data.append(reinterpret_cast<const char*>(&sequenceControl), sizeof(sequenceControl));
+    prepareBody(header, data.data(), data.size());
+
+    RestParser parser(prepareTensors({}));
+    ASSERT_EQ(parser.parseBinary(body, header.size()), StatusCode::OK);
+    const auto& sequenceIdProto = parser.getProto().inputs().at("sequence_id");
+    const auto& sequenceControlProto = parser.getProto().inputs().at("sequence_control_input");
+    ASSERT_EQ(sequenceIdProto.uint64_val_size(), 1);
+    EXPECT_EQ(sequenceIdProto.uint64_val(0), 42);
+    ASSERT_EQ(sequenceControlProto.uint32_val_size(), 1);
+    EXPECT_EQ(sequenceControlProto.uint32_val(0), 1);
+}
+
+TEST_F(RestParserBinaryData, HeaderLengthExceedsBody) {
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,2]}]})";
+    prepareBody(header, nullptr, 0);
+
+    RestParser parser(prepareTensors({{"a", {1, 2}}}));
+    EXPECT_EQ(parser.parseBinary(body, header.size() + 1), StatusCode::REST_BINARY_INVALID_HEADER_LENGTH);
+}
+
+TEST_F(RestParserBinaryData, InvalidHeader) {
+    float data[2] = {1.0f, 2.0f};
+    RestParser parser(prepareTensors({{"a", {1, 2}}}));
+
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,2]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::JSON_INVALID);
+
+    header = R"({"inputs":[]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_NO_INPUTS_FOUND);
+
+    header = R"({"inputs":[{"name":"a"}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_INPUT_HEADER);
+
+    header = R"({"inputs":[{"name":"a","shape":[1,-2]}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_INPUT_HEADER);
+
+    header = R"({"inputs":[{"name":"a","dtype":"FLOAT","shape":[1,2]}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_INPUT_HEADER);
+
+    header = R"({"inputs":[{"name":"unknown","shape":[1,2]}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_INPUT_HEADER);
+}
+
+TEST_F(RestParserBinaryData, InvalidTensorData) {
+    float data[2] = {1.0f, 2.0f};
+    RestParser parser(prepareTensors({{"a", {1, 2}}}));
+
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,3]}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_TENSOR_DATA);
+
+    header = R"({"inputs":[{"name":"a","shape":[1,2],"offset":4}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_TENSOR_DATA);
+
+    header = R"({"inputs":[{"name":"a","shape":[1,2],"size":4}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_TENSOR_DATA);
+
+    header = R"({"inputs":[{"name":"a","shape":[4294967296,4294967296,4294967296]}]})";
+    prepareBody(header, data, sizeof(data));
+    EXPECT_EQ(parser.parseBinary(body, header.size()), StatusCode::REST_BINARY_INVALID_TENSOR_DATA);
+}
+
+TEST_F(RestParserBinaryData, OutputFilter) {
+    float data[2] = {1.0f, 2.0f};
+    std::string header = R"({"inputs":[{"name":"a","shape":[1,2]}],"output_filter":["b"]})";
+    prepareBody(header, data, sizeof(data));
+
+    RestParser parser(prepareTensors({{"a", {1, 2}}}));
+    ASSERT_EQ(parser.parseBinary(body, header.size()), StatusCode::OK);
+    ASSERT_EQ(parser.getProto().output_filter_size(), 1);
+    EXPECT_EQ(parser.getProto().output_filter(0), "b");
+}
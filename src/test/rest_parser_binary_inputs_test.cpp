@@ -105,3 +105,13 @@ TEST_F(RestParserBinaryInputs, RowNoNamed) {
     ASSERT_EQ(parser.getProto().inputs().find("k")->second.string_val_size(), 1);
     EXPECT_EQ(std::memcmp(parser.getProto().inputs().find("k")->second.string_val(0).c_str(), image_bytes.get(), filesize), 0);
 }
+
+TEST_F(RestParserBinaryInputs, ColumnNamedParsedInsitu) {
+    std::string request = R"({"signature_name":"","inputs":{"k":[{"b64":")" + b64encoded + R"("}]}})";
+
+    RestParser parser(prepareTensors({}, InferenceEngine::Precision::FP16));
+    ASSERT_EQ(parser.parseInsitu(request.data()), StatusCode::OK);
+    ASSERT_EQ(parser.getProto().inputs().count("k"), 1);
+    ASSERT_EQ(parser.getProto().inputs().find("k")->second.string_val_size(), 1);
+    EXPECT_EQ(std::memcmp(parser.getProto().inputs().find("k")->second.string_val(0).c_str(), image_bytes.get(), filesize), 0);
+}
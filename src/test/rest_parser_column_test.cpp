@@ -611,3 +611,43 @@ TEST(RestParserColumn, RemoveUnnecessaryInputs) {
     ASSERT_EQ(parser.getProto().inputs().count("k"), 1);
     ASSERT_EQ(parser.getProto().inputs().count("l"), 1);
 }
+
+TEST(RestParserColumn, ParseInsituValid2Inputs) {
+    RestParser parser(prepareTensors({{"inputA", {2, 2, 3, 2}},
+        {"inputB", {2, 2, 3}}}));
+
+    std::string request = predictRequestColumnNamedJson;
+    auto status = parser.parseInsitu(request.data());
+
+    ASSERT_EQ(status, StatusCode::OK);
+    EXPECT_EQ(parser.getOrder(), Order::COLUMN);
+    EXPECT_EQ(parser.getFormat(), Format::NAMED);
+    ASSERT_EQ(parser.getProto().inputs_size(), 2);
+    const auto& inputA = parser.getProto().inputs().at("inputA");
+    const auto& inputB = parser.getProto().inputs().at("inputB");
+    EXPECT_THAT(asVector(inputA.tensor_shape()), ElementsAre(2, 2, 3, 2));
+    EXPECT_THAT(asVector(inputB.tensor_shape()), ElementsAre(2, 2, 3));
+    EXPECT_THAT(asVector<float>(inputB.tensor_content()), ElementsAre(
+                                                              1.0, 2.0, 3.0,
+                                                              4.0, 5.0, 6.0,
+                                                              //============
+                                                              11.0, 12, 13.0,
+                                                              14.0, 15.0, 16.0));
+}
+
+TEST(RestParserColumn, ParseInsituInvalidJson) {
+    RestParser parser(prepareTensors({{"i", {1, 1}}}));
+    std::string request = R"({"inputs":{"i":[[1.0]])";
+    EXPECT_EQ(parser.parseInsitu(request.data()), StatusCode::JSON_INVALID);
+}
+
+TEST(RestParserColumn, MixedNumberTypesInArray) {
+    RestParser parser(prepareTensors({{"i", {1, 3}}}, InferenceEngine::Precision::I32));
+    ASSERT_EQ(parser.parse(R"({"inputs":{"i":[[1, 2.0, 3]]}})"), StatusCode::OK);
+    EXPECT_THAT(asVector<int32_t>(parser.getProto().inputs().at("i").tensor_content()), ElementsAre(1, 2, 3));
+}
+
+TEST(RestParserColumn, NonNumericValueInArrayIsRejected) {
+    RestParser parser(prepareTensors({{"i", {1, 3}}}));
+    EXPECT_EQ(parser.parse(R"({"inputs":{"i":[[1.0, "a", 3.0]]}})"), StatusCode::REST_COULD_NOT_PARSE_INPUT);
+}
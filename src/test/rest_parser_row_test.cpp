@@ -639,3 +639,20 @@ TEST(RestParserRow, RemoveUnnecessaryInputs) {
     ASSERT_EQ(parser.getProto().inputs().count("k"), 1);
     ASSERT_EQ(parser.getProto().inputs().count("l"), 1);
 }
+
+TEST(RestParserRow, OutputFilter) {
+    RestParser parser(prepareTensors({{"i", {1, 1}}}));
+
+    ASSERT_EQ(parser.parse(R"({"output_filter":["a","b"],"instances":[{"i":[1.0]}]})"), StatusCode::OK);
+    ASSERT_EQ(parser.getProto().output_filter_size(), 2);
+    EXPECT_EQ(parser.getProto().output_filter(0), "a");
+    EXPECT_EQ(parser.getProto().output_filter(1), "b");
+}
+
+TEST(RestParserRow, InvalidOutputFilter) {
+    RestParser parser(prepareTensors({{"i", {1, 1}}}));
+    EXPECT_EQ(parser.parse(R"({"output_filter":"a","instances":[{"i":[1.0]}]})"), StatusCode::REST_INVALID_OUTPUT_FILTER);
+
+    RestParser parser2(prepareTensors({{"i", {1, 1}}}));
+    EXPECT_EQ(parser2.parse(R"({"output_filter":[1],"instances":[{"i":[1.0]}]})"), StatusCode::REST_INVALID_OUTPUT_FILTER);
+}
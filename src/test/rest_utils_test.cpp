@@ -13,6 +13,8 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 //*****************************************************************************
+#include <limits>
+
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
 
@@ -267,6 +269,24 @@ TEST_F(RestUtilsTest, MakeJsonFromPredictResponse_ErrorWhenNoOutputs) {
     EXPECT_EQ(makeJsonFromPredictResponse(proto, &json, Order::COLUMN), StatusCode::REST_PROTO_TO_STRING_ERROR);
 }
 
+TEST_F(RestUtilsTest, MakeJsonFromPredictResponse_RowOrder_InconsistentBatchSizeError) {
+    output2->mutable_tensor_shape()->mutable_dim(0)->set_size(1);
+    output2->mutable_tensor_shape()->mutable_dim(1)->set_size(10);
+    EXPECT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::REST_PROTO_TO_STRING_ERROR);
+    EXPECT_EQ(makeJsonFromPredictResponse(proto, &json, Order::COLUMN), StatusCode::OK);
+}
+
+TEST_F(RestUtilsTest, MakeJsonFromPredictResponse_RowOrder_ScalarOutputError) {
+    proto.mutable_outputs()->erase("output1");
+    output2->mutable_tensor_shape()->clear_dim();
+    output2->mutable_tensor_content()->resize(1);
+    EXPECT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::REST_PROTO_TO_STRING_ERROR);
+    ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::COLUMN), StatusCode::OK);
+    EXPECT_EQ(json, R"({
+    "outputs": 5
+})");
+}
+
 TEST_F(RestUtilsTest, Base64DecodeCorrect) {
     std::string bytes = "abcd";
     std::string decodedBytes;
@@ -451,6 +471,42 @@ TEST_F(RestUtilsPrecisionTest, MakeJsonFromPredictResponse_Uint64) {
 })");
 }
 
+TEST_F(RestUtilsPrecisionTest, MakeJsonFromPredictResponse_FloatShortestRepresentation) {
+    float data[4] = {0.1f, 1e-7f, 3.4028235e38f, 123456.79f};
+    output->set_dtype(tensorflow::DataType::DT_FLOAT);
+    output->mutable_tensor_shape()->mutable_dim(1)->set_size(4);
+    output->mutable_tensor_content()->assign(reinterpret_cast<const char*>(data), 4 * sizeof(float));
+    ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::OK);
+    EXPECT_EQ(json, R"({
+    "predictions": [[0.1, 1e-7, 3.4028235e38, 123456.79]
+    ]
+})");
+}
+
+TEST_F(RestUtilsPrecisionTest, MakeJsonFromPredictResponse_FloatNonFinite) {
+    float data[3] = {std::numeric_limits<float>::quiet_NaN(), std::numeric_limits<float>::infinity(), -std::numeric_limits<float>::infinity()};
+    output->set_dtype(tensorflow::DataType::DT_FLOAT);
+    output->mutable_tensor_shape()->mutable_dim(1)->set_size(3);
+    output->mutable_tensor_content()->assign(reinterpret_cast<const char*>(data), 3 * sizeof(float));
+    ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::OK);
+    EXPECT_EQ(json, R"({
+    "predictions": [[NaN, Infinity, -Infinity]
+    ]
+})");
+}
+
+TEST_F(RestUtilsPrecisionTest, MakeJsonFromPredictResponse_DoubleShortestRepresentation) {
+    double data[2] = {0.1, -2.5e-10};
+    output->set_dtype(tensorflow::DataType::DT_DOUBLE);
+    output->mutable_tensor_shape()->mutable_dim(1)->set_size(2);
+    output->mutable_tensor_content()->assign(reinterpret_cast<const char*>(data), 2 * sizeof(double));
+    ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::OK);
+    EXPECT_EQ(json, R"({
+    "predictions": [[0.1, -2.5e-10]
+    ]
+})");
+}
+
 TEST_F(RestUtilsValTest, MakeJsonFromPredictResponse_ColumnOrder_ContainSingleUint64Val) {
     proto.mutable_outputs()->erase("two_uint32_vals");
     ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::COLUMN), StatusCode::OK);
@@ -570,3 +626,55 @@ TEST_F(RestUtilsValTest, MakeJsonFromPredictResponse_ColumnOrder_ContainTwoUint3
 
     EXPECT_TRUE(is_in_first_order || is_in_second_order);
 }
+
+TEST_F(RestUtilsValTest, MakeJsonFromPredictResponse_RowOrder_ContainTwoUint32Vals) {
+    proto.mutable_outputs()->erase("single_uint64_val");
+    proto.mutable_outputs()->erase("tensor_content_output");
+    ASSERT_EQ(makeJsonFromPredictResponse(proto, &json, Order::ROW), StatusCode::OK);
+    EXPECT_EQ(json, R"({
+    "predictions": [4000000000, 1
+    ]
+})");
+}
+
+TEST_F(RestUtilsTest, MakeBinaryFromPredictResponse) {
+    proto.mutable_outputs()->erase("output1");
+    size_t headerLength = 0;
+    ASSERT_EQ(makeBinaryFromPredictResponse(proto, &json, &headerLength), StatusCode::OK);
+    const std::string expectedHeader = R"({"outputs":[{"name":"output2","dtype":"DT_INT8","shape":[2,5],"offset":0,"size":10}]})";
+    ASSERT_EQ(headerLength, expectedHeader.size());
+    EXPECT_EQ(json.substr(0, headerLength), expectedHeader);
+    EXPECT_EQ(json.substr(headerLength), output2->tensor_content());
+}
+
+TEST_F(RestUtilsTest, MakeBinaryFromPredictResponse_OffsetsFollowOutputs) {
+    size_t headerLength = 0;
+    ASSERT_EQ(makeBinaryFromPredictResponse(proto, &json, &headerLength), StatusCode::OK);
+    ASSERT_EQ(json.size(), headerLength + output1->tensor_content().size() + output2->tensor_content().size());
+    const std::string data = json.substr(headerLength);
+    const std::string header = json.substr(0, headerLength);
+    if (header.find(R"("name":"output1")") < header.find(R"("name":"output2")")) {
+        EXPECT_THAT(header, ::testing::HasSubstr(R"("name":"output2","dtype":"DT_INT8","shape":[2,5],"offset":32,"size":10)"));
+        EXPECT_EQ(data, output1->tensor_content() + output2->tensor_content());
+    } else {
+        EXPECT_THAT(header, ::testing::HasSubstr(R"("name":"output1","dtype":"DT_FLOAT","shape":[2,1,4],"offset":10,"size":32)"));
+        EXPECT_EQ(data, output2->tensor_content() + output1->tensor_content());
+    }
+}
+
+TEST_F(RestUtilsValTest, MakeBinaryFromPredictResponse_ContainUint64Val) {
+    proto.mutable_outputs()->erase("tensor_content_output");
+    proto.mutable_outputs()->erase("two_uint32_vals");
+    size_t headerLength = 0;
+    ASSERT_EQ(makeBinaryFromPredictResponse(proto, &json, &headerLength), StatusCode::OK);
+    uint64_t expected = 5000000000;
+    EXPECT_EQ(json.substr(headerLength), std::string(reinterpret_cast<const char*>(&expected), sizeof(expected)));
+}
+
+TEST_F(RestUtilsPrecisionTest, MakeBinaryFromPredictResponse_Int8Val) {
+    output->set_dtype(tensorflow::DataType::DT_INT8);
+    output->add_int_val(-53);
+    size_t headerLength = 0;
+    ASSERT_EQ(makeBinaryFromPredictResponse(proto, &json, &headerLength), StatusCode::OK);
+    EXPECT_EQ(json.substr(headerLength), std::string("\xCB", 1));
+}
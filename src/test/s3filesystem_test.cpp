@@ -0,0 +1,124 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <filesystem>
+#include <fstream>
+#include <sstream>
+#include <string>
+
+#include "spdlog/spdlog.h"
+
+#include "../s3filesystem.hpp"
+#include "gtest/gtest.h"
+
+using namespace ovms;
+
+namespace {
+
+// Requires S3 compatible storage, e.g. MinIO started as in tests/functional/object_model/minio_docker.py
+// with S3_ENDPOINT, AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY set
+std::string getEnvOrThrow(const std::string& name) {
+    const char* p = std::getenv(name.c_str());
+    if (!p) {
+        spdlog::error("Missing required environment variable: {}", name);
+        throw std::runtime_error("Missing required environment variable");
+    }
+    spdlog::trace("Value of env {} is {}", name, std::string(p));
+    return std::string(p);
+}
+
+// directory with a model version, e.g. s3://inference/resnet/1
+std::string getDirPath() { return getEnvOrThrow("S3_TEST_DIR_PATH"); }
+
+std::string readFile(const std::filesystem::path& path) {
+    std::ifstream file(path, std::ios::binary);
+    std::stringstream contents;
+    contents << file.rdbuf();
+    return contents.str();
+}
+
+void expectSameDirectories(const std::string& first, const std::string& second) {
+    size_t filesCount = 0;
+    for (auto& entry : std::filesystem::recursive_directory_iterator(first)) {
+        if (!entry.is_regular_file()) {
+            continue;
+        }
+        auto relative = std::filesystem::relative(entry.path(), first);
+        EXPECT_EQ(readFile(entry.path()), readFile(std::filesystem::path(second) / relative)) << relative;
+        filesCount++;
+    }
+    EXPECT_GT(filesCount, 0);
+}
+
+}  // namespace
+
+TEST(DISABLED_S3FileSystem, DownloadWithCache) {
+    const std::string cacheDir = "/tmp/ovms_test_s3_cache";
+    std::filesystem::remove_all(cacheDir);
+    Aws::SDKOptions options;
+    Aws::InitAPI(options);
+    S3FileSystem uncachedFs(options, getDirPath());
+    std::string uncachedPath;
+    ASSERT_EQ(FileSystem::createTempPath(&uncachedPath), StatusCode::OK);
+    ASSERT_EQ(uncachedFs.downloadFileFolder(getDirPath(), uncachedPath), StatusCode::OK);
+    EXPECT_FALSE(std::filesystem::exists(cacheDir));
+
+    Aws::InitAPI(options);
+    S3FileSystem fs(options, getDirPath(), cacheDir);
+    std::string firstPath;
+    ASSERT_EQ(FileSystem::createTempPath(&firstPath), StatusCode::OK);
+    ASSERT_EQ(fs.downloadFileFolder(getDirPath(), firstPath), StatusCode::OK);
+    expectSameDirectories(uncachedPath, firstPath);
+
+    size_t etagsCount = 0;
+    for (auto& entry : std::filesystem::recursive_directory_iterator(cacheDir)) {
+        if (entry.path().extension() == ".etag") {
+            etagsCount++;
+        }
+    }
+    EXPECT_GT(etagsCount, 0);
+
+    // unchanged objects are taken from cache
+    std::string secondPath;
+    ASSERT_EQ(FileSystem::createTempPath(&secondPath), StatusCode::OK);
+    ASSERT_EQ(fs.downloadFileFolder(getDirPath(), secondPath), StatusCode::OK);
+    expectSameDirectories(uncachedPath, secondPath);
+
+    std::filesystem::remove_all(uncachedPath);
+    std::filesystem::remove_all(firstPath);
+    std::filesystem::remove_all(secondPath);
+    std::filesystem::remove_all(cacheDir);
+}
+
+TEST(DISABLED_S3FileSystem, DownloadModelVersions) {
+    Aws::SDKOptions options;
+    Aws::InitAPI(options);
+    S3FileSystem fs(options, getDirPath());
+    std::string versionPath = getDirPath();
+    auto separator = versionPath.find_last_of('/');
+    std::string modelPath = versionPath.substr(0, separator);
+    model_version_t version = std::stoll(versionPath.substr(separator + 1));
+
+    std::string expectedPath;
+    ASSERT_EQ(FileSystem::createTempPath(&expectedPath), StatusCode::OK);
+    ASSERT_EQ(fs.downloadFileFolder(versionPath, expectedPath), StatusCode::OK);
+
+    std::string localPath;
+    ASSERT_EQ(fs.downloadModelVersions(modelPath, &localPath, {version}), StatusCode::OK);
+    expectSameDirectories(expectedPath, localPath + "/" + std::to_string(version));
+
+    std::filesystem::remove_all(expectedPath);
+    std::filesystem::remove_all(localPath);
+}
@@ -756,6 +756,27 @@ TEST(SchemaTest, ModelConfigSequenceMaxNumberNegative) {
     EXPECT_EQ(result, ovms::StatusCode::JSON_INVALID);
 }
 
+TEST(SchemaTest, ModelConfigColdStateStorageInvalid) {
+    const char* modelConfigColdStateStorageInvalid = R"(
+    {
+    "model_config_list": [
+        {
+            "config": {
+                "name": "dummy_model",
+                "base_path": "dummy_path",
+                "stateful": true,
+                "cold_state_storage": "swap"
+            }
+        }
+    ]
+    })";
+
+    rapidjson::Document modelConfigColdStateStorageInvalidDoc;
+    modelConfigColdStateStorageInvalidDoc.Parse(modelConfigColdStateStorageInvalid);
+    auto result = ovms::validateJsonAgainstSchema(modelConfigColdStateStorageInvalidDoc, ovms::MODELS_CONFIG_SCHEMA);
+    EXPECT_EQ(result, ovms::StatusCode::JSON_INVALID);
+}
+
 TEST(SchemaTest, ModelConfigTimeoutNegative) {
     const char* modelConfigTimeoutNegative = R"(
     {
@@ -13,13 +13,19 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 //*****************************************************************************
+#include <atomic>
 #include <chrono>
+#include <future>
 #include <limits>
+#include <memory>
+#include <mutex>
 #include <thread>
+#include <vector>
 
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
 
+#include "../metrics.hpp"
 #include "../sequence_manager.hpp"
 #include "../status.hpp"
 #pragma GCC diagnostic push
@@ -87,7 +93,12 @@ TEST(SequenceManager, CreateSequenceNoIdProvided) {
     sequenceManager.mockCreateSequence(spec1);
     ovms::SequenceProcessingSpec spec2(ovms::SEQUENCE_START, 0);
     ASSERT_TRUE(sequenceManager.sequenceExists(1));
+    // Sequence id has to be assigned while locking the bucket
     auto status = sequenceManager.mockCreateSequence(spec2);
+    ASSERT_EQ(status, ovms::StatusCode::SEQUENCE_ID_NOT_PROVIDED);
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 1);
+    auto sequencesBucketLock = sequenceManager.lockSequencesBucket(spec2);
+    status = sequenceManager.mockCreateSequence(spec2);
     ASSERT_TRUE(status.ok());
     EXPECT_EQ(spec2.getSequenceId(), 2);
     ASSERT_TRUE(sequenceManager.sequenceExists(spec2.getSequenceId()));
@@ -101,6 +112,7 @@ TEST(SequenceManager, CreateSequenceNoIdProvidedExceedingRange) {
     sequenceManager.mockCreateSequence(spec);
     ASSERT_TRUE(sequenceManager.sequenceExists(sequenceId));
     ovms::SequenceProcessingSpec spec2(ovms::SEQUENCE_START, 0);
+    auto sequencesBucketLock = sequenceManager.lockSequencesBucket(spec2);
     auto status = sequenceManager.mockCreateSequence(spec2);
     ASSERT_TRUE(status.ok());
     EXPECT_EQ(spec2.getSequenceId(), 1);
@@ -150,6 +162,20 @@ TEST(SequenceManager, HasSequenceTerminated) {
     ASSERT_TRUE(status == ovms::StatusCode::SEQUENCE_MISSING);
 }
 
+TEST(SequenceManager, HasSequenceStreamed) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1);
+    uint64_t sequenceId = 42;
+    ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+    sequenceManager.mockCreateSequence(spec);
+    sequenceManager.getSequence(sequenceId).setStreamed();
+
+    auto status = sequenceManager.mockHasSequence(sequenceId);
+    ASSERT_TRUE(status == ovms::StatusCode::SEQUENCE_STREAMED);
+    status = sequenceManager.mockTerminateSequence(sequenceId);
+    ASSERT_TRUE(status == ovms::StatusCode::SEQUENCE_STREAMED);
+    ASSERT_FALSE(sequenceManager.getSequence(sequenceId).isTerminated());
+}
+
 TEST(SequenceManager, TerminateSequenceOK) {
     MockedSequenceManager sequenceManager(24, "dummy", 1);
     uint64_t sequenceId = 42;
@@ -322,4 +348,275 @@ TEST(SequenceManager, ExceedMaxSequenceNumber) {
         ASSERT_EQ(sequenceManager.mockCreateSequence(spec), ovms::StatusCode::MAX_SEQUENCE_NUMBER_REACHED);
     }
 }
+
+TEST(SequenceManager, ConcurrentSequenceStartWithoutId) {
+    MockedSequenceManager sequenceManager(4000, "dummy", 1);
+    const uint32_t threadsCount = 8;
+    const uint32_t sequencesPerThread = 500;
+    std::atomic<uint32_t> failures{0};
+    std::vector<std::thread> threads;
+    for (uint32_t i = 0; i < threadsCount; i++) {
+        threads.emplace_back([&sequenceManager, &failures]() {
+            for (uint32_t j = 0; j < sequencesPerThread; j++) {
+                ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, 0);
+                std::unique_lock<std::mutex> sequencesBucketLock = sequenceManager.lockSequencesBucket(spec);
+                if (!sequenceManager.processRequestedSpec(spec).ok())
+                    failures++;
+            }
+        });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    EXPECT_EQ(failures.load(), 0);
+    EXPECT_EQ(sequenceManager.getSequencesCount(), threadsCount * sequencesPerThread);
+}
+
+TEST(SequenceManager, ConcurrentExceedMaxSequenceNumber) {
+    MockedSequenceManager sequenceManager(100, "dummy", 1);
+    std::atomic<uint32_t> created{0};
+    std::vector<std::thread> threads;
+    for (uint64_t i = 0; i < 8; i++) {
+        threads.emplace_back([&sequenceManager, &created, i]() {
+            for (uint64_t j = 1; j <= 50; j++) {
+                ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, i * 1000 + j);
+                std::unique_lock<std::mutex> sequencesBucketLock = sequenceManager.lockSequencesBucket(spec);
+                auto status = sequenceManager.processRequestedSpec(spec);
+                if (status.ok()) {
+                    created++;
+                } else {
+                    EXPECT_EQ(status, ovms::StatusCode::MAX_SEQUENCE_NUMBER_REACHED);
+                }
+            }
+        });
+    }
+    for (auto& thread : threads) {
+        thread.join();
+    }
+    EXPECT_EQ(created.load(), 100);
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 100);
+}
+
+TEST(SequenceManager, RemoveIdleSequencesSkipsLockedBucket) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1);
+    uint64_t sequenceId1 = 1;
+    uint64_t sequenceId2 = 2;
+    ovms::SequenceProcessingSpec spec1(ovms::SEQUENCE_START, sequenceId1);
+    ovms::SequenceProcessingSpec spec2(ovms::SEQUENCE_START, sequenceId2);
+    sequenceManager.mockCreateSequence(spec1);
+    sequenceManager.mockCreateSequence(spec2);
+    sequenceManager.getSequence(sequenceId1).setIdle();
+    sequenceManager.getSequence(sequenceId2).setIdle();
+    ASSERT_NE(&sequenceManager.getMutex(sequenceId1), &sequenceManager.getMutex(sequenceId2));
+
+    std::unique_lock<std::mutex> sequencesBucketLock(sequenceManager.getMutex(sequenceId2));
+    std::thread cleanerThread([&sequenceManager]() {
+        sequenceManager.removeIdleSequences();
+    });
+    std::this_thread::sleep_for(std::chrono::milliseconds(100));
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 1);
+    sequencesBucketLock.unlock();
+    cleanerThread.join();
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 0);
+    EXPECT_FALSE(sequenceManager.sequenceExists(sequenceId1));
+    EXPECT_FALSE(sequenceManager.sequenceExists(sequenceId2));
+}
+
+TEST(SequenceManager, RemoveExpiredSequences) {
+    MockedSequenceManager sequenceManager(24, "expired_sequences", 1, 10);
+    auto& idleEvictions = ovms::MetricRegistry::getInstance().counter("ovms_sequence_idle_evictions_total", "").labeled({{"name", "expired_sequences"}, {"version", "1"}});
+    for (uint64_t sequenceId = 1; sequenceId <= 3; sequenceId++) {
+        ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+        sequenceManager.mockCreateSequence(spec);
+    }
+    auto now = std::chrono::steady_clock::now();
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(5));
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 3);
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(12));
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 0);
+    EXPECT_EQ(idleEvictions.get(), 3);
+}
+
+TEST(SequenceManager, RemoveExpiredSequencesKeepsActiveSequence) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 10);
+    uint64_t activeSequenceId = 1;
+    uint64_t inactiveSequenceId = 2;
+    ovms::SequenceProcessingSpec activeSpec(ovms::SEQUENCE_START, activeSequenceId);
+    ovms::SequenceProcessingSpec inactiveSpec(ovms::SEQUENCE_START, inactiveSequenceId);
+    sequenceManager.mockCreateSequence(activeSpec);
+    sequenceManager.mockCreateSequence(inactiveSpec);
+    auto now = std::chrono::steady_clock::now();
+    sequenceManager.getSequence(activeSequenceId).setLastActivityTime(now + std::chrono::seconds(8));
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(12));
+    EXPECT_TRUE(sequenceManager.sequenceExists(activeSequenceId));
+    EXPECT_FALSE(sequenceManager.sequenceExists(inactiveSequenceId));
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(20));
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 0);
+}
+
+TEST(SequenceManager, RemoveExpiredSequencesSkipsLockedSequence) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 10);
+    uint64_t sequenceId = 1;
+    ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+    sequenceManager.mockCreateSequence(spec);
+    auto now = std::chrono::steady_clock::now();
+
+    std::unique_lock<std::mutex> sequenceLock(sequenceManager.getSequence(sequenceId).getMutex());
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(12));
+    EXPECT_TRUE(sequenceManager.sequenceExists(sequenceId));
+    sequenceLock.unlock();
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(23));
+    EXPECT_FALSE(sequenceManager.sequenceExists(sequenceId));
+}
+
+TEST(SequenceManager, RemoveExpiredSequencesWithoutTimeout) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1);
+    ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, 1);
+    sequenceManager.mockCreateSequence(spec);
+
+    sequenceManager.removeExpiredSequences(std::chrono::steady_clock::now() + std::chrono::hours(24));
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 1);
+}
+
+TEST(SequenceManager, RemoveExpiredSequencesIgnoresRemovedSequence) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 10);
+    uint64_t sequenceId = 1;
+    ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+    sequenceManager.mockCreateSequence(spec);
+    ASSERT_TRUE(sequenceManager.removeSequence(sequenceId).ok());
+    // Sequence started again with the same id has its own expiration time
+    auto now = std::chrono::steady_clock::now() + std::chrono::seconds(5);
+    sequenceManager.mockCreateSequence(spec);
+    sequenceManager.getSequence(sequenceId).setLastActivityTime(now);
+
+    sequenceManager.removeExpiredSequences(now + std::chrono::seconds(7));
+    EXPECT_TRUE(sequenceManager.sequenceExists(sequenceId));
+}
+
+TEST(SequenceManager, StreamedSequencesAreNotRemovedAsIdle) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 10);
+    uint64_t sequenceId = 1;
+    ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+    sequenceManager.mockCreateSequence(spec);
+    sequenceManager.getSequence(sequenceId).setStreamed();
+
+    sequenceManager.removeIdleSequences();
+    sequenceManager.removeIdleSequences();
+    sequenceManager.removeExpiredSequences(std::chrono::steady_clock::now() + std::chrono::seconds(12));
+    EXPECT_TRUE(sequenceManager.sequenceExists(sequenceId));
+
+    ASSERT_TRUE(sequenceManager.removeSequence(sequenceId).ok());
+    EXPECT_EQ(sequenceManager.getSequencesCount(), 0);
+}
+
+class SequenceManagerStateMemoryBudget : public ::testing::Test {
+protected:
+    std::vector<size_t> shape{1, 10};
+    std::vector<float> values = std::vector<float>(10, 0.5f);
+    // every sequence keeps 40 bytes of memory state
+    const uint64_t stateSize = 10 * sizeof(float);
+
+    std::shared_ptr<ovms::Sequence> startSequence(MockedSequenceManager& sequenceManager, uint64_t sequenceId) {
+        ovms::SequenceProcessingSpec spec(ovms::SEQUENCE_START, sequenceId);
+        sequenceManager.mockCreateSequence(spec);
+        auto sequence = sequenceManager.getSequencePtr(sequenceId);
+        ovms::model_memory_state_t state;
+        addState(state, "state", shape, values);
+        std::unique_lock<std::mutex> sequenceLock(sequence->getMutex());
+        sequence->updateMemoryState(state);
+        sequenceManager.updateStateMemoryUsage(sequence);
+        return sequence;
+    }
+};
+
+TEST_F(SequenceManagerStateMemoryBudget, LeastRecentlyUsedStateIsMovedToColdStorage) {
+    MockedSequenceManager sequenceManager(24, "state_memory_budget", 1, 0, 2 * stateSize + 1);
+    auto& stores = ovms::MetricRegistry::getInstance().counter("ovms_sequence_cold_state_stores_total", "").labeled({{"name", "state_memory_budget"}, {"version", "1"}});
+    auto& restores = ovms::MetricRegistry::getInstance().counter("ovms_sequence_cold_state_restores_total", "").labeled({{"name", "state_memory_budget"}, {"version", "1"}});
+    auto sequence1 = startSequence(sequenceManager, 1);
+    auto sequence2 = startSequence(sequenceManager, 2);
+    auto sequence3 = startSequence(sequenceManager, 3);
+    EXPECT_TRUE(sequence1->isMemoryStateCold());
+    EXPECT_FALSE(sequence2->isMemoryStateCold());
+    EXPECT_FALSE(sequence3->isMemoryStateCold());
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 2 * stateSize);
+
+    {
+        std::unique_lock<std::mutex> sequenceLock(sequence1->getMutex());
+        ASSERT_EQ(sequenceManager.restoreMemoryState(*sequence1), ovms::StatusCode::OK);
+        sequenceManager.updateStateMemoryUsage(sequence1);
+    }
+    EXPECT_FALSE(sequence1->isMemoryStateCold());
+    EXPECT_TRUE(sequence2->isMemoryStateCold());
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 2 * stateSize);
+    std::vector<float> restored((float*)sequence1->getMemoryState().at("state")->buffer(), ((float*)sequence1->getMemoryState().at("state")->buffer()) + values.size());
+    EXPECT_EQ(restored, values);
+    EXPECT_EQ(stores.get(), 2);
+    EXPECT_EQ(restores.get(), 1);
+}
+
+TEST_F(SequenceManagerStateMemoryBudget, LockedSequenceIsSkipped) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 0, 2 * stateSize);
+    auto sequence1 = startSequence(sequenceManager, 1);
+    auto sequence2 = startSequence(sequenceManager, 2);
+
+    std::promise<void> locked, release;
+    std::thread processingThread([&]() {
+        std::unique_lock<std::mutex> sequenceLock(sequence1->getMutex());
+        locked.set_value();
+        release.get_future().wait();
+    });
+    locked.get_future().wait();
+    auto sequence3 = startSequence(sequenceManager, 3);
+    release.set_value();
+    processingThread.join();
+
+    EXPECT_FALSE(sequence1->isMemoryStateCold());
+    EXPECT_TRUE(sequence2->isMemoryStateCold());
+    EXPECT_FALSE(sequence3->isMemoryStateCold());
+}
+
+TEST_F(SequenceManagerStateMemoryBudget, RemovedSequenceReleasesStateMemory) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 0, 10 * stateSize);
+    startSequence(sequenceManager, 1);
+    startSequence(sequenceManager, 2);
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 2 * stateSize);
+    ASSERT_EQ(sequenceManager.removeSequence(1), ovms::StatusCode::OK);
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), stateSize);
+}
+
+TEST_F(SequenceManagerStateMemoryBudget, RemovedSequenceIsNotAccountedAgain) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1, 0, 10 * stateSize);
+    // Shared ownership is kept e.g. by infer request kept for the sequence
+    auto sequence = startSequence(sequenceManager, 1);
+    ASSERT_EQ(sequenceManager.removeSequence(1), ovms::StatusCode::OK);
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 0);
+
+    // Evicting kept infer request saves its memory state in the removed sequence
+    {
+        std::unique_lock<std::mutex> sequenceLock(sequence->getMutex());
+        ovms::model_memory_state_t state;
+        addState(state, "state", shape, values);
+        sequence->updateMemoryState(state);
+        sequenceManager.updateStateMemoryUsage(sequence);
+    }
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 0);
+    sequence.reset();
+    startSequence(sequenceManager, 2);
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), stateSize);
+}
+
+TEST_F(SequenceManagerStateMemoryBudget, NoBudget) {
+    MockedSequenceManager sequenceManager(24, "dummy", 1);
+    auto sequence1 = startSequence(sequenceManager, 1);
+    auto sequence2 = startSequence(sequenceManager, 2);
+    EXPECT_FALSE(sequence1->isMemoryStateCold());
+    EXPECT_FALSE(sequence2->isMemoryStateCold());
+    EXPECT_EQ(sequenceManager.getHotMemoryStateSize(), 0);
+}
 #pragma GCC diagnostic pop
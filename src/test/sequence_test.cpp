@@ -68,4 +68,49 @@ TEST(Sequence, UpdateSequenceState) {
     state2BlobSequenceData.assign((float*)sequenceMemoryState.at("state2")->buffer(), ((float*)sequenceMemoryState.at("state2")->buffer()) + elementsCount2);
     EXPECT_EQ(state2BlobSequenceData, state2);
 }
+
+TEST(Sequence, StoreAndRestoreMemoryState) {
+    ovms::model_memory_state_t newState;
+    std::vector<size_t> shape{1, 10};
+    std::vector<float> state(10);
+    std::iota(state.begin(), state.end(), 0);
+    addState(newState, "state", shape, state);
+
+    ovms::Sequence sequence(3);
+    sequence.updateMemoryState(newState);
+    EXPECT_EQ(sequence.getMemoryStateSize(), state.size() * sizeof(float));
+
+    for (auto storage : {ovms::ColdStateStorage::FILE, ovms::ColdStateStorage::FP16}) {
+        ASSERT_EQ(sequence.storeMemoryState(storage), ovms::StatusCode::OK);
+        EXPECT_TRUE(sequence.isMemoryStateCold());
+        EXPECT_EQ(sequence.getMemoryStateSize(), 0);
+        EXPECT_TRUE(sequence.getMemoryState().empty());
+
+        ASSERT_EQ(sequence.restoreMemoryState(), ovms::StatusCode::OK);
+        EXPECT_FALSE(sequence.isMemoryStateCold());
+        EXPECT_EQ(sequence.getMemoryStateSize(), state.size() * sizeof(float));
+        const ovms::sequence_memory_state_t& sequenceMemoryState = sequence.getMemoryState();
+        ASSERT_TRUE(sequenceMemoryState.count("state"));
+        std::vector<float> restoredState((float*)sequenceMemoryState.at("state")->buffer(), ((float*)sequenceMemoryState.at("state")->buffer()) + state.size());
+        EXPECT_EQ(restoredState, state);
+    }
+}
+
+TEST(Sequence, UpdateMemoryStateDropsColdMemoryState) {
+    ovms::model_memory_state_t oldState, newState;
+    std::vector<size_t> shape{1, 10};
+    std::vector<float> oldValues(10, 1.0f);
+    std::vector<float> newValues(10, 2.0f);
+    addState(oldState, "state", shape, oldValues);
+    addState(newState, "state", shape, newValues);
+
+    ovms::Sequence sequence(3);
+    sequence.updateMemoryState(oldState);
+    ASSERT_EQ(sequence.storeMemoryState(ovms::ColdStateStorage::FILE), ovms::StatusCode::OK);
+    sequence.updateMemoryState(newState);
+    EXPECT_FALSE(sequence.isMemoryStateCold());
+    ASSERT_EQ(sequence.restoreMemoryState(), ovms::StatusCode::OK);
+    std::vector<float> state((float*)sequence.getMemoryState().at("state")->buffer(), ((float*)sequence.getMemoryState().at("state")->buffer()) + newValues.size());
+    EXPECT_EQ(state, newValues);
+}
 #pragma GCC diagnostic pop
@@ -203,17 +203,35 @@ TEST_P(SerializeTFGRPCPredictResponse, ShouldSuccessForSupportedPrecision) {
     Precision testedPrecision = GetParam();
     auto inputs = getInputs(testedPrecision);
     PredictResponse response;
-    auto status = serializePredictResponse(std::get<0>(inputs), std::get<1>(inputs), &response);
+    PredictRequest request;
+    auto status = serializePredictResponse(std::get<0>(inputs), std::get<1>(inputs), &response, request.output_filter());
     EXPECT_TRUE(status.ok());
 }
 
+TEST_F(SerializeTFGRPCPredictResponse, ShouldSerializeOnlyOutputsFromOutputFilter) {
+    auto inputs = getInputs(Precision::FP32);
+    auto& tenMap = std::get<1>(inputs);
+    tenMap["Second"] = std::make_shared<ovms::TensorInfo>("Second", Precision::FP32, shape_t{2}, InferenceEngine::Layout::C);
+    PredictRequest request;
+    PredictResponse response;
+    ASSERT_EQ(serializePredictResponse(std::get<0>(inputs), tenMap, &response, request.output_filter()), ovms::StatusCode::OK);
+    EXPECT_EQ(response.outputs_size(), 2);
+
+    response.Clear();
+    request.add_output_filter("Second");
+    ASSERT_EQ(serializePredictResponse(std::get<0>(inputs), tenMap, &response, request.output_filter()), ovms::StatusCode::OK);
+    ASSERT_EQ(response.outputs_size(), 1);
+    EXPECT_EQ(response.outputs().count("Second"), 1);
+}
+
 class SerializeTFGRPCPredictResponseNegative : public SerializeTFGRPCPredictResponse {};
 
 TEST_P(SerializeTFGRPCPredictResponseNegative, DISABLED_ShouldFailForUnsupportedPrecision) {
     Precision testedPrecision = GetParam();
     auto inputs = getInputs(testedPrecision);
     PredictResponse response;
-    auto status = serializePredictResponse(std::get<0>(inputs), std::get<1>(inputs), &response);
+    PredictRequest request;
+    auto status = serializePredictResponse(std::get<0>(inputs), std::get<1>(inputs), &response, request.output_filter());
     EXPECT_EQ(status, ovms::StatusCode::OV_UNSUPPORTED_SERIALIZATION_PRECISION);
 }
 
@@ -224,7 +242,8 @@ TEST_F(SerializeTFGRPCPredictResponseNegative, DISABLED_OutputNameNotCreatedInIn
     InferenceEngine::InferRequest inferRequest(mInferRequestPtr);
     EXPECT_CALL(*mInferRequestPtr, GetBlob(_, _, _));
     PredictResponse response;
-    auto status = serializePredictResponse(inferRequest, std::get<1>(inputs), &response);
+    PredictRequest request;
+    auto status = serializePredictResponse(inferRequest, std::get<1>(inputs), &response, request.output_filter());
     EXPECT_EQ(status, ovms::StatusCode::OV_INTERNAL_SERIALIZATION_ERROR);
 }
 
@@ -29,6 +29,7 @@
 #include "../executingstreamidguard.hpp"
 #include "../get_model_metadata_impl.hpp"
 #include "../global_sequences_viewer.hpp"
+#include "../metrics.hpp"
 #include "../ov_utils.hpp"
 #include "../sequence_processing_spec.hpp"
 #include "../serialization.hpp"
@@ -86,6 +87,25 @@ static const char* modelStatefulConfig = R"(
     ]
 })";
 
+static const char* modelStatefulInferRequestAffinityConfig = R"(
+{
+    "model_config_list": [
+        {
+            "config": {
+                "name": "dummy",
+                "base_path": "/ovms/src/test/dummy",
+                "target_device": "CPU",
+                "model_version_policy": {"latest": {"num_versions":1}},
+                "nireq": 1,
+                "stateful": true,
+                "infer_request_affinity": true,
+                "max_sequence_number": 1000,
+                "shape": {"b": "(1,10) "}
+            }
+        }
+    ]
+})";
+
 constexpr const char* DUMMY_MODEL_INPUT_NAME = "b";
 class StatefulModelInstanceTempDir : public TestWithTempDir {
 public:
@@ -199,7 +219,7 @@ public:
             std::cout << "Waiting before sequenceManagerLock" << std::endl;
             waitBeforeManagerLock->get();
         }
-        std::unique_lock<std::mutex> sequenceManagerLock(sequenceManager->getMutex());
+        std::unique_lock<std::mutex> sequencesBucketLock = sequenceManager->lockSequencesBucket(sequenceProcessingSpec);
         status = sequenceManager->processRequestedSpec(sequenceProcessingSpec);
         if (!status.ok())
             return status;
@@ -214,7 +234,7 @@ public:
         }
 
         std::unique_lock<std::mutex> sequenceLock(sequence.getMutex());
-        sequenceManagerLock.unlock();
+        sequencesBucketLock.unlock();
 
         timer.start("get infer request");
         ovms::ExecutingStreamIdGuard executingStreamIdGuard(getInferRequestsQueue());
@@ -259,7 +279,7 @@ public:
 
         sequenceLock.unlock();
         if (sequenceProcessingSpec.getSequenceControlInput() == ovms::SEQUENCE_END) {
-            sequenceManagerLock.lock();
+            sequencesBucketLock.lock();
             status = sequenceManager->removeSequence(sequenceId);
             if (!status.ok())
                 return status;
@@ -714,11 +734,12 @@ TEST_F(StatefulModelInstanceTempDir, statefulInferManagerMutexTest) {
     });
 
     stetefulMockedModelInstance->getSequencesViewer()->removeIdleSequences();
-    std::unique_lock<std::mutex> sequenceManagerLock(stetefulMockedModelInstance->getSequenceManager()->getMutex());
+    // Cleaner removes sequences from other buckets while bucket of the last sequence is locked
+    std::unique_lock<std::mutex> sequencesBucketLock(stetefulMockedModelInstance->getSequenceManager()->getMutex(sequenceCounter));
     cleanerStartPromise.set_value();
     std::this_thread::sleep_for(std::chrono::milliseconds(100));
-    ASSERT_EQ(stetefulMockedModelInstance->getSequenceManager()->getSequencesCount(), sequenceCounter);
-    sequenceManagerLock.unlock();
+    ASSERT_EQ(stetefulMockedModelInstance->getSequenceManager()->getSequencesCount(), 1);
+    sequencesBucketLock.unlock();
     cleanerEndFuture.get();
     ASSERT_EQ(stetefulMockedModelInstance->getSequenceManager()->getSequencesCount(), 0);
     cleanerThread.join();
@@ -1050,6 +1071,162 @@ TEST_F(StatefulModelInstanceTempDir, statefulInferStandardFlow) {
     EXPECT_TRUE(CheckSequenceIdResponse(lastResponse, seqId));
 }
 
+TEST_F(StatefulModelInstanceTempDir, statefulInferWithInferRequestAffinity) {
+    SetUpConfig(modelStatefulInferRequestAffinityConfig);
+    ConstructorEnabledModelManager manager;
+    std::unique_ptr<ovms::ModelInstanceUnloadGuard> unload_guard;
+    createConfigFileWithContent(ovmsConfig, configFilePath);
+    auto status = manager.loadConfig(configFilePath);
+    ASSERT_TRUE(status.ok());
+    auto modelInstance = manager.findModelInstance(dummyModelName);
+    auto& copiesAvoided = ovms::MetricRegistry::getInstance().counter("ovms_sequence_state_copies_avoided_total", "").labeled({{"name", dummyModelName}, {"version", "1"}});
+    auto& evictions = ovms::MetricRegistry::getInstance().counter("ovms_sequence_infer_request_evictions_total", "").labeled({{"name", dummyModelName}, {"version", "1"}});
+    auto copiesAvoidedBefore = copiesAvoided.get();
+    auto evictionsBefore = evictions.get();
+
+    auto inferSequence = [&](uint64_t seqId, uint32_t sequenceControl) {
+        tensorflow::serving::PredictRequest request = preparePredictRequest(modelInput);
+        setRequestSequenceId(&request, seqId);
+        setRequestSequenceControl(&request, sequenceControl);
+        tensorflow::serving::PredictResponse response;
+        ASSERT_EQ(modelInstance->infer(&request, &response, unload_guard), ovms::StatusCode::OK);
+        EXPECT_TRUE(CheckSequenceIdResponse(response, seqId));
+    };
+
+    // Single sequence keeps the only infer request, state is neither loaded nor saved
+    inferSequence(1, ovms::SEQUENCE_START);
+    inferSequence(1, ovms::NO_CONTROL_INPUT);
+    EXPECT_EQ(copiesAvoided.get() - copiesAvoidedBefore, 3);
+    EXPECT_EQ(evictions.get() - evictionsBefore, 0);
+
+    // Second sequence evicts infer request of the first one, there are more sequences than infer requests now
+    inferSequence(2, ovms::SEQUENCE_START);
+    EXPECT_EQ(evictions.get() - evictionsBefore, 1);
+    inferSequence(1, ovms::NO_CONTROL_INPUT);
+    inferSequence(2, ovms::SEQUENCE_END);
+    inferSequence(1, ovms::SEQUENCE_END);
+    EXPECT_EQ(copiesAvoided.get() - copiesAvoidedBefore, 3);
+    EXPECT_EQ(evictions.get() - evictionsBefore, 1);
+}
+
+TEST_F(StatefulModelInstanceTempDir, statefulInferRequestAffinityReleasedOnIdleSequenceRemoval) {
+    SetUpConfig(modelStatefulInferRequestAffinityConfig);
+    ConstructorEnabledModelManager manager;
+    std::unique_ptr<ovms::ModelInstanceUnloadGuard> unload_guard;
+    createConfigFileWithContent(ovmsConfig, configFilePath);
+    auto status = manager.loadConfig(configFilePath);
+    ASSERT_TRUE(status.ok());
+    auto modelInstance = std::static_pointer_cast<ovms::StatefulModelInstance>(manager.findModelInstance(dummyModelName));
+    auto& evictions = ovms::MetricRegistry::getInstance().counter("ovms_sequence_infer_request_evictions_total", "").labeled({{"name", dummyModelName}, {"version", "1"}});
+    auto evictionsBefore = evictions.get();
+
+    tensorflow::serving::PredictRequest request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, 1);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_START);
+    tensorflow::serving::PredictResponse response;
+    ASSERT_EQ(modelInstance->infer(&request, &response, unload_guard), ovms::StatusCode::OK);
+
+    // Idle sequence removed by the cleaner returns the only infer request it keeps
+    modelInstance->getSequenceManager()->removeIdleSequences();
+    modelInstance->getSequenceManager()->removeIdleSequences();
+    EXPECT_EQ(modelInstance->getSequenceManager()->getSequencesCount(), 0);
+
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, 2);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_START);
+    ASSERT_EQ(modelInstance->infer(&request, &response, unload_guard), ovms::StatusCode::OK);
+    EXPECT_EQ(evictions.get() - evictionsBefore, 0);
+}
+
+TEST_F(StatefulModelInstanceTempDir, statefulInferSequenceStream) {
+    ConstructorEnabledModelManager manager;
+    std::unique_ptr<ovms::ModelInstanceUnloadGuard> unload_guard;
+    createConfigFileWithContent(ovmsConfig, configFilePath);
+    auto status = manager.loadConfig(configFilePath);
+    ASSERT_TRUE(status.ok());
+    auto modelInstance = std::static_pointer_cast<ovms::StatefulModelInstance>(manager.findModelInstance(dummyModelName));
+    auto& sequenceManager = modelInstance->getSequenceManager();
+    ovms::SequenceStream stream;
+
+    // First request starts the sequence without control input
+    tensorflow::serving::PredictRequest request = preparePredictRequest(modelInput);
+    tensorflow::serving::PredictResponse response;
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::OK);
+    ASSERT_NE(stream.sequence, nullptr);
+    const uint64_t seqId = stream.sequence->getId();
+    EXPECT_TRUE(CheckSequenceIdResponse(response, seqId));
+    EXPECT_EQ(sequenceManager->getSequencesCount(), 1);
+
+    // Streamed sequence is not accessible by unary requests and is not removed as idle
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, seqId);
+    setRequestSequenceControl(&request, ovms::NO_CONTROL_INPUT);
+    ASSERT_EQ(modelInstance->infer(&request, &response, unload_guard), ovms::StatusCode::SEQUENCE_STREAMED);
+    sequenceManager->removeIdleSequences();
+    sequenceManager->removeIdleSequences();
+    EXPECT_EQ(sequenceManager->getSequencesCount(), 1);
+
+    request = preparePredictRequest(modelInput);
+    response.Clear();
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::OK);
+    EXPECT_TRUE(CheckSequenceIdResponse(response, seqId));
+
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_START);
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::INVALID_SEQUENCE_CONTROL_INPUT);
+
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, seqId + 1);
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::SEQUENCE_MISSING);
+
+    // SEQUENCE_END request ends the stream
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, seqId);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_END);
+    response.Clear();
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::OK);
+    EXPECT_TRUE(CheckSequenceIdResponse(response, seqId));
+    EXPECT_TRUE(stream.ended);
+    EXPECT_EQ(sequenceManager->getSequencesCount(), 0);
+
+    request = preparePredictRequest(modelInput);
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::SEQUENCE_TERMINATED);
+}
+
+TEST_F(StatefulModelInstanceTempDir, statefulInferSequenceStreamClosedWithoutEnd) {
+    SetUpConfig(modelStatefulInferRequestAffinityConfig);
+    ConstructorEnabledModelManager manager;
+    createConfigFileWithContent(ovmsConfig, configFilePath);
+    auto status = manager.loadConfig(configFilePath);
+    ASSERT_TRUE(status.ok());
+    auto modelInstance = std::static_pointer_cast<ovms::StatefulModelInstance>(manager.findModelInstance(dummyModelName));
+    ovms::SequenceStream stream;
+    uint64_t seqId = 42;
+
+    // SEQUENCE_END cannot be the first request of the stream
+    tensorflow::serving::PredictRequest request = preparePredictRequest(modelInput);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_END);
+    tensorflow::serving::PredictResponse response;
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::INVALID_SEQUENCE_CONTROL_INPUT);
+    EXPECT_EQ(stream.sequence, nullptr);
+
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, seqId);
+    ASSERT_EQ(modelInstance->inferSequenceStream(&request, &response, stream), ovms::StatusCode::OK);
+    EXPECT_TRUE(CheckSequenceIdResponse(response, seqId));
+    EXPECT_EQ(modelInstance->getSequenceManager()->getSequencesCount(), 1);
+
+    // Sequence is removed and the only infer request kept by it is released
+    modelInstance->endSequenceStream(stream);
+    EXPECT_TRUE(stream.ended);
+    EXPECT_EQ(modelInstance->getSequenceManager()->getSequencesCount(), 0);
+    std::unique_ptr<ovms::ModelInstanceUnloadGuard> unload_guard;
+    request = preparePredictRequest(modelInput);
+    setRequestSequenceId(&request, seqId);
+    setRequestSequenceControl(&request, ovms::SEQUENCE_START);
+    ASSERT_EQ(modelInstance->infer(&request, &response, unload_guard), ovms::StatusCode::OK);
+}
+
 TEST_F(StatefulModelInstanceTempDir, loadModel) {
     ovms::GlobalSequencesViewer sequencesViewer;
     ovms::StatefulModelInstance modelInstance(dummyModelName, modelVersion, &sequencesViewer);
@@ -1272,6 +1449,32 @@ TEST_F(StatefulModelInstanceTest, PreprocessingIntermediateRequest) {
     }
 }
 
+TEST_F(StatefulModelInstanceTest, PreprocessingWithoutLoadingState) {
+    // Prepare model instance and processing spec
+    uint64_t sequenceId = 42;
+    ovms::SequenceProcessingSpec sequenceProcessingSpec(ovms::NO_CONTROL_INPUT, sequenceId);
+
+    // Initialize InferRequest with current state kept from the previous request of the sequence
+    std::shared_ptr<IInferRequest> iireqPtr = std::make_shared<MockIInferRequestStateful>("state", currentBlob, defaultBlob);
+    InferRequest inferRequest(iireqPtr);
+    const ovms::model_memory_state_t& irMemoryState = inferRequest.QueryState();
+
+    // Inject sequence with outdated newState
+    ovms::model_memory_state_t memoryState;
+    addState(memoryState, "state", shape, newState);
+    modelInstance->injectSequence(sequenceId, memoryState);
+
+    ovms::Sequence& sequence = modelInstance->getMockedSequenceManager()->getSequence(sequenceId);
+    modelInstance->preInferenceProcessing(inferRequest, sequence, sequenceProcessingSpec, false);
+
+    // Check if InferRequest memory state has not been overwritten
+    InferenceEngine::Blob::Ptr stateCloneBlob = nullptr;
+    EXPECT_EQ(ovms::blobClone(stateCloneBlob, irMemoryState[0].GetState()), ovms::StatusCode::OK);
+    std::vector<float> currentBlobIrData;
+    currentBlobIrData.assign((float*)stateCloneBlob->buffer(), ((float*)stateCloneBlob->buffer()) + elementsCount);
+    EXPECT_EQ(currentBlobIrData, currentState);
+}
+
 TEST_F(StatefulModelInstanceTest, PostprocessingLastRequest) {
     // Prepare model instance and processing spec
     uint32_t sequenceControlInput = ovms::SEQUENCE_END;
@@ -1355,6 +1558,35 @@ TEST_F(StatefulModelInstanceTest, PostprocessingStartAndNoControl) {
     }
 }
 
+TEST_F(StatefulModelInstanceTest, PostprocessingWithoutSavingState) {
+    // Prepare model instance and processing spec
+    uint64_t sequenceId = 33;
+    ovms::SequenceProcessingSpec sequenceProcessingSpec(ovms::NO_CONTROL_INPUT, sequenceId);
+
+    std::shared_ptr<IInferRequest> iireqPtr = std::make_shared<MockIInferRequestStateful>("state", currentBlob, defaultBlob);
+    InferRequest inferRequest(iireqPtr);
+
+    // Inject idle sequence with newState
+    ovms::model_memory_state_t memoryState;
+    addState(memoryState, "state", shape, newState);
+    modelInstance->injectSequence(sequenceId, memoryState);
+    ovms::Sequence& sequence = modelInstance->getMockedSequenceManager()->getSequence(sequenceId);
+    sequence.setIdle();
+
+    tensorflow::serving::PredictResponse response;
+    modelInstance->postInferenceProcessing(&response, inferRequest, sequence, sequenceProcessingSpec, false);
+
+    // Check if sequence memory state has not been updated but sequence is marked as active
+    const ovms::sequence_memory_state_t& sequenceMemoryState = sequence.getMemoryState();
+    EXPECT_TRUE(sequenceMemoryState.count("state"));
+    InferenceEngine::Blob::Ptr blob = sequenceMemoryState.at("state");
+    std::vector<float> sequenceBlobData;
+    sequenceBlobData.assign((float*)blob->buffer(), ((float*)blob->buffer()) + elementsCount);
+    EXPECT_EQ(sequenceBlobData, newState);
+    EXPECT_FALSE(sequence.isIdle());
+    EXPECT_TRUE(CheckSequenceIdResponse(response, sequenceId));
+}
+
 TEST_F(StatefulModelInstanceTest, extractSequenceId_OK) {
     tensorflow::TensorProto proto;
     proto.set_dtype(tensorflow::DataType::DT_UINT64);
@@ -146,8 +146,9 @@ public:
 
 class MockedSequenceManager : public ovms::SequenceManager {
 public:
-    MockedSequenceManager(uint32_t maxSequenceNumber, std::string name, ovms::model_version_t version) :
-        ovms::SequenceManager(maxSequenceNumber, name, version) {}
+    MockedSequenceManager(uint32_t maxSequenceNumber, std::string name, ovms::model_version_t version, uint32_t idleSequenceTimeoutSeconds = 0,
+        uint64_t stateMemoryBudget = 0, ovms::ColdStateStorage coldStateStorage = ovms::ColdStateStorage::FILE) :
+        ovms::SequenceManager(maxSequenceNumber, name, version, idleSequenceTimeoutSeconds, stateMemoryBudget, coldStateStorage) {}
 
     void setSequenceIdCounter(uint64_t newValue) {
         this->sequenceIdCounter = newValue;
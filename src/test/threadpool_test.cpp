@@ -0,0 +1,83 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <atomic>
+#include <future>
+#include <mutex>
+#include <set>
+#include <thread>
+#include <vector>
+
+#include <gtest/gtest.h>
+
+#include "../threadpool.hpp"
+
+using namespace ovms;
+
+TEST(ThreadPool, SubmittedTasksAreExecuted) {
+    ThreadPool pool(2);
+    std::promise<void> first;
+    std::promise<void> second;
+    pool.submit([&first]() { first.set_value(); });
+    pool.submit([&second]() { second.set_value(); });
+    EXPECT_EQ(first.get_future().wait_for(std::chrono::seconds(5)), std::future_status::ready);
+    EXPECT_EQ(second.get_future().wait_for(std::chrono::seconds(5)), std::future_status::ready);
+}
+
+TEST(ThreadPool, ParallelForVisitsEveryIndexOnce) {
+    ThreadPool pool(4);
+    const size_t count = 1000;
+    std::vector<std::atomic<int>> visits(count);
+    pool.parallelFor(count, [&visits](size_t i) { visits[i]++; });
+    for (size_t i = 0; i < count; i++) {
+        EXPECT_EQ(visits[i].load(), 1) << "index: " << i;
+    }
+}
+
+TEST(ThreadPool, ParallelForUsesWorkerThreads) {
+    ThreadPool pool(3);
+    std::mutex mtx;
+    std::set<std::thread::id> threadIds;
+    std::atomic<size_t> started{0};
+    pool.parallelFor(4, [&](size_t i) {
+        started++;
+        // Wait until every index is taken so that each one runs on a different thread
+        while (started.load() < 4) {
+            std::this_thread::yield();
+        }
+        std::unique_lock<std::mutex> lock(mtx);
+        threadIds.insert(std::this_thread::get_id());
+    });
+    EXPECT_EQ(threadIds.size(), 4);
+    EXPECT_EQ(threadIds.count(std::this_thread::get_id()), 1);
+}
+
+TEST(ThreadPool, ParallelForProgressesWhenWorkersAreBusy) {
+    ThreadPool pool(1);
+    std::promise<void> release;
+    auto released = release.get_future().share();
+    pool.submit([released]() { released.wait(); });
+    std::atomic<size_t> sum{0};
+    pool.parallelFor(10, [&sum](size_t i) { sum += i; });
+    EXPECT_EQ(sum.load(), 45);
+    release.set_value();
+}
+
+TEST(ThreadPool, ParallelForWithZeroCount) {
+    ThreadPool pool(2);
+    bool called = false;
+    pool.parallelFor(0, [&called](size_t) { called = true; });
+    EXPECT_FALSE(called);
+}
@@ -0,0 +1,116 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include <chrono>
+#include <cstdint>
+#include <map>
+#include <random>
+#include <set>
+#include <vector>
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "../timingwheel.hpp"
+
+using namespace ovms;
+using namespace std::chrono_literals;
+
+using ::testing::ElementsAre;
+using ::testing::UnorderedElementsAre;
+
+class TimingWheelTest : public ::testing::Test {
+protected:
+    const std::chrono::steady_clock::time_point start = std::chrono::steady_clock::time_point{};
+    std::vector<int> expired;
+};
+
+TEST_F(TimingWheelTest, ItemIsNotReturnedBeforeExpiration) {
+    TimingWheel<int> wheel(1s, start);
+    wheel.schedule(1, start + 2500ms);
+    wheel.advance(start + 2999ms, expired);
+    EXPECT_TRUE(expired.empty());
+    EXPECT_EQ(wheel.size(), 1);
+    wheel.advance(start + 3s, expired);
+    EXPECT_THAT(expired, ElementsAre(1));
+    EXPECT_EQ(wheel.size(), 0);
+}
+
+TEST_F(TimingWheelTest, PastExpirationIsReturnedByNextAdvance) {
+    TimingWheel<int> wheel(1s, start);
+    wheel.advance(start + 10s, expired);
+    wheel.schedule(1, start + 5s);
+    wheel.schedule(2, start);
+    wheel.advance(start + 10s, expired);
+    EXPECT_THAT(expired, UnorderedElementsAre(1, 2));
+}
+
+TEST_F(TimingWheelTest, ItemsOnHigherLevelsExpireAtTheirTick) {
+    TimingWheel<int> wheel(1s, start);
+    const std::vector<uint64_t> expirations = {1, 63, 64, 65, 4095, 4096, 4097, 300000, 16777215, 16777216, 40000000};
+    for (size_t i = 0; i < expirations.size(); i++) {
+        wheel.schedule(i, start + std::chrono::seconds(expirations[i]));
+    }
+    for (size_t i = 0; i < expirations.size(); i++) {
+        wheel.advance(start + std::chrono::seconds(expirations[i] - 1), expired);
+        EXPECT_TRUE(expired.empty()) << "expiration: " << expirations[i];
+        wheel.advance(start + std::chrono::seconds(expirations[i]), expired);
+        EXPECT_THAT(expired, ElementsAre(i)) << "expiration: " << expirations[i];
+        expired.clear();
+    }
+    EXPECT_EQ(wheel.size(), 0);
+}
+
+TEST_F(TimingWheelTest, RandomExpirationsAreReturnedAtExactTick) {
+    TimingWheel<int> wheel(1s, start);
+    std::mt19937_64 generator(42);
+    std::map<int, uint64_t> expirations;
+    for (int i = 0; i < 3000; i++) {
+        expirations[i] = generator() % 300000;
+        wheel.schedule(i, start + std::chrono::seconds(expirations[i]));
+    }
+    for (uint64_t second = 0; second <= 300000; second++) {
+        wheel.advance(start + std::chrono::seconds(second), expired);
+        for (int item : expired) {
+            ASSERT_EQ(expirations[item], second);
+        }
+        expired.clear();
+    }
+    EXPECT_EQ(wheel.size(), 0);
+}
+
+TEST_F(TimingWheelTest, AdvanceBySeveralTicks) {
+    TimingWheel<int> wheel(1s, start);
+    std::mt19937_64 generator(42);
+    std::multiset<uint64_t> pending;
+    std::map<int, uint64_t> expirations;
+    for (int i = 0; i < 5000; i++) {
+        expirations[i] = generator() % 20000000;
+        pending.insert(expirations[i]);
+        wheel.schedule(i, start + std::chrono::seconds(expirations[i]));
+    }
+    uint64_t second = 0;
+    while (!pending.empty()) {
+        second += 1 + generator() % 7000;
+        wheel.advance(start + std::chrono::seconds(second), expired);
+        for (int item : expired) {
+            ASSERT_LE(expirations[item], second);
+            pending.erase(pending.find(expirations[item]));
+        }
+        expired.clear();
+        ASSERT_TRUE(pending.empty() || *pending.begin() > second);
+    }
+    EXPECT_EQ(wheel.size(), 0);
+}
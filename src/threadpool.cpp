@@ -0,0 +1,107 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#include "threadpool.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <memory>
+#include <utility>
+
+namespace ovms {
+
+ThreadPool::ThreadPool(size_t threadsCount) {
+    workers.reserve(threadsCount);
+    for (size_t i = 0; i < threadsCount; i++) {
+        workers.emplace_back([this]() { run(); });
+    }
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::unique_lock<std::mutex> lock(mtx);
+        stopped = true;
+    }
+    signal.notify_all();
+    for (auto& worker : workers) {
+        worker.join();
+    }
+}
+
+void ThreadPool::run() {
+    while (true) {
+        std::function<void()> task;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            signal.wait(lock, [this]() { return stopped || !tasks.empty(); });
+            if (tasks.empty()) {
+                return;
+            }
+            task = std::move(tasks.front());
+            tasks.pop();
+        }
+        task();
+    }
+}
+
+void ThreadPool::submit(std::function<void()> task) {
+    {
+        std::unique_lock<std::mutex> lock(mtx);
+        tasks.push(std::move(task));
+    }
+    signal.notify_one();
+}
+
+namespace {
+struct ParallelForState {
+    ParallelForState(size_t count, const std::function<void(size_t)>& function) :
+        count(count),
+        function(function) {}
+
+    const size_t count;
+    // Only dereferenced while some index is still unfinished, caller waits for all of them
+    const std::function<void(size_t)>& function;
+    std::atomic<size_t> next{0};
+    std::atomic<size_t> finished{0};
+    std::mutex mtx;
+    std::condition_variable allFinished;
+
+    void work() {
+        size_t index;
+        while ((index = next.fetch_add(1)) < count) {
+            function(index);
+            if (finished.fetch_add(1) + 1 == count) {
+                std::unique_lock<std::mutex> lock(mtx);
+                allFinished.notify_all();
+            }
+        }
+    }
+};
+}  // namespace
+
+void ThreadPool::parallelFor(size_t count, const std::function<void(size_t)>& function) {
+    if (count == 0) {
+        return;
+    }
+    auto state = std::make_shared<ParallelForState>(count, function);
+    size_t helpersCount = std::min(count - 1, workers.size());
+    for (size_t i = 0; i < helpersCount; i++) {
+        submit([state]() { state->work(); });
+    }
+    state->work();
+    std::unique_lock<std::mutex> lock(state->mtx);
+    state->allFinished.wait(lock, [&state]() { return state->finished.load() == state->count; });
+}
+}  // namespace ovms
@@ -0,0 +1,58 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <condition_variable>
+#include <functional>
+#include <mutex>
+#include <queue>
+#include <thread>
+#include <vector>
+
+namespace ovms {
+
+/**
+ * @brief Fixed number of worker threads executing tasks from a shared queue
+ */
+class ThreadPool {
+    std::vector<std::thread> workers;
+    std::queue<std::function<void()>> tasks;
+    std::mutex mtx;
+    std::condition_variable signal;
+    bool stopped = false;
+
+    void run();
+
+public:
+    ThreadPool(size_t threadsCount);
+    ~ThreadPool();
+
+    ThreadPool(const ThreadPool&) = delete;
+    ThreadPool& operator=(const ThreadPool&) = delete;
+
+    size_t getThreadsCount() const { return workers.size(); }
+
+    void submit(std::function<void()> task);
+
+    /**
+     * @brief Calls function for every index in [0, count) and waits until all calls finish
+     *
+     * Calling thread takes part in the work, so it always makes progress even if all workers are busy.
+     * Function must not throw.
+     */
+    void parallelFor(size_t count, const std::function<void(size_t)>& function);
+};
+}  // namespace ovms
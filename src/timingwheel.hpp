@@ -0,0 +1,146 @@
+//*****************************************************************************
+// Copyright 2021 Intel Corporation
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//*****************************************************************************
+#pragma once
+
+#include <array>
+#include <chrono>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+namespace ovms {
+
+/**
+ * @brief Hierarchical timing wheel of items expiring at given time points
+ *
+ * Time is divided into ticks. Level 0 has a slot for every one of the next SLOTS_COUNT ticks, every slot of a higher
+ * level covers all slots of the level below. Items are moved to lower levels when time reaches their slot, so advancing
+ * costs O(1) per tick and per expired or moved item, independent of the number of scheduled items.
+ * Items are never returned before their expiration time, they are returned at most one tick after it.
+ *
+ * Not thread safe.
+ */
+template <typename T>
+class TimingWheel {
+public:
+    using clock = std::chrono::steady_clock;
+
+    static constexpr uint32_t SLOT_BITS = 6;
+    static constexpr uint64_t SLOTS_COUNT = 1 << SLOT_BITS;
+    static constexpr uint32_t LEVELS_COUNT = 4;
+
+    TimingWheel(clock::duration tick, clock::time_point start = clock::now()) :
+        tick(tick),
+        start(start) {}
+
+    void schedule(T item, clock::time_point expiration) {
+        uint64_t expirationTick = 0;
+        if (expiration > start) {
+            auto elapsed = expiration - start;
+            expirationTick = elapsed / tick;
+            if (elapsed % tick != clock::duration::zero()) {
+                expirationTick++;
+            }
+        }
+        place(Entry{expirationTick, std::move(item)});
+        itemsCount++;
+    }
+
+    /**
+     * @brief Moves wheel time to now and appends items which expired until then to expired
+     */
+    void advance(clock::time_point now, std::vector<T>& expired) {
+        const uint64_t targetTick = now > start ? (now - start) / tick : 0;
+        while (currentTick < targetTick) {
+            currentTick++;
+            cascade();
+            takeAll(slots[0][currentTick & SLOTS_MASK], expired);
+        }
+        takeAll(due, expired);
+    }
+
+    size_t size() const {
+        return itemsCount;
+    }
+
+private:
+    static constexpr uint64_t SLOTS_MASK = SLOTS_COUNT - 1;
+
+    struct Entry {
+        uint64_t expirationTick;
+        T item;
+    };
+
+    const clock::duration tick;
+    const clock::time_point start;
+    uint64_t currentTick = 0;
+    size_t itemsCount = 0;
+
+    std::array<std::array<std::vector<Entry>, SLOTS_COUNT>, LEVELS_COUNT> slots;
+
+    /**
+     * @brief Items expiring in the current or past ticks, returned by the next advance
+     */
+    std::vector<Entry> due;
+
+    /**
+     * @brief Items expiring beyond the range of the highest level, placed again whenever it wraps around
+     */
+    std::vector<Entry> overflow;
+
+    void place(Entry&& entry) {
+        if (entry.expirationTick <= currentTick) {
+            due.push_back(std::move(entry));
+            return;
+        }
+        // Item goes to the lowest level at which its tick and the current tick differ only in that level slot
+        for (uint32_t level = 0; level < LEVELS_COUNT; level++) {
+            if (((entry.expirationTick ^ currentTick) >> (SLOT_BITS * (level + 1))) == 0) {
+                slots[level][(entry.expirationTick >> (SLOT_BITS * level)) & SLOTS_MASK].push_back(std::move(entry));
+                return;
+            }
+        }
+        overflow.push_back(std::move(entry));
+    }
+
+    void placeAll(std::vector<Entry>& entries) {
+        std::vector<Entry> toPlace;
+        toPlace.swap(entries);
+        for (auto& entry : toPlace) {
+            place(std::move(entry));
+        }
+    }
+
+    void cascade() {
+        if ((currentTick & ((uint64_t(1) << (SLOT_BITS * LEVELS_COUNT)) - 1)) == 0) {
+            placeAll(overflow);
+        }
+        for (uint32_t level = LEVELS_COUNT - 1; level > 0; level--) {
+            if ((currentTick & ((uint64_t(1) << (SLOT_BITS * level)) - 1)) == 0) {
+                placeAll(slots[level][(currentTick >> (SLOT_BITS * level)) & SLOTS_MASK]);
+            }
+        }
+    }
+
+    void takeAll(std::vector<Entry>& entries, std::vector<T>& expired) {
+        for (auto& entry : entries) {
+            expired.push_back(std::move(entry.item));
+        }
+        itemsCount -= entries.size();
+        entries.clear();
+    }
+};
+}  // namespace ovms
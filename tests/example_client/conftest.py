@@ -1,6 +1,5 @@
-#!/bin/bash
 #
-# Copyright (c) 2020 Intel Corporation
+# Copyright (c) 2021 Intel Corporation
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -14,4 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-./grpc_latency.py $*
+import os
+import sys
+
+EXAMPLE_CLIENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client')
+
+# The example client modules are scripts next to each other, not an installed package
+sys.path.insert(0, EXAMPLE_CLIENT_PATH)
@@ -0,0 +1,42 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import subprocess
+import sys
+
+EXAMPLE_CLIENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client')
+
+# Runs in a separate interpreter, so modules imported by pytest plugins do not affect the result
+NO_TENSORFLOW_CHECK = """
+import sys
+import ovms_client
+import ovms_tensor
+from ovms_protos import predict_pb2, prediction_service_pb2_grpc
+
+request = predict_pb2.PredictRequest()
+ovms_tensor.fill_tensor_proto(request.inputs['input'], [[1.0, 2.0]], dtype='float32')
+assert ovms_tensor.make_ndarray(request.inputs['input']).tolist() == [[1.0, 2.0]]
+loaded = sorted(module for module in sys.modules if module.split('.')[0] in ('tensorflow', 'tensorflow_serving'))
+assert not loaded, 'TensorFlow modules imported by the client: {}'.format(loaded)
+"""
+
+
+class TestExampleClientImports:
+
+    def test_predict_client_does_not_import_tensorflow(self):
+        result = subprocess.run([sys.executable, '-c', NO_TENSORFLOW_CHECK], cwd=EXAMPLE_CLIENT_PATH,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        assert result.returncode == 0, result.stdout
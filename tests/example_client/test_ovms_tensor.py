@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pytest
+
+import ovms_tensor
+from ovms_tensor import fill_tensor_proto, make_ndarray, make_tensor_proto
+
+
+class TestOvmsTensor:
+
+    @pytest.mark.parametrize("dtype", list(ovms_tensor.NUMPY_TO_TENSOR_DTYPE))
+    def test_round_trip(self, dtype):
+        values = np.arange(6).reshape(2, 3).astype(dtype)
+        tensor = make_tensor_proto(values)
+        assert tensor.dtype == ovms_tensor.NUMPY_TO_TENSOR_DTYPE[dtype]
+        assert [dim.size for dim in tensor.tensor_shape.dim] == [2, 3]
+        result = make_ndarray(tensor)
+        assert result.dtype == dtype
+        np.testing.assert_array_equal(result, values)
+
+    @pytest.mark.parametrize("dtype", ["float32", "int32", "int64", "uint8"])
+    def test_numeric_data_is_stored_in_tensor_content(self, dtype):
+        tensor = make_tensor_proto(np.ones((2, 2), dtype=dtype))
+        assert tensor.tensor_content == np.ones((2, 2), dtype=dtype).tobytes()
+        assert not getattr(tensor, ovms_tensor.VALUE_FIELDS[tensor.dtype])
+
+    def test_half_is_stored_in_half_val(self):
+        values = np.array([1.5, -2.0], dtype=np.float16)
+        tensor = make_tensor_proto(values)
+        assert tensor.dtype == ovms_tensor.DT_HALF
+        assert not tensor.tensor_content
+        assert list(tensor.half_val) == values.view(np.uint16).tolist()
+        np.testing.assert_array_equal(make_ndarray(tensor), values)
+
+    def test_uint16_is_stored_in_int_val(self):
+        tensor = make_tensor_proto(np.array([0, 65535], dtype=np.uint16))
+        assert tensor.dtype == ovms_tensor.DT_UINT16
+        assert not tensor.tensor_content
+        assert list(tensor.int_val) == [0, 65535]
+
+    def test_sequence_id_is_stored_in_uint64_val(self):
+        sequence_id = 2 ** 63 + 5
+        tensor = make_tensor_proto([sequence_id], dtype="uint64")
+        assert tensor.dtype == ovms_tensor.DT_UINT64
+        assert not tensor.tensor_content
+        assert list(tensor.uint64_val) == [sequence_id]
+        assert [dim.size for dim in tensor.tensor_shape.dim] == [1]
+        assert make_ndarray(tensor).tolist() == [sequence_id]
+
+    def test_sequence_control_input_is_stored_in_uint32_val(self):
+        tensor = make_tensor_proto([1], dtype="uint32")
+        assert tensor.dtype == ovms_tensor.DT_UINT32
+        assert not tensor.tensor_content
+        assert list(tensor.uint32_val) == [1]
+        assert make_ndarray(tensor).tolist() == [1]
+
+    def test_tensor_dtype_value(self):
+        tensor = make_tensor_proto([1, 2], dtype=ovms_tensor.DT_FLOAT)
+        assert tensor.dtype == ovms_tensor.DT_FLOAT
+        assert make_ndarray(tensor).dtype == np.float32
+
+    def test_strings(self):
+        tensor = make_tensor_proto([b"abc", "def"])
+        assert tensor.dtype == ovms_tensor.DT_STRING
+        assert list(tensor.string_val) == [b"abc", b"def"]
+        assert [dim.size for dim in tensor.tensor_shape.dim] == [2]
+        assert make_ndarray(tensor).tolist() == [b"abc", b"def"]
+
+    def test_single_string(self):
+        tensor = make_tensor_proto(b"abc")
+        assert list(tensor.string_val) == [b"abc"]
+        assert [dim.size for dim in tensor.tensor_shape.dim] == [1]
+
+    @pytest.mark.parametrize("value", [3.0, 7, np.float32(1)])
+    def test_scalar(self, value):
+        tensor = make_tensor_proto(value)
+        assert len(tensor.tensor_shape.dim) == 0
+        result = make_ndarray(tensor)
+        assert result.shape == ()
+        assert result == value
+
+    def test_explicit_shape(self):
+        tensor = make_tensor_proto([1, 2, 3, 4], shape=[2, 2], dtype="int32")
+        assert make_ndarray(tensor).tolist() == [[1, 2], [3, 4]]
+
+    def test_shape_mismatch(self):
+        with pytest.raises(ValueError, match="does not match"):
+            make_tensor_proto([1, 2, 3], shape=[2, 2], dtype="int32")
+
+    def test_unsupported_dtype(self):
+        with pytest.raises(ValueError, match="Unsupported data type"):
+            make_tensor_proto(np.array(["2021-01-01"], dtype="datetime64[D]"))
+
+    def test_fill_clears_previous_content(self):
+        tensor = make_tensor_proto(np.float16([1.0]))
+        fill_tensor_proto(tensor, [1.0, 2.0], dtype="float32")
+        assert not tensor.half_val
+        assert make_ndarray(tensor).tolist() == [1.0, 2.0]
+
+    def test_missing_values_repeat_the_last_value(self):
+        tensor = make_tensor_proto(np.int64([0]))
+        tensor.ClearField("tensor_content")
+        tensor.int64_val.extend([4, 5])
+        tensor.tensor_shape.dim[0].size = 4
+        assert make_ndarray(tensor).tolist() == [4, 5, 5, 5]
@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import threading
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from ovms_client import ChannelPool, PredictClient
+from ovms_protos import predict_pb2, prediction_service_pb2_grpc
+from ovms_tensor import fill_tensor_proto, make_ndarray
+
+
+class DoublingPredictionService(prediction_service_pb2_grpc.PredictionServiceServicer):
+    """Returns every input multiplied by 2 and remembers the peer of each call."""
+
+    def __init__(self):
+        self.peers = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def Predict(self, request, context):
+        self.peers.append(context.peer())
+        if request.model_spec.name != "doubler":
+            context.abort(grpc.StatusCode.NOT_FOUND, "Model with requested name is not found")
+        self.release.wait()
+        response = predict_pb2.PredictResponse()
+        response.model_spec.CopyFrom(request.model_spec)
+        for name, tensor in request.inputs.items():
+            fill_tensor_proto(response.outputs[name], make_ndarray(tensor) * 2)
+        return response
+
+
+@pytest.fixture
+def service():
+    service = DoublingPredictionService()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    prediction_service_pb2_grpc.add_PredictionServiceServicer_to_server(service, server)
+    service.address = "localhost:{}".format(server.add_insecure_port("localhost:0"))
+    server.start()
+    yield service
+    service.release.set()
+    server.stop(None)
+
+
+def _request():
+    request = predict_pb2.PredictRequest()
+    request.model_spec.name = "doubler"
+    fill_tensor_proto(request.inputs["x"], np.float32([1, 2]))
+    return request
+
+
+class TestChannelPool:
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            ChannelPool("localhost:9000", size=0)
+
+    def test_round_robin(self, service):
+        with ChannelPool(service.address, size=3) as pool:
+            assert len(pool) == 3
+            stubs = [pool.stub() for _ in range(6)]
+            assert stubs[:3] == pool.stubs
+            assert stubs[3:] == pool.stubs
+            for stub in stubs:
+                stub.Predict(_request(), 5)
+        # Each channel keeps its own connection, reused by every call made through it
+        assert len(set(service.peers)) == 3
+        assert service.peers[:3] == service.peers[3:]
+
+    def test_close(self, service):
+        pool = ChannelPool(service.address, size=2)
+        stub = pool.stub()
+        stub.Predict(_request(), 5)
+        pool.close()
+        assert len(pool) == 0
+        with pytest.raises(ValueError, match="closed"):
+            pool.stub()
+        with pytest.raises(ValueError):
+            stub.Predict(_request(), 5)
+
+
+class TestPredictClient:
+
+    def test_predict(self, service):
+        with PredictClient(service.address, pool_size=2) as client:
+            outputs = client.predict("doubler", {"x": np.float32([[1, 2]]), "y": np.int64([3])})
+        assert outputs["x"].dtype == np.float32
+        assert outputs["x"].tolist() == [[2, 4]]
+        assert outputs["y"].tolist() == [6]
+
+    def test_make_request(self):
+        request = PredictClient.make_request("model", {"x": np.int32([1])}, model_version=3)
+        assert request.model_spec.name == "model"
+        assert request.model_spec.version.value == 3
+        assert make_ndarray(request.inputs["x"]).tolist() == [1]
+
+    def test_error(self, service):
+        with PredictClient(service.address) as client:
+            with pytest.raises(grpc.RpcError) as error:
+                client.predict("missing", {"x": np.float32([1])})
+        assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+    def test_predict_async(self, service):
+        async def run(client):
+            return await asyncio.gather(*(client.predict_async("doubler", {"x": np.int32([index])})
+                                          for index in range(8)))
+
+        with PredictClient(service.address, pool_size=2) as client:
+            results = asyncio.run(run(client))
+        assert [outputs["x"].tolist() for outputs in results] == [[2 * index] for index in range(8)]
+
+    def test_predict_async_error(self, service):
+        with PredictClient(service.address) as client:
+            with pytest.raises(grpc.RpcError) as error:
+                asyncio.run(client.predict_async("missing", {"x": np.float32([1])}))
+        assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+    def test_predict_async_cancel(self, service):
+        service.release.clear()
+
+        async def run(client):
+            task = asyncio.ensure_future(client.predict_async("doubler", {"x": np.float32([1])}))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with PredictClient(service.address) as client:
+            asyncio.run(run(client))
@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+import numpy as np
+import pytest
+
+from ovms_client import rest_json
+from ovms_client.rest_json import decode_predict_response, encode_predict_request
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(rest_json, "orjson", None)
+    return request.param
+
+
+def _encode(inputs, request_format):
+    return json.loads(b"".join(encode_predict_request(inputs, request_format)))
+
+
+class TestEncodePredictRequest:
+
+    def test_column_name(self, encoder):
+        body = _encode({"a": np.arange(6, dtype=np.int32).reshape(3, 2), "b": np.float32([1.5])}, "column_name")
+        assert body == {"signature_name": "serving_default", "inputs": {"a": [[0, 1], [2, 3], [4, 5]], "b": [1.5]}}
+
+    def test_column_noname(self, encoder):
+        body = _encode({"a": np.float16([[0.5, 1.0]])}, "column_noname")
+        assert body["inputs"] == [[0.5, 1.0]]
+
+    def test_row_noname(self, encoder):
+        body = _encode({"a": np.int64([[1, 2], [3, 4]])}, "row_noname")
+        assert body["instances"] == [[1, 2], [3, 4]]
+
+    def test_row_name(self, encoder):
+        body = _encode({"a": np.int32([[1, 2], [3, 4]]), "b": np.float64([5.0, 6.0])}, "row_name")
+        assert body["instances"] == [{"a": [1, 2], "b": 5.0}, {"a": [3, 4], "b": 6.0}]
+
+    def test_binary(self, encoder):
+        body = _encode({"image": [b"\x00\x01", b"\xff"]}, "row_name")
+        assert body["instances"] == [{"image": {"b64": "AAE="}}, {"image": {"b64": "/w=="}}]
+        body = _encode({"image": [b"\x00\x01"]}, "column_name")
+        assert body["inputs"] == {"image": [{"b64": "AAE="}]}
+
+    def test_empty_array(self, encoder):
+        assert _encode({"a": np.zeros((0,), dtype=np.float32)}, "column_name")["inputs"] == {"a": []}
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError, match="Invalid request format"):
+            encode_predict_request({"a": np.zeros(1)}, "rows")
+
+    def test_noname_format_with_many_inputs(self):
+        with pytest.raises(ValueError, match="supports only one input"):
+            encode_predict_request({"a": np.zeros(1), "b": np.zeros(1)}, "row_noname")
+
+    def test_row_format_with_different_batch_sizes(self):
+        with pytest.raises(ValueError, match="same batch size"):
+            encode_predict_request({"a": np.zeros(1), "b": np.zeros(2)}, "row_name")
+
+
+class TestParseArray:
+
+    def test_int(self):
+        array = rest_json._parse_array(b"[[1,2,3],[4,5,6]]", 2)
+        assert array.dtype == np.int64
+        assert array.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+    @pytest.mark.parametrize("text, expected", [
+        (b"[1.5,2]", [1.5, 2.0]),
+        (b"[1e3,2]", [1000.0, 2.0]),
+        (b"[-2E-1,0]", [-0.2, 0.0]),
+    ])
+    def test_float(self, text, expected):
+        array = rest_json._parse_array(text, 1)
+        assert array.dtype == np.float64
+        assert array.tolist() == expected
+
+    def test_nan(self):
+        array = rest_json._parse_array(b"[NaN,1]", 1)
+        assert array.dtype == np.float64
+        assert np.isnan(array[0]) and array[1] == 1.0
+
+    def test_empty(self):
+        assert rest_json._parse_array(b"[]", 1).shape == (0,)
+        assert rest_json._parse_array(b"[[]]", 2).shape == (1, 0)
+
+    def test_three_dimensions(self):
+        array = rest_json._parse_array(b"[[[1],[2]],[[3],[4]],[[5],[6]]]", 3)
+        assert array.shape == (3, 2, 1)
+        assert array.ravel().tolist() == [1, 2, 3, 4, 5, 6]
+
+    @pytest.mark.parametrize("text", [b"[[1,2],[3]]", b"[[1],[2,3]]"])
+    def test_not_rectangular(self, text):
+        with pytest.raises(ValueError, match="not rectangular"):
+            rest_json._parse_array(text, 2)
+
+
+class TestDecodePredictResponse:
+
+    def test_named_outputs(self):
+        outputs = decode_predict_response(b'{"outputs": {"a": [[1, 2], [3, 4]], "b": [0.5]}}')
+        assert outputs["a"].tolist() == [[1, 2], [3, 4]]
+        assert outputs["b"].tolist() == [0.5]
+
+    def test_unnamed_output(self):
+        outputs = decode_predict_response(b'{"outputs": [[1.0, 2.0]]}')
+        assert outputs[rest_json.UNNAMED_OUTPUT].tolist() == [[1.0, 2.0]]
+
+    def test_predictions(self):
+        outputs = decode_predict_response(b'{"predictions": [[1], [2]]}')
+        assert outputs[rest_json.UNNAMED_OUTPUT].tolist() == [[1], [2]]
+
+    def test_named_predictions(self):
+        outputs = decode_predict_response(b'{"predictions": [{"a": [1, 2], "b": [0.5]}, {"a": [3, 4], "b": [1.5]}]}')
+        assert outputs["a"].tolist() == [[1, 2], [3, 4]]
+        assert outputs["b"].tolist() == [[0.5], [1.5]]
+
+    def test_string_output(self):
+        outputs = decode_predict_response(b'{"outputs": {"text": ["abc", "de"]}}')
+        assert outputs["text"].tolist() == ["abc", "de"]
+
+    def test_error(self):
+        with pytest.raises(ValueError, match="Server returned error: Missing input"):
+            decode_predict_response(b'{"error": "Missing input"}')
+
+    def test_round_trip(self, encoder):
+        data = np.arange(12, dtype=np.float32).reshape(3, 4) / 4
+        request = _encode({"a": data}, "column_name")
+        body = json.dumps({"outputs": request["inputs"]}).encode()
+        np.testing.assert_array_equal(decode_predict_response(body)["a"], data)
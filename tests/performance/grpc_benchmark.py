@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2021 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import sys
+import time
+import queue
+import random
+import argparse
+import importlib
+import threading
+import multiprocessing
+import numpy as np
+
+
+EXAMPLE_CLIENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client')
+sys.path.append(EXAMPLE_CLIENT_PATH)
+
+
+def load_example_client_module(name):
+    path = os.path.join(EXAMPLE_CLIENT_PATH, name + '.py')
+    spec = importlib.util.spec_from_loader(name, importlib.machinery.SourceFileLoader(name, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+client_utils = load_example_client_module('client_utils')
+ovms_tensor = load_example_client_module('ovms_tensor')
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Sends requests via TFS gRPC API from a pool of worker processes using images in numpy format.'
+                    ' Supports closed-loop (fixed concurrency) and open-loop (Poisson arrivals at target rate) load'
+                    ' and reports aggregated throughput and latency percentiles.')
+    parser.add_argument('--images_numpy_path',
+                        required=True,
+                        help='numpy in shape [n,w,h,c] or [n,c,h,w]')
+    parser.add_argument('--grpc_address',
+                        required=False,
+                        default='localhost',
+                        help='Specify url to grpc service. default:localhost')
+    parser.add_argument('--grpc_port',
+                        required=False,
+                        default=9178,
+                        help='Specify port to grpc service. default: 9178')
+    parser.add_argument('--input_name',
+                        required=False,
+                        default='input',
+                        help='Specify input tensor name. default: input')
+    parser.add_argument('--model_name',
+                        default='resnet',
+                        help='Define model name in payload. default: resnet')
+    parser.add_argument('--model_version',
+                        default=0,
+                        help='Model version number. default: 0 (latest)',
+                        type=int)
+    parser.add_argument('--batchsize',
+                        default=1,
+                        help='Number of images in a single request. default: 1',
+                        type=int)
+    parser.add_argument('--precision',
+                        default=np.float32,
+                        help='input precision',
+                        type=np.dtype)
+    parser.add_argument('--workers',
+                        default=1,
+                        help='Number of client processes, each with its own gRPC channel. default: 1',
+                        type=int)
+    parser.add_argument('--mode',
+                        default='closed',
+                        choices=['closed', 'open'],
+                        help='closed: keep --concurrency requests in flight; '
+                             'open: send requests with Poisson arrivals at --rate. default: closed')
+    parser.add_argument('--concurrency',
+                        default=1,
+                        help='Closed loop only. Total number of requests in flight, '
+                             'spread evenly across workers. default: 1',
+                        type=int)
+    parser.add_argument('--rate',
+                        default=100.0,
+                        help='Open loop only. Target total request rate per second. default: 100',
+                        type=float)
+    parser.add_argument('--duration',
+                        default=0.0,
+                        help='Length of the measurement in seconds. default: 0 (use --iterations)',
+                        type=float)
+    parser.add_argument('--iterations',
+                        default=1000,
+                        help='Total number of requests when --duration is not set. default: 1000',
+                        type=int)
+    parser.add_argument('--warmup',
+                        default=0.0,
+                        help='Seconds of load sent before the measurement starts. default: 0',
+                        type=float)
+    parser.add_argument('--timeout',
+                        default=10.0,
+                        help='Request timeout in seconds. default: 10',
+                        type=float)
+    parser.add_argument('--histogram_json',
+                        required=False,
+                        help='Path to save the merged latency histogram in JSON format')
+    parser.add_argument('--histogram_csv',
+                        required=False,
+                        help='Path to save the merged latency histogram buckets in CSV format')
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("Argument '--workers' must be at least 1")
+    if args.mode == 'closed' and args.concurrency < args.workers:
+        parser.error("Argument '--concurrency' can't be lower than '--workers'")
+    if args.mode == 'open' and args.rate <= 0:
+        parser.error("Argument '--rate' must be greater than 0")
+    if args.duration <= 0 and args.iterations < args.workers:
+        parser.error("Argument '--iterations' can't be lower than '--workers'")
+    return args
+
+
+def split_evenly(total, parts, index):
+    return total // parts + (1 if index < total % parts else 0)
+
+
+def prepare_requests(args):
+    from ovms_protos import predict_pb2
+
+    imgs = np.load(args.images_numpy_path, mmap_mode='r', allow_pickle=False)
+    imgs = imgs - np.min(imgs)  # Normalization 0-255
+    imgs = imgs / np.ptp(imgs) * 255  # Normalization 0-255
+    imgs = imgs.astype(args.precision)
+    while args.batchsize > imgs.shape[0]:
+        imgs = np.append(imgs, imgs, axis=0)
+
+    # Requests are built once so serialization cost does not skew the load
+    requests = []
+    for x in range(0, imgs.shape[0] - args.batchsize + 1, args.batchsize):
+        img = imgs[x:(x + args.batchsize)]
+        request = predict_pb2.PredictRequest()
+        request.model_spec.name = args.model_name
+        if args.model_version > 0:
+            request.model_spec.version.value = args.model_version
+        ovms_tensor.fill_tensor_proto(request.inputs[args.input_name], img)
+        requests.append(request)
+    return requests
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = client_utils.LatencyHistogram()
+        self.errors = 0
+        self.measuring = False
+
+    def record(self, latency_ms, ok):
+        if not self.measuring:
+            return
+        with self.lock:
+            if ok:
+                self.latencies.record(latency_ms)
+            else:
+                self.errors += 1
+
+
+def run_closed_loop(stub, requests, args, recorder, in_flight, deadline, total):
+    # Each worker keeps `in_flight` requests outstanding, the next one is sent as soon as one completes
+    slots = threading.Semaphore(in_flight)
+    sent = 0
+    while (total is None or sent < total) and time.perf_counter() < deadline:
+        slots.acquire()
+        request = requests[sent % len(requests)]
+        start = time.perf_counter()
+
+        def on_done(future, start=start):
+            recorder.record((time.perf_counter() - start) * 1000, future.exception() is None)
+            slots.release()
+
+        stub.Predict.future(request, args.timeout).add_done_callback(on_done)
+        sent += 1
+    for _ in range(in_flight):
+        slots.acquire()
+    return sent
+
+
+def run_open_loop(stub, requests, args, recorder, rate, deadline, total):
+    # Requests are sent on a precomputed Poisson schedule regardless of completions. Latency is measured
+    # from the scheduled send time, so a stalled client or server is not hidden (coordinated omission).
+    pending = threading.Semaphore(0)
+    sent = 0
+    scheduled = time.perf_counter()
+    while (total is None or sent < total) and scheduled < deadline:
+        scheduled += random.expovariate(rate)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        request = requests[sent % len(requests)]
+
+        def on_done(future, start=scheduled):
+            recorder.record((time.perf_counter() - start) * 1000, future.exception() is None)
+            pending.release()
+
+        stub.Predict.future(request, args.timeout).add_done_callback(on_done)
+        sent += 1
+    for _ in range(sent):
+        pending.acquire()
+    return sent
+
+
+def worker(index, args, barrier, results):
+    import grpc
+    from ovms_protos import prediction_service_pb2_grpc
+
+    requests = prepare_requests(args)
+    channel = grpc.insecure_channel("{}:{}".format(args.grpc_address, args.grpc_port))
+    stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
+    recorder = Recorder()
+
+    if args.mode == 'closed':
+        share = split_evenly(args.concurrency, args.workers, index)
+
+        def run(deadline, total):
+            return run_closed_loop(stub, requests, args, recorder, share, deadline, total)
+    else:
+        share = args.rate / args.workers
+
+        def run(deadline, total):
+            return run_open_loop(stub, requests, args, recorder, share, deadline, total)
+
+    barrier.wait()
+    if args.warmup > 0:
+        run(time.perf_counter() + args.warmup, None)
+
+    barrier.wait()
+    recorder.measuring = True
+    total = None if args.duration > 0 else split_evenly(args.iterations, args.workers, index)
+    deadline = time.perf_counter() + args.duration if args.duration > 0 else float('inf')
+    start = time.time()
+    sent = run(deadline, total)
+    end = time.time()
+    channel.close()
+
+    results.put({
+        'id': index,
+        'sent': sent,
+        'errors': recorder.errors,
+        'latencies': recorder.latencies.to_dict(),
+        'start': start,
+        'end': end})
+
+
+def print_report(args, results):
+    latencies = client_utils.LatencyHistogram()
+    for result in results:
+        latencies.merge(client_utils.LatencyHistogram.from_dict(result['latencies']))
+    sent = sum(result['sent'] for result in results)
+    errors = sum(result['errors'] for result in results)
+    elapsed = max(result['end'] for result in results) - min(result['start'] for result in results)
+    completed = latencies.count
+
+    print('Mode: {}; Workers: {}; {}'.format(
+        args.mode, args.workers,
+        'Concurrency: {}'.format(args.concurrency) if args.mode == 'closed'
+        else 'Target rate: {:.2f} req/s'.format(args.rate)))
+    print('Requests sent: {}; Completed: {}; Errors: {}; Duration: {:.2f}s'.format(sent, completed, errors, elapsed))
+    print('Throughput: {:.2f} req/s; {:.2f} fps'.format(completed / elapsed, completed * args.batchsize / elapsed))
+    if completed == 0:
+        print('No request completed successfully')
+        return
+    print('Latency average: {:.2f} ms; min: {:.2f} ms; max: {:.2f} ms'.format(
+        latencies.average(), latencies.min, latencies.max))
+    print('; '.join('p{}: {:.2f} ms'.format(percentile, latencies.percentile(percentile))
+                    for percentile in PERCENTILES))
+    if args.histogram_json:
+        latencies.write_json(args.histogram_json)
+    if args.histogram_csv:
+        latencies.write_csv(args.histogram_csv)
+
+
+def main():
+    args = parse_arguments()
+    # gRPC is not fork safe, each worker starts from a clean interpreter
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(args.workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(index, args, barrier, results))
+                 for index in range(args.workers)]
+    for process in processes:
+        process.start()
+
+    print('Starting {} workers'.format(args.workers))
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=1))
+        except queue.Empty:
+            if any(process.exitcode not in (None, 0) for process in processes):
+                for process in processes:
+                    process.terminate()
+                print('Worker process has failed')
+                sys.exit(1)
+    for process in processes:
+        process.join()
+    print_report(args, collected)
+
+
+if __name__ == '__main__':
+    main()
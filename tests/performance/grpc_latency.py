@@ -15,15 +15,26 @@
 # limitations under the License.
 #
 
+import os
 import sys
 import grpc
 import datetime
 import argparse
+import importlib
 import numpy as np
-from tensorflow import make_tensor_proto, make_ndarray
-from tensorflow_serving.apis import predict_pb2
-from tensorflow_serving.apis import prediction_service_pb2_grpc
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client'))
+from ovms_protos import predict_pb2
+from ovms_protos import prediction_service_pb2_grpc
+
+client_utils_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client', 'client_utils.py')
+spec = importlib.util.spec_from_loader('client_utils', importlib.machinery.SourceFileLoader('client_utils', client_utils_path))
+client_utils = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(client_utils)
+ovms_tensor_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'example_client', 'ovms_tensor.py')
+spec = importlib.util.spec_from_loader('ovms_tensor', importlib.machinery.SourceFileLoader('ovms_tensor', ovms_tensor_path))
+ovms_tensor = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ovms_tensor)
 
 parser = argparse.ArgumentParser(
     description='Sends requests via TFS gRPC API using images in numpy format.'
@@ -79,6 +90,12 @@ parser.add_argument('--precision',
 parser.add_argument('--id',
                     default='--',
                     help='Helps identifying client')
+parser.add_argument('--histogram_json',
+                    required=False,
+                    help='Path to save the latency histogram in JSON format')
+parser.add_argument('--histogram_csv',
+                    required=False,
+                    help='Path to save the latency histogram buckets in CSV format')
 args = parser.parse_args()
 
 accurracy_measuring_mode = args.labels_numpy_path is not None
@@ -89,7 +106,7 @@ channel = grpc.insecure_channel("{}:{}".format(
 
 stub = prediction_service_pb2_grpc.PredictionServiceStub(channel)
 
-processing_times = np.zeros((0), int)
+processing_times = client_utils.LatencyHistogram()
 
 imgs = np.load(args.images_numpy_path, mmap_mode='r', allow_pickle=False)
 imgs = imgs - np.min(imgs)  # Normalization 0-255
@@ -140,8 +157,7 @@ while iteration <= iterations:
         request.model_spec.version.value = args.model_version
 
         # Populating request with data
-        request.inputs[args.input_name].CopyFrom(
-            make_tensor_proto(img, shape=(img.shape)))
+        ovms_tensor.fill_tensor_proto(request.inputs[args.input_name], img)
 
         # Measuring gRPC request time
         start_time = datetime.datetime.now()
@@ -150,11 +166,11 @@ while iteration <= iterations:
 
         # Aggregating processing time statistics
         duration = (end_time - start_time).total_seconds() * 1000
-        processing_times = np.append(processing_times, np.array([duration]))
+        processing_times.record(duration)
         
         # If we want to check accurracy
         if accurracy_measuring_mode:
-            output = np.array(make_ndarray(result.outputs[args.output_name]))
+            output = np.array(ovms_tensor.make_ndarray(result.outputs[args.output_name]))
             if args.model_name == "dummy":
                 if (img + 1 == output ).all():
                     matches_count += 1
@@ -168,14 +184,22 @@ while iteration <= iterations:
         if args.report_every > 0 and iteration < iterations and iteration % args.report_every == 0:
             print(f'[{args.id:2}] Iteration {iteration:5}/{iterations:5}; '
                   f'Current latency: {round(duration, 2):.2f}ms; '
-                  f'Average latency: {round(np.average(processing_times), 2):.2f}ms')
+                  f'Average latency: {round(processing_times.average(), 2):.2f}ms')
+
+percentiles = '; '.join('p{}: {:.2f}ms'.format(percentile, processing_times.percentile(percentile))
+                        for percentile in (50, 90, 99, 99.9))
+if args.histogram_json:
+    processing_times.write_json(args.histogram_json)
+if args.histogram_csv:
+    processing_times.write_csv(args.histogram_csv)
 
 # Latency and accurracy
 if accurracy_measuring_mode:
     accuracy = 100 * matches_count / total_count
     print(f"[{args.id:2}] "
       f"Iterations: {iterations:5}; "
-      f"Final average latency: {round(np.average(processing_times), 2):.2f}ms; "
+      f"Final average latency: {round(processing_times.average(), 2):.2f}ms; "
+      f"{percentiles}; "
       f"Classification accuracy: {accuracy}%")
     if accuracy < 100.0:
         print('Accurracy is lower than 100')
@@ -184,4 +208,5 @@ if accurracy_measuring_mode:
 else:
     print(f"[{args.id:2}] "
         f"Iterations: {iterations:5}; "
-        f"Final average latency: {round(np.average(processing_times), 2):.2f}ms")  
+        f"Final average latency: {round(processing_times.average(), 2):.2f}ms; "
+        f"{percentiles}")